@@ -1,17 +1,152 @@
 """Build script.
 
 All subclasses of Builder in the builds package are automatically called.
+
+The build is tuned for startup time. A one file app unpacks everything
+to a temporary directory on every launch, so the app is built as a folder
+that is zipped once for the release. The modules the game never imports
+are left out and the bytecode is compiled at build time. The assets are
+bundled in one pack file, which the game maps into memory. The pack is
+built in the temporary build directory, so a checkout keeps reading the
+files of the resources package.
 """
 
+import os
+import shutil
+from pathlib import Path
 from types import ModuleType
 
 from pyrig.dev.artifacts.builder.base.base import PyInstallerBuilder
 
+from notty.dev.artifacts import resources
+from notty.dev.artifacts.builder.pack import build_asset_pack, collect_assets
+from notty.dev.artifacts.builder.sprites import build_sprite_variants
+from notty.src.assets import PACK_NAME, get_assets_dir
+from notty.src.ui.sprites import get_sprite_dir
+
+# modules pyinstaller would bundle but the game never imports
+EXCLUDED_MODULES = (
+    "PIL",
+    "_tkinter",
+    "cryptography",
+    "nacl",
+    "numpy",
+    "pygame.docs",
+    "pygame.examples",
+    "pygame.tests",
+    "tkinter",
+    "yaml",
+)
+# optimization level of the bytecode, 2 would drop the docstrings of the CLI
+BYTECODE_OPTIMIZATION = 1
+
 
 class NottyBuilder(PyInstallerBuilder):
     """Builder for notty."""
 
+    @classmethod
+    def create_artifacts(cls, temp_artifacts_dir: Path) -> None:
+        """Scale the sprites, pack the assets, build the app folder and zip it."""
+        build_sprite_variants(get_sprite_dir())
+        build_asset_pack(
+            get_assets_dir(), cls.get_temp_packpath(temp_artifacts_dir.parent)
+        )
+        super().create_artifacts(temp_artifacts_dir)
+        cls.archive_app_dir(temp_artifacts_dir)
+
+    @classmethod
+    def archive_app_dir(cls, temp_artifacts_dir: Path) -> Path:
+        """Replace the app folder by a zip file, a release takes only files.
+
+        Args:
+            temp_artifacts_dir: The directory pyinstaller built the app in.
+
+        Returns:
+            The path of the zip file.
+        """
+        app_dir = temp_artifacts_dir / cls.get_app_name()
+        archive = shutil.make_archive(
+            str(app_dir), "zip", temp_artifacts_dir, app_dir.name
+        )
+        shutil.rmtree(app_dir)
+        return Path(archive)
+
+    @classmethod
+    def get_pyinstaller_options(cls, temp_artifacts_dir: Path) -> list[str]:
+        """Get the pyinstaller options of a folder app that starts fast.
+
+        Args:
+            temp_artifacts_dir: The directory to build the app in.
+
+        Returns:
+            The command line options of pyinstaller.
+        """
+        options = super().get_pyinstaller_options(temp_artifacts_dir)
+        pack = cls.get_temp_packpath(temp_artifacts_dir.parent) / PACK_NAME
+        # the pack goes where the game looks for it, in the resources package
+        dest = Path(*resources.__name__.split("."))
+        options.extend(["--add-data", f"{pack}{os.pathsep}{dest}"])
+        # the assets stay plain files next to the app instead of being unpacked
+        options[options.index("--onefile")] = "--onedir"
+        options.extend(
+            [
+                # upx compressed libraries are decompressed on every start
+                "--noupx",
+                "--optimize",
+                str(BYTECODE_OPTIMIZATION),
+            ]
+        )
+        for module in EXCLUDED_MODULES:
+            options.extend(["--exclude-module", module])
+        return options
+
+    @classmethod
+    def get_temp_packpath(cls, temp_dir: Path) -> Path:
+        """Get the directory the asset pack is built in.
+
+        Args:
+            temp_dir: The temporary build directory.
+
+        Returns:
+            The directory, created if missing.
+        """
+        path = temp_dir / "packpath"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
     @classmethod
     def get_additional_resource_pkgs(cls) -> list[ModuleType]:
         """Get the add datas."""
         return []
+
+    @classmethod
+    def get_add_datas(cls) -> list[tuple[Path, Path]]:
+        """Get the add data paths with the asset pack instead of the assets.
+
+        Pyinstaller copies a directory with everything in it, so the
+        directories of the resources package are replaced by their files
+        without the packed assets and the full size sprites. A pack left in
+        the resources package by an older build is skipped, the fresh pack
+        is added by get_pyinstaller_options.
+
+        Returns:
+            list[tuple[Path, Path]]: List of tuples with the source path
+                and the destination path.
+        """
+        assets_dir = get_assets_dir().resolve()
+        sprite_dir = get_sprite_dir().resolve()
+        packed = {path.resolve() for path in collect_assets(assets_dir).values()}
+        add_datas: list[tuple[Path, Path]] = []
+        for src, dest in super().get_add_datas():
+            if not src.resolve().is_relative_to(assets_dir):
+                add_datas.append((src, dest))
+                continue
+            add_datas.extend(
+                (path, dest)
+                for path in sorted(src.iterdir())
+                if path.is_file()
+                and path.resolve() not in packed
+                and path.name != PACK_NAME
+                and not (path.parent.resolve() == sprite_dir and path.suffix == ".png")
+            )
+        return add_datas
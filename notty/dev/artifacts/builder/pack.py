@@ -0,0 +1,61 @@
+"""Asset build stage writing all assets into one pack file.
+
+The pack is read by notty.src.assets. It holds the icon, the music and
+the scaled sprites, the full size sprites are left out. It is written
+outside the resources package, a pack there would shadow the files of a
+checkout even after they changed.
+"""
+
+import json
+from pathlib import Path
+
+from notty.src.assets import PACK_HEADER, PACK_MAGIC, PACK_NAME, PACK_VERSION
+from notty.src.ui.sprites import VARIANT_FORMAT
+
+# the assets in the pack, relative to the resources directory
+PACKED_PATTERNS = ("icon.png", "music/*.mp3", f"sprites/*/*.{VARIANT_FORMAT}")
+
+
+def collect_assets(assets_dir: Path) -> dict[str, Path]:
+    """Find the assets to pack.
+
+    Args:
+        assets_dir: The resources directory.
+
+    Returns:
+        The files by their path relative to the resources directory.
+    """
+    return {
+        path.relative_to(assets_dir).as_posix(): path
+        for pattern in PACKED_PATTERNS
+        for path in sorted(assets_dir.glob(pattern))
+    }
+
+
+def build_asset_pack(assets_dir: Path, output_dir: Path) -> Path:
+    """Write the assets of the resources directory into a pack.
+
+    Args:
+        assets_dir: The resources directory.
+        output_dir: The directory to write the pack into.
+
+    Returns:
+        The path of the pack.
+    """
+    assets = collect_assets(assets_dir)
+    # offsets count from the end of the index, where the assets start
+    index: dict[str, tuple[int, int]] = {}
+    offset = 0
+    for name, asset in assets.items():
+        size = asset.stat().st_size
+        index[name] = (offset, size)
+        offset += size
+    encoded = json.dumps(index).encode()
+
+    path = output_dir / PACK_NAME
+    with path.open("wb") as pack:
+        pack.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(encoded)))
+        pack.write(encoded)
+        for asset in assets.values():
+            pack.write(asset.read_bytes())
+    return path
@@ -0,0 +1,59 @@
+"""Asset build stage scaling the full size sprites.
+
+Every sprite is scaled to the heights the game shows it at and saved as
+WebP next to the source, in a directory per height. Variants newer than
+their source are kept, so a build only scales the changed sprites.
+"""
+
+from pathlib import Path
+
+from PIL import Image
+
+from notty.src.ui.sprites import VARIANT_FORMAT, VARIANT_HEIGHTS
+
+# lossy color at a quality without visible artifacts, alpha stays lossless
+VARIANT_QUALITY = 90
+
+
+def is_up_to_date(source: Path, target: Path) -> bool:
+    """Check if a variant was built from the current source.
+
+    Args:
+        source: The full size sprite.
+        target: The variant.
+
+    Returns:
+        True if the variant exists and is newer than the source.
+    """
+    return target.is_file() and target.stat().st_mtime >= source.stat().st_mtime
+
+
+def build_sprite_variants(
+    sprite_dir: Path, heights: tuple[int, ...] = VARIANT_HEIGHTS
+) -> list[Path]:
+    """Scale every sprite of a directory to every height.
+
+    Args:
+        sprite_dir: The directory of the full size PNG sprites.
+        heights: The heights of the variants.
+
+    Returns:
+        The paths of all variants.
+    """
+    variants: list[Path] = []
+    for source in sorted(sprite_dir.glob("*.png")):
+        targets = {
+            height: sprite_dir / str(height) / f"{source.stem}.{VARIANT_FORMAT}"
+            for height in heights
+        }
+        variants.extend(targets.values())
+        if all(is_up_to_date(source, target) for target in targets.values()):
+            continue
+        with Image.open(source) as image:
+            for height, target in targets.items():
+                width = round(image.width * height / image.height)
+                target.parent.mkdir(exist_ok=True)
+                image.resize((width, height), Image.Resampling.LANCZOS).save(
+                    target, VARIANT_FORMAT.upper(), quality=VARIANT_QUALITY
+                )
+    return variants
@@ -0,0 +1,101 @@
+"""Startup time of a built app.
+
+The app is started with QUIT_AFTER_FIRST_FRAME_ENV set, so it quits once
+its first frame is drawn, and the time until it exits is measured. The
+first start is cold, the files of the app are read from disk if the page
+cache could be dropped. The following starts are warm.
+"""
+
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from pyrig.src.os.os import run_subprocess
+
+from notty.src.consts import QUIT_AFTER_FIRST_FRAME_ENV
+
+# the kernel drops the page cache when 3 is written here, only as root
+DROP_CACHES_PATH = Path("/proc/sys/vm/drop_caches")
+# seconds a start may take before it is considered hanging
+STARTUP_TIMEOUT_S = 60
+
+
+@dataclass(frozen=True)
+class StartupReport:
+    """Cold and warm startup times of an app."""
+
+    cold: float
+    warm: tuple[float, ...]
+    # False if the page cache could not be dropped before the cold start
+    caches_dropped: bool
+
+    def get_warm_median(self) -> float:
+        """Get the median of the warm startup times.
+
+        Returns:
+            The median in seconds, 0 without warm starts.
+        """
+        return statistics.median(self.warm) if self.warm else 0.0
+
+    def __str__(self) -> str:
+        """Return a summary of the report."""
+        cold = "cold" if self.caches_dropped else "first (page cache kept)"
+        return (
+            f"{cold} {self.cold * 1000:.0f}ms, "
+            f"warm median {self.get_warm_median() * 1000:.0f}ms "
+            f"of {len(self.warm)} starts"
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the report."""
+        return (
+            f"{self.__class__.__name__}(cold={self.cold}, warm={self.warm}, "
+            f"caches_dropped={self.caches_dropped})"
+        )
+
+
+def drop_caches() -> bool:
+    """Drop the page cache of the kernel, so the next start reads from disk.
+
+    Returns:
+        True if the cache was dropped, False without permission or on
+        systems other than Linux.
+    """
+    try:
+        DROP_CACHES_PATH.write_text("3\n")
+    except OSError:
+        return False
+    return True
+
+
+def time_startup(executable: Path) -> float:
+    """Start an app and wait until it quits after its first frame.
+
+    Args:
+        executable: The built app.
+
+    Returns:
+        The seconds from the start until the app exited.
+    """
+    env = {**os.environ, QUIT_AFTER_FIRST_FRAME_ENV: "1"}
+    start = time.perf_counter()
+    run_subprocess([str(executable)], timeout=STARTUP_TIMEOUT_S, env=env)
+    return time.perf_counter() - start
+
+
+def measure_startup(executable: Path, runs: int = 5) -> StartupReport:
+    """Measure a cold start and then a number of warm starts of an app.
+
+    Args:
+        executable: The built app.
+        runs: The number of warm starts.
+
+    Returns:
+        The startup times.
+    """
+    caches_dropped = drop_caches()
+    cold = time_startup(executable)
+    warm = tuple(time_startup(executable) for _ in range(runs))
+    return StartupReport(cold, warm, caches_dropped)
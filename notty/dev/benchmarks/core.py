@@ -0,0 +1,410 @@
+"""Micro benchmarks of the hot paths of the rules engine.
+
+Every benchmark times a small operation, like drawing cards or checking a
+group, in rounds of as many calls as fit into ROUND_TIME_S, and keeps the
+time per call of every round. A run is compared with the latest run saved
+in the history file: a benchmark regressed if its median got slower by
+more than THRESHOLD and a one sided Mann-Whitney U test says the rounds
+are slower with a p-value below ALPHA, so noise alone does not fail a run.
+"""
+
+import functools
+import itertools
+import json
+import math
+import platform
+import random
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from notty.src.card import Card
+from notty.src.deck import Deck
+from notty.src.game import Game
+from notty.src.player import Hand, Player
+from notty.src.tournament import play_match
+
+HISTORY_PATH = Path(__file__).with_name("core_history.json")
+# saved runs kept in the history, the oldest are dropped
+HISTORY_SIZE = 20
+ROUNDS = 20
+# a round repeats a benchmark until it took at least this long
+ROUND_TIME_S = 0.01
+# fraction the median of a benchmark may get slower
+THRESHOLD = 0.2
+# significance level of the test that a benchmark got slower
+ALPHA = 0.01
+SEED = 0
+# cards drawn, added and grouped by the benchmarks
+CARD_COUNT = 10
+# a benchmark is made once and returns the operation it times
+Benchmark = Callable[[], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class BenchmarkComparison:
+    """The median time per call of a benchmark in two runs."""
+
+    name: str
+    # seconds per call, before in the saved run and after in the new run
+    before: float
+    after: float
+    p_value: float
+
+    def get_ratio(self) -> float:
+        """Get how much slower the new run is.
+
+        Returns:
+            The median of the new run divided by the saved one.
+        """
+        return self.after / self.before if self.before else 1.0
+
+    def is_regression(self, threshold: float = THRESHOLD, alpha: float = ALPHA) -> bool:
+        """Check if the benchmark got significantly slower.
+
+        Args:
+            threshold: The fraction the median may get slower.
+            alpha: The significance level of the test.
+
+        Returns:
+            True if the median is slower beyond the threshold
+            and the test is significant.
+        """
+        return self.get_ratio() > 1 + threshold and self.p_value < alpha
+
+    def __str__(self) -> str:
+        """Return a summary of the comparison."""
+        return (
+            f"{self.name}: {self.before * 1e6:.2f}us -> {self.after * 1e6:.2f}us "
+            f"({self.get_ratio() - 1:+.0%}, p={self.p_value:.3g})"
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the comparison."""
+        return (
+            f"{self.__class__.__name__}(name={self.name!r}, before={self.before}, "
+            f"after={self.after}, p_value={self.p_value})"
+        )
+
+
+def get_cards() -> list[Card]:
+    """Get the same cards in every run.
+
+    Returns:
+        CARD_COUNT cards picked with SEED.
+    """
+    return random.Random(SEED).sample(Deck().cards, CARD_COUNT)  # noqa: S311
+
+
+def get_game() -> Game:
+    """Get a game of 3 players dealt with SEED.
+
+    Returns:
+        The game.
+    """
+    random.seed(SEED)
+    return Game([Player("a"), Player("b"), Player("c")])
+
+
+def make_deck_init() -> Callable[[], object]:
+    """Time building a deck of all cards.
+
+    Returns:
+        The operation.
+    """
+    return Deck
+
+
+def make_deck_draw_multiple() -> Callable[[], object]:
+    """Time drawing cards from a deck, they are put back after.
+
+    Returns:
+        The operation.
+    """
+    deck = Deck()
+
+    def run() -> None:
+        deck.add_cards(deck.draw_multiple(CARD_COUNT))
+
+    return run
+
+
+def make_hand_add_cards() -> Callable[[], object]:
+    """Time adding cards to a hand, they are removed after.
+
+    Returns:
+        The operation.
+    """
+    hand = Hand()
+    cards = get_cards()
+
+    def run() -> None:
+        hand.add_cards(cards)
+        hand.cards.clear()
+
+    return run
+
+
+def make_hand_remove_cards() -> Callable[[], object]:
+    """Time removing cards from a hand, they are added back after.
+
+    Returns:
+        The operation.
+    """
+    hand = Hand()
+    cards = get_cards()
+
+    def run() -> None:
+        hand.cards.extend(cards)
+        hand.remove_cards(cards)
+
+    return run
+
+
+def make_card_group_is_valid() -> Callable[[], object]:
+    """Time checking every group of 3 and 4 of some cards.
+
+    Returns:
+        The operation.
+    """
+    game = get_game()
+    cards = get_cards()
+    groups = [
+        list(group) for size in (3, 4) for group in itertools.combinations(cards, size)
+    ]
+
+    def run() -> None:
+        for group in groups:
+            game.card_group_is_valid(group)
+
+    return run
+
+
+def make_predicate(name: str) -> Callable[[], object]:
+    """Time a player_can_* predicate of the current player of a game.
+
+    Args:
+        name: The name of the predicate.
+
+    Returns:
+        The operation.
+    """
+    return functools.partial(getattr(Game, name), get_game())
+
+
+def make_random_game() -> Callable[[], object]:
+    """Time a full game of 3 random strategies.
+
+    Returns:
+        The operation.
+    """
+    return functools.partial(play_match, ("random", "random", "random"), SEED)
+
+
+def get_benchmarks() -> dict[str, Benchmark]:
+    """Get every benchmark, one for every player_can_* predicate of Game.
+
+    Returns:
+        The benchmarks by name.
+    """
+    predicates = sorted(name for name in dir(Game) if name.startswith("player_can_"))
+    return {
+        "deck_init": make_deck_init,
+        "deck_draw_multiple": make_deck_draw_multiple,
+        "hand_add_cards": make_hand_add_cards,
+        "hand_remove_cards": make_hand_remove_cards,
+        "card_group_is_valid": make_card_group_is_valid,
+        **{name: functools.partial(make_predicate, name) for name in predicates},
+        "random_game": make_random_game,
+    }
+
+
+def measure(operation: Callable[[], object], rounds: int = ROUNDS) -> list[float]:
+    """Time an operation in rounds.
+
+    Args:
+        operation: The operation.
+        rounds: The number of rounds.
+
+    Returns:
+        The seconds per call of every round.
+    """
+    # double the calls per round until a round takes long enough
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= ROUND_TIME_S:
+            break
+        number *= 2
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def run_benchmarks(rounds: int = ROUNDS) -> dict[str, list[float]]:
+    """Run every benchmark.
+
+    Args:
+        rounds: The number of rounds of every benchmark.
+
+    Returns:
+        The seconds per call of every round by benchmark.
+    """
+    state = random.getstate()
+    try:
+        return {
+            name: measure(benchmark(), rounds)
+            for name, benchmark in get_benchmarks().items()
+        }
+    finally:
+        random.setstate(state)
+
+
+def get_mann_whitney_p(before: list[float], after: list[float]) -> float:
+    """Test if the values after tend to be larger than the ones before.
+
+    The U statistic is approximated by a normal distribution,
+    which is close enough from about 10 values per side.
+
+    Args:
+        before: The values of the first sample.
+        after: The values of the second sample.
+
+    Returns:
+        The one sided p-value.
+    """
+    values = sorted(
+        [(value, False) for value in before] + [(value, True) for value in after]
+    )
+    # tied values get the average of their ranks
+    rank_sum = 0.0
+    position = 0
+    for _, group in itertools.groupby(values, key=lambda item: item[0]):
+        items = list(group)
+        rank = position + (len(items) + 1) / 2
+        rank_sum += rank * sum(is_after for _, is_after in items)
+        position += len(items)
+    n_before, n_after = len(before), len(after)
+    u = rank_sum - n_after * (n_after + 1) / 2
+    mean = n_before * n_after / 2
+    deviation = math.sqrt(n_before * n_after * (n_before + n_after + 1) / 12)
+    if not deviation:
+        return 1.0
+    return 1 - statistics.NormalDist().cdf((u - mean) / deviation)
+
+
+def compare_runs(
+    before: dict[str, list[float]], after: dict[str, list[float]]
+) -> list[BenchmarkComparison]:
+    """Compare the benchmarks of two runs.
+
+    Args:
+        before: The saved run.
+        after: The new run.
+
+    Returns:
+        The comparison of every benchmark in both runs.
+    """
+    return [
+        BenchmarkComparison(
+            name,
+            statistics.median(before[name]),
+            statistics.median(samples),
+            get_mann_whitney_p(before[name], samples),
+        )
+        for name, samples in after.items()
+        if name in before
+    ]
+
+
+def load_history(path: Path = HISTORY_PATH) -> list[dict[str, Any]]:
+    """Load the saved runs.
+
+    Args:
+        path: The JSON history file.
+
+    Returns:
+        The runs from the oldest to the latest, empty without a file.
+    """
+    if not path.is_file():
+        return []
+    history: list[dict[str, Any]] = json.loads(path.read_text())
+    return history
+
+
+def save_run(results: dict[str, list[float]], path: Path = HISTORY_PATH) -> None:
+    """Add a run to the history as the new baseline.
+
+    Args:
+        results: The seconds per call of every round by benchmark.
+        path: The JSON history file.
+    """
+    run = {
+        "time": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        # 4 significant digits are finer than the noise
+        "results": {
+            name: [float(f"{sample:.4g}") for sample in samples]
+            for name, samples in results.items()
+        },
+    }
+    history = [*load_history(path), run][-HISTORY_SIZE:]
+    path.write_text(json.dumps(history, indent=1) + "\n")
+
+
+def benchmark_core(
+    *, save: bool = False, path: Path = HISTORY_PATH
+) -> tuple[dict[str, list[float]], list[BenchmarkComparison]]:
+    """Run the benchmarks and compare them with the latest saved run.
+
+    Args:
+        save: Save the run as the new baseline.
+        path: The JSON history file.
+
+    Returns:
+        The seconds per call of every round by benchmark and the
+        comparisons, empty without a saved run.
+    """
+    history = load_history(path)
+    results = run_benchmarks()
+    comparisons = compare_runs(history[-1]["results"], results) if history else []
+    if save:
+        save_run(results, path)
+    return results, comparisons
+
+
+def format_report(
+    results: dict[str, list[float]],
+    comparisons: list[BenchmarkComparison],
+    threshold: float = THRESHOLD,
+) -> str:
+    """Describe a run, compared with the saved run if there is one.
+
+    Args:
+        results: The seconds per call of every round by benchmark.
+        comparisons: The comparisons with the saved run.
+        threshold: The fraction the median of a benchmark may get slower.
+
+    Returns:
+        One line per benchmark, regressions marked.
+    """
+    if not comparisons:
+        return "\n".join(
+            f"{name}: {statistics.median(samples) * 1e6:.2f}us"
+            for name, samples in results.items()
+        )
+    return "\n".join(
+        f"{'REGRESSION ' if comparison.is_regression(threshold) else ''}{comparison}"
+        for comparison in comparisons
+    )
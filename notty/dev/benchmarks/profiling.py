@@ -0,0 +1,321 @@
+"""Profiles of headless games with cProfile or a stack sampler.
+
+The workload plays a number of 3 player games of one strategy from a seed,
+so a profile can be repeated. cProfile measures every call exactly but
+slows down small functions, the sampler looks at the stack of the game
+every millisecond from a thread and barely slows it down. Both write a
+pstats file, for pstats, snakeviz and the like, and collapsed stacks,
+one line of frames and a weight per stack, for flamegraph.pl or speedscope.
+cProfile has no stacks, they are derived from the time of every caller and
+callee pair, which splits the time of a function over its callers evenly.
+"""
+
+import cProfile
+import itertools
+import marshal
+import sys
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+
+import notty.src
+from notty.src.tournament import play_match
+
+# seconds between two samples of the stack
+SAMPLE_INTERVAL_S = 0.001
+# functions of notty.src listed in the report
+TOP_COUNT = 15
+# players of every game of the workload
+PLAYERS = 3
+# weights of collapsed stacks of cProfile are microseconds
+WEIGHT_PER_S = 1_000_000
+# stacks derived from cProfile end this deep, recursion is cut off before
+MAX_DEPTH = 64
+SOURCE_DIR = Path(notty.src.__file__).parent
+
+# a function as pstats names it: file, first line and name
+FunctionKey = tuple[str, int, str]
+# pstats entry: primitive calls, calls, own seconds, seconds with callees
+# and the entries of the callers by caller
+StatsEntry = tuple[int, int, float, float, Mapping[FunctionKey, object]]
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """The files of a profile and the slowest functions of notty.src."""
+
+    stats_path: Path
+    collapsed_path: Path
+    # lines with the own and total seconds, the calls and the function
+    top: tuple[str, ...]
+
+    def __str__(self) -> str:
+        """Return the top functions and where the profile was written."""
+        return "\n".join(
+            (
+                f"{'own s':>8} {'total s':>8} {'calls':>9}  function",
+                *self.top,
+                f"pstats: {self.stats_path}",
+                f"collapsed stacks: {self.collapsed_path}",
+            )
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the report."""
+        return (
+            f"{self.__class__.__name__}(stats_path={self.stats_path}, "
+            f"collapsed_path={self.collapsed_path}, top={len(self.top)})"
+        )
+
+
+class StackSampler:
+    """Counts the stacks of a thread, sampled from another thread."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_S) -> None:
+        """Initialize the sampler, it samples the thread calling start.
+
+        Args:
+            interval: Seconds between two samples.
+        """
+        self.interval = interval
+        self.stacks: Counter[tuple[FunctionKey, ...]] = Counter()
+        self.thread_id = threading.get_ident()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="sampler", daemon=True)
+        self.switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        """Start sampling the calling thread."""
+        self.thread_id = threading.get_ident()
+        # the sampler needs the GIL to look at the stack, let it take turns
+        sys.setswitchinterval(self.interval)
+        self.thread.start()
+
+    def run(self) -> None:
+        """Sample the stack until stopped, runs in the sampler thread."""
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            if frame is not None:
+                self.stacks[get_stack(frame)] += 1
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self.stopped.set()
+        self.thread.join()
+        sys.setswitchinterval(self.switch_interval)
+
+    def get_stats(self) -> dict[FunctionKey, StatsEntry]:
+        """Get the samples in the format of pstats.
+
+        The calls are the number of samples a function was on the stack.
+
+        Returns:
+            The entry of every sampled function.
+        """
+        own: Counter[FunctionKey] = Counter()
+        total: Counter[FunctionKey] = Counter()
+        callers: dict[FunctionKey, Counter[FunctionKey]] = {}
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            # a recursive function counts once per sample
+            for key in set(stack):
+                total[key] += count
+            for caller, callee in itertools.pairwise(stack):
+                callers.setdefault(callee, Counter())[caller] += count
+        return {
+            key: (
+                samples,
+                samples,
+                own[key] * self.interval,
+                samples * self.interval,
+                dict(callers.get(key, {})),
+            )
+            for key, samples in total.items()
+        }
+
+    def get_collapsed(self) -> Counter[str]:
+        """Get the samples as collapsed stacks.
+
+        Returns:
+            The number of samples of every stack.
+        """
+        collapsed: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            collapsed[";".join(map(get_label, stack))] += count
+        return collapsed
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the sampler."""
+        return (
+            f"{self.__class__.__name__}({self.interval}s, "
+            f"{self.stacks.total()} samples)"
+        )
+
+
+def get_stack(frame: FrameType) -> tuple[FunctionKey, ...]:
+    """Get the functions on a stack.
+
+    Args:
+        frame: The innermost frame.
+
+    Returns:
+        The function of every frame from the outermost to the innermost.
+    """
+    stack: list[FunctionKey] = []
+    current: FrameType | None = frame
+    while current is not None:
+        code = current.f_code
+        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+        current = current.f_back
+    return tuple(reversed(stack))
+
+
+def get_label(key: FunctionKey) -> str:
+    """Get the name of a function in a collapsed stack.
+
+    Args:
+        key: The function.
+
+    Returns:
+        The name with its file and line, without the semicolons
+        separating the frames.
+    """
+    filename, line, name = key
+    location = f"{'/'.join(Path(filename).parts[-2:])}:{line}" if line else filename
+    return f"{name} ({location})".replace(";", ",")
+
+
+def get_collapsed_from_stats(stats: Mapping[FunctionKey, StatsEntry]) -> Counter[str]:
+    """Derive collapsed stacks from the caller and callee times of cProfile.
+
+    Starting from the functions without callers, the time of every callee is
+    followed along every caller. The own time of a function is split over
+    the stacks in the proportion of its total time reached through them.
+
+    Args:
+        stats: The entries of cProfile.
+
+    Returns:
+        The microseconds of every stack.
+    """
+    callees: dict[FunctionKey, list[FunctionKey]] = {}
+    for key, (*_, callers) in stats.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(key)
+    collapsed: Counter[str] = Counter()
+
+    def add(stack: tuple[FunctionKey, ...], seconds: float) -> None:
+        key = stack[-1]
+        _, _, own, total, _ = stats[key]
+        share = seconds / total if total else 0.0
+        label = ";".join(map(get_label, stack))
+        collapsed[label] += round(own * share * WEIGHT_PER_S)
+        if len(stack) >= MAX_DEPTH:
+            return
+        for callee in callees.get(key, []):
+            edge = stats[callee][4][key]
+            edge_total = edge[3] if isinstance(edge, tuple) else 0.0
+            if callee not in stack and edge_total * share > 0:
+                add((*stack, callee), edge_total * share)
+
+    for key, (_, _, _, total, callers) in stats.items():
+        if not callers:
+            add((key,), total)
+    return +collapsed
+
+
+def write_collapsed(collapsed: Counter[str], path: Path) -> None:
+    """Write collapsed stacks, one stack with its weight per line.
+
+    Args:
+        collapsed: The weight of every stack.
+        path: The file.
+    """
+    path.write_text(
+        "".join(f"{stack} {weight}\n" for stack, weight in sorted(collapsed.items()))
+    )
+
+
+def get_top(
+    stats: Mapping[FunctionKey, StatsEntry], count: int = TOP_COUNT
+) -> tuple[str, ...]:
+    """Get the functions of notty.src with the most own time.
+
+    Args:
+        stats: The pstats entries.
+        count: The number of functions.
+
+    Returns:
+        A line with the own and total seconds, the calls and the function
+        for each.
+    """
+    source = [
+        (key, entry)
+        for key, entry in stats.items()
+        if Path(key[0]).is_relative_to(SOURCE_DIR)
+    ]
+    source.sort(key=lambda item: item[1][2], reverse=True)
+    return tuple(
+        f"{own:8.3f} {total:8.3f} {calls:9d}  {get_label(key)}"
+        for key, (_, calls, own, total, _) in source[:count]
+    )
+
+
+def play_games(games: int, strategy: str, seed: int) -> None:
+    """Play games of one strategy in every seat.
+
+    Args:
+        games: The number of games.
+        strategy: The name of the strategy.
+        seed: The seed of the first game, the next games count up from it.
+    """
+    for game in range(games):
+        play_match((strategy,) * PLAYERS, seed + game)
+
+
+def profile_games(
+    games: int,
+    strategy: str,
+    seed: int,
+    output: Path,
+    *,
+    sample: bool = False,
+) -> ProfileReport:
+    """Profile games and write the profile.
+
+    Args:
+        games: The number of games.
+        strategy: The name of the strategy of every player.
+        seed: The seed of the first game.
+        output: The path of the profile, .pstats and .collapsed are added.
+        sample: Sample the stack instead of running cProfile.
+
+    Returns:
+        The files and the slowest functions.
+    """
+    stats: Mapping[FunctionKey, StatsEntry]
+    if sample:
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            play_games(games, strategy, seed)
+        finally:
+            sampler.stop()
+        stats = sampler.get_stats()
+        collapsed = sampler.get_collapsed()
+    else:
+        profiler = cProfile.Profile()
+        profiler.runcall(play_games, games, strategy, seed)
+        profiler.create_stats()
+        stats = profiler.stats
+        collapsed = get_collapsed_from_stats(stats)
+
+    stats_path = output.with_name(f"{output.name}.pstats")
+    collapsed_path = output.with_name(f"{output.name}.collapsed")
+    # the format of pstats.Stats.dump_stats, loaded with pstats.Stats(path)
+    stats_path.write_bytes(marshal.dumps(stats))
+    write_collapsed(collapsed, collapsed_path)
+    return ProfileReport(stats_path, collapsed_path, get_top(stats))
@@ -0,0 +1,310 @@
+"""Headless benchmarks of the rendering of the game window.
+
+Every scenario draws frames with the functions of notty.src.ui.app on the
+display surface of the SDL dummy video driver, so they run without a
+screen, e.g. in CI. A scenario is a generator drawing one frame per step.
+The frames per second are measured first, then the bytes Python allocates
+per frame with tracemalloc, which would slow down the timed frames.
+The results are compared with the baselines stored next to this module,
+a scenario regressed if it is slower or allocates more than its baseline
+beyond a tolerance.
+"""
+
+import itertools
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+import pygame
+
+from notty.src.game import Game
+from notty.src.ui.app import (
+    draw_frame,
+    get_game_layout,
+    handle_background_ready,
+    handle_resize,
+    init_game,
+    simulate_first_shuffle_and_deal,
+)
+from notty.src.ui.background import BACKGROUND_ASSET, BackgroundLoader
+from notty.src.ui.loop import FPS
+from notty.src.ui.renderer import DirtyRenderer
+from notty.src.ui.tween import TweenScheduler
+
+BASELINES_PATH = Path(__file__).with_name("render_baselines.json")
+WINDOW_SIZE = (1280, 720)
+# the window sizes the resize scenario switches between every frame
+RESIZE_SIZES = ((1280, 720), (1024, 600), (1600, 900), (800, 500))
+# the animations advance by the time of a frame at the frame rate
+FRAME_MS = 1000 / FPS
+WARMUP_FRAMES = 10
+# frames measured with tracemalloc, they are much slower than the others
+ALLOC_FRAMES = 20
+# fraction of the baseline a scenario may be slower or allocate more
+TOLERANCE = 0.3
+# allocations below this do not count as a regression, they vary between runs
+ALLOC_SLACK_KIB = 4.0
+
+# a scenario draws a frame on the screen every step
+Scenario = Callable[[pygame.Surface], Generator[None]]
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """Frames per second and allocations per frame of a scenario."""
+
+    name: str
+    fps: float
+    # the peak of the Python allocations during a frame
+    alloc_kib: float
+
+    def __str__(self) -> str:
+        """Return a summary of the result."""
+        return f"{self.name}: {self.fps:.0f} fps, {self.alloc_kib:.1f} KiB per frame"
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the result."""
+        return (
+            f"{self.__class__.__name__}(name={self.name!r}, fps={self.fps}, "
+            f"alloc_kib={self.alloc_kib})"
+        )
+
+
+def init_headless() -> None:
+    """Initialize pygame with the dummy video driver, without a screen."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.display.init()
+    pygame.font.init()
+
+
+def get_full_game() -> Game:
+    """Get a game of 3 players with full hands of 20 cards.
+
+    Returns:
+        The game.
+    """
+    game = init_game()
+    for player in game.players:
+        while not player.hand.hand_is_full():
+            player.hand.add_card(game.deck.draw())
+    return game
+
+
+def get_plain_background(size: tuple[int, int]) -> pygame.Surface:
+    """Get a background of one color, it blits as fast as the image.
+
+    Args:
+        size: Width and height of the background.
+
+    Returns:
+        The background in the format of the display.
+    """
+    background = pygame.Surface(size).convert()
+    background.fill((20, 60, 30))
+    return background
+
+
+def run_full_hands(screen: pygame.Surface) -> Generator[None]:
+    """Redraw the whole window with 3 full hands every frame.
+
+    Args:
+        screen: The display surface.
+
+    Yields:
+        After every frame.
+    """
+    game = get_full_game()
+    renderer = DirtyRenderer(screen, get_plain_background(screen.get_size()))
+    layout = get_game_layout(game, *screen.get_size())
+    scheduler = TweenScheduler()
+    while True:
+        renderer.invalidate()
+        draw_frame(renderer, game, layout, scheduler)
+        yield
+
+
+def run_deal(screen: pygame.Surface) -> Generator[None]:
+    """Play the shuffle and deal animation of a new game again and again.
+
+    Args:
+        screen: The display surface.
+
+    Yields:
+        After every frame.
+    """
+    renderer = DirtyRenderer(screen, get_plain_background(screen.get_size()))
+    while True:
+        game = init_game()
+        layout = get_game_layout(game, *screen.get_size())
+        scheduler = TweenScheduler()
+        simulate_first_shuffle_and_deal(scheduler, game, layout)
+        while scheduler.is_active():
+            if scheduler.update(FRAME_MS):
+                renderer.invalidate()
+            draw_frame(renderer, game, layout, scheduler)
+            yield
+
+
+def run_resize(screen: pygame.Surface) -> Generator[None]:
+    """Resize the window with 3 full hands every frame.
+
+    The backgrounds of the new sizes are made in a thread as in the game,
+    cached in a temporary directory.
+
+    Args:
+        screen: The display surface.
+
+    Yields:
+        After every frame.
+    """
+    game = get_full_game()
+    renderer = DirtyRenderer(screen, get_plain_background(screen.get_size()))
+    scheduler = TweenScheduler()
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as cache_dir:
+        loader = BackgroundLoader(BACKGROUND_ASSET, Path(cache_dir))
+        try:
+            for size in itertools.cycle(RESIZE_SIZES):
+                pygame.display.set_mode(size, pygame.RESIZABLE)
+                handle_resize(renderer, loader, size)
+                handle_background_ready(renderer, loader)
+                layout = get_game_layout(game, *size)
+                draw_frame(renderer, game, layout, scheduler)
+                yield
+        finally:
+            loader.close()
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "full_hands": run_full_hands,
+    "deal": run_deal,
+    "resize": run_resize,
+}
+
+
+def measure_scenario(name: str, frames: int) -> RenderResult:
+    """Draw the frames of a scenario on a new window.
+
+    Args:
+        name: The name of a scenario in SCENARIOS.
+        frames: The number of frames timed.
+
+    Returns:
+        The frames per second and allocations per frame.
+    """
+    screen = pygame.display.set_mode(WINDOW_SIZE, pygame.RESIZABLE)
+    scenario = SCENARIOS[name](screen)
+    try:
+        for _ in range(WARMUP_FRAMES):
+            next(scenario)
+        start = time.perf_counter()
+        for _ in range(frames):
+            next(scenario)
+        fps = frames / (time.perf_counter() - start)
+
+        allocated = 0
+        tracemalloc.start()
+        try:
+            for _ in range(ALLOC_FRAMES):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                next(scenario)
+                allocated += tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+    finally:
+        scenario.close()
+    return RenderResult(name, fps, allocated / ALLOC_FRAMES / 1024)
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict[str, RenderResult]:
+    """Load the stored results of the scenarios.
+
+    Args:
+        path: The JSON file of the baselines.
+
+    Returns:
+        The baselines by scenario, empty if none are stored.
+    """
+    if not path.is_file():
+        return {}
+    return {
+        name: RenderResult(name, values["fps"], values["alloc_kib"])
+        for name, values in json.loads(path.read_text()).items()
+    }
+
+
+def save_baselines(results: list[RenderResult], path: Path = BASELINES_PATH) -> None:
+    """Store results as the new baselines.
+
+    Args:
+        results: The results of the scenarios.
+        path: The JSON file of the baselines.
+    """
+    baselines = {
+        result.name: {
+            "fps": round(result.fps, 1),
+            "alloc_kib": round(result.alloc_kib, 1),
+        }
+        for result in results
+    }
+    path.write_text(json.dumps(baselines, indent=2) + "\n")
+
+
+def find_regressions(
+    results: list[RenderResult],
+    baselines: dict[str, RenderResult],
+    tolerance: float = TOLERANCE,
+) -> list[str]:
+    """Compare results with their baselines.
+
+    Args:
+        results: The results of the scenarios.
+        baselines: The baselines by scenario, scenarios without one pass.
+        tolerance: The fraction a result may be worse than its baseline.
+
+    Returns:
+        A description of every regression, empty if there is none.
+    """
+    regressions = []
+    for result in results:
+        baseline = baselines.get(result.name)
+        if baseline is None:
+            continue
+        if result.fps < baseline.fps * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: {result.fps:.0f} fps, baseline {baseline.fps:.0f}"
+            )
+        if result.alloc_kib > baseline.alloc_kib * (1 + tolerance) + ALLOC_SLACK_KIB:
+            regressions.append(
+                f"{result.name}: {result.alloc_kib:.1f} KiB per frame, "
+                f"baseline {baseline.alloc_kib:.1f}"
+            )
+    return regressions
+
+
+def benchmark_render(
+    frames: int = 300, *, update: bool = False
+) -> tuple[list[RenderResult], list[str]]:
+    """Run every scenario headless and compare it with its baseline.
+
+    Args:
+        frames: The number of frames timed per scenario.
+        update: Store the results as the new baselines instead of comparing.
+
+    Returns:
+        The results and the regressions, none when updating.
+    """
+    init_headless()
+    try:
+        results = [measure_scenario(name, frames) for name in SCENARIOS]
+    finally:
+        pygame.quit()
+    if update:
+        save_baselines(results)
+        return results, []
+    return results, find_regressions(results, load_baselines())
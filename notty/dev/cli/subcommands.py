@@ -4,3 +4,153 @@ They will be automatically imported and added to the CLI
 IMPORTANT: All funcs in this file will be added as subcommands.
 So best to define the logic elsewhere and just call it here in a wrapper.
 """
+
+import sys
+from pathlib import Path
+
+from notty.dev.artifacts.builder.startup import measure_startup
+from notty.dev.benchmarks.profiling import profile_games
+from notty.src.arena.arena import DEFAULT_TIME_LIMIT
+from notty.src.arena.arena import arena as arena_cmd
+from notty.src.metrics import export_metrics, serve_metrics
+from notty.src.server.loadgen import loadgen as loadgen_cmd
+from notty.src.server.server import DEFAULT_HOST, DEFAULT_PORT
+from notty.src.server.server import serve as serve_cmd
+from notty.src.server.supervisor import supervise as supervise_cmd
+from notty.src.tournament import MIN_GAMES
+from notty.src.tournament import tournament as tournament_cmd
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = 0,
+    shards: int = 0,
+) -> None:
+    """Host Notty tables over TCP until interrupted.
+
+    Bot turns run in a pool of the given number of worker processes,
+    with 0 workers they run on the event loop. With shards, a supervisor
+    spreads the tables over that many processes instead.
+    """
+    if shards > 0:
+        supervise_cmd(host, port, shards)
+    else:
+        serve_cmd(host, port, workers)
+
+
+def loadgen(
+    host: str = "",
+    port: int = DEFAULT_PORT,
+    clients: int = 100,
+    moves: int = 100,
+    shards: int = 0,
+) -> None:
+    """Measure moves per second and p99 latency of a game server.
+
+    Without a host a local server is started in this process,
+    with shards its tables are spread over that many processes.
+    """
+    report = loadgen_cmd(host, port, clients, moves, shards)
+    sys.stdout.write(f"{report}\n")
+
+
+def arena(
+    bots: list[str],
+    rounds: int = 1,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    concurrency: int = 8,
+) -> None:
+    """Play 2 or 3 bot processes against each other in every seating.
+
+    A bot is the name of a bundled strategy or the command line of a
+    program speaking the arena protocol, every move has a time limit.
+    """
+    summary = arena_cmd(bots, rounds, time_limit, concurrency)
+    sys.stdout.write(f"{summary}\n")
+
+
+def metrics(
+    directory: Path,
+    output: Path | None = None,
+    host: str = DEFAULT_HOST,
+    port: int = 0,
+) -> None:
+    """Sum up the game metrics every process saved to a directory.
+
+    Processes count their games if NOTTY_METRICS_DIR names the directory.
+    The Prometheus text is printed or written to the output file, with a
+    port it is served at /metrics until interrupted instead.
+    """
+    if port > 0:
+        serve_metrics(directory, host, port)
+    else:
+        text = export_metrics(directory, output)
+        if output is None:
+            sys.stdout.write(text)
+
+
+def tournament(
+    output: Path = Path("tournament.jsonl"),
+    strategies: list[str] | None = None,
+    rounds: int = 100,
+    workers: int = 0,
+    min_games: int = MIN_GAMES,
+) -> None:
+    """Rank the strategies by Elo in a round-robin self-play tournament.
+
+    Results are appended to the output file as games finish. The tournament
+    stops once every strategy played min_games pairwise games and the
+    ratings are separated, with 0 min games all rounds are played.
+    """
+    ranking = tournament_cmd(
+        output, strategies, rounds, workers or None, min_games or None
+    )
+    sys.stdout.write(f"{ranking}\n")
+
+
+def startup(executable: Path, runs: int = 5) -> None:
+    """Measure the cold and warm startup time of a built app.
+
+    The app quits once its first frame is drawn. The page cache is dropped
+    before the cold start if permitted, which needs root on Linux.
+    """
+    report = measure_startup(executable, runs)
+    sys.stdout.write(f"{report}\n")
+
+
+def bench_render(frames: int = 300, *, update: bool = False) -> None:
+    """Benchmark the rendering of the game window without a screen.
+
+    Every scenario is drawn with the SDL dummy video driver and compared
+    with its stored baseline, the command fails if one regressed.
+    With update the results are stored as the new baselines instead.
+    """
+    # imports pygame, so it is imported only when the benchmarks run
+    from notty.dev.benchmarks.render import benchmark_render  # noqa: PLC0415
+
+    results, regressions = benchmark_render(frames, update=update)
+    for result in results:
+        sys.stdout.write(f"{result}\n")
+    if regressions:
+        sys.stderr.write("".join(f"regression {line}\n" for line in regressions))
+        raise SystemExit(1)
+
+
+def profile(
+    games: int = 10,
+    strategy: str = "random",
+    seed: int = 0,
+    output: Path = Path("profile"),
+    *,
+    sample: bool = False,
+) -> None:
+    """Profile headless games of one strategy in every seat.
+
+    The games run under cProfile, or with sample under a stack sampler
+    that barely slows them down. The profile is written to output.pstats
+    and as collapsed stacks for flamegraph tools to output.collapsed,
+    the functions of notty.src with the most own time are printed.
+    """
+    report = profile_games(games, strategy, seed, output, sample=sample)
+    sys.stdout.write(f"{report}\n")
@@ -0,0 +1,56 @@
+"""Pytest hooks running the micro benchmarks of the rules engine.
+
+With --benchmark-core the benchmarks of notty.dev.benchmarks.core run after
+the tests and the session fails if one regressed against the latest saved
+run. --benchmark-save saves the run as the new baseline. Without the
+options the hooks do nothing, the benchmarks take about 20 seconds.
+"""
+
+import pytest
+
+from notty.dev.benchmarks.core import THRESHOLD, benchmark_core, format_report
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options of the benchmarks.
+
+    Args:
+        parser: The parser of the pytest options.
+    """
+    group = parser.getgroup("benchmarks", "micro benchmarks of the rules engine")
+    group.addoption(
+        "--benchmark-core",
+        action="store_true",
+        help="run the micro benchmarks after the tests and fail on regressions",
+    )
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        help="save the benchmark run as the new baseline",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=THRESHOLD,
+        help="fraction a benchmark may get slower before it regressed",
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Run the benchmarks after the tests if asked to.
+
+    Args:
+        session: The test session, it fails if a benchmark regressed.
+    """
+    config = session.config
+    if not config.getoption("--benchmark-core", default=False):
+        return
+    threshold = config.getoption("--benchmark-threshold")
+    results, comparisons = benchmark_core(save=config.getoption("--benchmark-save"))
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is not None:
+        reporter.ensure_newline()
+        reporter.write_sep("-", "core benchmarks")
+        reporter.write_line(format_report(results, comparisons, threshold))
+    if any(comparison.is_regression(threshold) for comparison in comparisons):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
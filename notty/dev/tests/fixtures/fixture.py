@@ -5,3 +5,20 @@ across the entire test suite.
 All fixtures defined under the fixtures package are auto plugged in automatically
 by pyrig via the pytest_plugins mechanism.
 """
+
+from collections.abc import Iterator
+
+import pytest
+
+from notty.src.metrics import GameMetrics, disable_metrics, enable_metrics
+
+
+@pytest.fixture
+def game_metrics() -> Iterator[GameMetrics]:
+    """Count the metrics of the games of a test, without saving them.
+
+    Yields:
+        The metrics the hooks of the game update.
+    """
+    yield enable_metrics()
+    disable_metrics()
@@ -0,0 +1,463 @@
+"""Arena pitting bot processes against each other over the arena protocol.
+
+Bots run as subprocesses, see the bot module for the protocol. The arena
+plays many games concurrently, gives every move a time limit and keeps
+finished bots warm, so the next game does not pay their startup again.
+A bot that runs out of time, answers with an illegal move or exits
+forfeits the game and its process is not reused.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import shlex
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from notty.src.arena.bot import PROTOCOL_VERSION, encode_line, get_go_message, get_move
+from notty.src.game import Game
+from notty.src.player import Player
+from notty.src.server.protocol import decode_message
+
+DEFAULT_TIME_LIMIT = 1.0
+# startup of a bot, including the import of its interpreter
+HANDSHAKE_TIME_LIMIT = 10.0
+# games of bots that never end the game are a draw after this many moves
+MAX_MOVES = 5_000
+
+
+def get_builtin_command(strategy_name: str) -> list[str]:
+    """Get the command running a bundled strategy as a bot.
+
+    Args:
+        strategy_name: The name of the strategy.
+
+    Returns:
+        The command line of the bot.
+    """
+    return [sys.executable, "-m", "notty.src.arena.bot", strategy_name]
+
+
+class BotProcess:
+    """A running bot subprocess speaking the arena protocol."""
+
+    def __init__(self, name: str, process: asyncio.subprocess.Process) -> None:
+        """Initialize the bot.
+
+        Args:
+            name: The name the bot answered the hello with.
+            process: The bot subprocess with piped stdin and stdout.
+        """
+        self.name = name
+        self.process = process
+        # number of games the process played, it is reused across games
+        self.games = 0
+        # set right away, the exit code only once the process is reaped
+        self.killed = False
+
+    @classmethod
+    async def spawn(cls, command: list[str]) -> "BotProcess":
+        """Start a bot and wait until it is ready.
+
+        Args:
+            command: The command line of the bot.
+
+        Returns:
+            The ready bot.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        bot = cls(command[-1], process)
+        try:
+            await bot.send({"type": "hello", "version": PROTOCOL_VERSION})
+            answer = await bot.receive(HANDSHAKE_TIME_LIMIT)
+        except BaseException:
+            await bot.close()
+            raise
+        bot.name = str(answer.get("name", bot.name))
+        return bot
+
+    def is_alive(self) -> bool:
+        """Check if the process is still running.
+
+        Returns:
+            True if the process has neither exited nor been killed.
+        """
+        return not self.killed and self.process.returncode is None
+
+    async def send(self, message: dict[str, Any]) -> None:
+        """Send a message to the bot.
+
+        Args:
+            message: The message.
+        """
+        if self.process.stdin is None:
+            msg = f"Bot {self.name} has no stdin"
+            raise ConnectionError(msg)
+        self.process.stdin.write(encode_line(message))
+        await self.process.stdin.drain()
+
+    async def receive(self, time_limit: float) -> dict[str, Any]:
+        """Wait for the next message of the bot.
+
+        A bot that runs out of time is killed,
+        its late answer would be taken for the next one.
+
+        Args:
+            time_limit: The seconds to wait.
+
+        Returns:
+            The message.
+
+        Raises:
+            ConnectionError: If the bot exited.
+            TimeoutError: If the bot did not answer in time.
+        """
+        if self.process.stdout is None:
+            msg = f"Bot {self.name} has no stdout"
+            raise ConnectionError(msg)
+        try:
+            line = await asyncio.wait_for(self.process.stdout.readline(), time_limit)
+        except TimeoutError:
+            self.kill()
+            raise
+        if not line:
+            msg = f"Bot {self.name} exited"
+            raise ConnectionError(msg)
+        return decode_message(line)
+
+    async def new_game(self, seat: int) -> None:
+        """Tell the bot a new game starts.
+
+        Args:
+            seat: The seat the bot plays.
+        """
+        self.games += 1
+        await self.send({"type": "newgame", "seat": seat})
+
+    async def choose_move(self, game: Game, time_limit: float) -> dict[str, Any]:
+        """Ask the bot for the move of the current player.
+
+        Args:
+            game: The game to move in.
+            time_limit: The seconds the bot has to answer.
+
+        Returns:
+            The answer of the bot.
+        """
+        await self.send(get_go_message(game, time_limit))
+        return await self.receive(time_limit)
+
+    def kill(self) -> None:
+        """Kill the process if it is still running."""
+        if self.is_alive():
+            self.process.kill()
+            self.killed = True
+
+    async def close(self) -> None:
+        """Ask the bot to quit and kill it if it does not."""
+        if self.is_alive():
+            with contextlib.suppress(ConnectionError):
+                await self.send({"type": "quit"})
+            try:
+                await asyncio.wait_for(self.process.wait(), HANDSHAKE_TIME_LIMIT)
+            except TimeoutError:
+                self.kill()
+        await self.process.wait()
+        # the pipes keep the transport open after the exit
+        if self.process.stdin is not None:
+            self.process.stdin.close()
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """The result of one arena game.
+
+    bots are the bot names by seat, winner and forfeit are seats.
+    reason is WON, MOVE_LIMIT or why the forfeiting bot lost.
+    """
+
+    WON = "won"
+    MOVE_LIMIT = "move limit"
+    TIMEOUT = "timeout"
+    ILLEGAL = "illegal move"
+    CRASHED = "crashed"
+
+    bots: tuple[str, ...]
+    winner: int | None
+    forfeit: int | None
+    moves: int
+    reason: str
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the result."""
+        return (
+            f"{self.__class__.__name__}(bots={self.bots}, winner={self.winner}, "
+            f"forfeit={self.forfeit}, moves={self.moves}, reason={self.reason!r})"
+        )
+
+
+class Arena:
+    """Plays games between bots, keeping idle bot processes warm."""
+
+    def __init__(
+        self,
+        commands: dict[str, list[str]],
+        time_limit: float = DEFAULT_TIME_LIMIT,
+        max_moves: int = MAX_MOVES,
+    ) -> None:
+        """Initialize the arena without running bots.
+
+        Args:
+            commands: The command line of every bot by name.
+            time_limit: The seconds a bot has for every move.
+            max_moves: Moves after which a game ends in a draw.
+        """
+        self.commands = commands
+        self.time_limit = time_limit
+        self.max_moves = max_moves
+        self.idle: dict[str, list[BotProcess]] = {name: [] for name in commands}
+        # number of processes started, lower than the seats played if reused
+        self.spawned = 0
+
+    async def acquire(self, name: str) -> BotProcess:
+        """Get an idle bot or start a new one.
+
+        Args:
+            name: The name of the bot.
+
+        Returns:
+            The ready bot.
+
+        Raises:
+            ValueError: If the bot is unknown.
+        """
+        if name not in self.commands:
+            msg = f"Unknown bot: {name}. Must be one of {set(self.commands)}"
+            raise ValueError(msg)
+        while self.idle[name]:
+            bot = self.idle[name].pop()
+            if bot.is_alive():
+                return bot
+        self.spawned += 1
+        return await BotProcess.spawn(self.commands[name])
+
+    async def release(self, name: str, bot: BotProcess) -> None:
+        """Keep a bot for the next game or close it if it forfeited.
+
+        Args:
+            name: The name of the bot.
+            bot: The bot.
+        """
+        if bot.is_alive():
+            self.idle[name].append(bot)
+        else:
+            await bot.close()
+
+    async def play_move(self, game: Game, bot: BotProcess) -> str | None:
+        """Ask a bot for its move and apply it.
+
+        Args:
+            game: The game to move in.
+            bot: The bot of the current player.
+
+        Returns:
+            None if the move was applied, else why the bot forfeits.
+        """
+        try:
+            move = get_move(await bot.choose_move(game, self.time_limit))
+        except TimeoutError:
+            return GameResult.TIMEOUT
+        except ConnectionError:
+            return GameResult.CRASHED
+        except (ValueError, KeyError, TypeError):
+            bot.kill()
+            return GameResult.ILLEGAL
+        if not game.is_legal_move(move):
+            bot.kill()
+            return GameResult.ILLEGAL
+        game.apply_move(move)
+        return None
+
+    async def play_game(self, names: list[str]) -> GameResult:
+        """Play a game between bots.
+
+        Args:
+            names: The name of the bot of every seat.
+
+        Returns:
+            The result of the game.
+        """
+        bots: list[BotProcess] = []
+        game = Game([Player(name) for name in names])
+        moves = 0
+        reason = None
+        try:
+            for seat, name in enumerate(names):
+                bots.append(await self.acquire(name))
+                await bots[seat].new_game(seat)
+            while not game.game_over and moves < self.max_moves:
+                reason = await self.play_move(game, bots[game.current_player_index])
+                if reason is not None:
+                    break
+                moves += 1
+        finally:
+            # bots started before a failed start are released too
+            for name, bot in zip(names, bots, strict=False):
+                await self.release(name, bot)
+        if reason is not None:
+            winner = None
+            forfeit: int | None = game.current_player_index
+        else:
+            reason = GameResult.WON if game.game_over else GameResult.MOVE_LIMIT
+            winner = None if game.winner is None else game.players.index(game.winner)
+            forfeit = None
+        return GameResult(tuple(names), winner, forfeit, moves, reason)
+
+    async def play_games(
+        self, lineups: list[list[str]], concurrency: int = 8
+    ) -> list[GameResult]:
+        """Play many games, some of them at the same time.
+
+        Args:
+            lineups: The bot names by seat of every game.
+            concurrency: The number of games played at the same time.
+
+        Returns:
+            The results in the order of the lineups.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def play(names: list[str]) -> GameResult:
+            async with semaphore:
+                return await self.play_game(names)
+
+        return list(await asyncio.gather(*(play(names) for names in lineups)))
+
+    async def close(self) -> None:
+        """Close all idle bots."""
+        bots = [bot for idle in self.idle.values() for bot in idle]
+        for idle in self.idle.values():
+            idle.clear()
+        await asyncio.gather(*(bot.close() for bot in bots))
+
+
+def get_lineups(names: list[str], rounds: int) -> list[list[str]]:
+    """Get every seating of the bots, repeated for some rounds.
+
+    Args:
+        names: The names of the 2 or 3 bots of every game.
+        rounds: How often every seating is played.
+
+    Returns:
+        The bot names by seat of every game.
+    """
+    return [
+        list(seating)
+        for _ in range(rounds)
+        for seating in itertools.permutations(names)
+    ]
+
+
+def get_summary(results: list[GameResult]) -> str:
+    """Summarize the wins and forfeits of the bots.
+
+    Args:
+        results: The results of the games.
+
+    Returns:
+        One line per bot with its wins, forfeits and games.
+    """
+    games: Counter[str] = Counter()
+    wins: Counter[str] = Counter()
+    forfeits: Counter[str] = Counter()
+    for result in results:
+        games.update(set(result.bots))
+        if result.winner is not None:
+            wins[result.bots[result.winner]] += 1
+        if result.forfeit is not None:
+            forfeits[result.bots[result.forfeit]] += 1
+    return "\n".join(
+        f"{name}: {wins[name]} wins, {forfeits[name]} forfeits, {games[name]} games"
+        for name in sorted(games, key=lambda name: -wins[name])
+    )
+
+
+async def run_arena(
+    commands: dict[str, list[str]],
+    rounds: int,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    concurrency: int = 8,
+) -> list[GameResult]:
+    """Play every seating of the bots for some rounds.
+
+    Args:
+        commands: The command line of every bot by name.
+        rounds: How often every seating is played.
+        time_limit: The seconds a bot has for every move.
+        concurrency: The number of games played at the same time.
+
+    Returns:
+        The results of all games.
+    """
+    arena = Arena(commands, time_limit)
+    try:
+        return await arena.play_games(get_lineups(list(commands), rounds), concurrency)
+    finally:
+        await arena.close()
+
+
+def get_commands(bots: list[str]) -> dict[str, list[str]]:
+    """Parse the bots given on the command line.
+
+    Args:
+        bots: Names of bundled strategies or command lines of bots.
+
+    Returns:
+        The command line of every bot by a unique name.
+    """
+    commands: dict[str, list[str]] = {}
+    for bot in bots:
+        command = shlex.split(bot)
+        if len(command) == 1 and not command[0].startswith(("/", ".")):
+            command = get_builtin_command(command[0])
+        name = bot
+        while name in commands:
+            name += "'"
+        commands[name] = command
+    return commands
+
+
+def arena(
+    bots: list[str],
+    rounds: int = 1,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    concurrency: int = 8,
+) -> str:
+    """Play 2 or 3 bots against each other and summarize the results.
+
+    Args:
+        bots: Names of bundled strategies or command lines of bots.
+        rounds: How often every seating is played.
+        time_limit: The seconds a bot has for every move.
+        concurrency: The number of games played at the same time.
+
+    Returns:
+        The summary of the games.
+
+    Raises:
+        ValueError: If not 2 or 3 bots are given.
+    """
+    if not Game.MIN_PLAYERS <= len(bots) <= Game.MAX_PLAYERS:
+        msg = f"Need {Game.MIN_PLAYERS}-{Game.MAX_PLAYERS} bots, got {len(bots)}"
+        raise ValueError(msg)
+    results = asyncio.run(
+        run_arena(get_commands(bots), rounds, time_limit, concurrency)
+    )
+    return get_summary(results)
@@ -0,0 +1,140 @@
+"""Bot side of the arena protocol, in the style of UCI for chess.
+
+A bot is a process that reads one JSON message per line from stdin
+and answers with one JSON message per line on stdout:
+- {"type": "hello", "version": 1}: answered with {"type": "ready", "name": name}
+- {"type": "newgame", "seat": index}: a new game starts, not answered
+- {"type": "go", "state": state, "legal_moves": [...], "time_limit": seconds}:
+  answered with {"type": "move", "move": move}, one of the legal moves
+- {"type": "quit"}: the bot exits
+
+The state is the public view of the game, the save format with the size
+of the deck instead of its cards, and moves are in the format of
+Move.to_dict, the same as in the messages of the game server.
+Bots of other teams only have to speak this protocol,
+run_bot makes the bundled strategies speak it too.
+"""
+
+import json
+import sys
+from typing import TYPE_CHECKING, Any
+
+from notty.src.game import Game, Move
+from notty.src.server.protocol import decode_message
+from notty.src.strategy import Strategy, get_strategy
+
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+PROTOCOL_VERSION = 1
+
+
+def encode_line(message: dict[str, Any]) -> bytes:
+    """Encode a message as one line.
+
+    Args:
+        message: The JSON serializable message.
+
+    Returns:
+        The compact JSON of the message with a trailing newline.
+    """
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def get_go_message(game: Game, time_limit: float) -> dict[str, Any]:
+    """Get the message asking a bot for the move of the current player.
+
+    Args:
+        game: The game to move in.
+        time_limit: The seconds the bot has to answer.
+
+    Returns:
+        The go message.
+    """
+    return {
+        "type": "go",
+        "state": game.to_public_dict(),
+        "legal_moves": [move.to_dict() for move in game.get_legal_moves()],
+        "time_limit": time_limit,
+    }
+
+
+def answer_message(
+    strategy: Strategy, message: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Answer a message of the arena with a strategy.
+
+    Args:
+        strategy: The strategy playing the bot.
+        message: The message of the arena.
+
+    Returns:
+        The answer, None if the message is not answered.
+
+    Raises:
+        ValueError: If the message type is unknown.
+    """
+    if message["type"] == "hello":
+        return {"type": "ready", "name": strategy.NAME}
+    if message["type"] == "newgame":
+        return None
+    if message["type"] == "go":
+        move = strategy.choose_move(Game.from_dict(message["state"]))
+        return {"type": "move", "move": move.to_dict()}
+    msg = f"Unknown type: {message['type']}"
+    raise ValueError(msg)
+
+
+def run_bot(
+    strategy_name: str,
+    stdin: "BinaryIO | None" = None,
+    stdout: "BinaryIO | None" = None,
+    seed: int | None = None,
+) -> None:
+    """Play a bundled strategy over the arena protocol until told to quit.
+
+    Args:
+        strategy_name: The name of the strategy.
+        stdin: Stream to read messages from, the stdin of the process if None.
+        stdout: Stream to write answers to, the stdout of the process if None.
+        seed: Seed for the strategy's random number generator.
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    strategy = get_strategy(strategy_name, seed)
+    for line in stdin:
+        message = decode_message(line)
+        if message["type"] == "quit":
+            break
+        answer = answer_message(strategy, message)
+        if answer is not None:
+            stdout.write(encode_line(answer))
+            # the arena waits for the answer, it must not sit in a buffer
+            stdout.flush()
+
+
+def get_move(answer: dict[str, Any]) -> Move:
+    """Get the move of a bot's answer to a go message.
+
+    Args:
+        answer: The answer of the bot.
+
+    Returns:
+        The move.
+
+    Raises:
+        ValueError: If the answer is not a move.
+    """
+    if answer["type"] != "move":
+        msg = f"Expected a move, got {answer['type']}"
+        raise ValueError(msg)
+    return Move.from_dict(answer["move"])
+
+
+def main() -> None:
+    """Run the bundled strategy named by the first command line argument."""
+    run_bot(sys.argv[1] if len(sys.argv) > 1 else "random")
+
+
+if __name__ == "__main__":
+    main()
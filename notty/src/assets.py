@@ -0,0 +1,236 @@
+"""Assets read from one memory mapped pack file.
+
+The build writes every asset into a single pack: a header, an index with
+the offset and length of every asset and then the assets one after another,
+the offsets count from the end of the index.
+The pack is mapped into memory once and assets are handed out as views of
+the mapping, so there is one open file, no file system lookup per asset,
+and the pages are shared between all games running on a host. Without a
+pack, e.g. in a checkout, the assets are read from the resources package.
+"""
+
+import functools
+import io
+import json
+import mmap
+import struct
+from collections.abc import Buffer
+from pathlib import Path
+from typing import BinaryIO
+
+from pyrig.dev.artifacts.resources.resource import get_resource_path
+
+from notty.dev.artifacts import resources
+
+PACK_NAME = "assets.pak"
+PACK_MAGIC = b"NOTTYPAK"
+PACK_VERSION = 1
+# magic, version and the length of the JSON index following the header
+PACK_HEADER = struct.Struct("<8sII")
+
+
+class MemoryFile(io.RawIOBase):
+    """Read only file reading from a memoryview without copying it."""
+
+    def __init__(self, view: memoryview) -> None:
+        """Initialize the file at the start of the view.
+
+        Args:
+            view: The bytes of the file.
+        """
+        super().__init__()
+        self.view = view
+        self.position = 0
+
+    def readable(self) -> bool:
+        """Tell the file can be read.
+
+        Returns:
+            True.
+        """
+        return True
+
+    def seekable(self) -> bool:
+        """Tell the file supports random access.
+
+        Returns:
+            True.
+        """
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        """Read bytes at the position into a buffer.
+
+        Args:
+            buffer: The buffer to fill.
+
+        Returns:
+            The number of bytes read, 0 at the end of the file.
+        """
+        target = memoryview(buffer).cast("B")
+        chunk = self.view[self.position : self.position + len(target)]
+        target[: len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move the position.
+
+        Args:
+            offset: The offset from the start, the position or the end.
+            whence: io.SEEK_SET, io.SEEK_CUR or io.SEEK_END.
+
+        Returns:
+            The new position.
+        """
+        start = {
+            io.SEEK_SET: 0,
+            io.SEEK_CUR: self.position,
+            io.SEEK_END: len(self.view),
+        }
+        self.position = max(start[whence] + offset, 0)
+        return self.position
+
+    def tell(self) -> int:
+        """Get the position.
+
+        Returns:
+            The position from the start.
+        """
+        return self.position
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the file."""
+        return f"{self.__class__.__name__}({self.position}/{len(self.view)})"
+
+
+class AssetPack:
+    """A pack file mapped into memory with the index of its assets."""
+
+    def __init__(self, path: Path) -> None:
+        """Map a pack and read its index.
+
+        Args:
+            path: The pack file.
+
+        Raises:
+            ValueError: If the file is not a pack of this version.
+        """
+        self.path = path
+        with path.open("rb") as file:
+            # the mapping stays valid after the file is closed
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_size = PACK_HEADER.unpack_from(self.mmap)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            msg = f"{path} is not an asset pack of version {PACK_VERSION}"
+            raise ValueError(msg)
+        self.data_start = PACK_HEADER.size + index_size
+        index = self.mmap[PACK_HEADER.size : self.data_start]
+        self.index: dict[str, tuple[int, int]] = {
+            name: (offset, length)
+            for name, (offset, length) in json.loads(index).items()
+        }
+
+    def get(self, name: str) -> memoryview:
+        """Get the bytes of an asset without copying them.
+
+        Args:
+            name: The path of the asset in the resources package.
+
+        Returns:
+            A view of the asset in the mapping.
+        """
+        offset, length = self.index[name]
+        start = self.data_start + offset
+        return memoryview(self.mmap)[start : start + length]
+
+    def open(self, name: str) -> BinaryIO:
+        """Open an asset as a file, e.g. for pygame.image.load.
+
+        Args:
+            name: The path of the asset in the resources package.
+
+        Returns:
+            A buffered file reading from the mapping.
+        """
+        return io.BufferedReader(MemoryFile(self.get(name)))
+
+    def __contains__(self, name: object) -> bool:
+        """Check if an asset is in the pack.
+
+        Args:
+            name: The path of the asset in the resources package.
+
+        Returns:
+            True if the pack has the asset.
+        """
+        return name in self.index
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the pack."""
+        return f"{self.__class__.__name__}({self.path.name}, {len(self.index)} assets)"
+
+
+def get_assets_dir() -> Path:
+    """Get the resources package the assets are in.
+
+    Returns:
+        The resources directory, inside the bundle of a frozen app.
+    """
+    return get_resource_path("", resources)
+
+
+@functools.cache
+def get_asset_pack() -> AssetPack | None:
+    """Get the asset pack, mapped on the first call.
+
+    Returns:
+        The pack, None if there is no pack and the assets are files.
+    """
+    path = get_assets_dir() / PACK_NAME
+    return AssetPack(path) if path.is_file() else None
+
+
+def has_asset(name: str) -> bool:
+    """Check if an asset exists.
+
+    Args:
+        name: The path of the asset in the resources package.
+
+    Returns:
+        True if the asset is in the pack or, without a pack, a file.
+    """
+    pack = get_asset_pack()
+    if pack is not None:
+        return name in pack
+    return (get_assets_dir() / name).is_file()
+
+
+def open_asset(name: str) -> BinaryIO:
+    """Open an asset as a file.
+
+    Args:
+        name: The path of the asset in the resources package.
+
+    Returns:
+        The file, close it when done.
+    """
+    pack = get_asset_pack()
+    if pack is not None:
+        return pack.open(name)
+    return (get_assets_dir() / name).open("rb")
+
+
+def read_asset(name: str) -> Buffer:
+    """Get the bytes of an asset, without copying them from a pack.
+
+    Args:
+        name: The path of the asset in the resources package.
+
+    Returns:
+        The bytes.
+    """
+    pack = get_asset_pack()
+    if pack is not None:
+        return pack.get(name)
+    return (get_assets_dir() / name).read_bytes()
@@ -1,6 +1,7 @@
 """Card class for the Notty game."""
 
 from dataclasses import dataclass
+from typing import Any, ClassVar
 
 
 class Color:
@@ -46,6 +47,15 @@ class Card:
     Numbers: 1-9
     """
 
+    # order of the colors in the card ids, do not change as ids are sent to clients
+    ID_COLORS: ClassVar[tuple[str, ...]] = (
+        Color.RED,
+        Color.GREEN,
+        Color.YELLOW,
+        Color.BLACK,
+        Color.BLUE,
+    )
+
     color: str
     number: int
 
@@ -61,6 +71,50 @@ class Card:
             msg = f"Invalid number: {self.number}. Must be between 1 and 9"
             raise ValueError(msg)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the card to a JSON serializable dict.
+
+        Returns:
+            Dict with the color and number of the card.
+        """
+        return {"color": self.color, "number": self.number}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Card":
+        """Create a card from a dict created by to_dict.
+
+        Args:
+            data: Dict with the color and number of the card.
+
+        Returns:
+            The card.
+        """
+        return cls(data["color"], data["number"])
+
+    def to_id(self) -> int:
+        """Get the id of the card face.
+
+        Both copies of a card share the same id.
+
+        Returns:
+            The id between 0 and 44.
+        """
+        numbers = Number.get_all_numbers()
+        return self.ID_COLORS.index(self.color) * len(numbers) + self.number - 1
+
+    @classmethod
+    def from_id(cls, card_id: int) -> "Card":
+        """Create a card from the id of its face.
+
+        Args:
+            card_id: The id created by to_id.
+
+        Returns:
+            The card.
+        """
+        color_index, number_index = divmod(card_id, len(Number.get_all_numbers()))
+        return cls(cls.ID_COLORS[color_index], number_index + 1)
+
     def __str__(self) -> str:
         """Return a string representation of the card."""
         return f"{self.color} {self.number}"
@@ -6,3 +6,12 @@ APP_WIDTH = 1000
 APP_HEIGHT = 500
 
 ANTI_ALIASING = True
+
+# quits once the first frame is drawn if set, to measure the startup time
+QUIT_AFTER_FIRST_FRAME_ENV = "NOTTY_QUIT_AFTER_FIRST_FRAME"
+
+# the frame profiler writes the time of every render stage to this CSV file
+PROFILE_CSV_ENV = "NOTTY_PROFILE_CSV"
+
+# games count their metrics and save them to this directory if set
+METRICS_DIR_ENV = "NOTTY_METRICS_DIR"
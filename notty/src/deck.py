@@ -10,6 +10,9 @@ class Deck:
 
     The deck contains 90 cards total:
     - 5 colors * 9 numbers * 2 duplicates = 90 cards
+
+    Cards are drawn from the end of the list and discarded cards are put
+    there face up, so the players know the top cards until they are drawn.
     """
 
     NUM_DUPLICATES = 2
@@ -17,6 +20,8 @@ class Deck:
     def __init__(self) -> None:
         """Initialize the deck with all 90 cards."""
         self.cards: list[Card] = []
+        # the cards on top that were discarded, everyone knows them
+        self.known = 0
         self._initialize_deck()
 
     def _initialize_deck(self) -> None:
@@ -30,6 +35,21 @@ class Deck:
     def shuffle(self) -> None:
         """Shuffle the deck."""
         random.shuffle(self.cards)
+        self.known = 0
+
+    def shuffle_unknown(self) -> None:
+        """Shuffle the cards below the known ones, the players cannot tell."""
+        unknown = self.cards[: len(self.cards) - self.known]
+        random.shuffle(unknown)
+        self.cards[: len(unknown)] = unknown
+
+    def get_known_cards(self) -> list[Card]:
+        """Get the discarded cards on top of the deck.
+
+        Returns:
+            The cards everyone knows, in the order they are drawn.
+        """
+        return self.cards[len(self.cards) - self.known :][::-1]
 
     def draw(self) -> Card:
         """Draw the top card from the deck.
@@ -40,6 +60,7 @@ class Deck:
         if not self.cards:
             msg = "Cannot draw from an empty deck"
             raise ValueError(msg)
+        self.known = max(self.known - 1, 0)
         return self.cards.pop()
 
     def draw_multiple(self, count: int) -> list[Card]:
@@ -75,6 +96,7 @@ class Deck:
             card: Card to add back to the deck.
         """
         self.cards.append(card)
+        self.known += 1
 
     def is_empty(self) -> bool:
         """Check if the deck is empty.
@@ -102,4 +124,4 @@ class Deck:
 
     def __repr__(self) -> str:
         """Return a detailed string representation of the deck."""
-        return f"{self.__class__.__name__}(cards={len(self.cards)})"
+        return f"{self.__class__.__name__}(cards={len(self.cards)}, known={self.known})"
@@ -0,0 +1,317 @@
+"""Monte Carlo estimate of the win probability of every player.
+
+Worker processes play rollouts from the current state of a game with the
+greedy strategy in every seat. The order of the deck is unknown to the
+players except for the discarded cards on top, so the cards below them
+are shuffled for every rollout. Strategies of this game rarely
+empty a hand within thousands of moves, so a rollout ends after ROLLOUT_TURNS
+turns and is won by the player with the fewest cards then, ties share it.
+The estimate is refined with every batch of rollouts, each batch runs for
+about BATCH_TIME_S, and restarts once the state of the game changes.
+Batches of an old state that already run are finished and ignored.
+"""
+
+import contextlib
+import functools
+import multiprocessing
+import os
+import random
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from notty.src.game import Game
+from notty.src.metrics import disable_metrics
+from notty.src.stats import get_wilson_interval
+from notty.src.strategy import get_strategy
+
+ROLLOUT_STRATEGY = "greedy"
+# turns of a rollout before the player with the fewest cards wins
+ROLLOUT_TURNS = 30
+# seconds a worker plays rollouts before it reports them
+BATCH_TIME_S = 0.2
+# the event loop keeps a core, more workers than this barely help
+MAX_WORKERS = 4
+# niceness of the workers, the window is drawn first
+WORKER_NICENESS = 10
+
+# the state of a game as far as the estimate is concerned
+StateKey = Hashable
+
+
+@dataclass(frozen=True)
+class WinEstimate:
+    """The rollouts won by every player so far."""
+
+    names: tuple[str, ...] = ()
+    # shared wins count as a fraction for every player sharing them
+    wins: tuple[float, ...] = ()
+    rollouts: int = 0
+
+    def add(self, wins: tuple[float, ...], rollouts: int) -> "WinEstimate":
+        """Add a batch of rollouts.
+
+        Args:
+            wins: The wins of every player in the batch.
+            rollouts: The rollouts of the batch.
+
+        Returns:
+            The estimate with the batch.
+        """
+        total = tuple(a + b for a, b in zip(self.wins, wins, strict=True))
+        return WinEstimate(self.names, total, self.rollouts + rollouts)
+
+    def get_probability(self, seat: int) -> float:
+        """Get the estimated win probability of a player.
+
+        Args:
+            seat: The index of the player.
+
+        Returns:
+            The share of rollouts won, 0 without rollouts.
+        """
+        return self.wins[seat] / self.rollouts if self.rollouts else 0.0
+
+    def get_interval(self, seat: int) -> tuple[float, float]:
+        """Get the 95% confidence interval of the win probability of a player.
+
+        Args:
+            seat: The index of the player.
+
+        Returns:
+            The lower and upper bound.
+        """
+        return get_wilson_interval(self.wins[seat], self.rollouts)
+
+    def get_lines(self) -> tuple[str, ...]:
+        """Get the text of the win probability panel.
+
+        Returns:
+            A header and the probability with its interval of every player.
+        """
+        if not self.rollouts:
+            return ("Win chance", "estimating...")
+        lines = [f"Win chance ({self.rollouts} rollouts)"]
+        for seat, name in enumerate(self.names):
+            low, high = self.get_interval(seat)
+            lines.append(
+                f"{name} {self.get_probability(seat):.0%} ({low:.0%}-{high:.0%})"
+            )
+        return tuple(lines)
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the estimate."""
+        return (
+            f"{self.__class__.__name__}(names={self.names}, wins={self.wins}, "
+            f"rollouts={self.rollouts})"
+        )
+
+
+def get_state_key(game: Game) -> StateKey:
+    """Get what decides the estimate of a game, the deck order is unknown.
+
+    Args:
+        game: The game.
+
+    Returns:
+        The hands, the current player, the used actions, the deck size
+        and the known cards on top of the deck.
+    """
+    return (
+        tuple(tuple(card.to_id() for card in p.hand.cards) for p in game.players),
+        game.current_player_index,
+        tuple(sorted(game.actions_used.items())),
+        game.deck.size(),
+        tuple(card.to_id() for card in game.deck.get_known_cards()),
+        game.game_over,
+    )
+
+
+def play_rollout(state: dict[str, Any], seed: int) -> tuple[float, ...]:
+    """Play one rollout from a state.
+
+    Args:
+        state: The game in the save format.
+        seed: The seed of the deck order and the strategies.
+
+    Returns:
+        The share of the win of every player.
+    """
+    # the deck shuffles with the module level generator
+    random.seed(seed)
+    game = Game.from_dict(state)
+    game.deck.shuffle_unknown()
+    seats = len(game.players)
+    strategies = [get_strategy(ROLLOUT_STRATEGY, seed + seat) for seat in range(seats)]
+    for _ in range(ROLLOUT_TURNS):
+        if game.game_over:
+            break
+        strategies[game.current_player_index].play_turn(game)
+    if game.winner is not None:
+        winners = [game.players.index(game.winner)]
+    else:
+        fewest = min(player.hand.size() for player in game.players)
+        winners = [
+            seat for seat, p in enumerate(game.players) if p.hand.size() == fewest
+        ]
+    return tuple(1 / len(winners) if seat in winners else 0.0 for seat in range(seats))
+
+
+def play_rollouts(
+    state: dict[str, Any], seed: int, time_limit: float = BATCH_TIME_S
+) -> tuple[tuple[float, ...], int]:
+    """Play rollouts from a state for some time, runs in a worker process.
+
+    Args:
+        state: The game in the save format.
+        seed: The seed of the first rollout, the next ones count up from it.
+        time_limit: Seconds after which no rollout is started, at least
+            one is played.
+
+    Returns:
+        The wins of every player and the number of rollouts.
+    """
+    deadline = time.perf_counter() + time_limit
+    wins = [0.0] * len(state["players"])
+    rollouts = 0
+    while not rollouts or time.perf_counter() < deadline:
+        for seat, share in enumerate(play_rollout(state, seed + rollouts)):
+            wins[seat] += share
+        rollouts += 1
+    return tuple(wins), rollouts
+
+
+def lower_priority() -> None:
+    """Make the calling worker process yield the CPU to the window.
+
+    The worker inherits the metrics directory of the window, its rollouts
+    are not games of the players and are not counted.
+    """
+    disable_metrics()
+    # only POSIX has niceness
+    with contextlib.suppress(AttributeError, OSError):
+        os.nice(WORKER_NICENESS)
+
+
+def get_worker_count() -> int:
+    """Get the number of worker processes.
+
+    Returns:
+        One less than the CPUs, at least 1 and at most MAX_WORKERS.
+    """
+    return max(1, min(MAX_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+class WinEstimator:
+    """Estimates the win probabilities of a game in worker processes."""
+
+    def __init__(
+        self, notify: Callable[[], object] | None = None, workers: int = 0
+    ) -> None:
+        """Initialize the estimator, the workers start with the first estimate.
+
+        Args:
+            notify: Called from another thread when a batch is done,
+                e.g. to wake up the event loop.
+            workers: The number of worker processes, 0 for get_worker_count.
+        """
+        self.notify = notify
+        self.workers = workers or get_worker_count()
+        self.executor: ProcessPoolExecutor | None = None
+        self.key: StateKey = None
+        self.state: dict[str, Any] = {}
+        self.estimate = WinEstimate()
+        self.pending: set[Future[tuple[tuple[float, ...], int]]] = set()
+        self.seed = 0
+
+    def update(self, game: Game, *, running: bool = True) -> bool:
+        """Add the finished batches and keep the workers busy.
+
+        Called every frame, it never waits for a worker.
+
+        Args:
+            game: The game, the estimate restarts if its state changed.
+            running: Whether to start new batches, e.g. not while cards move.
+
+        Returns:
+            True if the estimate changed.
+        """
+        changed = False
+        key = get_state_key(game)
+        if key != self.key:
+            self.restart(game, key)
+            changed = True
+        changed = self.collect() or changed
+        if running and not game.game_over:
+            while len(self.pending) < self.workers:
+                self.submit()
+        return changed
+
+    def restart(self, game: Game, key: StateKey) -> None:
+        """Drop the estimate and the batches of the previous state.
+
+        Args:
+            game: The game.
+            key: The state key of the game.
+        """
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.key = key
+        self.state = game.to_dict()
+        names = tuple(player.name for player in game.players)
+        self.estimate = WinEstimate(names, (0.0,) * len(names))
+
+    def collect(self) -> bool:
+        """Add the batches that are done.
+
+        Returns:
+            True if a batch was added.
+        """
+        done = {future for future in self.pending if future.done()}
+        self.pending -= done
+        for future in done:
+            self.estimate = self.estimate.add(*future.result())
+        return bool(done)
+
+    def submit(self) -> None:
+        """Start a batch of rollouts of the current state."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=lower_priority,
+            )
+        future = self.executor.submit(play_rollouts, self.state, self.seed)
+        # every batch plays other deck orders
+        self.seed += 1_000_000
+        if self.notify is not None:
+            future.add_done_callback(functools.partial(notify_done, self.notify))
+        self.pending.add(future)
+
+    def close(self) -> None:
+        """Stop the workers and drop the batches not started yet."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+        self.pending.clear()
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the estimator."""
+        return (
+            f"{self.__class__.__name__}(workers={self.workers}, "
+            f"pending={len(self.pending)}, estimate={self.estimate})"
+        )
+
+
+def notify_done(notify: Callable[[], object], future: Future[Any]) -> None:
+    """Call notify for a batch that finished and was not cancelled.
+
+    Args:
+        notify: The callback of the estimator.
+        future: The batch.
+    """
+    if not future.cancelled():
+        notify()
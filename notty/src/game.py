@@ -1,11 +1,18 @@
 """Game class for the Notty game."""
 
 import itertools
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from notty.src.card import Card
 from notty.src.deck import Deck
+from notty.src.metrics import GameMetrics
 from notty.src.player import Player
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class Action:
     """Represents an action in the Notty game."""
@@ -21,6 +28,74 @@ class Action:
         return {cls.DRAW, cls.STEAL, cls.DRAW_DISCARD_DRAW, cls.DRAW_DISCARD_DISCARD}
 
 
+@dataclass(frozen=True)
+class Move:
+    """Represents a single move a player can make during their turn.
+
+    The kind is one of the Action constants or END_TURN or DISCARD_GROUP.
+    count is only used by DRAW, target (a player index) only by STEAL
+    and cards only by DRAW_DISCARD_DISCARD and DISCARD_GROUP.
+    """
+
+    END_TURN: ClassVar[str] = "end_turn"
+    DISCARD_GROUP: ClassVar[str] = "discard_group"
+
+    kind: str
+    count: int = 0
+    target: int | None = None
+    cards: tuple[Card, ...] = ()
+
+    def __post_init__(self) -> None:
+        """Validate the move kind."""
+        if self.kind not in self.get_all_kinds():
+            msg = (
+                f"Invalid move kind: {self.kind}. Must be one of {self.get_all_kinds()}"
+            )
+            raise ValueError(msg)
+
+    @classmethod
+    def get_all_kinds(cls) -> set[str]:
+        """Get all move kinds."""
+        return {*Action.get_all_actions(), cls.END_TURN, cls.DISCARD_GROUP}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the move to a JSON serializable dict.
+
+        Returns:
+            Dict with the kind, count, target and cards of the move.
+        """
+        return {
+            "kind": self.kind,
+            "count": self.count,
+            "target": self.target,
+            "cards": [card.to_dict() for card in self.cards],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Move":
+        """Create a move from a dict created by to_dict.
+
+        Args:
+            data: Dict with the kind and optionally count, target and cards.
+
+        Returns:
+            The move.
+        """
+        return cls(
+            kind=data["kind"],
+            count=data.get("count", 0),
+            target=data.get("target"),
+            cards=tuple(Card.from_dict(card) for card in data.get("cards", [])),
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the move."""
+        return (
+            f"{self.__class__.__name__}({self.kind}, count={self.count}, "
+            f"target={self.target}, cards={[str(card) for card in self.cards]})"
+        )
+
+
 class Game:
     """Represents a Notty game session.
 
@@ -30,6 +105,7 @@ class Game:
     MIN_PLAYERS = 2
     MAX_PLAYERS = 3
     INITIAL_HAND_SIZE = 4
+    MAX_DRAW_COUNT = 3
 
     def __init__(self, players: list[Player]) -> None:
         """Initialize a new game.
@@ -103,6 +179,9 @@ class Game:
 
     def next_turn(self) -> None:
         """Move to the next player's turn."""
+        metrics = GameMetrics.active
+        if metrics is not None:
+            metrics.on_turn_end(self.deck.size(), self.get_current_player().hand.size())
         self.current_player_index = self.get_next_player_index()
 
         # Reset action tracking for new turn
@@ -155,6 +234,18 @@ class Game:
             and not self.get_current_player().hand.hand_is_full()
         )
 
+    def get_max_draw_count(self) -> int:
+        """Get the most cards the current player can draw in one move.
+
+        Cards that do not fit into the hand would be lost,
+        so the count is capped by the free space in the hand.
+
+        Returns:
+            The maximum draw count, 0 if the hand is full.
+        """
+        hand = self.get_current_player().hand
+        return max(0, min(self.MAX_DRAW_COUNT, hand.MAX_CARDS - hand.size()))
+
     def player_draws_multiple(self, count: int) -> bool:
         """Player draws cards.
 
@@ -310,6 +401,252 @@ class Game:
         self.deck.add_cards(cards)
         return True
 
+    def find_valid_groups(self, cards: list[Card]) -> list[tuple[Card, ...]]:
+        """Find all valid groups that can be formed from the given cards.
+
+        Every sequence and every set of distinct cards is returned,
+        including the shorter ones contained in longer ones.
+
+        Args:
+            cards: List of cards to search, usually a hand.
+
+        Returns:
+            List of valid groups.
+        """
+        # distinct cards of the hand by color and by number
+        by_color: dict[str, dict[int, Card]] = {}
+        by_number: dict[int, dict[str, Card]] = {}
+        for card in cards:
+            by_color.setdefault(card.color, {})[card.number] = card
+            by_number.setdefault(card.number, {})[card.color] = card
+
+        groups: list[tuple[Card, ...]] = []
+
+        # sequences: every run of at least 3 consecutive numbers in one color
+        min_sequence = 3
+        for color in sorted(by_color):
+            numbers = by_color[color]
+            for start in sorted(numbers):
+                run: list[Card] = []
+                number = start
+                while number in numbers:
+                    run.append(numbers[number])
+                    if len(run) >= min_sequence:
+                        groups.append(tuple(run))
+                    number += 1
+
+        # sets: every combination of at least 4 colors for one number
+        min_set = 4
+        for number in sorted(by_number):
+            colors = by_number[number]
+            for size in range(min_set, len(colors) + 1):
+                groups.extend(
+                    tuple(colors[color] for color in combination)
+                    for combination in itertools.combinations(sorted(colors), size)
+                )
+
+        return groups
+
+    def get_legal_moves(self) -> list[Move]:
+        """Get all moves the current player can make right now.
+
+        Returns:
+            List of legal moves, passing is always included.
+        """
+        moves = [Move(Move.END_TURN)]
+        hand = self.get_current_player().hand
+
+        if self.player_can_draw_multiple():
+            moves.extend(
+                Move(Action.DRAW, count=count)
+                for count in range(1, self.get_max_draw_count() + 1)
+            )
+
+        if self.player_can_steal():
+            moves.extend(
+                Move(Action.STEAL, target=i)
+                for i, p in enumerate(self.players)
+                if i != self.current_player_index and not p.hand.is_empty()
+            )
+
+        if self.player_can_draw_discard_draw():
+            moves.append(Move(Action.DRAW_DISCARD_DRAW))
+
+        if self.player_can_draw_discard_discard():
+            moves.extend(
+                Move(Action.DRAW_DISCARD_DISCARD, cards=(card,))
+                for card in dict.fromkeys(hand.cards)
+            )
+
+        moves.extend(
+            Move(Move.DISCARD_GROUP, cards=group)
+            for group in self.find_valid_groups(hand.cards)
+        )
+
+        return moves
+
+    def is_legal_move(self, move: Move) -> bool:
+        """Check if the current player can make the given move.
+
+        Uses the player_can_* checks and makes sure that
+        all cards of the move are in the current player's hand.
+
+        Args:
+            move: The move to check.
+
+        Returns:
+            True if the move is legal.
+        """
+        if self.game_over:
+            return False
+
+        hand_counts = Counter(self.get_current_player().hand.cards)
+        if any(hand_counts[c] < n for c, n in Counter(move.cards).items()):
+            return False
+
+        checks: dict[str, Callable[[], bool]] = {
+            Move.END_TURN: self.player_can_pass,
+            Action.DRAW: lambda: (
+                1 <= move.count <= self.get_max_draw_count()
+                and self.player_can_draw_multiple()
+            ),
+            Action.STEAL: lambda: (
+                move.target is not None
+                and 0 <= move.target < self.num_players
+                and move.target != self.current_player_index
+                and not self.players[move.target].hand.is_empty()
+                and self.player_can_steal()
+            ),
+            Action.DRAW_DISCARD_DRAW: self.player_can_draw_discard_draw,
+            Action.DRAW_DISCARD_DISCARD: lambda: (
+                len(move.cards) == 1 and self.player_can_draw_discard_discard()
+            ),
+            Move.DISCARD_GROUP: lambda: self.card_group_is_valid(list(move.cards)),
+        }
+        return checks[move.kind]()
+
+    def apply_move(self, move: Move) -> bool:
+        """Apply a move for the current player and check the win condition.
+
+        Args:
+            move: The move to apply.
+
+        Returns:
+            True if the move was applied.
+
+        Raises:
+            ValueError: If the move is not legal.
+        """
+        if not self.is_legal_move(move):
+            msg = f"Illegal move: {move}"
+            raise ValueError(msg)
+
+        if move.kind == Move.END_TURN:
+            self.player_passes()
+        elif move.kind == Action.DRAW:
+            self.player_draws_multiple(move.count)
+        elif move.kind == Action.STEAL and move.target is not None:
+            self.player_steals(self.players[move.target])
+        elif move.kind == Action.DRAW_DISCARD_DRAW:
+            self.player_draw_discard_draws()
+        elif move.kind == Action.DRAW_DISCARD_DISCARD:
+            self.player_draw_discard_discards(move.cards[0])
+        else:
+            self.player_discards_group(list(move.cards))
+
+        self.check_win_condition()
+        metrics = GameMetrics.active
+        if metrics is not None:
+            metrics.on_move(move.kind)
+            if self.game_over:
+                metrics.on_game_over()
+        return True
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the game to a JSON serializable dict.
+
+        This is the save format of a game. It contains the full state
+        and can be loaded again with from_dict.
+
+        Returns:
+            Dict with the players, their hands, the deck and the turn state.
+        """
+        return {
+            "players": [
+                {
+                    "name": player.name,
+                    "is_human": player.is_human,
+                    "hand": [card.to_dict() for card in player.hand.cards],
+                }
+                for player in self.players
+            ],
+            "deck": [card.to_dict() for card in self.deck.cards],
+            "known": self.deck.known,
+            "current_player_index": self.current_player_index,
+            "actions_used": {
+                action: int(used) for action, used in self.actions_used.items()
+            },
+            "winner": None if self.winner is None else self.players.index(self.winner),
+            "game_over": self.game_over,
+        }
+
+    def to_public_dict(self) -> dict[str, Any]:
+        """Convert the game to what every player may know.
+
+        The deck is drawn from its end, so its order would tell every
+        future draw, only the discarded cards on top are known. The hands
+        are shown face up, as in the window.
+
+        Returns:
+            The save format with the deck replaced by its size and
+            the known cards on top in the order they are drawn.
+        """
+        return {
+            **self.to_dict(),
+            "deck": self.deck.size(),
+            "top": [card.to_dict() for card in self.deck.get_known_cards()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Game":
+        """Create a game from a dict created by to_dict.
+
+        A public view of to_public_dict has only the size of the deck,
+        its cards are the ones in no hand, shuffled below the known ones.
+
+        Args:
+            data: The saved game state or its public view.
+
+        Returns:
+            The game with the saved state restored.
+        """
+        players = [
+            Player(player["name"], is_human=player["is_human"])
+            for player in data["players"]
+        ]
+        game = cls(players)
+        for player, saved in zip(players, data["players"], strict=True):
+            player.hand.cards = [Card.from_dict(card) for card in saved["hand"]]
+        if isinstance(data["deck"], int):
+            top = [Card.from_dict(card) for card in data.get("top", [])]
+            in_hands = Counter(card for player in players for card in player.hand.cards)
+            # the new game dealt from its deck already, start from a full one
+            unseen = Counter(Deck().cards) - in_hands - Counter(top)
+            game.deck.cards = list(unseen.elements())
+            game.deck.shuffle()
+            game.deck.cards.extend(reversed(top))
+            game.deck.known = len(top)
+        else:
+            game.deck.cards = [Card.from_dict(card) for card in data["deck"]]
+            # saves from before the known cards were tracked know none
+            game.deck.known = data.get("known", 0)
+        game.current_player_index = data["current_player_index"]
+        game.actions_used = dict(data["actions_used"])
+        winner = data["winner"]
+        game.winner = None if winner is None else players[winner]
+        game.game_over = data["game_over"]
+        return game
+
     def __str__(self) -> str:
         """Return a string representation of the game."""
         return f"{self.__class__.__name__}({len(self.players)}) players"
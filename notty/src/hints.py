@@ -0,0 +1,503 @@
+"""Move hints for the human player, evaluated in a worker process.
+
+Every legal move of the human is scored by the number of cards expected
+in their hand once the move is made and the best groups are discarded
+after it. The discarded cards on top of the deck are known and drawn
+first, the other cards come from the rest of the deck or a stolen hand
+with the exact probabilities of their composition, their order is
+unknown. The planner finds the disjoint groups discarding the most cards
+of a hand.
+
+The moves are evaluated one by one from the cheap to the expensive ones
+in a niced process, so the window keeps the GIL, a hint is shown at once
+and gets better while drawing several cards is still evaluated. Once the
+state changes no move of it is started and the result of a move already
+started is ignored. Finished hints are cached by the canonical state in
+the window process, so a state seen before gets its hint at once.
+"""
+
+import functools
+import itertools
+import math
+import multiprocessing
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from notty.src.card import Card, Number
+from notty.src.estimator import lower_priority, notify_done
+from notty.src.game import Action, Game, Move
+
+# the groups of Game.card_group_is_valid on card ids: a sequence is at least
+# 3 consecutive numbers of a color, a set at least 4 colors of a number
+MIN_SEQUENCE = 3
+MIN_SET = 4
+NUMBERS = len(Number.get_all_numbers())
+CARD_IDS = len(Card.ID_COLORS) * NUMBERS
+# hands the planner remembers, a draw of 3 cards plans about 50000
+PLAN_CACHE_SIZE = 1 << 16
+# a move has to be better by more than rounding errors of the probabilities
+TOLERANCE = 1e-9
+# finished hints kept by state
+HINT_CACHE_SIZE = 256
+# evaluated from the first to the last, the random moves cost the most
+MOVE_ORDER = (
+    Move.END_TURN,
+    Move.DISCARD_GROUP,
+    Action.DRAW_DISCARD_DISCARD,
+    Action.STEAL,
+    Action.DRAW_DISCARD_DRAW,
+    Action.DRAW,
+)
+
+# card ids sorted, the order of a hand or the deck does not matter
+Cards = tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class HintState:
+    """The canonical state of a turn of the human, it decides the hint."""
+
+    # the index of the human
+    seat: int
+    hands: tuple[Cards, ...]
+    # the cards of the deck below the known ones
+    deck: Cards
+    # the discarded cards on top of the deck, in the order they are drawn
+    top: Cards
+    # the sorted actions used this turn
+    actions: tuple[tuple[str, int], ...]
+
+    def get_hand(self) -> Cards:
+        """Get the hand of the human.
+
+        Returns:
+            The sorted card ids.
+        """
+        return self.hands[self.seat]
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the state."""
+        return (
+            f"{self.__class__.__name__}(seat={self.seat}, "
+            f"hands={[len(hand) for hand in self.hands]}, deck={len(self.deck)}, "
+            f"top={self.top})"
+        )
+
+
+@dataclass(frozen=True)
+class Hint:
+    """The best move evaluated so far."""
+
+    move: Move | None = None
+    # the expected cards in the hand after the move and the best discards
+    cards_left: float = 0.0
+    evaluated: int = 0
+    moves: int = 0
+
+    def is_done(self) -> bool:
+        """Check if every move was evaluated.
+
+        Returns:
+            True if the hint is final.
+        """
+        return self.evaluated == self.moves
+
+    def get_lines(self, names: tuple[str, ...]) -> tuple[str, ...]:
+        """Get the text of the hint.
+
+        Args:
+            names: The names of the players, for steals.
+
+        Returns:
+            A header, the move and the cards expected afterwards,
+            nothing without a move.
+        """
+        if self.move is None:
+            return ()
+        header = "Hint" if self.is_done() else f"Hint ({self.evaluated}/{self.moves})"
+        return (
+            header,
+            describe_move(self.move, names),
+            f"{self.cards_left:.1f} cards left",
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the hint."""
+        return (
+            f"{self.__class__.__name__}(move={self.move}, "
+            f"cards_left={self.cards_left}, evaluated={self.evaluated}/{self.moves})"
+        )
+
+
+def get_ids(cards: list[Card] | tuple[Card, ...]) -> Cards:
+    """Get the sorted ids of cards.
+
+    Args:
+        cards: The cards.
+
+    Returns:
+        The sorted card ids.
+    """
+    return tuple(sorted(card.to_id() for card in cards))
+
+
+def get_hint_state(game: Game) -> HintState | None:
+    """Get the canonical state of a game for the hint.
+
+    Args:
+        game: The game.
+
+    Returns:
+        The state, None if it is not the turn of the human.
+    """
+    if game.game_over or not game.get_current_player().is_human:
+        return None
+    known = game.deck.get_known_cards()
+    return HintState(
+        game.current_player_index,
+        tuple(get_ids(player.hand.cards) for player in game.players),
+        get_ids(game.deck.cards[: game.deck.size() - len(known)]),
+        tuple(card.to_id() for card in known),
+        tuple(
+            sorted((action, int(used)) for action, used in game.actions_used.items())
+        ),
+    )
+
+
+def describe_move(move: Move, names: tuple[str, ...]) -> str:
+    """Describe a move in a few words.
+
+    Args:
+        move: The move.
+        names: The names of the players, for steals.
+
+    Returns:
+        The description.
+    """
+    cards = move.cards
+    if move.kind == Move.DISCARD_GROUP:
+        first, last = cards[0], cards[-1]
+        # the colors of a set differ
+        if first.color == last.color:
+            return f"discard {first.color} {first.number}-{last.number}"
+        return f"discard {len(cards)} {first.number}s"
+    if move.kind == Action.STEAL and move.target is not None:
+        return f"steal from {names[move.target]}"
+    descriptions = {
+        Action.DRAW: f"draw {move.count}",
+        Action.DRAW_DISCARD_DRAW: "draw, then discard one",
+        Action.DRAW_DISCARD_DISCARD: f"discard {cards[0] if cards else 'a card'}",
+    }
+    return descriptions.get(move.kind, "end the turn")
+
+
+def remove_cards(hand: Cards, cards: Cards) -> Cards:
+    """Remove one copy of every card from a hand.
+
+    Args:
+        hand: The sorted card ids of the hand.
+        cards: The card ids to remove.
+
+    Returns:
+        The sorted card ids left.
+    """
+    left = list(hand)
+    for card in cards:
+        left.remove(card)
+    return tuple(left)
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_discard_plan(hand: Cards) -> tuple[Cards, ...]:
+    """Get the disjoint groups discarding the most cards of a hand.
+
+    The lowest card either stays in the hand or is in one of the groups
+    it starts, every group is followed by the plan of the cards left.
+
+    Args:
+        hand: The sorted card ids of the hand.
+
+    Returns:
+        The groups, their cards in order.
+    """
+    if not hand:
+        return ()
+    first = hand[0]
+    best = get_discard_plan(hand[1:])
+    best_count = sum(map(len, best))
+    present = set(hand)
+    groups: list[Cards] = []
+    # sequences start with the lowest card, the next ids are the next numbers
+    run = [first]
+    card = first + 1
+    while card % NUMBERS and card in present:
+        run.append(card)
+        if len(run) >= MIN_SEQUENCE:
+            groups.append(tuple(run))
+        card += 1
+    # sets have the lowest card in the first of their colors
+    others = [c for c in range(first + NUMBERS, CARD_IDS, NUMBERS) if c in present]
+    for size in range(MIN_SET - 1, len(others) + 1):
+        groups.extend(
+            (first, *combination)
+            for combination in itertools.combinations(others, size)
+        )
+    for group in groups:
+        plan = (group, *get_discard_plan(remove_cards(hand, group)))
+        count = sum(map(len, plan))
+        if count > best_count:
+            best, best_count = plan, count
+    return best
+
+
+def get_cards_left(hand: Cards) -> int:
+    """Get the cards left in a hand after discarding the best groups.
+
+    Args:
+        hand: The sorted card ids of the hand.
+
+    Returns:
+        The number of cards left.
+    """
+    return len(hand) - sum(map(len, get_discard_plan(hand)))
+
+
+def get_best_cards_left(hand: Cards) -> int:
+    """Get the cards left after discarding a single card or not.
+
+    Args:
+        hand: The sorted card ids of the hand after the draw of a draw-discard.
+
+    Returns:
+        The number of cards left after the best discard and groups.
+    """
+    return min(
+        get_cards_left(hand),
+        *(get_cards_left(remove_cards(hand, (card,))) for card in set(hand)),
+    )
+
+
+def get_draw_outcomes(deck: Cards, count: int) -> Iterator[tuple[float, Cards]]:
+    """Get every set of cards a draw can give with its probability.
+
+    Args:
+        deck: The sorted card ids of the deck, its order is unknown.
+        count: The number of cards drawn.
+
+    Yields:
+        The probability and the sorted card ids drawn.
+    """
+    counts = Counter(deck)
+    draws = math.comb(len(deck), count)
+    for drawn in itertools.combinations_with_replacement(sorted(counts), count):
+        ways = math.prod(
+            math.comb(counts[card], copies) for card, copies in Counter(drawn).items()
+        )
+        if ways:
+            yield ways / draws, drawn
+
+
+def get_deck_outcomes(state: HintState, count: int) -> Iterator[tuple[float, Cards]]:
+    """Get every set of cards a draw from the deck can give with its probability.
+
+    Args:
+        state: The state the cards are drawn in.
+        count: The number of cards drawn, fewer if the deck runs out.
+
+    Yields:
+        The probability and the card ids drawn, the known ones first.
+    """
+    known = state.top[:count]
+    rest = min(count - len(known), len(state.deck))
+    for probability, drawn in get_draw_outcomes(state.deck, rest):
+        yield probability, known + drawn
+
+
+def evaluate_move(state: HintState, move: Move) -> float:
+    """Get the expected cards left after a move and the best discards.
+
+    Runs in the worker process of HintService.
+
+    Args:
+        state: The state the move is made in.
+        move: A legal move of the human.
+
+    Returns:
+        The expected number of cards left.
+    """
+    hand = state.get_hand()
+    if move.kind == Move.END_TURN:
+        return float(len(hand))
+    if move.kind in (Move.DISCARD_GROUP, Action.DRAW_DISCARD_DISCARD):
+        return float(get_cards_left(remove_cards(hand, get_ids(move.cards))))
+    if move.kind == Action.STEAL and move.target is not None:
+        # the target shuffles their hand, every card is as likely
+        outcomes: Iterator[tuple[float, Cards]] = get_draw_outcomes(
+            state.hands[move.target], 1
+        )
+    else:
+        outcomes = get_deck_outcomes(state, move.count or 1)
+    score = (
+        get_best_cards_left if move.kind == Action.DRAW_DISCARD_DRAW else get_cards_left
+    )
+    expected = 0.0
+    for probability, cards in outcomes:
+        expected += probability * score(tuple(sorted(hand + cards)))
+    return expected
+
+
+def get_move_order(move: Move) -> tuple[int, int]:
+    """Get the position of a move in the evaluation.
+
+    Args:
+        move: The move.
+
+    Returns:
+        The position of its kind and the cards it draws.
+    """
+    return MOVE_ORDER.index(move.kind), move.count
+
+
+class HintService:
+    """Evaluates the moves of the human in a worker process and caches hints."""
+
+    def __init__(self, notify: Callable[[], object] | None = None) -> None:
+        """Initialize the service, the worker starts with the first state.
+
+        Args:
+            notify: Called from another thread when a move is evaluated,
+                e.g. to wake up the event loop.
+        """
+        self.notify = notify
+        self.executor: ProcessPoolExecutor | None = None
+        self.cache: OrderedDict[HintState, Hint] = OrderedDict()
+        self.state: HintState | None = None
+        self.names: tuple[str, ...] = ()
+        # the legal moves of the state, from the cheap to the expensive ones
+        self.moves: tuple[Move, ...] = ()
+        self.pending: Future[float] | None = None
+        self.hint = Hint()
+
+    def update(self, game: Game, *, running: bool = True) -> bool:
+        """Add the evaluated move and start the next one.
+
+        Called every frame, it never waits for the worker.
+
+        Args:
+            game: The game, the hint restarts if its state changed.
+            running: Whether to start the next move, e.g. not while cards move.
+
+        Returns:
+            True if the hint changed.
+        """
+        changed = False
+        state = get_hint_state(game)
+        if state != self.state:
+            self.restart(game, state)
+            changed = True
+        changed = self.collect() or changed
+        if running and state is not None and self.pending is None:
+            self.submit(state)
+        return changed
+
+    def restart(self, game: Game, state: HintState | None) -> None:
+        """Drop the hint of the previous state and start the new one.
+
+        A move of the previous state the worker already evaluates is
+        finished there and its result is ignored.
+
+        Args:
+            game: The game.
+            state: The hint state of the game.
+        """
+        if self.pending is not None:
+            self.pending.cancel()
+        self.pending = None
+        self.state = state
+        self.names = tuple(player.name for player in game.players)
+        self.moves = ()
+        if state is None:
+            self.hint = Hint()
+            return
+        cached = self.cache.get(state)
+        if cached is not None:
+            # a state seen before gets its hint at once
+            self.cache.move_to_end(state)
+            self.hint = cached
+            return
+        self.moves = tuple(sorted(game.get_legal_moves(), key=get_move_order))
+        self.hint = Hint(moves=len(self.moves))
+
+    def collect(self) -> bool:
+        """Add the evaluated move if it is done.
+
+        Returns:
+            True if a move was added.
+        """
+        if self.pending is None or not self.pending.done():
+            return False
+        cards_left = self.pending.result()
+        self.pending = None
+        hint = self.hint
+        move = self.moves[hint.evaluated]
+        # the cheaper move wins a tie
+        if hint.move is None or cards_left < hint.cards_left - TOLERANCE:
+            hint = Hint(move, cards_left, hint.evaluated, hint.moves)
+        self.hint = Hint(hint.move, hint.cards_left, hint.evaluated + 1, hint.moves)
+        if self.hint.is_done() and self.state is not None:
+            self.add_to_cache(self.state, self.hint)
+        return True
+
+    def submit(self, state: HintState) -> None:
+        """Start the evaluation of the next move of the current state.
+
+        Args:
+            state: The current state.
+        """
+        if self.hint.is_done():
+            return
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=lower_priority,
+            )
+        move = self.moves[self.hint.evaluated]
+        self.pending = self.executor.submit(evaluate_move, state, move)
+        if self.notify is not None:
+            self.pending.add_done_callback(functools.partial(notify_done, self.notify))
+
+    def add_to_cache(self, state: HintState, hint: Hint) -> None:
+        """Cache a finished hint and drop the least recently used ones.
+
+        Args:
+            state: The state.
+            hint: The final hint of the state.
+        """
+        self.cache[state] = hint
+        while len(self.cache) > HINT_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def get_lines(self) -> tuple[str, ...]:
+        """Get the text of the current hint.
+
+        Returns:
+            The lines of the hint, nothing if there is none yet.
+        """
+        return self.hint.get_lines(self.names)
+
+    def close(self) -> None:
+        """Stop the worker and drop the move not started yet."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+        self.pending = None
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the service."""
+        return (
+            f"{self.__class__.__name__}(state={self.state}, hint={self.hint}, "
+            f"cached={len(self.cache)})"
+        )
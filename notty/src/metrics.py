@@ -0,0 +1,476 @@
+"""Counters and histograms of played games in the Prometheus text format.
+
+Game and Hand call the hooks of GameMetrics.active, which is None unless the
+NOTTY_METRICS_DIR environment variable is set when this module is imported,
+so the hooks cost one attribute lookup while metrics are off.
+Processes inherit the variable, so every worker of a tournament or a server
+shard counts its own games and saves a JSON snapshot named after its pid to
+the directory at the end of every game and at exit. The snapshots of all
+processes are summed up into one Prometheus text file or endpoint.
+"""
+
+import asyncio
+import atexit
+import bisect
+import contextlib
+import functools
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, ClassVar
+
+from notty.src.consts import METRICS_DIR_ENV
+
+# the upper bounds of the buckets, a bucket for larger values is added
+DECK_SIZE_BUCKETS = (0, 5, 10, 20, 30, 40, 50, 60, 70, 80, 90)
+HAND_SIZE_BUCKETS = (0, 1, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_PATH = "/metrics"
+
+
+class Metric(ABC):
+    """A named metric that can be summed up over processes."""
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        """Initialize the metric.
+
+        Args:
+            name: The name in the export.
+            documentation: The help text in the export.
+        """
+        self.name = name
+        self.documentation = documentation
+
+    def get_lines(self) -> list[str]:
+        """Get the metric in the Prometheus text format.
+
+        Returns:
+            The help and type lines followed by the samples.
+        """
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}",
+            *self.get_samples(),
+        ]
+
+    @abstractmethod
+    def get_samples(self) -> list[str]:
+        """Get the sample lines of the metric.
+
+        Returns:
+            One line per sample.
+        """
+
+    @abstractmethod
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the values to a JSON serializable dict.
+
+        Returns:
+            The values.
+        """
+
+    @abstractmethod
+    def merge(self, data: dict[str, Any]) -> None:
+        """Add the values of another process.
+
+        Args:
+            data: The values as returned by to_dict.
+        """
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the metric."""
+        return f"{self.__class__.__name__}({self.name!r}, {self.to_dict()})"
+
+
+class Counter(Metric):
+    """A count per label value that only goes up."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, label: str = "") -> None:
+        """Initialize the counter.
+
+        Args:
+            name: The name in the export, ends with _total.
+            documentation: The help text in the export.
+            label: The name of the label, without one there is a single count.
+        """
+        super().__init__(name, documentation)
+        self.label = label
+        self.values: defaultdict[str, int] = defaultdict(int)
+        if not label:
+            # a single count is exported from the start
+            self.values[""] = 0
+
+    def inc(self, value: str = "", amount: int = 1) -> None:
+        """Count up.
+
+        Args:
+            value: The value of the label.
+            amount: How much to count up.
+        """
+        self.values[value] += amount
+
+    def get_samples(self) -> list[str]:
+        """Get a line per label value, sorted by value.
+
+        Returns:
+            The sample lines.
+        """
+        return [
+            f'{self.name}{{{self.label}="{value}"}} {count}'
+            if self.label
+            else f"{self.name} {count}"
+            for value, count in sorted(self.values.items())
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the counts to a JSON serializable dict.
+
+        Returns:
+            The count per label value.
+        """
+        return dict(self.values)
+
+    def merge(self, data: dict[str, Any]) -> None:
+        """Add the counts of another process.
+
+        Args:
+            data: The count per label value.
+        """
+        for value, count in data.items():
+            self.inc(value, count)
+
+
+class Histogram(Metric):
+    """The number of observed counts in fixed buckets.
+
+    The game only observes sizes, so every integer value is counted on its
+    own and sorted into the buckets on export. Observing is one increment
+    of a dict, cheaper than finding the bucket every time.
+    """
+
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[int]) -> None:
+        """Initialize the histogram.
+
+        Args:
+            name: The name in the export.
+            documentation: The help text in the export.
+            buckets: The upper bounds of the buckets, a bucket for
+                larger values is added.
+        """
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+        self.values: defaultdict[int, int] = defaultdict(int)
+
+    def observe(self, value: int) -> None:
+        """Count a value.
+
+        Args:
+            value: The observed value.
+        """
+        self.values[value] += 1
+
+    def get_counts(self) -> list[int]:
+        """Get the number of values in each bucket.
+
+        Returns:
+            The count of every bucket, the last of the values above every bound.
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        for value, count in self.values.items():
+            counts[bisect.bisect_left(self.buckets, value)] += count
+        return counts
+
+    def get_samples(self) -> list[str]:
+        """Get the cumulative bucket counts, the sum and the count.
+
+        Returns:
+            The sample lines.
+        """
+        lines = []
+        total = 0
+        bounds = (*map(str, self.buckets), "+Inf")
+        for bound, count in zip(bounds, self.get_counts(), strict=True):
+            total += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {total}')
+        value_sum = sum(value * count for value, count in self.values.items())
+        return [*lines, f"{self.name}_sum {value_sum}", f"{self.name}_count {total}"]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the counts to a JSON serializable dict.
+
+        Returns:
+            The count per value, the values as strings.
+        """
+        return {str(value): count for value, count in sorted(self.values.items())}
+
+    def merge(self, data: dict[str, Any]) -> None:
+        """Add the counts of another process.
+
+        Args:
+            data: The count per value.
+        """
+        for value, count in data.items():
+            self.values[int(value)] += count
+
+
+class GameMetrics:
+    """The metrics of the games of a process and the hooks updating them."""
+
+    # the metrics of this process, None while metrics are off
+    active: ClassVar["GameMetrics | None"] = None
+
+    def __init__(self, directory: Path | None = None) -> None:
+        """Initialize the metrics at zero.
+
+        Args:
+            directory: Where the snapshot of the process is saved,
+                None does not save it.
+        """
+        self.directory = directory
+        self.moves = Counter(
+            "notty_moves_total", "Moves applied by kind of move.", "kind"
+        )
+        self.rejected_cards = Counter(
+            "notty_rejected_cards_total", "Cards a full hand did not take."
+        )
+        self.games = Counter("notty_games_total", "Games played to the end.")
+        self.deck_size = Histogram(
+            "notty_deck_size",
+            "Cards in the deck at the end of a turn.",
+            DECK_SIZE_BUCKETS,
+        )
+        self.hand_size = Histogram(
+            "notty_hand_size",
+            "Cards in the hand at the end of its turn.",
+            HAND_SIZE_BUCKETS,
+        )
+        self.metrics: list[Metric] = [
+            self.moves,
+            self.rejected_cards,
+            self.games,
+            self.deck_size,
+            self.hand_size,
+        ]
+
+    def on_move(self, kind: str) -> None:
+        """Count an applied move.
+
+        Args:
+            kind: The kind of the move.
+        """
+        # called for every move, the values are updated without another call
+        self.moves.values[kind] += 1
+
+    def on_rejected_card(self) -> None:
+        """Count a card a full hand did not take."""
+        self.rejected_cards.inc()
+
+    def on_turn_end(self, deck_size: int, hand_size: int) -> None:
+        """Observe the sizes at the end of a turn.
+
+        Args:
+            deck_size: The cards in the deck.
+            hand_size: The cards in the hand of the player ending the turn.
+        """
+        self.deck_size.values[deck_size] += 1
+        self.hand_size.values[hand_size] += 1
+
+    def on_game_over(self) -> None:
+        """Count a finished game and save the snapshot."""
+        self.games.inc()
+        self.save()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the metrics to a JSON serializable snapshot.
+
+        Returns:
+            The values of every metric by name.
+        """
+        return {metric.name: metric.to_dict() for metric in self.metrics}
+
+    def merge(self, data: dict[str, Any]) -> None:
+        """Add the snapshot of another process.
+
+        Args:
+            data: The snapshot as returned by to_dict.
+        """
+        for metric in self.metrics:
+            if metric.name in data:
+                metric.merge(data[metric.name])
+
+    def to_prometheus(self) -> str:
+        """Export the metrics in the Prometheus text format.
+
+        Returns:
+            The text, ending with a newline.
+        """
+        return "".join(
+            f"{line}\n" for metric in self.metrics for line in metric.get_lines()
+        )
+
+    def save(self) -> None:
+        """Save the snapshot of this process to the directory, if there is one."""
+        if self.directory is not None:
+            write_atomic(
+                self.directory / f"{os.getpid()}.json", json.dumps(self.to_dict())
+            )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the metrics."""
+        return f"{self.__class__.__name__}({self.to_dict()})"
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write a file so readers never see it half written.
+
+    Args:
+        path: The file.
+        text: The content.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(text, encoding="utf-8")
+    temporary.replace(path)
+
+
+def load_snapshots(directory: Path) -> GameMetrics:
+    """Sum up the snapshots of all processes.
+
+    Args:
+        directory: The directory the processes saved their snapshots to.
+
+    Returns:
+        The metrics of all processes, saving nothing.
+    """
+    total = GameMetrics()
+    for path in sorted(directory.glob("*.json")):
+        # a snapshot can vanish or be replaced while it is read
+        with contextlib.suppress(OSError, ValueError):
+            total.merge(json.loads(path.read_text(encoding="utf-8")))
+    return total
+
+
+def get_metrics_dir() -> Path | None:
+    """Get the directory of the snapshots from the environment.
+
+    Returns:
+        The directory, None if metrics are off.
+    """
+    directory = os.environ.get(METRICS_DIR_ENV)
+    return Path(directory) if directory else None
+
+
+def enable_metrics(directory: Path | None = None) -> GameMetrics:
+    """Start counting the games of this process.
+
+    Args:
+        directory: Where the snapshot is saved at the end of every game
+            and at exit, None does not save it.
+
+    Returns:
+        The metrics the hooks update.
+    """
+    disable_metrics()
+    metrics = GameMetrics(directory)
+    if directory is not None:
+        atexit.register(metrics.save)
+    GameMetrics.active = metrics
+    return metrics
+
+
+def disable_metrics() -> None:
+    """Stop counting the games of this process."""
+    if GameMetrics.active is not None:
+        atexit.unregister(GameMetrics.active.save)
+    GameMetrics.active = None
+
+
+def export_metrics(directory: Path, output: Path | None = None) -> str:
+    """Sum up the snapshots of a directory in the Prometheus text format.
+
+    Args:
+        directory: The directory of the snapshots.
+        output: A file the text is written to, for the textfile collector
+            of the node exporter, None only returns it.
+
+    Returns:
+        The text.
+    """
+    text = load_snapshots(directory).to_prometheus()
+    if output is not None:
+        write_atomic(output, text)
+    return text
+
+
+async def handle_scrape(
+    directory: Path, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Answer an HTTP request for the metrics and close the connection.
+
+    Args:
+        directory: The directory of the snapshots.
+        reader: The stream of the request.
+        writer: The stream of the answer.
+    """
+    try:
+        request = await reader.readline()
+        # the headers are not needed, they end with an empty line
+        while (await reader.readline()).strip():
+            pass
+        parts = request.decode("latin-1").split()
+        if len(parts) > 1 and parts[1].split("?")[0] == METRICS_PATH:
+            status = "200 OK"
+            body = export_metrics(directory).encode()
+        else:
+            status = "404 Not Found"
+            body = b"only /metrics is served\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_metrics_server(directory: Path, host: str, port: int) -> None:
+    """Serve the metrics of a directory over HTTP until cancelled.
+
+    Args:
+        directory: The directory of the snapshots.
+        host: The host to listen on.
+        port: The port to listen on.
+    """
+    server = await asyncio.start_server(
+        functools.partial(handle_scrape, directory), host, port
+    )
+    async with server:
+        await server.serve_forever()
+
+
+def serve_metrics(directory: Path, host: str, port: int) -> None:
+    """Serve the metrics of a directory at /metrics until interrupted.
+
+    Args:
+        directory: The directory of the snapshots.
+        host: The host to listen on.
+        port: The port to listen on.
+    """
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run_metrics_server(directory, host, port))
+
+
+if (metrics_dir := get_metrics_dir()) is not None:
+    enable_metrics(metrics_dir)
@@ -3,6 +3,7 @@
 import random
 
 from notty.src.card import Card
+from notty.src.metrics import GameMetrics
 
 
 class Hand:
@@ -38,6 +39,9 @@ class Hand:
             True if the card was added, False if hand is full.
         """
         if self.size() >= self.MAX_CARDS and not draw_discard_draw:
+            metrics = GameMetrics.active
+            if metrics is not None:
+                metrics.on_rejected_card()
             return False
         self.cards.append(card)
         self.shuffle()
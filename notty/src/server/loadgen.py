@@ -0,0 +1,252 @@
+"""Load generator measuring the throughput and latency of a game server.
+
+Every simulated client opens its own connection, creates a table with
+one human seat and plays random legal moves, measuring the round trip
+of every move until it made its number of moves. Afterwards the stats
+of the server, or of every shard behind a supervisor, are fetched.
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any
+
+from notty.src.server.protocol import read_message, write_message
+from notty.src.server.server import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    GameServer,
+    ServerStats,
+)
+from notty.src.server.supervisor import Supervisor
+from notty.src.server.table import Table
+from notty.src.stats import get_percentile
+
+DEFAULT_SEATS = (Table.HUMAN, "random", "random")
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Result of a load generator run."""
+
+    moves: int
+    seconds: float
+    latencies: tuple[float, ...]
+    # stats of the server, or of every shard behind a supervisor
+    shards: tuple[ServerStats, ...] = ()
+
+    def get_moves_per_second(self) -> float:
+        """Get the moves per second over the whole run.
+
+        Returns:
+            The throughput of the server.
+        """
+        return self.moves / self.seconds if self.seconds > 0 else 0.0
+
+    def get_latency_percentile(self, percentile: float) -> float:
+        """Get a percentile of the move round trip latencies.
+
+        Args:
+            percentile: The percentile between 0 and 100.
+
+        Returns:
+            The latency in seconds.
+        """
+        return get_percentile(list(self.latencies), percentile)
+
+    def __str__(self) -> str:
+        """Return a summary of the report."""
+        return (
+            f"{self.moves} moves in {self.seconds:.2f}s: "
+            f"{self.get_moves_per_second():.0f} moves/s, "
+            f"p50 {self.get_latency_percentile(50) * 1000:.2f}ms, "
+            f"p99 {self.get_latency_percentile(99) * 1000:.2f}ms"
+        ) + "".join(f"\n  shard {i}: {stats}" for i, stats in enumerate(self.shards))
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the report."""
+        return f"{self.__class__.__name__}(moves={self.moves}, seconds={self.seconds})"
+
+
+async def request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    message: dict[str, Any],
+) -> dict[str, Any]:
+    """Send a request and wait for the answer.
+
+    Args:
+        reader: The stream to read the answer from.
+        writer: The stream to send the request to.
+        message: The request.
+
+    Returns:
+        The answer.
+
+    Raises:
+        RuntimeError: If the server closed the connection or answered an error.
+    """
+    await write_message(writer, message)
+    answer = await read_message(reader)
+    if answer is None:
+        msg = "Server closed the connection"
+        raise RuntimeError(msg)
+    if answer["type"] == "error":
+        msg = f"Server error: {answer['message']}"
+        raise RuntimeError(msg)
+    return answer
+
+
+async def run_client(
+    host: str,
+    port: int,
+    moves: int,
+    seats: tuple[str, ...] = DEFAULT_SEATS,
+    seed: int | None = None,
+) -> list[float]:
+    """Play random legal moves against a server.
+
+    A new table is created whenever a game is over.
+
+    Args:
+        host: The host of the server.
+        port: The port of the server.
+        moves: Number of moves to make.
+        seats: Seats of the created tables.
+        seed: Seed for picking the moves.
+
+    Returns:
+        The round trip latency of every move in seconds.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    latencies: list[float] = []
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        state = await request(reader, writer, {"type": "create", "seats": seats})
+        while len(latencies) < moves:
+            if not state["legal_moves"]:
+                await request(
+                    reader, writer, {"type": "close", "table": state["table"]}
+                )
+                state = await request(
+                    reader, writer, {"type": "create", "seats": seats}
+                )
+                continue
+            move = rng.choice(state["legal_moves"])
+            start = time.perf_counter()
+            state = await request(
+                reader, writer, {"type": "move", "table": state["table"], "move": move}
+            )
+            latencies.append(time.perf_counter() - start)
+        await request(reader, writer, {"type": "close", "table": state["table"]})
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return latencies
+
+
+async def get_server_stats(host: str, port: int) -> tuple[ServerStats, ...]:
+    """Get the stats of a server or of every shard behind a supervisor.
+
+    Args:
+        host: The host of the server.
+        port: The port of the server.
+
+    Returns:
+        The stats of every shard, or of the server if it has no shards.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        answer = await request(reader, writer, {"type": "stats"})
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return tuple(ServerStats.from_dict(data) for data in answer.get("shards", [answer]))
+
+
+async def run_load(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    clients: int = 100,
+    moves_per_client: int = 100,
+) -> LoadReport:
+    """Run many concurrent clients against a server.
+
+    Args:
+        host: The host of the server.
+        port: The port of the server.
+        clients: Number of concurrent clients, each with its own table.
+        moves_per_client: Number of moves every client makes.
+
+    Returns:
+        The report of the run.
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_client(host, port, moves_per_client, seed=i) for i in range(clients))
+    )
+    seconds = time.perf_counter() - start
+    latencies = tuple(latency for result in results for latency in result)
+    return LoadReport(
+        moves=len(latencies),
+        seconds=seconds,
+        latencies=latencies,
+        shards=await get_server_stats(host, port),
+    )
+
+
+async def run_local_load(
+    clients: int = 100,
+    moves_per_client: int = 100,
+    executor: Executor | None = None,
+    shards: int = 0,
+) -> LoadReport:
+    """Start a server in this process and run the load against it.
+
+    Args:
+        clients: Number of concurrent clients, each with its own table.
+        moves_per_client: Number of moves every client makes.
+        executor: Worker pool of the server for bot turns.
+        shards: Number of shard processes behind a supervisor,
+            0 hosts all tables in this process.
+
+    Returns:
+        The report of the run.
+    """
+    server = (
+        Supervisor(DEFAULT_HOST, 0, shards)
+        if shards > 0
+        else GameServer(DEFAULT_HOST, 0, executor)
+    )
+    port = await server.start()
+    try:
+        return await run_load(DEFAULT_HOST, port, clients, moves_per_client)
+    finally:
+        await server.stop()
+
+
+def loadgen(
+    host: str = "",
+    port: int = DEFAULT_PORT,
+    clients: int = 100,
+    moves: int = 100,
+    shards: int = 0,
+) -> LoadReport:
+    """Run the load generator against a server or a bundled local one.
+
+    Args:
+        host: The host of the server, empty starts a local server.
+        port: The port of the server.
+        clients: Number of concurrent clients.
+        moves: Number of moves every client makes.
+        shards: Number of shard processes of the local server,
+            0 hosts all tables in this process.
+
+    Returns:
+        The report of the run.
+    """
+    if not host:
+        return asyncio.run(run_local_load(clients, moves, shards=shards))
+    return asyncio.run(run_load(host, port, clients, moves))
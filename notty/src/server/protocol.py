@@ -0,0 +1,134 @@
+"""Length-prefixed wire protocol of the game server.
+
+Every frame is a 4 byte big-endian unsigned length and a frame type byte
+followed by that many bytes of body. MESSAGE frames hold one message dict
+as UTF-8 encoded JSON, they carry all requests and answers. NOTICE frames
+hold a message too, but one the server sends on its own, like the closing
+of a watched table. STATE frames hold the binary game states sent to
+spectators, see the sync module.
+"""
+
+import asyncio
+import json
+import struct
+from typing import Any
+
+HEADER = struct.Struct("!IB")
+
+MESSAGE = 1
+STATE = 2
+NOTICE = 3
+FRAME_TYPES = (MESSAGE, STATE, NOTICE)
+
+# protects the server from clients announcing absurdly large frames
+MAX_FRAME_SIZE = 1024 * 1024
+
+
+def encode_frame(body: bytes, frame_type: int = MESSAGE) -> bytes:
+    """Prefix a body with its length and frame type.
+
+    Args:
+        body: The body of the frame.
+        frame_type: MESSAGE, STATE or NOTICE.
+
+    Returns:
+        The frame bytes including the header.
+    """
+    return HEADER.pack(len(body), frame_type) + body
+
+
+def encode_message(message: dict[str, Any], frame_type: int = MESSAGE) -> bytes:
+    """Encode a message into a frame.
+
+    Args:
+        message: The message to encode.
+        frame_type: MESSAGE or NOTICE.
+
+    Returns:
+        The frame bytes including the header.
+    """
+    return encode_frame(
+        json.dumps(message, separators=(",", ":")).encode("utf-8"), frame_type
+    )
+
+
+def decode_message(body: bytes) -> dict[str, Any]:
+    """Decode the body of a frame into a message.
+
+    Args:
+        body: The frame bytes without the header.
+
+    Returns:
+        The decoded message.
+
+    Raises:
+        TypeError: If the body is not a JSON object.
+    """
+    message = json.loads(body.decode("utf-8"))
+    if not isinstance(message, dict):
+        msg = f"Expected a JSON object, got {type(message).__name__}"
+        raise TypeError(msg)
+    return message
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, bytes] | None:
+    """Read the next frame from a stream.
+
+    Args:
+        reader: The stream to read from.
+
+    Returns:
+        The frame type and the body, or None if the stream was closed.
+
+    Raises:
+        ValueError: If the frame is larger than MAX_FRAME_SIZE
+            or has an unknown frame type.
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    length, frame_type = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        msg = f"Frame of {length} bytes exceeds the maximum of {MAX_FRAME_SIZE}"
+        raise ValueError(msg)
+    if frame_type not in FRAME_TYPES:
+        msg = f"Unknown frame type: {frame_type}"
+        raise ValueError(msg)
+    try:
+        return frame_type, await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    """Read the next message from a stream.
+
+    Args:
+        reader: The stream to read from.
+
+    Returns:
+        The message, or None if the stream was closed.
+
+    Raises:
+        ValueError: If the next frame is not a MESSAGE frame.
+    """
+    frame = await read_frame(reader)
+    if frame is None:
+        return None
+    frame_type, body = frame
+    if frame_type != MESSAGE:
+        msg = f"Expected a message frame, got frame type {frame_type}"
+        raise ValueError(msg)
+    return decode_message(body)
+
+
+async def write_message(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    """Write a message to a stream and wait until it is flushed.
+
+    Args:
+        writer: The stream to write to.
+        message: The message to write.
+    """
+    writer.write(encode_message(message))
+    await writer.drain()
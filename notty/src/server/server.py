@@ -0,0 +1,571 @@
+"""Asyncio server hosting many Notty tables in one process.
+
+Clients talk to the server with the frames of the protocol module.
+Requests and their answers:
+- {"type": "create", "seats": [...]}: creates a table, answers with its state,
+  the table is closed when the connection that created it disconnects.
+  An optional "table" id lets a supervisor choose the id.
+- {"type": "move", "table": id, "move": {...}}: applies a move of a human seat,
+  lets the bots play until a human has to move again, answers with the state
+- {"type": "state", "table": id}: answers with the state
+- {"type": "close", "table": id}: removes the table, answers with "closed"
+- {"type": "watch", "table": id}: subscribes to the table, answers with
+  "watching", then sends a full STATE frame followed by deltas, see the sync
+  module. When the table closes, spectators get a "closed" NOTICE frame.
+- {"type": "export", "table": id}: removes the table, answers with "exported"
+  holding its seats and the game in the Game save format. Spectators get a
+  "moved" NOTICE frame.
+- {"type": "import", "table": id, "seats": [...], "state": {...}}: hosts an
+  exported table, answers with "imported"
+- {"type": "stats"}: answers with the ServerStats of the server
+Failed requests are answered with {"type": "error", "message": ...}.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from notty.src.game import Game
+from notty.src.server.protocol import (
+    NOTICE,
+    encode_message,
+    read_message,
+    write_message,
+)
+from notty.src.server.table import Table, apply_client_move, run_bot_turn
+from notty.src.stats import get_percentile
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+@dataclass(frozen=True)
+class ServerStats:
+    """Throughput and move latency of a server since it was created.
+
+    Latencies are the time the server needed to answer a move request,
+    including the turns of the bots, in seconds.
+    """
+
+    tables: int
+    moves: int
+    seconds: float
+    p50: float
+    p99: float
+
+    @classmethod
+    def merge(cls, stats: list["ServerStats"]) -> "ServerStats":
+        """Combine the stats of several servers.
+
+        Percentiles of different servers cannot be combined exactly,
+        so the merged ones are the worst of all servers.
+
+        Args:
+            stats: The stats of every server.
+
+        Returns:
+            The combined stats.
+        """
+        return cls(
+            tables=sum(s.tables for s in stats),
+            moves=sum(s.moves for s in stats),
+            seconds=max((s.seconds for s in stats), default=0.0),
+            p50=max((s.p50 for s in stats), default=0.0),
+            p99=max((s.p99 for s in stats), default=0.0),
+        )
+
+    def get_moves_per_second(self) -> float:
+        """Get the moves per second since the server was created.
+
+        Returns:
+            The throughput of the server.
+        """
+        return self.moves / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the stats to a JSON compatible dict.
+
+        Returns:
+            The stats as a dict.
+        """
+        return {
+            "tables": self.tables,
+            "moves": self.moves,
+            "seconds": self.seconds,
+            "p50": self.p50,
+            "p99": self.p99,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ServerStats":
+        """Create stats from a dict created by to_dict.
+
+        Args:
+            data: The stats as a dict.
+
+        Returns:
+            The stats.
+        """
+        return cls(
+            tables=int(data["tables"]),
+            moves=int(data["moves"]),
+            seconds=float(data["seconds"]),
+            p50=float(data["p50"]),
+            p99=float(data["p99"]),
+        )
+
+    def __str__(self) -> str:
+        """Return a summary of the stats."""
+        return (
+            f"{self.tables} tables, {self.moves} moves, "
+            f"{self.get_moves_per_second():.0f} moves/s, "
+            f"p50 {self.p50 * 1000:.2f}ms, p99 {self.p99 * 1000:.2f}ms"
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the stats."""
+        return (
+            f"{self.__class__.__name__}(tables={self.tables}, moves={self.moves}, "
+            f"seconds={self.seconds})"
+        )
+
+
+class GameServer:
+    """Hosts tables and serves clients on one event loop.
+
+    Bot turns run in the executor if one is given,
+    so slow strategies never block the event loop.
+    """
+
+    MAX_TABLES = 100_000
+    # move latencies kept for the percentiles of the stats
+    MAX_LATENCIES = 10_000
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            host: The host to listen on.
+            port: The port to listen on, 0 picks a free port.
+            executor: Worker pool for bot turns, None plays them inline.
+        """
+        self.host = host
+        self.port = port
+        self.executor = executor
+        self.tables: dict[int, Table] = {}
+        # ids of the tables every connection created, closed on disconnect
+        self.owned: dict[asyncio.StreamWriter, set[int]] = {}
+        # ids of the tables every spectator connection watches
+        self.watching: dict[asyncio.StreamWriter, set[int]] = {}
+        self.next_table_id = 1
+        self.server: asyncio.Server | None = None
+        self.started = time.perf_counter()
+        self.moves = 0
+        self.latencies: deque[float] = deque(maxlen=self.MAX_LATENCIES)
+
+    async def start(self) -> int:
+        """Start listening for clients.
+
+        Returns:
+            The port the server listens on.
+        """
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info("Serving Notty tables on %s:%s", self.host, self.port)
+        return self.port
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        if self.server is None:
+            await self.start()
+        if self.server is not None:
+            await self.server.serve_forever()
+
+    async def stop(self) -> None:
+        """Stop listening and close the server."""
+        if self.server is None:
+            return
+        self.server.close()
+        await self.server.wait_closed()
+        self.server = None
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one client until it disconnects.
+
+        Args:
+            reader: The stream to read requests from.
+            writer: The stream to write answers to.
+        """
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except (ValueError, TypeError) as e:
+                    await write_message(writer, {"type": "error", "message": str(e)})
+                    break
+                if message is None:
+                    break
+                answer = await self.handle_message(message, writer)
+                if answer is not None:
+                    await write_message(writer, answer)
+        except ConnectionError:
+            logger.debug("Client disconnected")
+        finally:
+            for table_id in self.watching.pop(writer, set()):
+                if table_id in self.tables:
+                    self.tables[table_id].broadcaster.unsubscribe(writer)
+            for table_id in self.owned.pop(writer, set()):
+                if table_id in self.tables:
+                    self.remove_table(self.tables[table_id])
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def handle_message(
+        self,
+        message: dict[str, Any],
+        writer: asyncio.StreamWriter | None = None,
+    ) -> dict[str, Any] | None:
+        """Answer a single request.
+
+        Args:
+            message: The request.
+            writer: The stream of the client, it owns the tables it creates
+                and is needed to watch a table.
+
+        Returns:
+            The answer, an error message if the request failed,
+            None if the answer was already sent to the writer.
+        """
+        handlers: dict[
+            str, Callable[[dict[str, Any]], Awaitable[dict[str, Any] | None]]
+        ] = {
+            "create": functools.partial(self.create_table, writer=writer),
+            "move": self.make_move,
+            "state": self.get_table_state,
+            "close": self.close_table,
+            "watch": functools.partial(self.watch_table, writer=writer),
+            "export": self.export_table,
+            "import": self.import_table,
+            "stats": self.get_stats_message,
+        }
+        handler = handlers.get(message.get("type", ""))
+        if handler is None:
+            return {"type": "error", "message": f"Unknown type: {message.get('type')}"}
+        try:
+            return await handler(message)
+        except (ValueError, KeyError, TypeError) as e:
+            return {"type": "error", "message": str(e)}
+
+    async def create_table(
+        self,
+        message: dict[str, Any],
+        writer: asyncio.StreamWriter | None = None,
+    ) -> dict[str, Any]:
+        """Create a table and let the bots play until a human is to move.
+
+        Args:
+            message: The create request with the seats and optionally the id
+                of the table.
+            writer: The stream of the client owning the table, None keeps
+                the table until it is closed explicitly.
+
+        Returns:
+            The state of the new table.
+
+        Raises:
+            ValueError: If the server already hosts MAX_TABLES tables.
+        """
+        table = self.add_table(
+            Table(self.get_new_table_id(message), list(message["seats"]))
+        )
+        if writer is not None:
+            table.owner = writer
+            self.owned.setdefault(writer, set()).add(table.table_id)
+        async with table.lock:
+            await self.play_bot_turns(table)
+            return table.get_state()
+
+    def get_new_table_id(self, message: dict[str, Any]) -> int:
+        """Get the id for a table created or imported by a request.
+
+        Args:
+            message: The request, with an optional "table" id.
+
+        Returns:
+            The requested id or the next free one.
+
+        Raises:
+            ValueError: If the server is full or the requested id is taken.
+        """
+        if len(self.tables) >= self.MAX_TABLES:
+            msg = f"Server is full with {self.MAX_TABLES} tables"
+            raise ValueError(msg)
+        table_id = message.get("table")
+        if table_id is None:
+            while self.next_table_id in self.tables:
+                self.next_table_id += 1
+            table_id = self.next_table_id
+            self.next_table_id += 1
+        if table_id in self.tables:
+            msg = f"Table {table_id} already exists"
+            raise ValueError(msg)
+        return int(table_id)
+
+    def add_table(self, table: Table) -> Table:
+        """Host a new table.
+
+        Args:
+            table: The table.
+
+        Returns:
+            The table.
+        """
+        self.tables[table.table_id] = table
+        return table
+
+    async def make_move(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Apply the move of a human and let the bots answer.
+
+        Args:
+            message: The move request with the table id and the move.
+
+        Returns:
+            The state of the table after the bots played.
+        """
+        start = time.perf_counter()
+        table = self.get_table(message)
+        async with table.lock:
+            apply_client_move(table, message["move"])
+            table.broadcaster.publish(table.game)
+            await self.play_bot_turns(table)
+            state = table.get_state()
+        self.moves += 1
+        self.latencies.append(time.perf_counter() - start)
+        return state
+
+    async def get_table_state(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Get the state of a table.
+
+        Args:
+            message: The state request with the table id.
+
+        Returns:
+            The state of the table.
+        """
+        table = self.get_table(message)
+        async with table.lock:
+            return table.get_state()
+
+    async def close_table(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Remove a table from the server.
+
+        Args:
+            message: The close request with the table id.
+
+        Returns:
+            The closed message.
+        """
+        table = self.get_table(message)
+        self.remove_table(table)
+        return {"type": "closed", "table": table.table_id}
+
+    def remove_table(self, table: Table, reason: str = "closed") -> None:
+        """Remove a table and tell its spectators why.
+
+        Args:
+            table: The table to remove.
+            reason: The type of the notice sent to the spectators,
+                "closed" or "moved" if the table lives on elsewhere.
+        """
+        del self.tables[table.table_id]
+        if table.owner is not None:
+            self.owned.get(table.owner, set()).discard(table.table_id)
+        notice = encode_message({"type": reason, "table": table.table_id}, NOTICE)
+        for writer in table.broadcaster.close(notice):
+            self.watching.get(writer, set()).discard(table.table_id)
+
+    async def export_table(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Remove a table to host it somewhere else.
+
+        Args:
+            message: The export request with the table id.
+
+        Returns:
+            The exported message with the seats and the game of the table.
+        """
+        table = self.get_table(message)
+        async with table.lock:
+            if table.table_id not in self.tables:
+                msg = f"Unknown table: {table.table_id}"
+                raise ValueError(msg)
+            self.remove_table(table, "moved")
+            return {
+                "type": "exported",
+                "table": table.table_id,
+                "seats": table.seats,
+                "state": table.game.to_dict(),
+            }
+
+    async def import_table(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Host a table exported by another server.
+
+        The imported table has no owner, the server
+        that moved it is responsible for closing it.
+
+        Args:
+            message: The import request as answered by export_table.
+
+        Returns:
+            The imported message.
+        """
+        table_id = self.get_new_table_id(message)
+        game = Game.from_dict(message["state"])
+        self.add_table(Table(table_id, list(message["seats"]), game))
+        return {"type": "imported", "table": table_id}
+
+    def get_stats(self) -> ServerStats:
+        """Get the throughput and move latencies of the server.
+
+        Returns:
+            The stats since the server was created.
+        """
+        latencies = list(self.latencies)
+        return ServerStats(
+            tables=len(self.tables),
+            moves=self.moves,
+            seconds=time.perf_counter() - self.started,
+            p50=get_percentile(latencies, 50),
+            p99=get_percentile(latencies, 99),
+        )
+
+    async def get_stats_message(self, _message: dict[str, Any]) -> dict[str, Any]:
+        """Answer a stats request.
+
+        Args:
+            _message: The stats request.
+
+        Returns:
+            The stats message.
+        """
+        return {"type": "stats", **self.get_stats().to_dict()}
+
+    async def watch_table(
+        self, message: dict[str, Any], writer: asyncio.StreamWriter | None
+    ) -> None:
+        """Subscribe a client to the state frames of a table.
+
+        The watching answer is written before the first state frame,
+        so the client knows the STATE frames that follow belong to the table.
+
+        Args:
+            message: The watch request with the table id.
+            writer: The stream of the client.
+
+        Raises:
+            ValueError: If the request did not come over a stream.
+        """
+        table = self.get_table(message)
+        if writer is None:
+            msg = "Watching a table needs a connection"
+            raise ValueError(msg)
+        await write_message(writer, {"type": "watching", "table": table.table_id})
+        table.broadcaster.subscribe(writer)
+        self.watching.setdefault(writer, set()).add(table.table_id)
+
+    def get_table(self, message: dict[str, Any]) -> Table:
+        """Get the table a request refers to.
+
+        Args:
+            message: The request with the table id.
+
+        Returns:
+            The table.
+
+        Raises:
+            ValueError: If the table does not exist.
+        """
+        table = self.tables.get(message["table"])
+        if table is None:
+            msg = f"Unknown table: {message['table']}"
+            raise ValueError(msg)
+        return table
+
+    async def play_bot_turns(self, table: Table) -> None:
+        """Let the bots play until a human is to move or the game is over.
+
+        Args:
+            table: The table to play at.
+        """
+        loop = asyncio.get_running_loop()
+        while table.is_bot_turn():
+            strategy = table.get_current_strategy()
+            if strategy is None:
+                break
+            if self.executor is None:
+                table.game = run_bot_turn(table.game, strategy)
+            else:
+                table.game = await loop.run_in_executor(
+                    self.executor, run_bot_turn, table.game, strategy
+                )
+            table.broadcaster.publish(table.game)
+
+
+async def run_server(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 0
+) -> None:
+    """Run a game server until cancelled.
+
+    Args:
+        host: The host to listen on.
+        port: The port to listen on.
+        workers: Number of worker processes for bot turns, 0 plays them inline.
+            Every bot turn pickles the game to a worker and back,
+            which is slower than playing the bundled strategies inline.
+    """
+    # spawned workers do not inherit the state of the running event loop
+    executor = (
+        ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 0
+        else None
+    )
+    server = GameServer(host, port, executor)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 0) -> None:
+    """Run a game server until interrupted.
+
+    Args:
+        host: The host to listen on.
+        port: The port to listen on.
+        workers: Number of worker processes for bot turns, 0 plays them inline.
+    """
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run_server(host, port, workers))
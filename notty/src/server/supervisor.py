@@ -0,0 +1,636 @@
+"""Supervisor sharding the tables of a game server across worker processes.
+
+Every shard is a GameServer in its own process, so the tables use all cores
+instead of one. Clients connect to the supervisor, which speaks the protocol
+of a GameServer: it picks the id and the shard of every new table and
+forwards every request about a table to the shard hosting it. Every client
+gets its own connection to each shard, so tables are still closed when their
+client disconnects. All frames of these connections are relayed back to the
+client in the order they arrive, so answers and STATE frames never swap.
+
+Additional requests:
+- {"type": "migrate", "table": id, "shard": index}: moves a live table to
+  another shard in the Game save format, answers with "migrated".
+  Spectators of the table get a "moved" NOTICE frame and watch it again.
+- {"type": "rebalance"}: migrates tables until all shards host about
+  as many tables, answers with "rebalanced" and the number of moved tables
+- {"type": "stats"}: answers with the merged ServerStats of all shards
+  and the stats of every shard under "shards"
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import multiprocessing
+import os
+from typing import TYPE_CHECKING, Any
+
+from notty.src.server.protocol import (
+    MESSAGE,
+    decode_message,
+    encode_frame,
+    read_frame,
+    read_message,
+    write_message,
+)
+from notty.src.server.server import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    GameServer,
+    ServerStats,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+logger = logging.getLogger(__name__)
+
+# requests about a table that are forwarded to the shard hosting it
+FORWARDED_TYPES = ("move", "state", "close", "watch")
+# requests answered by a shard, the answer is relayed to the client
+RELAYED_TYPES = ("create", *FORWARDED_TYPES)
+
+
+def run_shard(host: str, connection: "Connection") -> None:
+    """Host the GameServer of a shard until the process is terminated.
+
+    Module level so it can be the target of a spawned process.
+
+    Args:
+        host: The host to listen on.
+        connection: Pipe to send the port of the server to.
+    """
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve_shard(host, connection))
+
+
+async def serve_shard(host: str, connection: "Connection") -> None:
+    """Start a GameServer on a free port and serve forever.
+
+    Args:
+        host: The host to listen on.
+        connection: Pipe to send the port of the server to.
+    """
+    server = GameServer(host, 0)
+    connection.send(await server.start())
+    connection.close()
+    await server.serve_forever()
+
+
+class Shard:
+    """A worker process hosting the tables of one shard.
+
+    The supervisor talks to the shard over a control connection,
+    clients talk to it over their own connections, see ClientSession.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        host: str,
+        port: int,
+        process: "BaseProcess",
+        control: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+    ) -> None:
+        """Initialize the shard.
+
+        Args:
+            index: The index of the shard.
+            host: The host the shard listens on.
+            port: The port the shard listens on.
+            process: The worker process of the shard.
+            control: The control connection to the shard.
+        """
+        self.index = index
+        self.host = host
+        self.port = port
+        self.process = process
+        self.reader, self.writer = control
+        # number of tables the supervisor routes to the shard
+        self.tables = 0
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    async def spawn(cls, index: int, host: str = DEFAULT_HOST) -> "Shard":
+        """Start a worker process and connect to its server.
+
+        Args:
+            index: The index of the shard.
+            host: The host the shard listens on.
+
+        Returns:
+            The running shard.
+        """
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=run_shard,
+            args=(host, sender),
+            name=f"notty-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        loop = asyncio.get_running_loop()
+        try:
+            port = await loop.run_in_executor(None, receiver.recv)
+        finally:
+            receiver.close()
+        control = await asyncio.open_connection(host, port)
+        return cls(index, host, port, process, control)
+
+    async def request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Send a request over the control connection.
+
+        Args:
+            message: The request.
+
+        Returns:
+            The answer.
+
+        Raises:
+            ConnectionError: If the shard closed the connection.
+            ValueError: If the shard answered with an error.
+        """
+        async with self.lock:
+            await write_message(self.writer, message)
+            answer = await read_message(self.reader)
+        if answer is None:
+            msg = f"Shard {self.index} closed the connection"
+            raise ConnectionError(msg)
+        if answer["type"] == "error":
+            raise ValueError(answer["message"])
+        return answer
+
+    async def stop(self) -> None:
+        """Close the control connection and terminate the worker process."""
+        self.writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self.writer.wait_closed()
+        self.process.terminate()
+        await asyncio.get_running_loop().run_in_executor(None, self.process.join)
+
+
+class ClientSession:
+    """The connections of one client to the shards.
+
+    Every frame of a shard is relayed to the client as it arrives,
+    MESSAGE frames are also handed to the request waiting on that shard.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        """Initialize the session without shard connections.
+
+        Args:
+            writer: The stream of the client.
+        """
+        self.writer = writer
+        self.upstreams: dict[int, asyncio.StreamWriter] = {}
+        self.answers: dict[int, asyncio.Queue[dict[str, Any] | None]] = {}
+        self.relays: list[asyncio.Task[None]] = []
+        # ids of the tables the client created
+        self.tables: set[int] = set()
+
+    async def forward(self, shard: Shard, message: dict[str, Any]) -> dict[str, Any]:
+        """Send a request to a shard and wait for the answer.
+
+        Args:
+            shard: The shard to send the request to.
+            message: The request.
+
+        Returns:
+            The answer of the shard, it was already relayed to the client.
+
+        Raises:
+            ConnectionError: If the shard closed the connection.
+        """
+        if shard.index not in self.upstreams:
+            reader, writer = await asyncio.open_connection(shard.host, shard.port)
+            self.upstreams[shard.index] = writer
+            self.answers[shard.index] = asyncio.Queue()
+            self.relays.append(asyncio.create_task(self.relay(shard.index, reader)))
+        await write_message(self.upstreams[shard.index], message)
+        answer = await self.answers[shard.index].get()
+        if answer is None:
+            msg = f"Shard {shard.index} closed the connection"
+            raise ConnectionError(msg)
+        return answer
+
+    async def relay(self, index: int, reader: asyncio.StreamReader) -> None:
+        """Read the frames of a shard connection until it closes.
+
+        Args:
+            index: The index of the shard.
+            reader: The stream of the shard connection.
+        """
+        try:
+            while (frame := await read_frame(reader)) is not None:
+                frame_type, body = frame
+                if not self.writer.is_closing():
+                    self.writer.write(encode_frame(body, frame_type))
+                    # a slow client slows the shard connection down, so the
+                    # shard drops it as a spectator instead of the supervisor
+                    # buffering without limit
+                    await self.writer.drain()
+                if frame_type == MESSAGE:
+                    self.answers[index].put_nowait(decode_message(body))
+        except (ConnectionError, ValueError, TypeError):
+            logger.debug("Lost the connection to shard %s", index)
+        finally:
+            # wakes up a request waiting for an answer that never comes
+            self.answers[index].put_nowait(None)
+
+    async def close(self) -> None:
+        """Close all shard connections."""
+        for writer in self.upstreams.values():
+            writer.close()
+        await asyncio.gather(*self.relays, return_exceptions=True)
+
+
+class Supervisor:
+    """Shards tables across GameServer worker processes.
+
+    New tables go to the shard hosting the fewest tables.
+    Requests about one table are serialized by the supervisor,
+    so a table is never migrated while a request is in flight.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        shards: int | None = None,
+    ) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            host: The host to listen on.
+            port: The port to listen on, 0 picks a free port.
+            shards: Number of worker processes, None starts one per CPU.
+        """
+        self.host = host
+        self.port = port
+        self.num_shards = shards or os.cpu_count() or 1
+        self.shards: list[Shard] = []
+        # the shard hosting every table
+        self.routes: dict[int, Shard] = {}
+        self.locks: dict[int, asyncio.Lock] = {}
+        self.next_table_id = 1
+        self.server: asyncio.Server | None = None
+
+    async def start(self) -> int:
+        """Start the shards and listen for clients.
+
+        Returns:
+            The port the supervisor listens on.
+        """
+        if not self.shards:
+            self.shards = list(
+                await asyncio.gather(
+                    *(Shard.spawn(i, self.host) for i in range(self.num_shards))
+                )
+            )
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(
+            "Serving Notty tables on %s:%s with %s shards",
+            self.host,
+            self.port,
+            len(self.shards),
+        )
+        return self.port
+
+    async def serve_forever(self) -> None:
+        """Start the supervisor if needed and serve until cancelled."""
+        if self.server is None:
+            await self.start()
+        if self.server is not None:
+            await self.server.serve_forever()
+
+    async def stop(self) -> None:
+        """Stop listening and terminate all shards."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        await asyncio.gather(*(shard.stop() for shard in self.shards))
+        self.shards = []
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one client until it disconnects.
+
+        Args:
+            reader: The stream to read requests from.
+            writer: The stream to write answers to.
+        """
+        session = ClientSession(writer)
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except (ValueError, TypeError) as e:
+                    await write_message(writer, {"type": "error", "message": str(e)})
+                    break
+                if message is None:
+                    break
+                answer = await self.handle_message(message, session)
+                if answer is not None:
+                    await write_message(writer, answer)
+        except ConnectionError:
+            logger.debug("Client disconnected")
+        finally:
+            await self.close_tables(session)
+            await session.close()
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def handle_message(
+        self, message: dict[str, Any], session: ClientSession
+    ) -> dict[str, Any] | None:
+        """Answer a single request.
+
+        Args:
+            message: The request.
+            session: The session of the client.
+
+        Returns:
+            The answer, an error message if the request failed,
+            None if a shard answered and the answer was already relayed.
+        """
+        handlers: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {
+            "create": functools.partial(self.create_table, session=session),
+            "migrate": self.migrate_request,
+            "rebalance": self.rebalance_request,
+            "stats": self.get_stats_message,
+        }
+        for request_type in FORWARDED_TYPES:
+            handlers[request_type] = functools.partial(
+                self.forward_request, session=session
+            )
+        handler = handlers.get(message.get("type", ""))
+        if handler is None:
+            return {"type": "error", "message": f"Unknown type: {message.get('type')}"}
+        try:
+            answer = await handler(message)
+        except (ValueError, KeyError, TypeError, ConnectionError) as e:
+            return {"type": "error", "message": str(e)}
+        return None if message["type"] in RELAYED_TYPES else answer
+
+    async def create_table(
+        self, message: dict[str, Any], session: ClientSession
+    ) -> dict[str, Any]:
+        """Create a table on the shard hosting the fewest tables.
+
+        Args:
+            message: The create request with the seats of the table.
+            session: The session of the client owning the table.
+
+        Returns:
+            The answer of the shard, it was already relayed to the client.
+        """
+        shard = min(self.shards, key=lambda s: s.tables)
+        table_id = self.next_table_id
+        self.next_table_id += 1
+        # the route is reserved right away, so concurrent creates spread out
+        self.routes[table_id] = shard
+        shard.tables += 1
+        async with self.get_lock(table_id):
+            try:
+                answer = await session.forward(shard, {**message, "table": table_id})
+            except ConnectionError:
+                self.drop_route(table_id)
+                raise
+            if answer["type"] == "error":
+                self.drop_route(table_id)
+            else:
+                session.tables.add(table_id)
+            return answer
+
+    async def forward_request(
+        self, message: dict[str, Any], session: ClientSession
+    ) -> dict[str, Any]:
+        """Forward a request about a table to the shard hosting it.
+
+        Args:
+            message: The request with the table id.
+            session: The session of the client.
+
+        Returns:
+            The answer of the shard, it was already relayed to the client.
+        """
+        table_id = message["table"]
+        async with self.get_lock(table_id):
+            answer = await session.forward(self.get_shard(table_id), message)
+            if answer["type"] == "closed" and message["type"] == "close":
+                self.drop_route(table_id)
+                session.tables.discard(table_id)
+            return answer
+
+    def get_lock(self, table_id: int) -> asyncio.Lock:
+        """Get the lock serializing the requests about a table.
+
+        Only routed tables get a lock, so unknown ids sent by clients
+        do not pile up locks, drop_route removes it with the route.
+
+        Args:
+            table_id: The id of the table.
+
+        Returns:
+            The lock of the table.
+
+        Raises:
+            ValueError: If no shard hosts the table.
+        """
+        if table_id not in self.routes:
+            msg = f"Unknown table: {table_id}"
+            raise ValueError(msg)
+        return self.locks.setdefault(table_id, asyncio.Lock())
+
+    def get_shard(self, table_id: int) -> Shard:
+        """Get the shard hosting a table.
+
+        Args:
+            table_id: The id of the table.
+
+        Returns:
+            The shard.
+
+        Raises:
+            ValueError: If no shard hosts the table.
+        """
+        shard = self.routes.get(table_id)
+        if shard is None:
+            msg = f"Unknown table: {table_id}"
+            raise ValueError(msg)
+        return shard
+
+    def drop_route(self, table_id: int) -> None:
+        """Forget a closed table.
+
+        Args:
+            table_id: The id of the table.
+        """
+        shard = self.routes.pop(table_id, None)
+        if shard is not None:
+            shard.tables -= 1
+        self.locks.pop(table_id, None)
+
+    async def migrate_table(self, table_id: int, shard_index: int) -> None:
+        """Move a live table to another shard.
+
+        The table is exported in the Game save format and imported by
+        the other shard. If the import fails, the table is put back.
+
+        Args:
+            table_id: The id of the table.
+            shard_index: The index of the shard to move the table to.
+
+        Raises:
+            ValueError: If the shard does not exist.
+        """
+        if not 0 <= shard_index < len(self.shards):
+            msg = f"Unknown shard: {shard_index}"
+            raise ValueError(msg)
+        target = self.shards[shard_index]
+        async with self.get_lock(table_id):
+            source = self.get_shard(table_id)
+            if source is target:
+                return
+            exported = await source.request({"type": "export", "table": table_id})
+            imported = {**exported, "type": "import"}
+            try:
+                await target.request(imported)
+            except (ValueError, ConnectionError):
+                await source.request(imported)
+                raise
+            self.routes[table_id] = target
+            source.tables -= 1
+            target.tables += 1
+        logger.debug("Migrated table %s to shard %s", table_id, shard_index)
+
+    async def migrate_request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Answer a migrate request.
+
+        Args:
+            message: The migrate request with the table id and the shard index.
+
+        Returns:
+            The migrated message.
+        """
+        table_id, shard_index = int(message["table"]), int(message["shard"])
+        await self.migrate_table(table_id, shard_index)
+        return {"type": "migrated", "table": table_id, "shard": shard_index}
+
+    async def rebalance(self) -> int:
+        """Migrate tables until no shard hosts two tables more than another.
+
+        Returns:
+            Number of migrated tables.
+        """
+        moved = 0
+        while self.shards:
+            busiest = max(self.shards, key=lambda s: s.tables)
+            idlest = min(self.shards, key=lambda s: s.tables)
+            if busiest.tables - idlest.tables <= 1:
+                break
+            table_id = next(
+                table_id for table_id, shard in self.routes.items() if shard is busiest
+            )
+            await self.migrate_table(table_id, idlest.index)
+            moved += 1
+        return moved
+
+    async def rebalance_request(self, _message: dict[str, Any]) -> dict[str, Any]:
+        """Answer a rebalance request.
+
+        Args:
+            _message: The rebalance request.
+
+        Returns:
+            The rebalanced message with the number of migrated tables.
+        """
+        return {"type": "rebalanced", "moved": await self.rebalance()}
+
+    async def get_stats(self) -> list[ServerStats]:
+        """Get the stats of every shard.
+
+        Returns:
+            The stats of the shards in shard order.
+        """
+        answers = await asyncio.gather(
+            *(shard.request({"type": "stats"}) for shard in self.shards)
+        )
+        return [ServerStats.from_dict(answer) for answer in answers]
+
+    async def get_stats_message(self, _message: dict[str, Any]) -> dict[str, Any]:
+        """Answer a stats request.
+
+        Args:
+            _message: The stats request.
+
+        Returns:
+            The merged stats of all shards and the stats of every shard.
+        """
+        stats = await self.get_stats()
+        return {
+            "type": "stats",
+            **ServerStats.merge(stats).to_dict(),
+            "shards": [s.to_dict() for s in stats],
+        }
+
+    async def close_tables(self, session: ClientSession) -> None:
+        """Close the tables a client created, wherever they were migrated to.
+
+        Args:
+            session: The session of the client.
+        """
+        for table_id in session.tables:
+            if table_id not in self.routes:
+                continue
+            async with self.get_lock(table_id):
+                shard = self.routes.get(table_id)
+                if shard is None:
+                    continue
+                with contextlib.suppress(ValueError, ConnectionError):
+                    await shard.request({"type": "close", "table": table_id})
+                self.drop_route(table_id)
+        session.tables.clear()
+
+
+async def run_supervisor(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, shards: int | None = None
+) -> None:
+    """Run a supervisor until cancelled.
+
+    Args:
+        host: The host to listen on.
+        port: The port to listen on.
+        shards: Number of worker processes, None starts one per CPU.
+    """
+    supervisor = Supervisor(host, port, shards)
+    try:
+        await supervisor.serve_forever()
+    finally:
+        await supervisor.stop()
+
+
+def supervise(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, shards: int | None = None
+) -> None:
+    """Run a supervisor until interrupted.
+
+    Args:
+        host: The host to listen on.
+        port: The port to listen on.
+        shards: Number of worker processes, None starts one per CPU.
+    """
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run_supervisor(host, port, shards))
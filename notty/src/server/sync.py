@@ -0,0 +1,456 @@
+"""Delta-encoded game state sync for spectators and remote UIs.
+
+States are sent as small binary frames. Every frame starts with
+STATE_HEADER: kind, sequence number, current player, deck size,
+winner (NO_WINNER while the game runs) and number of players.
+- FULL frames then hold the size and the card ids of every hand.
+- DELTA frames then hold the number of hand changes and every change as
+  two bytes: player index * 2 + 1 if the card was added, and the card id.
+Hands are compared by card id, so their order is not synced.
+"""
+
+import asyncio
+import logging
+import struct
+from collections import Counter
+from dataclasses import dataclass
+
+from notty.src.game import Game
+from notty.src.server.protocol import STATE, encode_frame
+
+logger = logging.getLogger(__name__)
+
+FULL = 1
+DELTA = 2
+
+NO_WINNER = 255
+
+STATE_HEADER = struct.Struct("!BIBBBB")
+CHANGE_COUNT = struct.Struct("!H")
+
+
+@dataclass
+class SyncState:
+    """The part of a game state that is synced to spectators.
+
+    Hands are the card id counts of every player's hand
+    and winner is None while the game runs.
+    """
+
+    current_player: int
+    deck_size: int
+    winner: int | None
+    hands: list[Counter[int]]
+
+    @classmethod
+    def from_game(cls, game: Game) -> "SyncState":
+        """Take the synced state of a game.
+
+        Args:
+            game: The game.
+
+        Returns:
+            The state of the game.
+        """
+        return cls(
+            current_player=game.current_player_index,
+            deck_size=game.deck.size(),
+            winner=None if game.winner is None else game.players.index(game.winner),
+            hands=[
+                Counter(card.to_id() for card in player.hand.cards)
+                for player in game.players
+            ],
+        )
+
+    def get_hand_changes(self, new: "SyncState") -> list[tuple[int, int, bool]]:
+        """Get the hand changes from this state to a newer one.
+
+        Args:
+            new: The newer state.
+
+        Returns:
+            List of (player index, card id, added) for every
+            single card that was added to or removed from a hand.
+        """
+        changes: list[tuple[int, int, bool]] = []
+        for player, (old_hand, new_hand) in enumerate(
+            zip(self.hands, new.hands, strict=True)
+        ):
+            for card_id, count in (old_hand - new_hand).items():
+                changes.extend([(player, card_id, False)] * count)
+            for card_id, count in (new_hand - old_hand).items():
+                changes.extend([(player, card_id, True)] * count)
+        return changes
+
+    def apply_hand_changes(self, changes: list[tuple[int, int, bool]]) -> None:
+        """Apply hand changes created by get_hand_changes.
+
+        Args:
+            changes: List of (player index, card id, added).
+        """
+        for player, card_id, added in changes:
+            self.hands[player][card_id] += 1 if added else -1
+        # drop zero counts so equal hands compare equal
+        self.hands = [+hand for hand in self.hands]
+
+    def copy(self) -> "SyncState":
+        """Copy the state.
+
+        Returns:
+            A copy that does not share hands with this state.
+        """
+        return SyncState(
+            self.current_player,
+            self.deck_size,
+            self.winner,
+            [Counter(hand) for hand in self.hands],
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the state."""
+        return (
+            f"{self.__class__.__name__}(current_player={self.current_player}, "
+            f"deck_size={self.deck_size}, winner={self.winner}, "
+            f"hand_sizes={[hand.total() for hand in self.hands]})"
+        )
+
+
+def encode_header(kind: int, seq: int, state: SyncState) -> bytes:
+    """Encode the header of a state frame.
+
+    Args:
+        kind: FULL or DELTA.
+        seq: The sequence number of the frame.
+        state: The state the frame leads to.
+
+    Returns:
+        The header bytes.
+    """
+    return STATE_HEADER.pack(
+        kind,
+        seq,
+        state.current_player,
+        state.deck_size,
+        NO_WINNER if state.winner is None else state.winner,
+        len(state.hands),
+    )
+
+
+def encode_full(seq: int, state: SyncState) -> bytes:
+    """Encode a full snapshot of a state.
+
+    Args:
+        seq: The sequence number of the frame.
+        state: The state.
+
+    Returns:
+        The frame body.
+    """
+    parts = [encode_header(FULL, seq, state)]
+    for hand in state.hands:
+        card_ids = sorted(hand.elements())
+        parts.append(bytes([len(card_ids), *card_ids]))
+    return b"".join(parts)
+
+
+def encode_delta(seq: int, old: SyncState, new: SyncState) -> bytes:
+    """Encode the changes from one state to the next.
+
+    Args:
+        seq: The sequence number of the frame.
+        old: The state the receiver has.
+        new: The state the receiver should have afterwards.
+
+    Returns:
+        The frame body.
+    """
+    changes = old.get_hand_changes(new)
+    body = bytearray(encode_header(DELTA, seq, new))
+    body += CHANGE_COUNT.pack(len(changes))
+    for player, card_id, added in changes:
+        body += bytes([player * 2 + int(added), card_id])
+    return bytes(body)
+
+
+def decode_hands(data: bytes, num_players: int) -> list[Counter[int]]:
+    """Decode the hands of a FULL frame.
+
+    Args:
+        data: The frame body.
+        num_players: The number of players from the header.
+
+    Returns:
+        The card id counts of every hand.
+
+    Raises:
+        ValueError: If the frame ends before the last hand.
+    """
+    hands: list[Counter[int]] = []
+    offset = STATE_HEADER.size
+    for _ in range(num_players):
+        if offset >= len(data) or offset + 1 + data[offset] > len(data):
+            msg = "Truncated full state frame"
+            raise ValueError(msg)
+        size = data[offset]
+        hands.append(Counter(data[offset + 1 : offset + 1 + size]))
+        offset += 1 + size
+    return hands
+
+
+def decode_changes(data: bytes, num_players: int) -> list[tuple[int, int, bool]]:
+    """Decode the hand changes of a DELTA frame.
+
+    Args:
+        data: The frame body.
+        num_players: The number of players from the header.
+
+    Returns:
+        List of (player index, card id, added).
+
+    Raises:
+        ValueError: If the frame ends before the last change
+            or a change belongs to an unknown player.
+    """
+    offset = STATE_HEADER.size
+    if len(data) < offset + CHANGE_COUNT.size:
+        msg = "Truncated delta state frame"
+        raise ValueError(msg)
+    (count,) = CHANGE_COUNT.unpack_from(data, offset)
+    offset += CHANGE_COUNT.size
+    if len(data) < offset + 2 * count:
+        msg = "Truncated delta state frame"
+        raise ValueError(msg)
+    pairs = data[offset : offset + 2 * count]
+    changes = [
+        (pairs[i] // 2, pairs[i + 1], bool(pairs[i] % 2))
+        for i in range(0, len(pairs), 2)
+    ]
+    if any(player >= num_players for player, _, _ in changes):
+        msg = "Delta changes the hand of an unknown player"
+        raise ValueError(msg)
+    return changes
+
+
+def decode_state(data: bytes, base: SyncState | None) -> tuple[int, SyncState]:
+    """Decode a state frame.
+
+    Args:
+        data: The frame body.
+        base: The current state of the receiver, needed for DELTA frames.
+
+    Returns:
+        The sequence number and the new state. A DELTA frame
+        is applied to a copy, so base is never changed.
+
+    Raises:
+        ValueError: If the frame is malformed or a DELTA frame has no base.
+    """
+    if len(data) < STATE_HEADER.size:
+        msg = f"State frame of {len(data)} bytes is too short"
+        raise ValueError(msg)
+    kind, seq, current_player, deck_size, winner, num_players = (
+        STATE_HEADER.unpack_from(data)
+    )
+
+    if kind == FULL:
+        state = SyncState(
+            current_player, deck_size, None, decode_hands(data, num_players)
+        )
+    elif kind == DELTA:
+        if base is None:
+            msg = "Received a delta without a full snapshot"
+            raise ValueError(msg)
+        if num_players != len(base.hands):
+            msg = f"Delta for {num_players} players, base has {len(base.hands)}"
+            raise ValueError(msg)
+        state = base.copy()
+        state.current_player = current_player
+        state.deck_size = deck_size
+        state.apply_hand_changes(decode_changes(data, num_players))
+    else:
+        msg = f"Unknown state frame kind: {kind}"
+        raise ValueError(msg)
+
+    state.winner = None if winner == NO_WINNER else winner
+    return seq, state
+
+
+class StateEncoder:
+    """Encodes the successive states of one game.
+
+    Every change is encoded as a delta to the previous state, except
+    for every snapshot_interval-th frame, which is a full snapshot so
+    receivers that missed frames or joined late can resync.
+    """
+
+    def __init__(self, snapshot_interval: int = 50) -> None:
+        """Initialize the encoder.
+
+        Args:
+            snapshot_interval: Send a full snapshot every this many frames.
+        """
+        self.snapshot_interval = snapshot_interval
+        self.seq = 0
+        self.state: SyncState | None = None
+
+    def encode(self, game: Game) -> bytes | None:
+        """Encode the current state of the game.
+
+        Args:
+            game: The game.
+
+        Returns:
+            The frame body, or None if nothing changed since the last frame.
+        """
+        new = SyncState.from_game(game)
+        old = self.state
+        if old is not None and old == new:
+            return None
+        self.seq += 1
+        self.state = new
+        if old is None or self.seq % self.snapshot_interval == 0:
+            return encode_full(self.seq, new)
+        return encode_delta(self.seq, old, new)
+
+    def get_snapshot(self) -> bytes | None:
+        """Get a full snapshot of the last encoded state.
+
+        Returns:
+            The frame body, None if nothing was encoded yet.
+        """
+        if self.state is None:
+            return None
+        return encode_full(self.seq, self.state)
+
+
+class StateDecoder:
+    """Rebuilds the state of a game from the frames of a StateEncoder."""
+
+    def __init__(self) -> None:
+        """Initialize the decoder without a state."""
+        self.seq = 0
+        self.state: SyncState | None = None
+
+    def decode(self, data: bytes) -> SyncState | None:
+        """Apply a frame to the state.
+
+        Deltas that do not directly follow the current state are ignored
+        until the next full snapshot arrives.
+
+        Args:
+            data: The frame body.
+
+        Returns:
+            The new state, None if no state could be built yet.
+
+        Raises:
+            ValueError: If the frame is malformed.
+        """
+        kind = data[0] if data else None
+        if kind == DELTA and (
+            self.state is None or self.get_base_seq(data) != self.seq
+        ):
+            logger.debug("Dropped delta frame, waiting for the next snapshot")
+            self.state = None
+            return None
+        self.seq, self.state = decode_state(data, self.state)
+        return self.state
+
+    def get_base_seq(self, data: bytes) -> int:
+        """Get the sequence number that precedes a frame.
+
+        Args:
+            data: The frame body.
+
+        Returns:
+            The sequence number the receiver must have to apply the frame.
+
+        Raises:
+            ValueError: If the frame is shorter than its header.
+        """
+        if len(data) < STATE_HEADER.size:
+            msg = f"State frame of {len(data)} bytes is too short"
+            raise ValueError(msg)
+        return int(STATE_HEADER.unpack_from(data)[1]) - 1
+
+
+class Broadcaster:
+    """Fans out the state frames of one game to all its spectators.
+
+    Every frame is serialized once and the same bytes are written
+    to every subscriber. Subscribers that stop reading are dropped
+    instead of buffering without limit.
+    """
+
+    MAX_BUFFERED_BYTES = 1024 * 1024
+
+    def __init__(self, snapshot_interval: int = 50) -> None:
+        """Initialize the broadcaster without subscribers.
+
+        Args:
+            snapshot_interval: Send a full snapshot every this many frames.
+        """
+        self.encoder = StateEncoder(snapshot_interval)
+        self.subscribers: set[asyncio.StreamWriter] = set()
+
+    def subscribe(self, writer: asyncio.StreamWriter) -> None:
+        """Add a subscriber and send it a full snapshot right away.
+
+        Args:
+            writer: The stream of the subscriber.
+        """
+        self.subscribers.add(writer)
+        snapshot = self.encoder.get_snapshot()
+        if snapshot is not None:
+            writer.write(encode_frame(snapshot, STATE))
+
+    def unsubscribe(self, writer: asyncio.StreamWriter) -> None:
+        """Remove a subscriber.
+
+        Args:
+            writer: The stream of the subscriber.
+        """
+        self.subscribers.discard(writer)
+
+    def publish(self, game: Game) -> int:
+        """Send the current state of the game to all subscribers.
+
+        The state is always encoded, even without subscribers,
+        so deltas stay relative to the last published state.
+
+        Args:
+            game: The game.
+
+        Returns:
+            Number of bytes in the frame sent to each subscriber.
+        """
+        body = self.encoder.encode(game)
+        if body is None:
+            return 0
+        frame = encode_frame(body, STATE)
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.unsubscribe(writer)
+            elif writer.transport.get_write_buffer_size() > self.MAX_BUFFERED_BYTES:
+                logger.info("Dropped a spectator that stopped reading")
+                self.unsubscribe(writer)
+                writer.close()
+            else:
+                writer.write(frame)
+        return len(frame)
+
+    def close(self, notice: bytes) -> set[asyncio.StreamWriter]:
+        """Send a last frame to all subscribers and remove them.
+
+        Args:
+            notice: The complete frame telling the subscribers why they are removed.
+
+        Returns:
+            The removed subscribers.
+        """
+        subscribers = self.subscribers
+        self.subscribers = set()
+        for writer in subscribers:
+            if not writer.is_closing():
+                writer.write(notice)
+        return subscribers
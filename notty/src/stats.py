@@ -0,0 +1,50 @@
+"""Statistics helpers for measurements of the Notty game."""
+
+import math
+
+# z score of a two sided 95% confidence interval
+Z_95 = 1.96
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    """Get a percentile of values with the nearest-rank method.
+
+    Args:
+        values: The measured values, in any order.
+        percentile: The percentile between 0 and 100.
+
+    Returns:
+        The smallest value that is greater or equal to
+        the given percentage of values, 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(percentile / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def get_wilson_interval(
+    successes: float, trials: int, z: float = Z_95
+) -> tuple[float, float]:
+    """Get the Wilson score interval of a success rate.
+
+    Unlike the normal approximation it stays within 0 and 1
+    and is still useful for a few trials or a rate near 0 or 1.
+
+    Args:
+        successes: The successes, may be fractional for shared successes.
+        trials: The number of trials.
+        z: The z score of the confidence level.
+
+    Returns:
+        The lower and upper bound, 0 to 1 without trials.
+    """
+    if trials <= 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z**2 / trials
+    center = (rate + z**2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z**2 / (4 * trials**2))
+    margin /= denominator
+    return max(center - margin, 0.0), min(center + margin, 1.0)
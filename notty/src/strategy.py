@@ -0,0 +1,164 @@
+"""Strategies for the computer players of the Notty game."""
+
+import random
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import ClassVar
+
+from notty.src.game import Action, Game, Move
+
+
+class Strategy(ABC):
+    """Base class for computer player strategies.
+
+    A strategy picks one move at a time for the current player of a game.
+    Subclasses are registered by their NAME via get_all_strategies.
+    """
+
+    NAME: ClassVar[str]
+
+    # safety net so a faulty strategy can never loop forever in one turn
+    MAX_MOVES_PER_TURN = 50
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Initialize the strategy.
+
+        Args:
+            seed: Seed for the strategy's own random number generator.
+        """
+        self.random = random.Random(seed)  # noqa: S311
+
+    @abstractmethod
+    def choose_move(self, game: Game) -> Move:
+        """Choose the next move for the current player.
+
+        Args:
+            game: The game to choose a move in.
+
+        Returns:
+            A legal move for the current player.
+        """
+
+    def play_turn(self, game: Game) -> list[Move]:
+        """Play a full turn for the current player.
+
+        Moves are chosen and applied until the strategy ends the turn
+        or the game is over.
+
+        Args:
+            game: The game to play the turn in.
+
+        Returns:
+            List of the moves that were applied.
+        """
+        moves: list[Move] = []
+        player_index = game.current_player_index
+        while not game.game_over and game.current_player_index == player_index:
+            if len(moves) >= self.MAX_MOVES_PER_TURN:
+                move = Move(Move.END_TURN)
+            else:
+                move = self.choose_move(game)
+            game.apply_move(move)
+            moves.append(move)
+            if move.kind == Move.END_TURN:
+                break
+        return moves
+
+
+class RandomStrategy(Strategy):
+    """Strategy that picks a uniformly random legal move."""
+
+    NAME = "random"
+
+    def choose_move(self, game: Game) -> Move:
+        """Choose a random legal move.
+
+        Args:
+            game: The game to choose a move in.
+
+        Returns:
+            A random legal move.
+        """
+        return self.random.choice(game.get_legal_moves())
+
+
+class GreedyStrategy(Strategy):
+    """Strategy that discards the biggest group it can and otherwise draws.
+
+    Finishes a started draw-discard by discarding the card
+    that shares the fewest colors and numbers with the rest of the hand.
+    """
+
+    NAME = "greedy"
+
+    def choose_move(self, game: Game) -> Move:
+        """Choose the greedy move.
+
+        Args:
+            game: The game to choose a move in.
+
+        Returns:
+            The move with the biggest immediate gain.
+        """
+        moves = game.get_legal_moves()
+        by_kind: dict[str, list[Move]] = {}
+        for move in moves:
+            by_kind.setdefault(move.kind, []).append(move)
+
+        if Move.DISCARD_GROUP in by_kind:
+            return max(by_kind[Move.DISCARD_GROUP], key=lambda m: len(m.cards))
+        if Action.DRAW_DISCARD_DISCARD in by_kind:
+            return min(
+                by_kind[Action.DRAW_DISCARD_DISCARD],
+                key=lambda m: self.get_card_usefulness(game, m),
+            )
+        if Action.DRAW_DISCARD_DRAW in by_kind:
+            return by_kind[Action.DRAW_DISCARD_DRAW][0]
+        if Action.DRAW in by_kind:
+            return by_kind[Action.DRAW][0]
+        return Move(Move.END_TURN)
+
+    def get_card_usefulness(self, game: Game, move: Move) -> int:
+        """Count how many other cards in the hand share a color or number.
+
+        Args:
+            game: The game the move is made in.
+            move: A draw-discard discard move.
+
+        Returns:
+            The usefulness of the card the move would discard.
+        """
+        card = move.cards[0]
+        hand = game.get_current_player().hand.cards
+        colors = Counter(c.color for c in hand)
+        numbers = Counter(c.number for c in hand)
+        return colors[card.color] + numbers[card.number] - 2
+
+
+def get_all_strategies() -> dict[str, type[Strategy]]:
+    """Get all registered strategies by name.
+
+    Returns:
+        Dict mapping the strategy names to the strategy classes.
+    """
+    return {strategy.NAME: strategy for strategy in (RandomStrategy, GreedyStrategy)}
+
+
+def get_strategy(name: str, seed: int | None = None) -> Strategy:
+    """Create a strategy by its name.
+
+    Args:
+        name: The name of the strategy.
+        seed: Seed for the strategy's random number generator.
+
+    Returns:
+        The strategy instance.
+
+    Raises:
+        ValueError: If no strategy with that name exists.
+    """
+    strategies = get_all_strategies()
+    if name not in strategies:
+        msg = f"Unknown strategy: {name}. Must be one of {set(strategies)}"
+        raise ValueError(msg)
+    return strategies[name](seed)
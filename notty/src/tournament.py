@@ -0,0 +1,370 @@
+"""Self-play tournament ranking the registered strategies by Elo.
+
+Every mix of strategies plays in every seating of a 2 and a 3 player game,
+round after round, on a process pool. Finished games are appended to a JSON
+lines file right away and update the ratings, so the tournament stops as soon
+as the ratings are separated instead of playing all rounds.
+
+A game of 2 or 3 players counts as a won game of the winner against every
+other seat and as draws between the other seats. The Elo of a strategy
+is its performance against the field, derived from its pairwise score
+with a 95% confidence interval, the way chess engine testers report it.
+"""
+
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from notty.src.arena.arena import MAX_MOVES
+from notty.src.game import Game
+from notty.src.player import Player
+from notty.src.stats import Z_95
+from notty.src.strategy import get_all_strategies, get_strategy
+
+# pairwise games every strategy needs before the tournament may stop early
+MIN_GAMES = 30
+# a score of 0 or 1 has an infinite Elo, scores are kept this far away
+MIN_SCORE = 1e-3
+
+
+def get_lineups(strategies: list[str]) -> list[tuple[str, ...]]:
+    """Get every seating of every mix of strategies for all player counts.
+
+    Mixes where every seat plays the same strategy are left out,
+    they say nothing about the ranking.
+
+    Args:
+        strategies: The names of the strategies.
+
+    Returns:
+        The strategy names by seat of every game of a round.
+    """
+    lineups: dict[tuple[str, ...], None] = {}
+    for players in range(Game.MIN_PLAYERS, Game.MAX_PLAYERS + 1):
+        for mix in itertools.combinations_with_replacement(strategies, players):
+            if len(set(mix)) > 1:
+                lineups.update(dict.fromkeys(itertools.permutations(mix)))
+    return list(lineups)
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """The result of one tournament game.
+
+    lineup are the strategy names by seat, winner is a seat or None
+    if the game reached the move limit.
+    """
+
+    lineup: tuple[str, ...]
+    seed: int
+    winner: int | None
+    moves: int
+
+    def get_pairwise_scores(self) -> list[tuple[str, str, float]]:
+        """Split the game into pairwise games of different strategies.
+
+        Returns:
+            The two strategies and the score of the first one for every pair.
+        """
+        scores = []
+        for first, second in itertools.combinations(range(len(self.lineup)), 2):
+            if self.lineup[first] == self.lineup[second]:
+                continue
+            score = 0.5
+            if self.winner == first:
+                score = 1.0
+            elif self.winner == second:
+                score = 0.0
+            scores.append((self.lineup[first], self.lineup[second], score))
+        return scores
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a JSON serializable dict.
+
+        Returns:
+            Dict with the lineup, seed, winner and moves.
+        """
+        return {
+            "lineup": list(self.lineup),
+            "seed": self.seed,
+            "winner": self.winner,
+            "moves": self.moves,
+        }
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the result."""
+        return (
+            f"{self.__class__.__name__}(lineup={self.lineup}, seed={self.seed}, "
+            f"winner={self.winner}, moves={self.moves})"
+        )
+
+
+def play_match(lineup: tuple[str, ...], seed: int) -> MatchResult:
+    """Play one game between strategies.
+
+    Module level so it can be sent to a process pool.
+
+    Args:
+        lineup: The strategy names by seat.
+        seed: Seed of the deck and the strategies, the game can be replayed.
+
+    Returns:
+        The result of the game.
+    """
+    # the deck shuffles with the module level generator
+    random.seed(seed)
+    game = Game([Player(name) for name in lineup])
+    strategies = [get_strategy(name, seed + seat) for seat, name in enumerate(lineup)]
+    moves = 0
+    while not game.game_over and moves < MAX_MOVES:
+        moves += len(strategies[game.current_player_index].play_turn(game))
+    winner = None if game.winner is None else game.players.index(game.winner)
+    return MatchResult(lineup, seed, winner, moves)
+
+
+class Rating:
+    """The pairwise score of a strategy and the Elo derived from it."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the rating without games.
+
+        Args:
+            name: The name of the strategy.
+        """
+        self.name = name
+        self.games = 0
+        self.score = 0.0
+        # sum of the squared scores, for the variance with draws
+        self.squares = 0.0
+
+    def add(self, score: float) -> None:
+        """Add the score of a pairwise game.
+
+        Args:
+            score: 1 for a win, 0.5 for a draw and 0 for a loss.
+        """
+        self.games += 1
+        self.score += score
+        self.squares += score * score
+
+    def get_score_rate(self) -> float:
+        """Get the mean score.
+
+        Returns:
+            The mean score, 0.5 without games.
+        """
+        return self.score / self.games if self.games else 0.5
+
+    def get_interval(self) -> tuple[float, float]:
+        """Get the 95% confidence interval of the Elo.
+
+        Returns:
+            The lowest and highest Elo, infinite without games.
+        """
+        if not self.games:
+            return -math.inf, math.inf
+        rate = self.get_score_rate()
+        variance = max(self.squares / self.games - rate * rate, 0.0)
+        margin = Z_95 * math.sqrt(variance / self.games)
+        return get_elo(rate - margin), get_elo(rate + margin)
+
+    def get_elo(self) -> float:
+        """Get the Elo against the field.
+
+        Returns:
+            The Elo, 0 for an even score.
+        """
+        return get_elo(self.get_score_rate())
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the rating."""
+        return (
+            f"{self.__class__.__name__}({self.name}, games={self.games}, "
+            f"score={self.score})"
+        )
+
+
+def get_elo(score_rate: float) -> float:
+    """Get the Elo difference that predicts a mean score.
+
+    Args:
+        score_rate: The mean score between 0 and 1.
+
+    Returns:
+        The Elo difference to the opponents.
+    """
+    rate = min(max(score_rate, MIN_SCORE), 1 - MIN_SCORE)
+    return -400 * math.log10(1 / rate - 1)
+
+
+class Leaderboard:
+    """The ratings of all strategies of a tournament."""
+
+    def __init__(self, strategies: list[str]) -> None:
+        """Initialize the leaderboard without games.
+
+        Args:
+            strategies: The names of the strategies.
+        """
+        self.ratings = {name: Rating(name) for name in strategies}
+        self.matches = 0
+
+    def add(self, result: MatchResult) -> None:
+        """Update the ratings with a finished game.
+
+        Args:
+            result: The result of the game.
+        """
+        self.matches += 1
+        for first, second, score in result.get_pairwise_scores():
+            self.ratings[first].add(score)
+            self.ratings[second].add(1 - score)
+
+    def get_ranking(self) -> list[Rating]:
+        """Get the ratings from the best to the worst.
+
+        Returns:
+            The ratings sorted by Elo.
+        """
+        return sorted(self.ratings.values(), key=Rating.get_elo, reverse=True)
+
+    def is_separated(self, min_games: int = MIN_GAMES) -> bool:
+        """Check if the ranking is settled.
+
+        Args:
+            min_games: The pairwise games every strategy needs at least.
+
+        Returns:
+            True if every strategy played enough games and the confidence
+            intervals of neighbours in the ranking do not overlap.
+        """
+        ranking = self.get_ranking()
+        if any(rating.games < min_games for rating in ranking):
+            return False
+        return all(
+            better.get_interval()[0] > worse.get_interval()[1]
+            for better, worse in itertools.pairwise(ranking)
+        )
+
+    def __str__(self) -> str:
+        """Return the ranking with one line per strategy."""
+        lines = [f"{self.matches} games"]
+        for place, rating in enumerate(self.get_ranking(), 1):
+            low, high = rating.get_interval()
+            lines.append(
+                f"{place}. {rating.name}: {rating.get_elo():+.0f} Elo "
+                f"[{low:+.0f}, {high:+.0f}], score {rating.get_score_rate():.1%} "
+                f"in {rating.games} pairwise games"
+            )
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the leaderboard."""
+        return f"{self.__class__.__name__}({list(self.ratings)}, {self.matches})"
+
+
+def get_schedule(
+    lineups: list[tuple[str, ...]], rounds: int
+) -> Iterator[tuple[tuple[str, ...], int]]:
+    """Get the games of all rounds with their seeds.
+
+    Args:
+        lineups: The lineups of a round.
+        rounds: The number of rounds.
+
+    Yields:
+        The lineup and the seed of every game.
+    """
+    games = itertools.product(range(rounds), lineups)
+    for seed, (_, lineup) in enumerate(games):
+        yield lineup, seed
+
+
+def run_tournament(
+    output: Path,
+    strategies: list[str],
+    rounds: int = 100,
+    workers: int | None = None,
+    min_games: int | None = MIN_GAMES,
+) -> Leaderboard:
+    """Play a round-robin tournament on a process pool.
+
+    Only a few games per worker are queued at a time,
+    so stopping early does not leave a backlog of games to finish.
+
+    Args:
+        output: JSON lines file the results are appended to as they finish.
+        strategies: The names of the strategies to rank.
+        rounds: The number of rounds, every round plays every lineup once.
+        workers: The number of worker processes, the number of CPUs if None.
+        min_games: Pairwise games before stopping once the ratings are
+            separated, None plays all rounds.
+
+    Returns:
+        The leaderboard.
+    """
+    board = Leaderboard(strategies)
+    schedule = get_schedule(get_lineups(strategies), rounds)
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context("spawn")
+    with (
+        ProcessPoolExecutor(workers, mp_context=context) as executor,
+        output.open("a", encoding="utf-8") as file,
+    ):
+        pending: set[Future[MatchResult]] = set()
+        while True:
+            free = 2 * workers - len(pending)
+            for lineup, seed in itertools.islice(schedule, free):
+                pending.add(executor.submit(play_match, lineup, seed))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                file.write(json.dumps(result.to_dict()) + "\n")
+                board.add(result)
+            file.flush()
+            if min_games is not None and board.is_separated(min_games):
+                for future in pending:
+                    future.cancel()
+                break
+    return board
+
+
+def tournament(
+    output: Path,
+    strategies: list[str] | None = None,
+    rounds: int = 100,
+    workers: int | None = None,
+    min_games: int | None = MIN_GAMES,
+) -> str:
+    """Run a tournament and summarize the ranking.
+
+    Args:
+        output: JSON lines file the results are appended to.
+        strategies: The strategies to rank, all registered ones if None.
+        rounds: The maximum number of rounds.
+        workers: The number of worker processes, the number of CPUs if None.
+        min_games: Pairwise games before stopping early, None never stops.
+
+    Returns:
+        The ranking.
+
+    Raises:
+        ValueError: If a strategy is unknown or less than two are given.
+    """
+    strategies = list(dict.fromkeys(strategies or get_all_strategies()))
+    for name in strategies:
+        get_strategy(name)
+    if len(strategies) < Game.MIN_PLAYERS:
+        msg = f"Need at least {Game.MIN_PLAYERS} strategies, got {strategies}"
+        raise ValueError(msg)
+    return str(run_tournament(output, strategies, rounds, workers, min_games))
@@ -0,0 +1,694 @@
+"""The game window, imported only once the game starts.
+
+Importing pygame loads SDL, so notty.main imports this module only when
+the window opens and the CLI and its subcommands start without pygame.
+"""
+
+import functools
+import os
+from collections.abc import Collection
+from dataclasses import dataclass, field
+
+import pygame
+
+from notty.src.consts import ANTI_ALIASING, APP_NAME, QUIT_AFTER_FIRST_FRAME_ENV
+from notty.src.estimator import WinEstimator
+from notty.src.game import Game, Move
+from notty.src.hints import HintService
+from notty.src.player import Player
+from notty.src.ui.atlas import CARD_BACK_COLOR, COLOR_MAP, get_card_atlas
+from notty.src.ui.audio import MusicPlayer
+from notty.src.ui.background import (
+    BACKGROUND_ASSET,
+    BACKGROUND_READY,
+    BackgroundLoader,
+    get_background,
+)
+from notty.src.ui.layout import Layout, get_layout
+from notty.src.ui.loop import FramePacer
+from notty.src.ui.moves import DECK, CardMove, Hands, get_card_moves, get_hands
+from notty.src.ui.profiler import FrameProfiler, get_profile_csv
+from notty.src.ui.renderer import DirtyRenderer
+from notty.src.ui.text import get_font, render_text
+from notty.src.ui.tween import (
+    CARD_INTERVAL_MS,
+    CARD_MOVE_MS,
+    SHUFFLE_MS,
+    Tween,
+    TweenScheduler,
+)
+
+# posted from another thread when the estimate or the hint got better
+PANEL_READY = pygame.event.custom_type()
+PANEL_COLOR = (255, 255, 255)
+
+
+@dataclass(frozen=True)
+class HumanView:
+    """What the human sees besides the game: selected cards, estimate and hint."""
+
+    # indices of the selected cards of the human
+    selected: frozenset[int] = field(default_factory=frozenset)
+    # lines of the win probability panel
+    estimate: tuple[str, ...] = ()
+    # lines of the best move found so far
+    hint: tuple[str, ...] = ()
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the view."""
+        return (
+            f"{self.__class__.__name__}(selected={sorted(self.selected)}, "
+            f"estimate={self.estimate}, hint={self.hint})"
+        )
+
+
+# nothing selected, estimated or hinted, e.g. in the render benchmark
+NO_VIEW = HumanView()
+
+
+def start() -> None:
+    """Start the notty game."""
+    # pygame.init would open the audio device as well, the music does it later
+    pygame.display.init()
+    pygame.font.init()
+
+    run()
+
+    pygame.quit()
+
+
+def run() -> None:
+    """Run the game."""
+    # Get screen dimensions
+    app_width, app_height = get_window_size()
+
+    screen = create_window(app_width, app_height)
+
+    # start the music in a thread, the first frame does not wait for it
+    player = MusicPlayer()
+    player.start()
+
+    # initialize game
+    game = init_game()
+
+    # load background image
+    background = load_background(app_width, app_height)
+
+    # run the event loop, it starts with the first shuffle and deal
+    run_event_loop(screen, game, background, app_width, app_height)
+
+    player.stop()
+
+
+def run_event_loop(
+    screen: pygame.Surface,
+    game: Game,
+    background: pygame.Surface,
+    app_width: int,
+    app_height: int,
+) -> None:
+    """Run the main event loop.
+
+    Args:
+        screen: The pygame display surface.
+        game: The game instance.
+        background: The background image surface.
+        app_width: Width of the window.
+        app_height: Height of the window.
+    """
+    pacer = FramePacer()
+    # off unless toggled with its key or exporting to a CSV file
+    profiler = FrameProfiler(get_profile_csv())
+    # the win probabilities are estimated in worker processes
+    estimator = WinEstimator(post_panel_ready)
+    # the moves of the human are evaluated in a worker process
+    hints = HintService(post_panel_ready)
+    renderer = DirtyRenderer(screen, background, profiler)
+    loader = BackgroundLoader(BACKGROUND_ASSET)
+    scheduler = TweenScheduler()
+    # indices of the cards the human selected in their hand
+    selected: set[int] = set()
+    quit_after_first_frame = bool(os.environ.get(QUIT_AFTER_FIRST_FRAME_ENV))
+
+    # the game is already dealt, animate it while handling events
+    layout = get_game_layout(game, app_width, app_height)
+    hands = simulate_first_shuffle_and_deal(scheduler, game, layout)
+
+    while True:
+        # run at the frame rate while cards move, else sleep until an event
+        for event in pacer.wait_for_events(animating=scheduler.is_active()):
+            if event.type == pygame.QUIT:
+                loader.close()
+                profiler.close()
+                estimator.close()
+                hints.close()
+                return
+            if event.type == pygame.VIDEORESIZE:
+                # everything scales with the window, so redraw it in full
+                app_width, app_height = event.w, event.h
+                handle_resize(renderer, loader, (app_width, app_height))
+                # running animations move between positions of the old size
+                scheduler.skip()
+                layout = get_game_layout(game, app_width, app_height)
+            elif event.type == BACKGROUND_READY:
+                handle_background_ready(renderer, loader)
+            elif event.type in (
+                pygame.VIDEOEXPOSE,
+                pygame.WINDOWEXPOSED,
+            ) or profiler.handle_event(event):
+                # redraw in full, also to show or erase the profiler overlay
+                renderer.invalidate()
+            else:
+                handle_input(event, game, layout, selected, scheduler)
+
+        # moving cards cross the regions, so redraw in full while they move
+        if scheduler.update(pacer.elapsed_ms):
+            renderer.invalidate()
+
+        # animate the cards that moved since the last frame, whatever moved them
+        new_hands = get_hands(game)
+        if new_hands != hands:
+            layout = get_game_layout(game, app_width, app_height)
+            animate_card_moves(scheduler, layout, get_card_moves(hands, new_hands))
+            # the selected indices point to other cards now
+            selected.clear()
+            hands = new_hands
+
+        # estimate and hint while no cards move, both restart on a new state
+        idle = not scheduler.is_active()
+        estimator.update(game, running=idle)
+        hints.update(game, running=idle)
+        view = HumanView(
+            frozenset(selected), estimator.estimate.get_lines(), hints.get_lines()
+        )
+
+        # Draw the changed regions and update only their part of the display
+        draw_frame(renderer, game, layout, scheduler, view)
+        # the startup is measured until the first frame is on screen
+        if quit_after_first_frame:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def handle_resize(
+    renderer: DirtyRenderer, loader: BackgroundLoader, size: tuple[int, int]
+) -> None:
+    """Draw on the resized window and make its background in a thread.
+
+    Until the new background is ready the old one is stretched to the
+    new size, which is fast but blurry.
+
+    Args:
+        renderer: The renderer of the window.
+        loader: Makes the backgrounds in a thread.
+        size: The new width and height of the window.
+    """
+    stretched = pygame.transform.scale(renderer.background, size)
+    renderer.set_screen(pygame.display.get_surface(), stretched)
+    loader.request(size)
+
+
+def handle_background_ready(renderer: DirtyRenderer, loader: BackgroundLoader) -> None:
+    """Draw on the background made in a thread once it is ready.
+
+    Args:
+        renderer: The renderer of the window.
+        loader: Makes the backgrounds in a thread.
+    """
+    new_background = loader.poll()
+    if new_background is not None:
+        renderer.set_screen(renderer.screen, new_background.convert())
+
+
+def handle_input(
+    event: pygame.event.Event,
+    game: Game,
+    layout: Layout,
+    selected: set[int],
+    scheduler: TweenScheduler,
+) -> None:
+    """Handle mouse clicks and keys.
+
+    A left click selects a card of the human, enter discards the
+    selected cards and the other keys control the animations.
+
+    Args:
+        event: The event.
+        game: The game instance.
+        layout: The layout of the window.
+        selected: Indices of the selected cards of the human, changed in place.
+        scheduler: The scheduler of the animations.
+    """
+    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        handle_click(game, layout, selected, event.pos)
+    elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+        discard_selection(game, selected)
+    elif event.type == pygame.KEYDOWN:
+        handle_animation_key(scheduler, event.key)
+
+
+def handle_animation_key(scheduler: TweenScheduler, key: int) -> None:
+    """Skip or change the speed of the animations with a key.
+
+    Space or escape skips the running animations,
+    plus and minus double or halve the animation speed.
+
+    Args:
+        scheduler: The scheduler of the animations.
+        key: The pressed key.
+    """
+    if key in (pygame.K_SPACE, pygame.K_ESCAPE):
+        scheduler.skip()
+    elif key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+        scheduler.set_speed(scheduler.speed * 2)
+    elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+        scheduler.set_speed(scheduler.speed / 2)
+
+
+def handle_click(
+    game: Game, layout: Layout, selected: set[int], position: tuple[int, int]
+) -> bool:
+    """Select or unselect a card of the human player with a click.
+
+    Args:
+        game: The game instance.
+        layout: The layout of the window.
+        selected: Indices of the selected cards of the human, changed in place.
+        position: The position of the click.
+
+    Returns:
+        True if a card of the human was clicked.
+    """
+    slot = layout.hit_test(position)
+    human = next(player for player in game.players if player.is_human)
+    if not isinstance(slot, tuple) or slot[0] != human.name:
+        return False
+    selected.symmetric_difference_update({slot[1]})
+    return True
+
+
+def discard_selection(game: Game, selected: set[int]) -> bool:
+    """Discard the selected cards of the human as a group.
+
+    Args:
+        game: The game instance.
+        selected: Indices of the selected cards of the human.
+
+    Returns:
+        True if it is the turn of the human and the cards are a valid group.
+    """
+    player = game.get_current_player()
+    if not player.is_human or not selected:
+        return False
+    # sequences are only valid in order
+    cards = sorted((player.hand.cards[i] for i in selected), key=lambda c: c.number)
+    move = Move(Move.DISCARD_GROUP, cards=tuple(cards))
+    if not game.is_legal_move(move):
+        return False
+    return game.apply_move(move)
+
+
+def get_game_layout(game: Game, app_width: int, app_height: int) -> Layout:
+    """Get the layout of the window for the current hands.
+
+    Args:
+        game: The game instance.
+        app_width: Width of the window.
+        app_height: Height of the window.
+
+    Returns:
+        The cached layout, computed again only when a hand size changed.
+    """
+    hand_sizes = tuple(
+        (player.name, player.hand.size()) for player in get_player_display_order(game)
+    )
+    return get_layout(app_width, app_height, hand_sizes)
+
+
+def draw_frame(
+    renderer: DirtyRenderer,
+    game: Game,
+    layout: Layout,
+    scheduler: TweenScheduler,
+    view: HumanView = NO_VIEW,
+) -> list[pygame.Rect]:
+    """Draw the regions of the window whose state changed and moving cards.
+
+    Cards are shown in the deck until they start moving
+    and in a hand once they arrived.
+
+    Args:
+        renderer: The renderer of the window.
+        game: The game instance.
+        layout: The layout of the window.
+        scheduler: The scheduler of the moving cards.
+        view: The selected cards of the human, the win estimate and the hint.
+
+    Returns:
+        The updated rects of the display.
+    """
+    screen = renderer.screen
+    # the renderer measures the background and the flip, the rest is measured here
+    profiler = renderer.profiler
+    renderer.begin_frame()
+
+    # Display deck, counting the cards that have not left or reached it yet
+    deck_size = (
+        game.deck.size() + scheduler.count_source(DECK) - scheduler.count_target(DECK)
+    )
+    with profiler.stage("deck"):
+        renderer.draw_region(
+            "deck",
+            layout.deck_area,
+            deck_size,
+            lambda: show_deck(screen, deck_size, layout),
+        )
+
+    # Display players, each in its own region without the arriving cards
+    with profiler.stage("players"):
+        draw_players(renderer, game, layout, scheduler, view.selected)
+
+    # the win probabilities and the hint in the top right, redrawn when they change
+    lines = view.estimate + view.hint
+    with profiler.stage("actions"):
+        renderer.draw_region(
+            "actions",
+            layout.actions_area,
+            lines,
+            lambda: show_actions(screen, layout.actions_area, lines),
+        )
+
+    # moving cards on top of everything
+    scheduler.draw(screen)
+
+    # the percentiles of the previous frames, redrawn when they change
+    if profiler.shown:
+        renderer.draw_region(
+            "profiler",
+            layout.overlay_area,
+            profiler.lines,
+            lambda: profiler.draw(screen, layout.overlay_area),
+        )
+
+    return renderer.end_frame()
+
+
+def draw_players(
+    renderer: DirtyRenderer,
+    game: Game,
+    layout: Layout,
+    scheduler: TweenScheduler,
+    selected: Collection[int],
+) -> None:
+    """Draw every player in their own region without the arriving cards.
+
+    Args:
+        renderer: The renderer of the window.
+        game: The game instance.
+        layout: The layout of the window.
+        scheduler: The scheduler of the moving cards.
+        selected: Indices of the selected cards of the human.
+    """
+    screen = renderer.screen
+    targets = scheduler.get_targets()
+    for player in get_player_display_order(game):
+        hidden = frozenset(
+            target[1]
+            for target in targets
+            if isinstance(target, tuple) and target[0] == player.name
+        )
+        marked = frozenset(selected if player.is_human else ())
+        renderer.draw_region(
+            f"player {player.name}",
+            layout.player_areas[player.name],
+            (tuple(card.to_id() for card in player.hand.cards), hidden, marked),
+            functools.partial(
+                show_player_with_hand, screen, player, layout, hidden, marked
+            ),
+        )
+
+
+def animate_card_moves(
+    scheduler: TweenScheduler, layout: Layout, moves: list[CardMove]
+) -> None:
+    """Move cards one after another once the running animations are done.
+
+    Args:
+        scheduler: The scheduler of the animations.
+        layout: The layout of the window after the moves.
+        moves: The cards to move.
+    """
+    atlas = get_card_atlas(*layout.card_size)
+    start_ms = scheduler.get_remaining_ms()
+    for order, move in enumerate(moves):
+        scheduler.add(
+            Tween(
+                atlas.faces[move.card_id],
+                layout.get_slot_position(move.source),
+                layout.get_slot_position(move.target),
+                CARD_MOVE_MS,
+                start_ms + order * CARD_INTERVAL_MS,
+                target=move.target,
+                source=move.source,
+            )
+        )
+
+
+def get_window_size() -> tuple[int, int]:
+    """Get the window size based on screen dimensions.
+
+    Returns:
+        Tuple of (width, height) for the window.
+    """
+    # Get the display info to determine screen size
+    display_info = pygame.display.Info()
+    screen_width = display_info.current_w
+    screen_height = display_info.current_h
+
+    # Use 80% of screen width and 70% of screen height
+    factor = 0.8
+    app_width = int(screen_width * factor)
+    app_height = int(screen_height * factor)
+
+    # Set minimum dimensions to ensure usability
+    min_width = 800
+    min_height = 500
+
+    app_width = max(app_width, min_width)
+    app_height = max(app_height, min_height)
+
+    return app_width, app_height
+
+
+def create_window(app_width: int, app_height: int) -> pygame.Surface:
+    """Create the game window.
+
+    Args:
+        app_width: Width of the window.
+        app_height: Height of the window.
+    """
+    screen = pygame.display.set_mode((app_width, app_height), pygame.RESIZABLE)
+    # set the title
+    pygame.display.set_caption(APP_NAME)
+    return screen
+
+
+def load_background(app_width: int, app_height: int) -> pygame.Surface:
+    """Load the dimmed background, from the disk cache if it was made before.
+
+    Args:
+        app_width: Width of the window.
+        app_height: Height of the window.
+    """
+    return get_background(BACKGROUND_ASSET, (app_width, app_height)).convert()
+
+
+def simulate_first_shuffle_and_deal(
+    scheduler: TweenScheduler, game: Game, layout: Layout
+) -> Hands:
+    """Schedule the animation of the first shuffle and deal.
+
+    Game internally already calls setup and does the logic.
+    But we want to show the cards being shuffled and dealt,
+    the event loop plays the animation without blocking.
+
+    Args:
+        scheduler: The scheduler of the animations.
+        game: The game instance.
+        layout: The layout of the window.
+
+    Returns:
+        The dealt hands the animation ends with.
+    """
+    deck_x, deck_y, deck_width, deck_height = layout.deck_rect
+
+    deck = pygame.Surface((deck_width, deck_height))
+    deck.fill(COLOR_MAP[CARD_BACK_COLOR])
+    pygame.draw.rect(deck, (255, 255, 255), (0, 0, deck_width, deck_height), 3)
+
+    # Shuffling animation - show deck "shaking" by offsetting it slightly
+    shuffle_steps = 30
+    step_ms = SHUFFLE_MS / shuffle_steps
+    for step in range(shuffle_steps):
+        shake_x = deck_x + (step % 4 - 2) * 3
+        shake_y = deck_y + (step % 3 - 1) * 2
+        scheduler.add(
+            Tween(deck, (shake_x, shake_y), (shake_x, shake_y), step_ms, step * step_ms)
+        )
+
+    # Show "SHUFFLING..." text
+    font_size = max(int(layout.app_height * 0.05), 24)
+    shuffle_text = render_text("SHUFFLING...", font_size)
+    center = (layout.app_width // 2, layout.app_height // 2)
+    text_pos = shuffle_text.get_rect(center=center).topleft
+    scheduler.add(Tween(shuffle_text, text_pos, text_pos, SHUFFLE_MS))
+
+    # Dealing animation - one card to every player in turn, from the deck
+    hands = get_hands(game)
+    display_names = [player.name for player in get_player_display_order(game)]
+    moves = [
+        CardMove(hands[name][index], DECK, (name, index))
+        for index in range(game.INITIAL_HAND_SIZE)
+        for name in display_names
+        if index < len(hands[name])
+    ]
+    animate_card_moves(scheduler, layout, moves)
+    return hands
+
+
+def init_game() -> Game:
+    """Add players to the game."""
+    return Game(get_players())
+
+
+def get_players() -> list[Player]:
+    """Get the players."""
+    # Needed: Make players configurable by the real player
+    player_1 = Player("Human", is_human=True)
+    player_2 = Player("Computer 1", is_human=False)
+    player_3 = Player("Computer 2", is_human=False)
+    return [player_1, player_2, player_3]
+
+
+def show_deck(screen: pygame.Surface, deck_size: int, layout: Layout) -> None:
+    """Display the deck widget.
+
+    Args:
+        screen: The pygame display surface.
+        deck_size: The number of cards shown in the deck.
+        layout: The layout of the window.
+    """
+    deck_rect = layout.deck_rect
+
+    # Draw deck background (card back) using neutral color
+    pygame.draw.rect(screen, COLOR_MAP[CARD_BACK_COLOR], deck_rect)
+    pygame.draw.rect(screen, (255, 255, 255), deck_rect, 3)
+
+    # Display card count (font size scales with deck size)
+    font_size = max(int(deck_rect.height * 0.2), 16)  # At least 16px
+    count_text = render_text(str(deck_size), font_size)
+    screen.blit(count_text, count_text.get_rect(center=deck_rect.center))
+
+    # Display "DECK" label
+    label_font_size = max(int(deck_rect.height * 0.15), 14)  # At least 14px
+    label_text = render_text("DECK", label_font_size)
+    label_rect = label_text.get_rect(
+        center=(deck_rect.centerx, deck_rect.bottom + layout.label_spacing)
+    )
+    screen.blit(label_text, label_rect)
+
+
+def get_player_display_order(game: Game) -> list[Player]:
+    """Get the display order of players with human in the right.
+
+    Args:
+        game: The game instance.
+
+    Returns:
+        List of players in display order (left to right).
+    """
+    # Separate human and computer players
+    all_players = game.players
+    human_player = next(p for p in all_players if p.is_human)
+    display_order = [p for p in all_players if p != human_player]
+
+    display_order.append(human_player)
+
+    return display_order
+
+
+def show_player_with_hand(
+    screen: pygame.Surface,
+    player: Player,
+    layout: Layout,
+    hidden: Collection[int] = (),
+    selected: Collection[int] = (),
+) -> None:
+    """Display a player with their hand.
+
+    Args:
+        screen: The pygame display surface.
+        player: The player to display.
+        layout: The layout of the window.
+        hidden: Indices of cards not drawn, e.g. while they move to the hand.
+        selected: Indices of cards drawn with a selection frame.
+    """
+    # Draw player name (font size scales with window) above the cards
+    name_font_size = max(int(layout.app_height * 0.045), 16)  # At least 16px
+    player_type = "👤 " if player.is_human else "🤖 "
+    name_text = render_text(f"{player_type}{player.name}", name_font_size)
+    name_offset_x, name_offset_y = layout.name_offset
+    screen.blit(
+        name_text,
+        (
+            layout.player_x[player.name] + name_offset_x,
+            layout.hand_top - name_offset_y,
+        ),
+    )
+
+    # Draw each card in the player's hand (5 cards per row) from the atlas
+    cards = player.hand.cards
+    shown = [i for i in range(len(cards)) if i not in hidden]
+    positions = [layout.get_card_position(player.name, i) for i in shown]
+    atlas = get_card_atlas(*layout.card_size)
+    screen.blits(atlas.get_blits([cards[i] for i in shown], positions), doreturn=False)
+
+    # Frame the selected cards
+    border = max(layout.card_size[1] // 15, 2)
+    for i in selected:
+        if i not in hidden and i < len(cards):
+            rect = pygame.Rect(
+                layout.get_card_position(player.name, i), layout.card_size
+            )
+            pygame.draw.rect(screen, (0, 255, 255), rect, border)
+
+
+def show_actions(
+    screen: pygame.Surface, area: pygame.Rect, lines: tuple[str, ...]
+) -> None:
+    """Display the panel of the win probabilities and the hint.
+
+    The lines change with every batch of rollouts,
+    so they are rendered without the text cache.
+
+    Args:
+        screen: The pygame display surface.
+        area: The area of the panel.
+        lines: The estimate of every player and the hint.
+    """
+    if not lines:
+        return
+    # about 2 characters per font size fit into the width
+    longest = max(len(line) for line in lines)
+    font_size = max(min(area.height // (len(lines) + 1), 2 * area.width // longest), 12)
+    font = get_font(font_size)
+    y = area.top
+    for line in lines:
+        text = font.render(line, ANTI_ALIASING, PANEL_COLOR)
+        screen.blit(text, (area.left, y))
+        y += text.get_height()
+
+
+def post_panel_ready() -> None:
+    """Wake up the event loop for new lines of the panel, called from a thread."""
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(PANEL_READY))
@@ -0,0 +1,142 @@
+"""Card atlas with every card face pre-rendered for one card size.
+
+Drawing a hand is a batch of blits of the cached faces instead of
+three rect draws and a text render per card and frame.
+"""
+
+import functools
+from collections.abc import Iterable
+
+import pygame
+
+from notty.src.card import Card, Color, Number
+from notty.src.ui.text import render_text
+
+# Color constants
+CARD_BACK_COLOR = "NEUTRAL"
+
+# Global color map for cards and deck
+COLOR_MAP = {
+    Color.RED: (220, 20, 60),
+    Color.GREEN: (34, 139, 34),
+    Color.YELLOW: (255, 215, 0),
+    Color.BLACK: (50, 50, 50),
+    Color.BLUE: (30, 144, 255),
+    CARD_BACK_COLOR: (100, 100, 120),  # Neutral gray-blue for deck
+}
+
+
+class CardAtlas:
+    """The 45 card faces and the card back rendered for one card size."""
+
+    def __init__(self, card_width: int, card_height: int) -> None:
+        """Render all faces and the back.
+
+        Args:
+            card_width: Width of a card in pixels.
+            card_height: Height of a card in pixels.
+        """
+        self.card_width = card_width
+        self.card_height = card_height
+        # indexed by Card.to_id
+        self.faces = [
+            self.render_face(Card.from_id(card_id))
+            for card_id in range(len(Card.ID_COLORS) * len(Number.get_all_numbers()))
+        ]
+        self.back = self.render_back()
+        # faces in the pixel format of the display blit fastest
+        if pygame.display.get_surface() is not None:
+            self.faces = [face.convert() for face in self.faces]
+            self.back = self.back.convert()
+
+    def render_face(self, card: Card) -> pygame.Surface:
+        """Render the face of a card.
+
+        Args:
+            card: The card to render.
+
+        Returns:
+            The face of the card.
+        """
+        width, height = self.card_width, self.card_height
+        face = pygame.Surface((width, height))
+        # Border and padding scale with card size
+        card_border = max(int(height * 0.05), 2)
+        card_padding = max(int(height * 0.05), 2)
+
+        face.fill((255, 255, 255))
+        pygame.draw.rect(
+            face,
+            COLOR_MAP[card.color],
+            (
+                card_padding,
+                card_padding,
+                width - 2 * card_padding,
+                height - 2 * card_padding,
+            ),
+        )
+        pygame.draw.rect(face, (0, 0, 0), (0, 0, width, height), card_border)
+
+        # Draw card number (font size scales with card size)
+        number_font_size = max(int(height * 0.4), 16)  # At least 16px
+        number_text = render_text(str(card.number), number_font_size)
+        face.blit(number_text, number_text.get_rect(center=(width // 2, height // 2)))
+        return face
+
+    def render_back(self) -> pygame.Surface:
+        """Render the back of a card.
+
+        Returns:
+            The back of a card.
+        """
+        back = pygame.Surface((self.card_width, self.card_height))
+        back.fill(COLOR_MAP[CARD_BACK_COLOR])
+        pygame.draw.rect(
+            back, (255, 255, 255), (0, 0, self.card_width, self.card_height), 2
+        )
+        return back
+
+    def get_face(self, card: Card) -> pygame.Surface:
+        """Get the face of a card.
+
+        Args:
+            card: The card.
+
+        Returns:
+            The pre-rendered face.
+        """
+        return self.faces[card.to_id()]
+
+    def get_blits(
+        self, cards: Iterable[Card], positions: Iterable[tuple[int, int]]
+    ) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        """Get the blits drawing cards at positions.
+
+        Args:
+            cards: The cards to draw.
+            positions: The top left corner of every card.
+
+        Returns:
+            The faces with their positions, for Surface.blits.
+        """
+        return [
+            (self.faces[card.to_id()], position)
+            for card, position in zip(cards, positions, strict=True)
+        ]
+
+
+@functools.lru_cache(maxsize=1)
+def get_card_atlas(card_width: int, card_height: int) -> CardAtlas:
+    """Get the atlas for a card size.
+
+    Only the atlas of the last size is kept, so it is rebuilt
+    only when the window size and with it the card size changes.
+
+    Args:
+        card_width: Width of a card in pixels.
+        card_height: Height of a card in pixels.
+
+    Returns:
+        The atlas.
+    """
+    return CardAtlas(card_width, card_height)
@@ -0,0 +1,83 @@
+"""Background music streamed from the bundled track.
+
+The track is played with pygame.mixer.music, which decodes it while it
+plays, a pygame.mixer.Sound would decode all of it before the first note.
+Opening the audio device can take a while, so the mixer is initialized in
+a thread and the window is drawn meanwhile. Without an audio device the
+game runs without music.
+"""
+
+import logging
+import threading
+from pathlib import PurePosixPath
+from typing import BinaryIO
+
+import pygame
+
+from notty.src.assets import open_asset
+
+logger = logging.getLogger(__name__)
+
+MUSIC_ASSET = "music/Connected Hearts (short).mp3"
+MUSIC_VOLUME = 0.5
+# seconds to wait for a mixer that is still starting when the game ends
+STOP_TIMEOUT_S = 1.0
+
+
+class MusicPlayer:
+    """Loops a track, started in a thread off the startup path."""
+
+    def __init__(self, asset: str = MUSIC_ASSET, volume: float = MUSIC_VOLUME) -> None:
+        """Initialize the player, nothing is opened yet.
+
+        Args:
+            asset: The asset name of the track.
+            volume: The volume from 0 to 1.
+        """
+        self.asset = asset
+        self.volume = volume
+        # the mixer reads from the file while it plays
+        self.file: BinaryIO | None = None
+        self.thread: threading.Thread | None = None
+        self.playing = False
+
+    def start(self) -> None:
+        """Start the music in a thread and return at once."""
+        self.thread = threading.Thread(target=self.play, name="music", daemon=True)
+        self.thread.start()
+
+    def play(self) -> bool:
+        """Open the audio device and stream the track in a loop.
+
+        Returns:
+            True if the music plays, False if there is no audio device.
+        """
+        try:
+            # does nothing if the mixer is already initialized
+            pygame.mixer.init()
+            self.file = open_asset(self.asset)
+            pygame.mixer.music.load(self.file, PurePosixPath(self.asset).suffix[1:])
+            pygame.mixer.music.set_volume(self.volume)
+            pygame.mixer.music.play(loops=-1)
+        except (pygame.error, NotImplementedError) as error:
+            # no audio device, e.g. on a server, or pygame without a mixer
+            logger.info("Playing without music: %s", error)
+            return False
+        self.playing = True
+        return True
+
+    def stop(self) -> None:
+        """Stop the music once the mixer started."""
+        if self.thread is not None:
+            self.thread.join(STOP_TIMEOUT_S)
+        if self.playing:
+            pygame.mixer.music.stop()
+            pygame.mixer.music.unload()
+            self.playing = False
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the player."""
+        return f"{self.__class__.__name__}({self.asset}, {self.playing})"
@@ -0,0 +1,215 @@
+"""Dimmed background images cached on disk by source and resolution.
+
+Loading the large background image, scaling it to the window and blending
+the dark overlay takes a while. The finished background is saved as raw
+pixels keyed by a hash of the source image and the resolution, so later
+runs with the same window size read it back without decoding or scaling.
+On a resize the new background is made in a thread, the event loop keeps
+running and gets an event once it is ready.
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Final
+
+import pygame
+
+from notty.src.assets import open_asset, read_asset
+from notty.src.consts import APP_NAME
+
+logger = logging.getLogger(__name__)
+
+# the image the background is made of
+BACKGROUND_ASSET = "icon.png"
+# the dark overlay dimming the background
+DIM_ALPHA = 150
+DIM_COLOR = (20, 20, 20)
+# pixel format of the cached files
+CACHE_FORMAT: Final = "RGB"
+# backgrounds kept on disk, every resize may add one of a few MB
+MAX_CACHED = 8
+
+# posted when a background made in a thread is ready
+BACKGROUND_READY = pygame.event.custom_type()
+
+
+def get_cache_dir() -> Path:
+    """Get the directory the backgrounds are cached in.
+
+    Returns:
+        The notty directory in the user cache directory.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / APP_NAME / "backgrounds"
+
+
+def get_cache_path(source: str, size: tuple[int, int], cache_dir: Path) -> Path:
+    """Get the cache file of a background.
+
+    The key covers the source image and the overlay,
+    changing either makes a new background.
+
+    Args:
+        source: The asset name of the background image.
+        size: Width and height of the background.
+        cache_dir: The cache directory.
+
+    Returns:
+        The path of the cached pixels.
+    """
+    digest = hashlib.sha256(read_asset(source))
+    digest.update(f"{DIM_ALPHA}{DIM_COLOR}".encode())
+    width, height = size
+    return cache_dir / f"{digest.hexdigest()[:32]}-{width}x{height}.rgb"
+
+
+def render_background(source: str, size: tuple[int, int]) -> pygame.Surface:
+    """Load and scale an image and dim it with a dark overlay.
+
+    Args:
+        source: The asset name of the background image.
+        size: Width and height of the background.
+
+    Returns:
+        The dimmed background.
+    """
+    # Scale the image to fit the window
+    with open_asset(source) as file:
+        image = pygame.image.load(file, source)
+    background = pygame.transform.scale(image, size)
+
+    # Make the background less visible with a semi-transparent dark overlay
+    overlay = pygame.Surface(size)
+    overlay.set_alpha(DIM_ALPHA)
+    overlay.fill(DIM_COLOR)
+    background.blit(overlay, (0, 0))
+    return background
+
+
+def get_background(
+    source: str, size: tuple[int, int], cache_dir: Path | None = None
+) -> pygame.Surface:
+    """Load a background from the cache or render and cache it.
+
+    Safe to call from a thread, the surface is not converted
+    to the pixel format of the display.
+
+    Args:
+        source: The asset name of the background image.
+        size: Width and height of the background.
+        cache_dir: The cache directory, the user cache directory if None.
+
+    Returns:
+        The dimmed background.
+    """
+    path = get_cache_path(source, size, cache_dir or get_cache_dir())
+    try:
+        background = pygame.image.frombytes(path.read_bytes(), size, CACHE_FORMAT)
+        # the least recently used backgrounds are pruned first
+        path.touch()
+    except (OSError, ValueError):
+        # not cached yet or a broken file
+        pass
+    else:
+        return background
+    background = render_background(source, size)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written to a temporary file first, other instances never read half
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(pygame.image.tobytes(background, CACHE_FORMAT))
+        temporary.replace(path)
+        prune_cache(path.parent)
+    except OSError:
+        logger.warning("Could not cache the background in %s", path.parent)
+    return background
+
+
+def prune_cache(cache_dir: Path, keep: int = MAX_CACHED) -> None:
+    """Delete the least recently used backgrounds.
+
+    Args:
+        cache_dir: The cache directory.
+        keep: The number of backgrounds to keep.
+    """
+    paths = sorted(
+        cache_dir.glob("*.rgb"), key=lambda path: path.stat().st_mtime, reverse=True
+    )
+    for path in paths[keep:]:
+        path.unlink(missing_ok=True)
+
+
+class BackgroundLoader:
+    """Makes backgrounds in a thread and keeps the one of the latest size."""
+
+    def __init__(self, source: str, cache_dir: Path | None = None) -> None:
+        """Initialize the loader with one worker thread.
+
+        Args:
+            source: The asset name of the background image.
+            cache_dir: The cache directory, the user cache directory if None.
+        """
+        self.source = source
+        self.cache_dir = cache_dir
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="background")
+        self.size: tuple[int, int] | None = None
+        self.future: Future[pygame.Surface] | None = None
+
+    def request(self, size: tuple[int, int]) -> None:
+        """Start making the background of a size.
+
+        A background requested before and not started yet is dropped,
+        resizing a window sends many sizes and only the last one counts.
+
+        Args:
+            size: Width and height of the background.
+        """
+        if self.future is not None:
+            self.future.cancel()
+        self.size = size
+        self.future = self.executor.submit(self.load, size)
+        self.future.add_done_callback(self.notify)
+
+    def load(self, size: tuple[int, int]) -> pygame.Surface:
+        """Load a background, runs in the worker thread.
+
+        Args:
+            size: Width and height of the background.
+
+        Returns:
+            The dimmed background.
+        """
+        return get_background(self.source, size, self.cache_dir)
+
+    def notify(self, future: Future[pygame.Surface]) -> None:
+        """Wake up the event loop once a background is ready.
+
+        Args:
+            future: The finished or cancelled background.
+        """
+        if future.cancelled() or not pygame.display.get_init():
+            return
+        pygame.event.post(pygame.event.Event(BACKGROUND_READY))
+
+    def poll(self) -> pygame.Surface | None:
+        """Get the background of the latest requested size if it is ready.
+
+        Returns:
+            The background, None if it is not ready or was already returned.
+        """
+        future = self.future
+        if future is None or not future.done():
+            return None
+        self.future = None
+        return future.result()
+
+    def close(self) -> None:
+        """Stop the worker thread and drop the backgrounds not started yet."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the loader."""
+        return f"{self.__class__.__name__}({self.source}, {self.size})"
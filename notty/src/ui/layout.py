@@ -0,0 +1,228 @@
+"""Layout of the window with a spatial index for hit testing.
+
+The rects of the deck, the player areas and every card depend only on the
+window size and the number of cards in every hand, so a layout is computed
+once for them and reused by every frame. Mouse positions are resolved to
+cards through a grid of buckets, each holding the few rects overlapping
+its cell, so a click or hover looks at one bucket instead of every rect.
+"""
+
+import functools
+from collections import defaultdict
+from collections.abc import Hashable, Iterator
+
+import pygame
+
+from notty.src.ui.moves import DECK
+
+# cards per row of a hand and rows of a full hand
+CARDS_PER_ROW = 5
+MAX_ROWS = 4
+
+# hand sizes by player name in display order, left to right
+HandSizes = tuple[tuple[str, int], ...]
+# a rect in the spatial index and what it belongs to
+Entry = tuple[pygame.Rect, Hashable]
+
+
+class SpatialIndex:
+    """Grid of buckets with the rects overlapping every cell."""
+
+    def __init__(self, cell_size: int) -> None:
+        """Initialize an empty index.
+
+        Args:
+            cell_size: Width and height of a cell, about the size of a rect.
+        """
+        self.cell_size = max(cell_size, 1)
+        self.buckets: defaultdict[tuple[int, int], list[Entry]] = defaultdict(list)
+
+    def get_cells(self, rect: pygame.Rect) -> Iterator[tuple[int, int]]:
+        """Get the cells a rect overlaps.
+
+        Args:
+            rect: The rect.
+
+        Yields:
+            The column and row of every cell.
+        """
+        for column in range(
+            rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1
+        ):
+            for row in range(
+                rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1
+            ):
+                yield column, row
+
+    def insert(self, rect: pygame.Rect, key: Hashable) -> None:
+        """Add a rect to the buckets of all cells it overlaps.
+
+        Args:
+            rect: The rect.
+            key: What the rect belongs to, returned by query.
+        """
+        for cell in self.get_cells(rect):
+            self.buckets[cell].append((rect, key))
+
+    def query(self, point: tuple[int, int]) -> Hashable:
+        """Get what is at a point.
+
+        Args:
+            point: The position, e.g. of the mouse.
+
+        Returns:
+            The key of the last inserted rect containing the point,
+            which is drawn on top, or None.
+        """
+        cell = (point[0] // self.cell_size, point[1] // self.cell_size)
+        for rect, key in reversed(self.buckets.get(cell, [])):
+            if rect.collidepoint(point):
+                return key
+        return None
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the index."""
+        return f"{self.__class__.__name__}({self.cell_size}, {len(self.buckets)})"
+
+
+class Layout:
+    """The rects of the deck, the players, their cards and the actions."""
+
+    def __init__(self, app_width: int, app_height: int, hand_sizes: HandSizes) -> None:
+        """Compute all rects and index the deck and the cards.
+
+        Args:
+            app_width: Width of the window.
+            app_height: Height of the window.
+            hand_sizes: Number of cards of every player in display order.
+        """
+        self.app_width = app_width
+        self.app_height = app_height
+        self.hand_sizes = hand_sizes
+
+        # Card dimensions scale with window size (sized to fit 4 rows of 5 cards)
+        card_height = int(app_height * 0.08)  # 8% of window height per card
+        self.card_size = (int(card_height * 0.7), card_height)
+        self.card_spacing = (int(app_height * 0.008), int(app_height * 0.01))
+
+        # Deck (top center of screen) with its label centered below it
+        deck_width = int(app_width * 0.10)
+        deck_height = int(app_height * 0.3)
+        deck_y = int(app_height * 0.05)
+        self.deck_rect = pygame.Rect(
+            app_width // 2 - deck_width // 2, deck_y, deck_width, deck_height
+        )
+        self.label_spacing = int(app_height * 0.03)
+        label_bottom = self.deck_rect.bottom + 2 * self.label_spacing
+        # the label may be wider than the deck
+        self.deck_area = pygame.Rect(
+            app_width // 2 - deck_width, deck_y, 2 * deck_width, label_bottom - deck_y
+        )
+
+        # actions in the top right, next to the deck
+        left = max(self.deck_area.right, app_width * 3 // 4)
+        self.actions_area = pygame.Rect(
+            left, 0, app_width - left, self.deck_area.bottom
+        )
+        # the frame profiler in the top left, mirroring the actions
+        self.overlay_area = pygame.Rect(
+            0, 0, self.actions_area.width, self.actions_area.height
+        )
+
+        # Players side by side at the bottom, the name above 4 rows of cards
+        total_cards_height = (
+            MAX_ROWS * card_height + (MAX_ROWS - 1) * self.card_spacing[1]
+        )
+        name_height = int(app_height * 0.06)
+        total_player_height = name_height + total_cards_height + int(app_height * 0.02)
+        self.hand_top = app_height - total_player_height - int(app_height * 0.02)
+        self.name_offset = (int(app_height * 0.03), int(app_height * 0.06))
+        player_width = app_width // max(len(hand_sizes), 1)
+        area_top = self.hand_top - self.name_offset[1]
+        self.player_x = {
+            name: i * player_width for i, (name, _) in enumerate(hand_sizes)
+        }
+        self.player_areas = {
+            name: pygame.Rect(x, area_top, player_width, app_height - area_top)
+            for name, x in self.player_x.items()
+        }
+
+        self.index = SpatialIndex(max(self.card_size))
+        self.index.insert(self.deck_rect, DECK)
+        self.card_rects = {
+            (name, i): pygame.Rect(self.get_card_position(name, i), self.card_size)
+            for name, size in hand_sizes
+            for i in range(size)
+        }
+        for slot, rect in self.card_rects.items():
+            self.index.insert(rect, slot)
+
+    def get_card_position(self, name: str, index: int) -> tuple[int, int]:
+        """Get the top left corner of a card of a hand, 5 cards per row.
+
+        Args:
+            name: The name of the player.
+            index: The index of the card in the hand, may exceed the hand.
+
+        Returns:
+            The position of the card.
+        """
+        card_width, card_height = self.card_size
+        spacing_x, spacing_y = self.card_spacing
+        return (
+            self.player_x[name]
+            + self.name_offset[0]
+            + (index % CARDS_PER_ROW) * (card_width + spacing_x),
+            self.hand_top + (index // CARDS_PER_ROW) * (card_height + spacing_y),
+        )
+
+    def get_slot_position(self, slot: Hashable) -> tuple[int, int]:
+        """Get the top left corner of a card in the deck or a hand.
+
+        Args:
+            slot: DECK or a player name with the index of the card in the hand.
+
+        Returns:
+            The position of the card, centered on the deck for DECK.
+        """
+        if not isinstance(slot, tuple):
+            card_width, card_height = self.card_size
+            return (
+                self.deck_rect.centerx - card_width // 2,
+                self.deck_rect.centery - card_height // 2,
+            )
+        name, index = slot
+        return self.get_card_position(name, index)
+
+    def hit_test(self, point: tuple[int, int]) -> Hashable:
+        """Get the deck or card slot at a point.
+
+        Args:
+            point: The position, e.g. of the mouse.
+
+        Returns:
+            DECK, a player name with a card index or None.
+        """
+        return self.index.query(point)
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the layout."""
+        return (
+            f"{self.__class__.__name__}({self.app_width}x{self.app_height}, "
+            f"{self.hand_sizes})"
+        )
+
+
+@functools.lru_cache(maxsize=8)
+def get_layout(app_width: int, app_height: int, hand_sizes: HandSizes) -> Layout:
+    """Get the layout for a window size and hand sizes.
+
+    Args:
+        app_width: Width of the window.
+        app_height: Height of the window.
+        hand_sizes: Number of cards of every player in display order.
+
+    Returns:
+        The layout, computed only the first time.
+    """
+    return Layout(app_width, app_height, hand_sizes)
@@ -0,0 +1,59 @@
+"""Frame pacing of the event loop.
+
+While something animates the loop runs at a fixed frame rate. Otherwise it
+blocks in pygame.event.wait until an event arrives, so a static card table
+uses no CPU. The wait has a timeout so the loop still checks for state
+changes now and then, and other threads can wake it up right away by posting
+an event with pygame.event.post.
+"""
+
+import pygame
+
+# frames per second while something animates
+FPS = 60
+# longest time the loop sleeps without events, in milliseconds
+IDLE_TIMEOUT_MS = 500
+
+
+class FramePacer:
+    """Waits for the next frame, blocking on events while idle."""
+
+    def __init__(self, fps: int = FPS, idle_timeout_ms: int = IDLE_TIMEOUT_MS) -> None:
+        """Initialize the pacer, the first frame is drawn right away.
+
+        Args:
+            fps: Frames per second while something animates.
+            idle_timeout_ms: Longest time to wait for events while idle.
+        """
+        self.fps = fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.clock = pygame.time.Clock()
+        self.frame_requested = True
+        # milliseconds since the previous frame, 0 after being idle
+        self.elapsed_ms = 0
+
+    def request_frame(self) -> None:
+        """Run the next frame without waiting for an event."""
+        self.frame_requested = True
+
+    def wait_for_events(self, *, animating: bool) -> list[pygame.event.Event]:
+        """Wait until the next frame is due and get the events until then.
+
+        Args:
+            animating: Whether something animates, which runs the loop at the
+                fixed frame rate instead of waiting for events.
+
+        Returns:
+            The events that arrived, may be empty.
+        """
+        if animating or self.frame_requested:
+            self.frame_requested = False
+            self.elapsed_ms = self.clock.tick(self.fps)
+            return pygame.event.get()
+        event = pygame.event.wait(self.idle_timeout_ms)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        # time spent idle is no frame time, animations started now begin at 0
+        self.clock.tick()
+        self.elapsed_ms = 0
+        return events
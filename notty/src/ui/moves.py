@@ -0,0 +1,113 @@
+"""Card movements between two states of a game.
+
+The game changes hands and the deck without telling the window how.
+Comparing the hands before and after a change tells which cards were drawn
+from the deck, stolen from another player or discarded to the deck, so the
+window can animate every movement, whatever action caused it.
+"""
+
+from collections import Counter
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from notty.src.game import Game
+
+# source or target of cards drawn from or discarded to the deck
+DECK = "deck"
+
+# card ids of every hand by player name
+Hands = dict[str, tuple[int, ...]]
+
+
+@dataclass(frozen=True)
+class CardMove:
+    """A card moving from or to the deck or a slot of a hand.
+
+    source and target are DECK or a player name with the index of the card
+    in the hand, before the change for the source and after it for the target.
+    """
+
+    card_id: int
+    source: Hashable
+    target: Hashable
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the move."""
+        return (
+            f"{self.__class__.__name__}({self.card_id}, {self.source} -> {self.target})"
+        )
+
+
+def get_hands(game: Game) -> Hands:
+    """Get the card ids of all hands of a game.
+
+    Args:
+        game: The game.
+
+    Returns:
+        The card ids of every hand by player name.
+    """
+    return {
+        player.name: tuple(card.to_id() for card in player.hand.cards)
+        for player in game.players
+    }
+
+
+def get_changed_indices(
+    cards: tuple[int, ...], changed: Counter[int]
+) -> list[tuple[int, int]]:
+    """Get the slots of the cards that were added to or removed from a hand.
+
+    Equal cards count from the end of the hand, where new cards are added.
+
+    Args:
+        cards: The card ids of the hand.
+        changed: How often every card id was added or removed.
+
+    Returns:
+        The index and card id of every changed card, by index.
+    """
+    changed = changed.copy()
+    indices = []
+    for index in reversed(range(len(cards))):
+        if changed[cards[index]] > 0:
+            changed[cards[index]] -= 1
+            indices.append((index, cards[index]))
+    return indices[::-1]
+
+
+def get_card_moves(before: Hands, after: Hands) -> list[CardMove]:
+    """Get the card movements between two states of a game.
+
+    A card a player gained is stolen from a player who lost the same card,
+    else drawn from the deck. A card lost to nobody went to the deck.
+
+    Args:
+        before: The hands before the change.
+        after: The hands after the change.
+
+    Returns:
+        The movements, ordered by the slot they move to.
+    """
+    lost = {
+        name: get_changed_indices(cards, Counter(cards) - Counter(after.get(name, ())))
+        for name, cards in before.items()
+    }
+    moves = []
+    for name, cards in after.items():
+        gained = Counter(cards) - Counter(before.get(name, ()))
+        for index, card_id in get_changed_indices(cards, gained):
+            source: Hashable = DECK
+            for other, slots in lost.items():
+                slot = next((slot for slot in slots if slot[1] == card_id), None)
+                if other != name and slot is not None:
+                    slots.remove(slot)
+                    source = (other, slot[0])
+                    break
+            moves.append(CardMove(card_id, source, (name, index)))
+    moves.extend(
+        CardMove(card_id, (name, index), DECK)
+        for name, slots in lost.items()
+        for index, card_id in slots
+    )
+    return moves
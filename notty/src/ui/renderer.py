@@ -0,0 +1,118 @@
+"""Retained-mode renderer redrawing only the regions that changed.
+
+Every region of the window, like the deck or the hand of a player,
+has a rect and a state. A region is drawn again only when its state or rect
+changed, on top of the background restored under it, and only the changed
+rects are passed to pygame.display.update. The whole window is redrawn only
+after invalidate, e.g. on a resize or when the window was exposed.
+"""
+
+from collections.abc import Callable, Hashable
+
+import pygame
+
+from notty.src.ui.profiler import FrameProfiler
+
+
+class DirtyRenderer:
+    """Redraws changed regions of a screen over a cached background.
+
+    Regions must not overlap, restoring the background under one region
+    would erase the parts of another.
+    """
+
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        background: pygame.Surface,
+        profiler: FrameProfiler | None = None,
+    ) -> None:
+        """Initialize the renderer, the first frame is drawn in full.
+
+        Args:
+            screen: The surface to draw on, usually the display surface.
+            background: The background of the whole screen.
+            profiler: Measures the stages of every frame, off by default.
+        """
+        self.screen = screen
+        self.background = background
+        self.profiler = FrameProfiler() if profiler is None else profiler
+        # state and rect of every region when it was drawn last
+        self.states: dict[str, Hashable] = {}
+        self.rects: dict[str, pygame.Rect] = {}
+        self.dirty: list[pygame.Rect] = []
+        self.full_redraw = True
+
+    def invalidate(self) -> None:
+        """Redraw the whole screen in the next frame."""
+        self.full_redraw = True
+
+    def set_screen(self, screen: pygame.Surface, background: pygame.Surface) -> None:
+        """Draw on a new screen with a new background, e.g. after a resize.
+
+        Args:
+            screen: The surface to draw on.
+            background: The background of the whole screen.
+        """
+        self.screen = screen
+        self.background = background
+        self.invalidate()
+
+    def begin_frame(self) -> None:
+        """Start a frame, restores the whole background on a full redraw."""
+        self.dirty = []
+        if self.full_redraw:
+            with self.profiler.stage("background"):
+                self.screen.blit(self.background, (0, 0))
+            self.states.clear()
+            self.rects.clear()
+
+    def draw_region(
+        self,
+        name: str,
+        rect: pygame.Rect,
+        state: Hashable,
+        draw: Callable[[], object],
+    ) -> bool:
+        """Draw a region if its state or rect changed.
+
+        Drawing is clipped to the rect of the region.
+
+        Args:
+            name: The unique name of the region.
+            rect: The area the region draws in.
+            state: Everything the drawing depends on, compared with ==.
+            draw: Draws the region on the screen.
+
+        Returns:
+            True if the region was drawn.
+        """
+        old_rect = self.rects.get(name)
+        if name in self.states and self.states[name] == state and old_rect == rect:
+            return False
+        area = rect if old_rect is None else rect.union(old_rect)
+        self.screen.blit(self.background, area, area)
+        self.screen.set_clip(rect)
+        try:
+            draw()
+        finally:
+            self.screen.set_clip(None)
+        self.states[name] = state
+        self.rects[name] = rect
+        self.dirty.append(area)
+        return True
+
+    def end_frame(self) -> list[pygame.Rect]:
+        """Show the frame, updating only the changed parts of the display.
+
+        Returns:
+            The updated rects, empty if nothing changed.
+        """
+        rects = [self.screen.get_rect()] if self.full_redraw else self.dirty
+        self.full_redraw = False
+        # the flip of the frame, updating only the rects that changed
+        with self.profiler.stage("flip"):
+            if rects and pygame.display.get_surface() is self.screen:
+                pygame.display.update(rects)
+        self.profiler.end_frame()
+        return rects
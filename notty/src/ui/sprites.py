@@ -0,0 +1,248 @@
+"""Mascot sprites in the scaled variant that fits the display.
+
+The full size sprites are more than 2000 pixels high and about 3 MB each.
+The build scales them to the heights of VARIANT_HEIGHTS as WebP and bundles
+only those variants. A sprite is read from the smallest variant at least as
+high as it is shown, or from the full size image in a checkout where the
+variants were not built.
+
+Sprites are decoded on first use in a thread and converted to the pixel
+format of the display once. The decoded images and their copies scaled to
+the sizes they are shown at share a byte budget, the least recently used
+are dropped first.
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pygame
+
+from notty.src.assets import get_assets_dir, has_asset, open_asset
+
+# the sprites directory in the resources package
+SPRITES_DIR = "sprites"
+SPRITE_NAMES = (
+    "nottyangry",
+    "nottybegging",
+    "nottyconfident",
+    "nottyembarrassed",
+    "nottyshakinghead",
+    "nottystandard",
+    "nottywinning",
+)
+
+# heights of the scaled variants in pixels, from small to large
+VARIANT_HEIGHTS = (256, 512, 1024)
+# file format of the variants, loads faster and is far smaller than PNG
+VARIANT_FORMAT = "webp"
+# bytes of decoded and scaled sprites kept, a sprite 1024 pixels high has 3 MB
+SPRITE_BUDGET = 32 * 1024 * 1024
+
+# posted when a sprite decoded in a thread is ready
+SPRITE_READY = pygame.event.custom_type()
+
+
+def get_sprite_dir() -> Path:
+    """Get the directory of the full size sprites, the build reads them.
+
+    The variants are in a subdirectory per height.
+
+    Returns:
+        The sprites directory.
+    """
+    return get_assets_dir() / SPRITES_DIR
+
+
+def get_variant_name(name: str, height: int) -> str:
+    """Get the asset name of a scaled variant of a sprite.
+
+    Args:
+        name: The name of the sprite without extension.
+        height: The height of the variant.
+
+    Returns:
+        The asset name, which exists only after the variants were built.
+    """
+    return f"{SPRITES_DIR}/{height}/{name}.{VARIANT_FORMAT}"
+
+
+def get_sprite_asset(name: str, height: int) -> str:
+    """Get the smallest image of a sprite that is at least as high as shown.
+
+    Falls back to the full size image and then to the largest variant.
+
+    Args:
+        name: The name of the sprite without extension.
+        height: The height the sprite is shown at.
+
+    Returns:
+        The asset name of the image to load.
+
+    Raises:
+        FileNotFoundError: If the sprite does not exist.
+    """
+    for variant_height in VARIANT_HEIGHTS:
+        asset = get_variant_name(name, variant_height)
+        if variant_height >= height and has_asset(asset):
+            return asset
+    original = f"{SPRITES_DIR}/{name}.png"
+    if has_asset(original):
+        return original
+    for variant_height in reversed(VARIANT_HEIGHTS):
+        asset = get_variant_name(name, variant_height)
+        if has_asset(asset):
+            return asset
+    msg = f"No image of sprite {name}"
+    raise FileNotFoundError(msg)
+
+
+def load_image(asset: str) -> pygame.Surface:
+    """Decode an image asset, safe to call from a thread.
+
+    Args:
+        asset: The asset name of the image.
+
+    Returns:
+        The image, not converted to the pixel format of the display.
+    """
+    with open_asset(asset) as file:
+        return pygame.image.load(file, asset)
+
+
+def get_surface_bytes(surface: pygame.Surface) -> int:
+    """Get the memory used by the pixels of a surface.
+
+    Args:
+        surface: The surface.
+
+    Returns:
+        The number of bytes.
+    """
+    return surface.get_pitch() * surface.get_height()
+
+
+class SpriteCache:
+    """Loads sprites lazily and keeps the recently used under a byte budget."""
+
+    def __init__(self, budget: int = SPRITE_BUDGET) -> None:
+        """Initialize an empty cache with one worker thread.
+
+        Args:
+            budget: The bytes of surfaces kept, at least the last one is kept.
+        """
+        self.budget = budget
+        self.used = 0
+        # decoded images by asset name and scaled sprites by name and height
+        self.surfaces: OrderedDict[Hashable, pygame.Surface] = OrderedDict()
+        self.pending: dict[str, Future[pygame.Surface]] = {}
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="sprites")
+
+    def request(self, name: str, height: int) -> str:
+        """Start decoding the image of a sprite unless it is already decoded.
+
+        Args:
+            name: The name of the sprite without extension.
+            height: The height the sprite is shown at.
+
+        Returns:
+            The asset name of the image.
+        """
+        asset = get_sprite_asset(name, height)
+        if asset not in self.surfaces and asset not in self.pending:
+            future = self.executor.submit(load_image, asset)
+            future.add_done_callback(self.notify)
+            self.pending[asset] = future
+        return asset
+
+    def prefetch(self, names: Iterable[str], height: int) -> None:
+        """Start decoding sprites that are likely shown next.
+
+        Args:
+            names: The names of the sprites.
+            height: The height the sprites are shown at.
+        """
+        for name in names:
+            self.request(name, height)
+
+    def notify(self, future: Future[pygame.Surface]) -> None:
+        """Wake up the event loop once a sprite is decoded.
+
+        Args:
+            future: The finished or cancelled image.
+        """
+        if future.cancelled() or not pygame.display.get_init():
+            return
+        pygame.event.post(pygame.event.Event(SPRITE_READY))
+
+    def get_image(self, asset: str) -> pygame.Surface | None:
+        """Get a decoded image, converting it once it is ready.
+
+        Args:
+            asset: The asset name of the image.
+
+        Returns:
+            The image, None if it is not decoded yet.
+        """
+        image = self.surfaces.get(asset)
+        if image is not None:
+            self.surfaces.move_to_end(asset)
+            return image
+        future = self.pending.get(asset)
+        if future is None or not future.done():
+            return None
+        del self.pending[asset]
+        image = future.result()
+        # without a window there is no display format to convert to
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        self.add(asset, image)
+        return image
+
+    def get(self, name: str, height: int) -> pygame.Surface | None:
+        """Get a sprite scaled to a height, decoding it in a thread if needed.
+
+        Args:
+            name: The name of the sprite without extension.
+            height: The height the sprite is shown at.
+
+        Returns:
+            The sprite, None until it is decoded, draw again on SPRITE_READY.
+        """
+        key = (name, height)
+        sprite = self.surfaces.get(key)
+        if sprite is not None:
+            self.surfaces.move_to_end(key)
+            return sprite
+        image = self.get_image(self.request(name, height))
+        if image is None:
+            return None
+        width = round(image.get_width() * height / image.get_height())
+        sprite = pygame.transform.smoothscale(image, (width, height))
+        self.add(key, sprite)
+        return sprite
+
+    def add(self, key: Hashable, surface: pygame.Surface) -> None:
+        """Keep a surface and drop the least recently used over the budget.
+
+        Args:
+            key: The asset of a decoded image or the name and height of a sprite.
+            surface: The surface.
+        """
+        self.surfaces[key] = surface
+        self.used += get_surface_bytes(surface)
+        while self.used > self.budget and len(self.surfaces) > 1:
+            _, dropped = self.surfaces.popitem(last=False)
+            self.used -= get_surface_bytes(dropped)
+
+    def close(self) -> None:
+        """Stop the worker thread and drop the sprites not started yet."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the cache."""
+        return (
+            f"{self.__class__.__name__}({len(self.surfaces)} surfaces, "
+            f"{self.used}/{self.budget} bytes)"
+        )
@@ -0,0 +1,62 @@
+"""Shared fonts and a cache of rendered text surfaces.
+
+Fonts are created once per size and unchanged strings like "DECK" or the
+player names are rendered once, so a frame without changes allocates
+neither fonts nor text surfaces.
+"""
+
+import functools
+
+import pygame
+
+from notty.src.consts import ANTI_ALIASING
+
+# rendered strings kept, a frame shows a few dozen
+TEXT_CACHE_SIZE = 256
+
+
+@functools.cache
+def get_font(size: int) -> pygame.font.Font:
+    """Get the default font in a size.
+
+    Args:
+        size: The font size in pixels.
+
+    Returns:
+        The shared font.
+    """
+    return pygame.font.Font(None, size)
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(
+    text: str,
+    size: int,
+    color: tuple[int, int, int] = (255, 255, 255),
+    *,
+    antialias: bool = ANTI_ALIASING,
+) -> pygame.Surface:
+    """Render text with the default font.
+
+    The surface is shared by all callers and must not be drawn on.
+
+    Args:
+        text: The text to render.
+        size: The font size in pixels.
+        color: The color of the text.
+        antialias: Whether to smooth the edges of the text.
+
+    Returns:
+        The rendered text.
+    """
+    return get_font(size).render(text, antialias, color)
+
+
+def clear_text_caches() -> None:
+    """Drop all fonts and rendered texts.
+
+    Fonts are invalid after pygame.font.quit, call this before
+    initializing the font module again.
+    """
+    render_text.cache_clear()
+    get_font.cache_clear()
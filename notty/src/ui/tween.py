@@ -0,0 +1,235 @@
+"""Time based tweens and the scheduler running them.
+
+A tween moves a surface from a start to an end position over a duration.
+Tweens advance by elapsed time, not by frames, so an animation takes the
+same time at any frame rate. The scheduler runs all tweens of the window
+and can speed them up or skip them, while the event loop keeps handling
+input every frame.
+"""
+
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+
+import pygame
+
+# slowest and fastest animation speed
+MIN_SPEED = 0.25
+MAX_SPEED = 8.0
+
+# durations of the card animations in milliseconds at normal speed
+SHUFFLE_MS = 1000
+CARD_MOVE_MS = 250
+# time between the starts of cards moving one after another
+CARD_INTERVAL_MS = 100
+
+
+def ease_out_cubic(progress: float) -> float:
+    """Ease a movement to start fast and slow down at the end.
+
+    Args:
+        progress: The linear progress between 0 and 1.
+
+    Returns:
+        The eased progress between 0 and 1.
+    """
+    return 1 - (1 - progress) ** 3
+
+
+@dataclass
+class Tween:
+    """A surface moving between two positions.
+
+    The surface moves from start to end, its top left corner, over
+    duration_ms after waiting delay_ms, it is not drawn until then.
+    target is what the tween moves to, e.g. a card slot hidden until the
+    card arrives, and source what it moves from, e.g. the deck. easing maps
+    the linear progress to the drawn progress.
+    """
+
+    surface: pygame.Surface
+    start: tuple[int, int]
+    end: tuple[int, int]
+    duration_ms: float
+    delay_ms: float = 0.0
+    target: Hashable = None
+    source: Hashable = None
+    easing: Callable[[float], float] = field(default_factory=lambda: ease_out_cubic)
+    elapsed_ms: float = 0.0
+
+    def update(self, elapsed_ms: float) -> None:
+        """Advance the tween.
+
+        Args:
+            elapsed_ms: Time since the last update.
+        """
+        self.elapsed_ms += elapsed_ms
+
+    def is_started(self) -> bool:
+        """Check if the delay is over.
+
+        Returns:
+            True if the surface is moving or arrived.
+        """
+        return self.elapsed_ms >= self.delay_ms
+
+    def is_done(self) -> bool:
+        """Check if the surface arrived.
+
+        Returns:
+            True if the movement is over.
+        """
+        return self.elapsed_ms >= self.delay_ms + self.duration_ms
+
+    def get_progress(self) -> float:
+        """Get the eased progress of the movement.
+
+        Returns:
+            The progress between 0 at the start and 1 at the end.
+        """
+        if self.duration_ms <= 0:
+            return 1.0
+        progress = (self.elapsed_ms - self.delay_ms) / self.duration_ms
+        return self.easing(min(max(progress, 0.0), 1.0))
+
+    def get_position(self) -> tuple[int, int]:
+        """Get the current top left corner of the surface.
+
+        Returns:
+            The interpolated position.
+        """
+        progress = self.get_progress()
+        return (
+            round(self.start[0] + (self.end[0] - self.start[0]) * progress),
+            round(self.start[1] + (self.end[1] - self.start[1]) * progress),
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the tween."""
+        return (
+            f"{self.__class__.__name__}({self.start} -> {self.end}, "
+            f"{self.elapsed_ms:.0f}/{self.delay_ms + self.duration_ms:.0f} ms)"
+        )
+
+
+class TweenScheduler:
+    """Runs the tweens of a window."""
+
+    def __init__(self, speed: float = 1.0) -> None:
+        """Initialize the scheduler without tweens.
+
+        Args:
+            speed: Factor of the animation speed, 2 plays twice as fast.
+        """
+        self.speed = speed
+        self.tweens: list[Tween] = []
+        # skipped tweens still have to be erased from the screen
+        self.skipped = False
+
+    def add(self, tween: Tween) -> None:
+        """Start a tween.
+
+        Args:
+            tween: The tween to run.
+        """
+        self.tweens.append(tween)
+
+    def is_active(self) -> bool:
+        """Check if any tween runs.
+
+        Returns:
+            True if a tween waits or moves.
+        """
+        return bool(self.tweens)
+
+    def update(self, elapsed_ms: float) -> bool:
+        """Advance all tweens and drop the finished ones.
+
+        Args:
+            elapsed_ms: Time since the last update.
+
+        Returns:
+            True if any tween ran, the screen changed.
+        """
+        if not self.tweens and not self.skipped:
+            return False
+        self.skipped = False
+        for tween in self.tweens:
+            tween.update(elapsed_ms * self.speed)
+        self.tweens = [tween for tween in self.tweens if not tween.is_done()]
+        return True
+
+    def skip(self) -> None:
+        """Finish all tweens at once."""
+        self.skipped = self.skipped or bool(self.tweens)
+        self.tweens.clear()
+
+    def set_speed(self, speed: float) -> None:
+        """Set the animation speed within its limits.
+
+        Args:
+            speed: Factor of the animation speed.
+        """
+        self.speed = min(max(speed, MIN_SPEED), MAX_SPEED)
+
+    def get_remaining_ms(self) -> float:
+        """Get the time until all tweens are done at normal speed.
+
+        Returns:
+            The remaining time of the longest tween, 0 without tweens.
+        """
+        return max(
+            (
+                tween.delay_ms + tween.duration_ms - tween.elapsed_ms
+                for tween in self.tweens
+            ),
+            default=0.0,
+        )
+
+    def get_targets(self) -> list[Hashable]:
+        """Get what the running tweens move to.
+
+        Returns:
+            The target of every running tween.
+        """
+        return [tween.target for tween in self.tweens]
+
+    def count_source(self, source: Hashable) -> int:
+        """Count the running tweens that move from something.
+
+        Args:
+            source: What the tweens move from.
+
+        Returns:
+            The number of running tweens with that source.
+        """
+        return sum(tween.source == source for tween in self.tweens)
+
+    def count_target(self, target: Hashable) -> int:
+        """Count the running tweens that move to something.
+
+        Args:
+            target: What the tweens move to.
+
+        Returns:
+            The number of running tweens with that target.
+        """
+        return sum(tween.target == target for tween in self.tweens)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draw the started tweens in the order they were added.
+
+        Args:
+            screen: The surface to draw on.
+        """
+        screen.blits(
+            [
+                (tween.surface, tween.get_position())
+                for tween in self.tweens
+                if tween.is_started()
+            ],
+            doreturn=False,
+        )
+
+    def __repr__(self) -> str:
+        """Return a detailed string representation of the scheduler."""
+        return f"{self.__class__.__name__}({len(self.tweens)} tweens, x{self.speed})"
@@ -1,12 +1,125 @@
 """module."""
 
-from notty.dev.artifacts.builder.builder import NottyBuilder
+import os
+import zipfile
+from pathlib import Path
+
+from pyrig.dev.artifacts.builder.base.base import PyInstallerBuilder
+from pytest_mock import MockerFixture
+
+from notty.dev.artifacts.builder import builder as builder_module
+from notty.dev.artifacts.builder.builder import EXCLUDED_MODULES, NottyBuilder
+from notty.src.assets import PACK_NAME
 
 
 class TestNottyBuilder:
     """Test class."""
 
+    def test_create_artifacts(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Test the sprites are scaled and packed before pyinstaller runs."""
+        calls: list[str] = []
+        mocker.patch.object(
+            builder_module,
+            "build_sprite_variants",
+            side_effect=lambda _: calls.append("sprites"),
+        )
+        build_asset_pack = mocker.patch.object(
+            builder_module,
+            "build_asset_pack",
+            side_effect=lambda *_: calls.append("pack"),
+        )
+        mocker.patch.object(
+            PyInstallerBuilder,
+            "create_artifacts",
+            side_effect=lambda _: calls.append("pyinstaller"),
+        )
+        mocker.patch.object(
+            NottyBuilder,
+            "archive_app_dir",
+            side_effect=lambda _: calls.append("archive"),
+        )
+        NottyBuilder.create_artifacts(tmp_path / "artifacts")
+        assert calls == ["sprites", "pack", "pyinstaller", "archive"]
+        # the pack is not written into the resources package
+        assert build_asset_pack.call_args.args[1].is_relative_to(tmp_path)
+
+    def test_archive_app_dir(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Test the app folder is replaced by a zip file."""
+        mocker.patch.object(NottyBuilder, "get_app_name", return_value="notty")
+        app_dir = tmp_path / "notty"
+        (app_dir / "_internal").mkdir(parents=True)
+        (app_dir / "notty").write_text("app")
+        archive = NottyBuilder.archive_app_dir(tmp_path)
+        assert archive == tmp_path / "notty.zip"
+        assert list(tmp_path.iterdir()) == [archive]
+        with zipfile.ZipFile(archive) as zipped:
+            assert "notty/notty" in zipped.namelist()
+
+    def test_get_pyinstaller_options(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Test the app is built as a folder without the unused modules."""
+        mocker.patch.object(
+            PyInstallerBuilder,
+            "get_pyinstaller_options",
+            return_value=["main.py", "--onefile", "--noconsole"],
+        )
+        options = NottyBuilder.get_pyinstaller_options(tmp_path / "artifacts")
+        assert options[:3] == ["main.py", "--onedir", "--noconsole"]
+        assert "--noupx" in options
+        assert "--hidden-import" not in options
+        pack = NottyBuilder.get_temp_packpath(tmp_path) / PACK_NAME
+        dest = Path("notty", "dev", "artifacts", "resources")
+        assert f"{pack}{os.pathsep}{dest}" in options
+        excluded = [
+            options[i + 1]
+            for i, option in enumerate(options)
+            if option == "--exclude-module"
+        ]
+        assert excluded == list(EXCLUDED_MODULES)
+
+    def test_get_temp_packpath(self, tmp_path: Path) -> None:
+        """Test the pack is built in the temporary build directory."""
+        path = NottyBuilder.get_temp_packpath(tmp_path)
+        assert path.is_dir()
+        assert path.parent == tmp_path
+
     def test_get_additional_resource_pkgs(self) -> None:
         """Test method."""
         datas = NottyBuilder.get_additional_resource_pkgs()
         assert isinstance(datas, list), f"Expected list, got {type(datas)}"
+
+    def test_get_add_datas(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Test only the code of the resources is bundled, not an old pack."""
+        resources = tmp_path / "resources"
+        sprite_dir = resources / "sprites"
+        (sprite_dir / "256").mkdir(parents=True)
+        for path in (
+            resources / "__init__.py",
+            resources / "icon.png",
+            resources / PACK_NAME,
+            sprite_dir / "__init__.py",
+            sprite_dir / "nottyangry.png",
+            sprite_dir / "256" / "nottyangry.webp",
+        ):
+            path.touch()
+        other = tmp_path / "other"
+        other.mkdir()
+        dest = Path("resources")
+        mocker.patch.object(builder_module, "get_assets_dir", return_value=resources)
+        mocker.patch.object(builder_module, "get_sprite_dir", return_value=sprite_dir)
+        mocker.patch.object(
+            PyInstallerBuilder,
+            "get_add_datas",
+            return_value=[
+                (other, Path("other")),
+                (resources, dest),
+                (sprite_dir, dest / "sprites"),
+                (sprite_dir / "256", dest / "sprites" / "256"),
+            ],
+        )
+        assert NottyBuilder.get_add_datas() == [
+            (other, Path("other")),
+            (resources / "__init__.py", dest),
+            (sprite_dir / "__init__.py", dest / "sprites"),
+        ]
@@ -0,0 +1,43 @@
+"""Test pack module."""
+
+from pathlib import Path
+
+from notty.dev.artifacts.builder.pack import build_asset_pack, collect_assets
+from notty.src.assets import PACK_NAME, AssetPack
+
+
+def make_assets(assets_dir: Path) -> None:
+    """Write an icon, a track, a full size sprite and a scaled variant."""
+    (assets_dir / "music").mkdir()
+    (assets_dir / "sprites" / "256").mkdir(parents=True)
+    for path in (
+        assets_dir / "icon.png",
+        assets_dir / "__init__.py",
+        assets_dir / "music" / "track.mp3",
+        assets_dir / "sprites" / "sprite.png",
+        assets_dir / "sprites" / "256" / "sprite.webp",
+    ):
+        path.write_bytes(path.name.encode())
+
+
+def test_collect_assets(tmp_path: Path) -> None:
+    """Test the full size sprites and the code are not packed."""
+    make_assets(tmp_path)
+    assert collect_assets(tmp_path) == {
+        "icon.png": tmp_path / "icon.png",
+        "music/track.mp3": tmp_path / "music" / "track.mp3",
+        "sprites/256/sprite.webp": tmp_path / "sprites" / "256" / "sprite.webp",
+    }
+
+
+def test_build_asset_pack(tmp_path: Path) -> None:
+    """Test every asset can be read back from the pack in the output dir."""
+    assets_dir = tmp_path / "resources"
+    assets_dir.mkdir()
+    make_assets(assets_dir)
+    path = build_asset_pack(assets_dir, tmp_path)
+    assert path == tmp_path / PACK_NAME
+    assert not (assets_dir / PACK_NAME).exists()
+    pack = AssetPack(path)
+    for name, asset in collect_assets(assets_dir).items():
+        assert pack.get(name) == asset.read_bytes()
@@ -0,0 +1,39 @@
+"""Test sprites module."""
+
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from notty.dev.artifacts.builder.sprites import build_sprite_variants, is_up_to_date
+
+
+def test_is_up_to_date(tmp_path: Path) -> None:
+    """Test a variant is up to date if it is newer than its source."""
+    source = tmp_path / "source.png"
+    target = tmp_path / "target.webp"
+    source.touch()
+    assert not is_up_to_date(source, target)
+    target.touch()
+    os.utime(source, (0, 0))
+    assert is_up_to_date(source, target)
+    os.utime(target, (0, 0))
+    os.utime(source, (1, 1))
+    assert not is_up_to_date(source, target)
+
+
+def test_build_sprite_variants(tmp_path: Path) -> None:
+    """Test every sprite is scaled to every height once."""
+    Image.new("RGBA", (30, 40), (255, 0, 0, 128)).save(tmp_path / "sprite.png")
+    variants = build_sprite_variants(tmp_path, (8, 20))
+    assert variants == [tmp_path / "8" / "sprite.webp", tmp_path / "20" / "sprite.webp"]
+    with Image.open(variants[1]) as image:
+        expected = (15, 20)
+        assert image.size == expected
+        assert image.mode == "RGBA"
+
+    # up to date variants are not built again
+    os.utime(tmp_path / "sprite.png", (0, 0))
+    mtime = variants[0].stat().st_mtime_ns
+    build_sprite_variants(tmp_path, (8, 20))
+    assert variants[0].stat().st_mtime_ns == mtime
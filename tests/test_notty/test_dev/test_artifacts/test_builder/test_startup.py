@@ -0,0 +1,104 @@
+"""Test startup module."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.artifacts.builder import startup as startup_module
+from notty.dev.artifacts.builder.startup import (
+    StartupReport,
+    drop_caches,
+    measure_startup,
+    time_startup,
+)
+from notty.src.consts import QUIT_AFTER_FIRST_FRAME_ENV
+
+
+@pytest.fixture
+def app(tmp_path: Path) -> Path:
+    """Write an app that fails unless it is told to quit after a frame."""
+    path = tmp_path / "app"
+    path.write_text(
+        f"#!{sys.executable}\n"
+        "import os, sys\n"
+        f"sys.exit(0 if os.environ.get({QUIT_AFTER_FIRST_FRAME_ENV!r}) else 1)\n"
+    )
+    path.chmod(0o755)
+    return path
+
+
+class TestStartupReport:
+    """Test StartupReport class."""
+
+    def test___delattr__(self) -> None:
+        """Test report is frozen (cannot delete attributes)."""
+        report = StartupReport(1.0, (0.5,), caches_dropped=True)
+        with pytest.raises(AttributeError):
+            del report.cold
+
+    def test___eq__(self) -> None:
+        """Test report equality."""
+        assert StartupReport(1.0, (0.5,), caches_dropped=True) == StartupReport(
+            1.0, (0.5,), caches_dropped=True
+        )
+
+    def test___hash__(self) -> None:
+        """Test report is hashable."""
+        assert isinstance(hash(StartupReport(1.0, (0.5,), caches_dropped=True)), int)
+
+    def test___init__(self) -> None:
+        """Test report initialization."""
+        report = StartupReport(1.0, (0.5,), caches_dropped=True)
+        assert report.cold == 1.0
+        assert report.caches_dropped
+
+    def test___repr__(self) -> None:
+        """Test report repr."""
+        assert "StartupReport" in repr(StartupReport(1.0, (), caches_dropped=True))
+
+    def test___setattr__(self) -> None:
+        """Test report is frozen (cannot set attributes)."""
+        report = StartupReport(1.0, (0.5,), caches_dropped=True)
+        with pytest.raises(AttributeError):
+            report.cold = 2.0  # type: ignore[misc]
+
+    def test_get_warm_median(self) -> None:
+        """Test the median of the warm starts."""
+        expected = 0.3
+        report = StartupReport(1.0, (0.5, 0.3, 0.2), caches_dropped=True)
+        assert report.get_warm_median() == expected
+        assert StartupReport(1.0, (), caches_dropped=True).get_warm_median() == 0.0
+
+    def test___str__(self) -> None:
+        """Test the summary tells if the first start was cold."""
+        report = StartupReport(1.0, (0.5,), caches_dropped=True)
+        assert str(report) == "cold 1000ms, warm median 500ms of 1 starts"
+        report = StartupReport(1.0, (0.5,), caches_dropped=False)
+        assert str(report).startswith("first (page cache kept) 1000ms")
+
+
+def test_drop_caches(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test the page cache is dropped only with permission."""
+    path = tmp_path / "drop_caches"
+    mocker.patch.object(startup_module, "DROP_CACHES_PATH", path)
+    assert drop_caches()
+    assert path.read_text() == "3\n"
+    mocker.patch.object(startup_module, "DROP_CACHES_PATH", tmp_path / "no" / "file")
+    assert not drop_caches()
+
+
+def test_time_startup(app: Path) -> None:
+    """Test the app is told to quit after its first frame."""
+    assert time_startup(app) > 0
+
+
+def test_measure_startup(app: Path, mocker: MockerFixture) -> None:
+    """Test a cold start is followed by the warm starts."""
+    mocker.patch.object(startup_module, "drop_caches", return_value=False)
+    report = measure_startup(app, 2)
+    assert report.cold > 0
+    expected = 2
+    assert len(report.warm) == expected
+    assert not report.caches_dropped
@@ -0,0 +1,249 @@
+"""Test core module."""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.benchmarks import core as core_module
+from notty.dev.benchmarks.core import (
+    CARD_COUNT,
+    HISTORY_SIZE,
+    BenchmarkComparison,
+    benchmark_core,
+    compare_runs,
+    format_report,
+    get_benchmarks,
+    get_cards,
+    get_game,
+    get_mann_whitney_p,
+    load_history,
+    make_card_group_is_valid,
+    make_deck_draw_multiple,
+    make_deck_init,
+    make_hand_add_cards,
+    make_hand_remove_cards,
+    make_predicate,
+    make_random_game,
+    measure,
+    run_benchmarks,
+    save_run,
+)
+from notty.src.deck import Deck
+from notty.src.tournament import MatchResult
+
+SLOWER = [2.0 + i / 100 for i in range(20)]
+FASTER = [1.0 + i / 100 for i in range(20)]
+
+
+def get_closure(operation: Callable[[], object]) -> dict[str, Any]:
+    """Get the variables an operation closes over by name."""
+    cells = getattr(operation, "__closure__", None) or ()
+    names = operation.__code__.co_freevars
+    return {name: cell.cell_contents for name, cell in zip(names, cells, strict=True)}
+
+
+class TestBenchmarkComparison:
+    """Test BenchmarkComparison class."""
+
+    def test___delattr__(self) -> None:
+        """Test comparison is frozen (cannot delete attributes)."""
+        comparison = BenchmarkComparison("deck_init", 1.0, 2.0, 0.001)
+        with pytest.raises(AttributeError):
+            del comparison.after
+
+    def test___eq__(self) -> None:
+        """Test comparison equality."""
+        assert BenchmarkComparison("a", 1.0, 2.0, 0.1) == BenchmarkComparison(
+            "a", 1.0, 2.0, 0.1
+        )
+
+    def test___hash__(self) -> None:
+        """Test comparison is hashable."""
+        assert isinstance(hash(BenchmarkComparison("a", 1.0, 2.0, 0.1)), int)
+
+    def test___init__(self) -> None:
+        """Test comparison fields."""
+        comparison = BenchmarkComparison("a", 1.0, 2.0, 0.1)
+        assert comparison.name == "a"
+        assert comparison.before == 1.0
+        expected = 2.0
+        assert comparison.after == expected
+
+    def test___repr__(self) -> None:
+        """Test comparison repr."""
+        assert "BenchmarkComparison(name='a'" in repr(
+            BenchmarkComparison("a", 1.0, 2.0, 0.1)
+        )
+
+    def test___setattr__(self) -> None:
+        """Test comparison is frozen (cannot set attributes)."""
+        comparison = BenchmarkComparison("a", 1.0, 2.0, 0.1)
+        with pytest.raises(AttributeError):
+            comparison.after = 1.0  # type: ignore[misc]
+
+    def test___str__(self) -> None:
+        """Test the summary in microseconds."""
+        comparison = BenchmarkComparison("a", 1e-6, 1.5e-6, 0.001)
+        assert str(comparison) == "a: 1.00us -> 1.50us (+50%, p=0.001)"
+
+    def test_get_ratio(self) -> None:
+        """Test the ratio of the medians."""
+        expected = 1.5
+        assert BenchmarkComparison("a", 2.0, 3.0, 0.1).get_ratio() == expected
+        assert BenchmarkComparison("a", 0.0, 3.0, 0.1).get_ratio() == 1.0
+
+    def test_is_regression(self) -> None:
+        """Test a regression is slower beyond the threshold and significant."""
+        assert BenchmarkComparison("a", 1.0, 1.5, 0.001).is_regression()
+        assert not BenchmarkComparison("a", 1.0, 1.1, 0.001).is_regression()
+        assert not BenchmarkComparison("a", 1.0, 1.5, 0.2).is_regression()
+        assert BenchmarkComparison("a", 1.0, 1.1, 0.001).is_regression(0.05)
+
+
+def test_get_cards() -> None:
+    """Test the cards are the same in every run."""
+    assert get_cards() == get_cards()
+    assert len(get_cards()) == CARD_COUNT
+
+
+def test_get_game() -> None:
+    """Test the game is dealt the same in every run."""
+    assert get_game().to_dict() == get_game().to_dict()
+
+
+def test_make_deck_init() -> None:
+    """Test a deck is built."""
+    assert isinstance(make_deck_init()(), Deck)
+
+
+def test_make_deck_draw_multiple() -> None:
+    """Test the drawn cards are put back."""
+    operation = make_deck_draw_multiple()
+    size = Deck().size()
+    operation()
+    operation()
+    assert get_closure(operation)["deck"].size() == size
+
+
+def test_make_hand_add_cards() -> None:
+    """Test the hand is empty after every call."""
+    operation = make_hand_add_cards()
+    operation()
+    assert get_closure(operation)["hand"].is_empty()
+
+
+def test_make_hand_remove_cards() -> None:
+    """Test the hand is empty after every call."""
+    operation = make_hand_remove_cards()
+    operation()
+    assert get_closure(operation)["hand"].is_empty()
+
+
+def test_make_card_group_is_valid() -> None:
+    """Test every group is checked."""
+    assert make_card_group_is_valid()() is None
+
+
+def test_make_predicate() -> None:
+    """Test the predicate of a game is called."""
+    assert make_predicate("player_can_pass")() is True
+
+
+def test_make_random_game(mocker: MockerFixture) -> None:
+    """Test a game of random strategies is played."""
+    result = MatchResult(("random",) * 3, 0, 0, 10)
+    play_match = mocker.patch.object(core_module, "play_match", return_value=result)
+    assert make_random_game()() is result
+    play_match.assert_called_once_with(("random", "random", "random"), 0)
+
+
+def test_get_benchmarks() -> None:
+    """Test every predicate of the game has a benchmark."""
+    benchmarks = get_benchmarks()
+    assert "player_can_steal" in benchmarks
+    assert "random_game" in benchmarks
+    assert callable(benchmarks["player_can_pass"]())
+
+
+def test_measure(mocker: MockerFixture) -> None:
+    """Test the time per call of every round."""
+    mocker.patch.object(core_module, "ROUND_TIME_S", 0.0001)
+    calls: list[None] = []
+    samples = measure(lambda: calls.append(None), rounds=3)
+    expected = 3
+    assert len(samples) == expected
+    assert all(sample > 0 for sample in samples)
+    assert len(calls) > expected
+
+
+def test_run_benchmarks(mocker: MockerFixture) -> None:
+    """Test every benchmark is measured."""
+    mocker.patch.object(
+        core_module, "get_benchmarks", return_value={"deck_init": make_deck_init}
+    )
+    mocker.patch.object(core_module, "ROUND_TIME_S", 0.0001)
+    results = run_benchmarks(rounds=2)
+    assert list(results) == ["deck_init"]
+    assert len(results["deck_init"]) == len([1, 2])
+
+
+def test_get_mann_whitney_p() -> None:
+    """Test the p-value is small only if the values after are larger."""
+    significant = 1e-6
+    assert get_mann_whitney_p(FASTER, SLOWER) < significant
+    assert get_mann_whitney_p(SLOWER, FASTER) > 1 - significant
+    # the same values are no evidence either way
+    expected = 0.5
+    assert get_mann_whitney_p(FASTER, FASTER) == pytest.approx(expected)
+    # all values tie
+    assert get_mann_whitney_p([1.0], []) == 1.0
+
+
+def test_compare_runs() -> None:
+    """Test only benchmarks of both runs are compared."""
+    comparisons = compare_runs({"a": FASTER}, {"a": SLOWER, "b": SLOWER})
+    assert [comparison.name for comparison in comparisons] == ["a"]
+    assert comparisons[0].is_regression()
+
+
+def test_load_history(tmp_path: Path) -> None:
+    """Test the saved baseline has every benchmark."""
+    assert load_history(tmp_path / "missing.json") == []
+    assert set(load_history()[-1]["results"]) == set(get_benchmarks())
+
+
+def test_save_run(tmp_path: Path) -> None:
+    """Test runs are appended and only the latest are kept."""
+    path = tmp_path / "history.json"
+    for i in range(HISTORY_SIZE + 1):
+        save_run({"a": [float(i) + 0.123456]}, path)
+    history = load_history(path)
+    assert len(history) == HISTORY_SIZE
+    assert history[-1]["results"] == {"a": [20.12]}
+    assert json.loads(path.read_text()) == history
+
+
+def test_benchmark_core(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test a run is compared with the latest saved run."""
+    run = mocker.patch.object(core_module, "run_benchmarks", return_value={"a": FASTER})
+    path = tmp_path / "history.json"
+    assert benchmark_core(path=path) == ({"a": FASTER}, [])
+    benchmark_core(save=True, path=path)
+    run.return_value = {"a": SLOWER}
+    _, comparisons = benchmark_core(path=path)
+    assert comparisons[0].is_regression()
+    assert len(load_history(path)) == 1
+
+
+def test_format_report() -> None:
+    """Test the medians without a saved run and the regressions marked."""
+    assert format_report({"a": [1e-6, 2e-6, 3e-6]}, []) == "a: 2.00us"
+    comparisons = compare_runs({"a": FASTER}, {"a": SLOWER})
+    assert format_report({"a": SLOWER}, comparisons).startswith("REGRESSION a:")
+    assert not format_report({"a": SLOWER}, comparisons, threshold=2).startswith(
+        "REGRESSION"
+    )
@@ -0,0 +1,207 @@
+"""Test profiling module."""
+
+import pstats
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.benchmarks import profiling as profiling_module
+from notty.dev.benchmarks.profiling import (
+    SOURCE_DIR,
+    FunctionKey,
+    ProfileReport,
+    StackSampler,
+    StatsEntry,
+    get_collapsed_from_stats,
+    get_label,
+    get_stack,
+    get_top,
+    play_games,
+    profile_games,
+    write_collapsed,
+)
+
+GAME = str(SOURCE_DIR / "game.py")
+ROOT: FunctionKey = ("main.py", 1, "main")
+CALLEE: FunctionKey = (GAME, 10, "apply_move")
+# main takes 3 seconds, 1 of its own and 2 in apply_move
+STATS: dict[FunctionKey, StatsEntry] = {
+    ROOT: (1, 1, 1.0, 3.0, {}),
+    CALLEE: (4, 4, 2.0, 2.0, {ROOT: (4, 4, 2.0, 2.0)}),
+}
+
+
+def get_sampler() -> StackSampler:
+    """Get a sampler with two stacks of main, one in apply_move."""
+    sampler = StackSampler(0.5)
+    sampler.stacks.update({(ROOT,): 1, (ROOT, CALLEE): 3})
+    return sampler
+
+
+class TestProfileReport:
+    """Test ProfileReport class."""
+
+    def test___delattr__(self) -> None:
+        """Test report is frozen (cannot delete attributes)."""
+        report = ProfileReport(Path("p.pstats"), Path("p.collapsed"), ())
+        with pytest.raises(AttributeError):
+            del report.top
+
+    def test___eq__(self) -> None:
+        """Test report equality."""
+        assert ProfileReport(Path("a"), Path("b"), ()) == ProfileReport(
+            Path("a"), Path("b"), ()
+        )
+
+    def test___hash__(self) -> None:
+        """Test report is hashable."""
+        assert isinstance(hash(ProfileReport(Path("a"), Path("b"), ())), int)
+
+    def test___init__(self) -> None:
+        """Test report fields."""
+        report = ProfileReport(Path("a"), Path("b"), ("line",))
+        assert report.stats_path == Path("a")
+        assert report.collapsed_path == Path("b")
+        assert report.top == ("line",)
+
+    def test___repr__(self) -> None:
+        """Test report repr."""
+        assert "ProfileReport(stats_path=a" in repr(
+            ProfileReport(Path("a"), Path("b"), ())
+        )
+
+    def test___setattr__(self) -> None:
+        """Test report is frozen (cannot set attributes)."""
+        report = ProfileReport(Path("a"), Path("b"), ())
+        with pytest.raises(AttributeError):
+            report.top = ()  # type: ignore[misc]
+
+    def test___str__(self) -> None:
+        """Test the header, the top functions and the files."""
+        lines = str(ProfileReport(Path("a"), Path("b"), ("line",))).splitlines()
+        assert lines[0].endswith("function")
+        assert lines[1:] == ["line", "pstats: a", "collapsed stacks: b"]
+
+
+class TestStackSampler:
+    """Test StackSampler class."""
+
+    def test___init__(self) -> None:
+        """Test the sampler starts without samples."""
+        sampler = StackSampler(0.5)
+        expected = 0.5
+        assert sampler.interval == expected
+        assert not sampler.stacks
+
+    def test_start(self) -> None:
+        """Test the switch interval follows the sampling interval."""
+        switch_interval = sys.getswitchinterval()
+        sampler = StackSampler(0.002)
+        sampler.start()
+        expected = 0.002
+        assert sys.getswitchinterval() == pytest.approx(expected)
+        sampler.stop()
+        assert sys.getswitchinterval() == switch_interval
+
+    def test_run(self) -> None:
+        """Test the stacks of the calling thread are sampled."""
+        sampler = StackSampler(0.0001)
+        sampler.start()
+        while not sampler.stacks:
+            sum(range(1000))
+        sampler.stop()
+        assert any("test_run" in {key[2] for key in stack} for stack in sampler.stacks)
+
+    def test_stop(self) -> None:
+        """Test the thread ends."""
+        sampler = StackSampler()
+        sampler.start()
+        sampler.stop()
+        assert not sampler.thread.is_alive()
+
+    def test_get_stats(self) -> None:
+        """Test the own and total time and the callers of every function."""
+        stats = get_sampler().get_stats()
+        expected = 4
+        assert stats[ROOT][:4] == (expected, expected, 0.5, 2.0)
+        assert stats[CALLEE] == (3, 3, 1.5, 1.5, {ROOT: 3})
+
+    def test_get_collapsed(self) -> None:
+        """Test the samples of every stack."""
+        collapsed = get_sampler().get_collapsed()
+        expected = 3
+        assert collapsed["main (main.py:1);apply_move (src/game.py:10)"] == expected
+        assert collapsed["main (main.py:1)"] == 1
+
+    def test___repr__(self) -> None:
+        """Test sampler repr."""
+        assert repr(get_sampler()) == "StackSampler(0.5s, 4 samples)"
+
+
+def test_get_stack() -> None:
+    """Test the stack ends with the calling function."""
+    stack = get_stack(sys._getframe())  # noqa: SLF001
+    assert stack[-1] == (
+        __file__,
+        test_get_stack.__code__.co_firstlineno,
+        "test_get_stack",
+    )
+
+
+def test_get_label() -> None:
+    """Test the function is named with its file and line."""
+    assert get_label(CALLEE) == "apply_move (src/game.py:10)"
+    assert get_label(("~", 0, "<built-in method a;b>")) == "<built-in method a,b> (~)"
+
+
+def test_get_collapsed_from_stats() -> None:
+    """Test the own time of every function is found under its callers."""
+    collapsed = get_collapsed_from_stats(STATS)
+    assert collapsed == Counter(
+        {
+            "main (main.py:1)": 1_000_000,
+            get_label(ROOT) + ";" + get_label(CALLEE): 2_000_000,
+        }
+    )
+
+
+def test_write_collapsed(tmp_path: Path) -> None:
+    """Test one stack and its weight per line."""
+    path = tmp_path / "p.collapsed"
+    write_collapsed(Counter({"b;c": 2, "a": 1}), path)
+    assert path.read_text() == "a 1\nb;c 2\n"
+
+
+def test_get_top() -> None:
+    """Test only functions of notty.src are listed."""
+    top = get_top(STATS)
+    assert len(top) == 1
+    assert top[0].endswith("apply_move (src/game.py:10)")
+    assert get_top(STATS, 0) == ()
+
+
+def test_play_games(mocker: MockerFixture) -> None:
+    """Test every game has the next seed."""
+    play_match = mocker.patch.object(profiling_module, "play_match")
+    play_games(2, "greedy", 5)
+    assert play_match.call_args_list == [
+        mocker.call(("greedy",) * 3, 5),
+        mocker.call(("greedy",) * 3, 6),
+    ]
+
+
+@pytest.mark.parametrize("sample", [False, True])
+def test_profile_games(tmp_path: Path, *, sample: bool) -> None:
+    """Test pstats reads the profile and the collapsed stacks have weights."""
+    report = profile_games(1, "random", 0, tmp_path / "p", sample=sample)
+    assert report.stats_path == tmp_path / "p.pstats"
+    stats = pstats.Stats(str(report.stats_path))
+    assert stats.total_tt > 0  # type: ignore[attr-defined]
+    lines = report.collapsed_path.read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    if not sample:
+        assert any("play_match (src/tournament.py" in line for line in lines)
+        assert report.top
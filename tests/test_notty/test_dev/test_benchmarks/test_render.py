@@ -0,0 +1,188 @@
+"""Test render module."""
+
+from collections.abc import Generator, Iterator
+from pathlib import Path
+
+import pygame
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.benchmarks import render as render_module
+from notty.dev.benchmarks.render import (
+    ALLOC_SLACK_KIB,
+    SCENARIOS,
+    WINDOW_SIZE,
+    RenderResult,
+    benchmark_render,
+    find_regressions,
+    get_full_game,
+    get_plain_background,
+    init_headless,
+    load_baselines,
+    measure_scenario,
+    run_deal,
+    run_full_hands,
+    run_resize,
+    save_baselines,
+)
+from notty.src.player import Hand
+from notty.src.ui.text import clear_text_caches
+
+
+@pytest.fixture
+def headless(monkeypatch: pytest.MonkeyPatch) -> Iterator[pygame.Surface]:
+    """Open a window with the dummy video driver."""
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    init_headless()
+    clear_text_caches()
+    yield pygame.display.set_mode(WINDOW_SIZE)
+    clear_text_caches()
+    pygame.quit()
+
+
+def draw_frames(scenario: Generator[None], frames: int) -> None:
+    """Draw some frames of a scenario and stop it."""
+    for _ in range(frames):
+        next(scenario)
+    scenario.close()
+
+
+class TestRenderResult:
+    """Test RenderResult class."""
+
+    def test___delattr__(self) -> None:
+        """Test result is frozen (cannot delete attributes)."""
+        result = RenderResult("deal", 500.0, 1.0)
+        with pytest.raises(AttributeError):
+            del result.fps
+
+    def test___eq__(self) -> None:
+        """Test result equality."""
+        assert RenderResult("deal", 500.0, 1.0) == RenderResult("deal", 500.0, 1.0)
+        assert RenderResult("deal", 500.0, 1.0) != RenderResult("deal", 400.0, 1.0)
+
+    def test___hash__(self) -> None:
+        """Test result is hashable."""
+        assert isinstance(hash(RenderResult("deal", 500.0, 1.0)), int)
+
+    def test___init__(self) -> None:
+        """Test result fields."""
+        result = RenderResult("deal", 500.0, 1.0)
+        assert result.name == "deal"
+        expected = 500.0
+        assert result.fps == expected
+        assert result.alloc_kib == 1.0
+
+    def test___repr__(self) -> None:
+        """Test result repr."""
+        assert "RenderResult(name='deal'" in repr(RenderResult("deal", 500.0, 1.0))
+
+    def test___setattr__(self) -> None:
+        """Test result is frozen (cannot set attributes)."""
+        result = RenderResult("deal", 500.0, 1.0)
+        with pytest.raises(AttributeError):
+            result.fps = 1.0  # type: ignore[misc]
+
+    def test___str__(self) -> None:
+        """Test the summary."""
+        assert str(RenderResult("deal", 500.4, 1.25)) == (
+            "deal: 500 fps, 1.2 KiB per frame"
+        )
+
+
+def test_init_headless(headless: pygame.Surface) -> None:
+    """Test the window is opened without a screen."""
+    assert pygame.display.get_driver() == "dummy"
+    assert pygame.font.get_init()
+    assert headless.get_size() == WINDOW_SIZE
+
+
+def test_get_full_game() -> None:
+    """Test every hand is full."""
+    game = get_full_game()
+    assert [player.hand.size() for player in game.players] == [Hand.MAX_CARDS] * 3
+
+
+@pytest.mark.usefixtures("headless")
+def test_get_plain_background() -> None:
+    """Test the background has the size and one color."""
+    background = get_plain_background((10, 20))
+    assert background.get_size() == (10, 20)
+    assert background.get_at((0, 0)) == background.get_at((9, 19))
+
+
+def test_run_full_hands(headless: pygame.Surface) -> None:
+    """Test the hands are drawn over the background."""
+    background = get_plain_background(WINDOW_SIZE).get_at((0, 0))
+    draw_frames(run_full_hands(headless), 2)
+    average = pygame.Color(*pygame.transform.average_color(headless))
+    assert average != background
+
+
+def test_run_deal(headless: pygame.Surface) -> None:
+    """Test the deal is played again once it is done."""
+    # the shuffle and the deal of 12 cards take about 150 frames
+    draw_frames(run_deal(headless), 400)
+
+
+def test_run_resize(headless: pygame.Surface) -> None:
+    """Test the window takes another size every frame."""
+    scenario = run_resize(headless)
+    sizes = []
+    for _ in range(3):
+        next(scenario)
+        sizes.append(pygame.display.get_surface().get_size())
+    scenario.close()
+    expected = 3
+    assert len(set(sizes)) == expected
+
+
+@pytest.mark.usefixtures("headless")
+def test_measure_scenario() -> None:
+    """Test the frame rate and allocations are measured."""
+    result = measure_scenario("full_hands", 5)
+    assert result.name == "full_hands"
+    assert result.fps > 0
+    assert result.alloc_kib >= 0
+
+
+def test_load_baselines(tmp_path: Path) -> None:
+    """Test the stored baselines cover every scenario."""
+    assert set(load_baselines()) == set(SCENARIOS)
+    assert load_baselines(tmp_path / "missing.json") == {}
+
+
+def test_save_baselines(tmp_path: Path) -> None:
+    """Test saved baselines are loaded again."""
+    path = tmp_path / "baselines.json"
+    save_baselines([RenderResult("deal", 500.04, 1.26)], path)
+    assert load_baselines(path) == {"deal": RenderResult("deal", 500.0, 1.3)}
+
+
+def test_find_regressions() -> None:
+    """Test slower or more allocating scenarios regress beyond the tolerance."""
+    baselines = {"deal": RenderResult("deal", 500.0, 10.0)}
+    assert find_regressions([RenderResult("deal", 400.0, 11.0)], baselines) == []
+    assert find_regressions([RenderResult("other", 1.0, 1e6)], baselines) == []
+    slower = find_regressions([RenderResult("deal", 300.0, 10.0)], baselines)
+    assert slower == ["deal: 300 fps, baseline 500"]
+    allocating = RenderResult("deal", 500.0, 13.0 + ALLOC_SLACK_KIB + 1)
+    assert len(find_regressions([allocating], baselines)) == 1
+
+
+def test_benchmark_render(mocker: MockerFixture) -> None:
+    """Test every scenario is run and compared or stored."""
+    mocker.patch.object(render_module, "init_headless")
+    mocker.patch.object(
+        render_module,
+        "measure_scenario",
+        side_effect=lambda name, _: RenderResult(name, 1.0, 0.0),
+    )
+    save = mocker.patch.object(render_module, "save_baselines")
+    results, regressions = benchmark_render(1)
+    assert [result.name for result in results] == list(SCENARIOS)
+    # the stored baselines are much faster
+    assert len(regressions) == len(SCENARIOS)
+    save.assert_not_called()
+    assert benchmark_render(1, update=True) == (results, [])
+    save.assert_called_once_with(results)
@@ -1 +1,115 @@
 """module."""
+
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.artifacts.builder.startup import StartupReport
+from notty.dev.benchmarks import render
+from notty.dev.benchmarks.profiling import ProfileReport
+from notty.dev.benchmarks.render import RenderResult
+from notty.dev.cli.subcommands import (
+    arena,
+    bench_render,
+    loadgen,
+    metrics,
+    profile,
+    serve,
+    startup,
+    tournament,
+)
+from notty.src.server.loadgen import LoadReport
+
+
+def test_serve(mocker: MockerFixture) -> None:
+    """Test func for serve."""
+    serve_cmd = mocker.patch("notty.dev.cli.subcommands.serve_cmd")
+    supervise_cmd = mocker.patch("notty.dev.cli.subcommands.supervise_cmd")
+    serve("127.0.0.1", 1, 2)
+    serve_cmd.assert_called_once_with("127.0.0.1", 1, 2)
+    serve("127.0.0.1", 1, shards=3)
+    supervise_cmd.assert_called_once_with("127.0.0.1", 1, 3)
+
+
+def test_loadgen(mocker: MockerFixture) -> None:
+    """Test func for loadgen."""
+    loadgen_cmd = mocker.patch(
+        "notty.dev.cli.subcommands.loadgen_cmd",
+        return_value=LoadReport(1, 1.0, (0.1,)),
+    )
+    loadgen(clients=1, moves=1, shards=2)
+    loadgen_cmd.assert_called_once_with("", 8765, 1, 1, 2)
+
+
+def test_arena(mocker: MockerFixture) -> None:
+    """Test func for arena."""
+    arena_cmd = mocker.patch(
+        "notty.dev.cli.subcommands.arena_cmd", return_value="greedy: 1 wins"
+    )
+    arena(["greedy", "random"], rounds=2)
+    arena_cmd.assert_called_once_with(["greedy", "random"], 2, 1.0, 8)
+
+
+def test_metrics(
+    mocker: MockerFixture, capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    """Test func for metrics."""
+    serve_metrics = mocker.patch("notty.dev.cli.subcommands.serve_metrics")
+    metrics(tmp_path)
+    assert "notty_games_total 0" in capsys.readouterr().out
+    output = tmp_path / "notty.prom"
+    metrics(tmp_path, output)
+    assert not capsys.readouterr().out
+    assert "notty_games_total 0" in output.read_text()
+    metrics(tmp_path, port=9100)
+    serve_metrics.assert_called_once_with(tmp_path, "127.0.0.1", 9100)
+
+
+def test_tournament(mocker: MockerFixture) -> None:
+    """Test func for tournament."""
+    tournament_cmd = mocker.patch(
+        "notty.dev.cli.subcommands.tournament_cmd", return_value="1 games"
+    )
+    tournament(Path("out.jsonl"), rounds=2, min_games=0)
+    tournament_cmd.assert_called_once_with(Path("out.jsonl"), None, 2, None, None)
+
+
+def test_startup(mocker: MockerFixture, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test func for startup."""
+    measure_startup = mocker.patch(
+        "notty.dev.cli.subcommands.measure_startup",
+        return_value=StartupReport(1.0, (0.5,), caches_dropped=False),
+    )
+    startup(Path("notty"), runs=1)
+    measure_startup.assert_called_once_with(Path("notty"), 1)
+    assert "warm median 500ms" in capsys.readouterr().out
+
+
+def test_bench_render(
+    mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test func for bench_render."""
+    benchmark_render = mocker.patch.object(
+        render,
+        "benchmark_render",
+        return_value=([RenderResult("deal", 500.0, 1.0)], []),
+    )
+    bench_render(frames=10)
+    benchmark_render.assert_called_once_with(10, update=False)
+    assert "deal: 500 fps" in capsys.readouterr().out
+    benchmark_render.return_value = ([], ["deal: 100 fps, baseline 500"])
+    with pytest.raises(SystemExit):
+        bench_render(frames=10)
+    assert "regression deal" in capsys.readouterr().err
+
+
+def test_profile(mocker: MockerFixture, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test func for profile."""
+    report = ProfileReport(Path("p.pstats"), Path("p.collapsed"), ())
+    profile_games = mocker.patch(
+        "notty.dev.cli.subcommands.profile_games", return_value=report
+    )
+    profile(2, "greedy", 3, Path("p"), sample=True)
+    profile_games.assert_called_once_with(2, "greedy", 3, Path("p"), sample=True)
+    assert "collapsed stacks: p.collapsed" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+"""Test benchmarks module."""
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.benchmarks.core import THRESHOLD, BenchmarkComparison
+from notty.dev.tests.fixtures import benchmarks as benchmarks_module
+from notty.dev.tests.fixtures.benchmarks import (
+    pytest_addoption,
+    pytest_sessionfinish,
+)
+
+
+def test_pytest_addoption(mocker: MockerFixture) -> None:
+    """Test the options are added in their own group."""
+    parser = mocker.MagicMock()
+    pytest_addoption(parser)
+    group = parser.getgroup.return_value
+    options = [call.args[0] for call in group.addoption.call_args_list]
+    assert options == ["--benchmark-core", "--benchmark-save", "--benchmark-threshold"]
+
+
+def test_pytest_sessionfinish(mocker: MockerFixture) -> None:
+    """Test the session fails only if a benchmark regressed."""
+    options = {
+        "--benchmark-core": False,
+        "--benchmark-save": False,
+        "--benchmark-threshold": THRESHOLD,
+    }
+    session = mocker.MagicMock()
+    session.exitstatus = pytest.ExitCode.OK
+    session.config.getoption.side_effect = lambda name, **_: options[name]
+    benchmark_core = mocker.patch.object(
+        benchmarks_module,
+        "benchmark_core",
+        return_value=({}, [BenchmarkComparison("a", 1.0, 1.1, 0.001)]),
+    )
+    pytest_sessionfinish(session)
+    benchmark_core.assert_not_called()
+
+    options["--benchmark-core"] = True
+    pytest_sessionfinish(session)
+    benchmark_core.assert_called_once_with(save=False)
+    assert session.exitstatus == pytest.ExitCode.OK
+    reporter = session.config.pluginmanager.get_plugin.return_value
+    reporter.write_line.assert_called_once()
+
+    benchmark_core.return_value = ({}, [BenchmarkComparison("a", 1.0, 2.0, 0.001)])
+    pytest_sessionfinish(session)
+    assert session.exitstatus == pytest.ExitCode.TESTS_FAILED
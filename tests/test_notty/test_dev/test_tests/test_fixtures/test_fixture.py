@@ -1 +1,9 @@
 """module."""
+
+from notty.src.metrics import GameMetrics
+
+
+def test_game_metrics(game_metrics: GameMetrics) -> None:
+    """Test the hooks update the metrics of the test."""
+    assert GameMetrics.active is game_metrics
+    assert game_metrics.directory is None
@@ -1,9 +1,35 @@
 """test module."""
 
-import pytest
+import sys
+
 from pyrig.dev.configs.pyproject import PyprojectConfigFile
 from pyrig.src.os.os import run_subprocess
 
+# cumulative import times in microseconds, measured at about a quarter
+MAIN_IMPORT_BUDGET_US = 20_000
+SUBCOMMANDS_IMPORT_BUDGET_US = 300_000
+
+
+def get_import_times(module: str) -> dict[str, int]:
+    """Import a module in a new interpreter and get the import times.
+
+    Args:
+        module: The module to import.
+
+    Returns:
+        The cumulative import time in microseconds of every imported module.
+    """
+    completed = run_subprocess(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    )
+    times: dict[str, int] = {}
+    for line in completed.stderr.decode("utf-8").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
 
 def test_main() -> None:
     """Test func for main."""
@@ -14,79 +40,13 @@ def test_main() -> None:
     assert project_name in stdout
 
 
-@pytest.mark.skip(reason="Won't test UI")
-def test_run() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_create_window() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_init_game() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_get_players() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_show_deck() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_show_players() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_show_player_with_hand() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_run_event_loop() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_load_background() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_get_window_size() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_simulate_first_shuffle_and_deal() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_get_player_display_order() -> None:
-    """Test function."""
-    raise NotImplementedError
-
-
-@pytest.mark.skip(reason="Won't test UI")
-def test_show_actions() -> None:
-    """Test function."""
-    raise NotImplementedError
+def test_main_import_time() -> None:
+    """Test the CLI imports neither pygame nor the window and stays fast."""
+    for module, budget in (
+        ("notty.main", MAIN_IMPORT_BUDGET_US),
+        ("notty.dev.cli.subcommands", SUBCOMMANDS_IMPORT_BUDGET_US),
+    ):
+        times = get_import_times(module)
+        assert "pygame" not in times
+        assert "notty.src.ui.app" not in times
+        assert times[module] < budget, f"{module} took {times[module]} us"
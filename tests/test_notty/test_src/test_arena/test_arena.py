@@ -0,0 +1,376 @@
+"""Test arena module."""
+
+import asyncio
+import sys
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src.arena import arena as arena_module
+from notty.src.arena.arena import (
+    Arena,
+    BotProcess,
+    GameResult,
+    arena,
+    get_builtin_command,
+    get_commands,
+    get_lineups,
+    get_summary,
+    run_arena,
+)
+from notty.src.game import Game
+from notty.src.player import Player
+
+READY = 'print(\'{"type":"ready","name":"fake"}\', flush=True)'
+
+
+def get_fake_command(on_go: str) -> list[str]:
+    """Get the command of a bot that answers the hello and misbehaves on go.
+
+    Args:
+        on_go: Python statement run for every go message.
+    """
+    code = "\n".join(
+        [
+            "import sys, time",
+            "for line in sys.stdin:",
+            f"    if 'hello' in line: {READY}",
+            f"    if 'go' in line: {on_go}",
+        ]
+    )
+    return [sys.executable, "-c", code]
+
+
+# never answers in time
+SLOW = get_fake_command("time.sleep(60)")
+# answers with a draw of more cards than allowed
+ILLEGAL = get_fake_command(
+    'print(\'{"type":"move","move":{"kind":"draw","count":99}}\', flush=True)'
+)
+# exits instead of answering
+CRASHING = get_fake_command("sys.exit(1)")
+
+
+def make_game() -> Game:
+    """Make a two player game."""
+    return Game([Player("P1"), Player("P2")])
+
+
+def test_get_builtin_command() -> None:
+    """Test bundled strategies run as a module of this interpreter."""
+    command = get_builtin_command("greedy")
+    assert command[0] == sys.executable
+    assert command[-1] == "greedy"
+
+
+class TestBotProcess:
+    """Test BotProcess class."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test bot initialization."""
+        bot = BotProcess("greedy", mocker.MagicMock())
+        assert bot.name == "greedy"
+        assert bot.games == 0
+        assert not bot.killed
+
+    def test_spawn(self) -> None:
+        """Test starting a bot waits for its ready answer."""
+
+        async def spawn() -> tuple[str, bool]:
+            bot = await BotProcess.spawn(get_builtin_command("greedy"))
+            alive = bot.is_alive()
+            await bot.close()
+            return bot.name, alive
+
+        assert asyncio.run(spawn()) == ("greedy", True)
+
+    def test_is_alive(self) -> None:
+        """Test a closed bot is not alive."""
+
+        async def close() -> bool:
+            bot = await BotProcess.spawn(get_builtin_command("random"))
+            await bot.close()
+            return bot.is_alive()
+
+        assert not asyncio.run(close())
+
+    def test_send(self) -> None:
+        """Test sending a message the bot answers."""
+
+        async def send() -> dict[str, object]:
+            bot = await BotProcess.spawn(get_builtin_command("random"))
+            await bot.send({"type": "hello", "version": 1})
+            answer = await bot.receive(5.0)
+            await bot.close()
+            return answer
+
+        assert asyncio.run(send())["type"] == "ready"
+
+    def test_receive(self) -> None:
+        """Test a bot that runs out of time is killed."""
+
+        async def receive() -> bool:
+            bot = await BotProcess.spawn(SLOW)
+            await bot.send({"type": "go"})
+            with pytest.raises(TimeoutError):
+                await bot.receive(0.1)
+            await bot.close()
+            return bot.is_alive()
+
+        assert not asyncio.run(receive())
+
+    def test_new_game(self) -> None:
+        """Test games are counted."""
+
+        async def new_game() -> int:
+            bot = await BotProcess.spawn(get_builtin_command("random"))
+            await bot.new_game(0)
+            await bot.new_game(1)
+            await bot.close()
+            return bot.games
+
+        expected = 2
+        assert asyncio.run(new_game()) == expected
+
+    def test_choose_move(self) -> None:
+        """Test asking a bundled strategy for a move."""
+        game = make_game()
+
+        async def choose() -> dict[str, object]:
+            bot = await BotProcess.spawn(get_builtin_command("greedy"))
+            answer = await bot.choose_move(game, 5.0)
+            await bot.close()
+            return answer
+
+        assert asyncio.run(choose())["type"] == "move"
+
+    def test_kill(self) -> None:
+        """Test killing a running bot."""
+
+        async def kill() -> bool:
+            bot = await BotProcess.spawn(SLOW)
+            bot.kill()
+            await bot.close()
+            # killing an exited bot does nothing
+            bot.kill()
+            return bot.is_alive()
+
+        assert not asyncio.run(kill())
+
+    def test_close(self, mocker: MockerFixture) -> None:
+        """Test closing a bot that ignores quit kills it."""
+        mocker.patch.object(arena_module, "HANDSHAKE_TIME_LIMIT", 0.5)
+
+        async def close() -> int | None:
+            bot = await BotProcess.spawn(SLOW)
+            # the slow bot is busy and never reads the quit
+            await bot.send({"type": "go"})
+            await bot.close()
+            return bot.process.returncode
+
+        assert asyncio.run(close()) is not None
+
+
+class TestGameResult:
+    """Test GameResult class."""
+
+    def test___delattr__(self) -> None:
+        """Test results are frozen (cannot delete attributes)."""
+        result = GameResult(("a", "b"), 0, None, 10, GameResult.WON)
+        with pytest.raises(AttributeError):
+            del result.winner
+
+    def test___eq__(self) -> None:
+        """Test result equality."""
+        assert GameResult(("a", "b"), 0, None, 10, GameResult.WON) == GameResult(
+            ("a", "b"), 0, None, 10, GameResult.WON
+        )
+
+    def test___hash__(self) -> None:
+        """Test results are hashable."""
+        result = GameResult(("a", "b"), 0, None, 10, GameResult.WON)
+        assert isinstance(hash(result), int)
+
+    def test___init__(self) -> None:
+        """Test result initialization."""
+        result = GameResult(("a", "b"), None, 1, 3, GameResult.TIMEOUT)
+        assert result.forfeit == 1
+        assert result.winner is None
+
+    def test___setattr__(self) -> None:
+        """Test results are frozen (cannot set attributes)."""
+        result = GameResult(("a", "b"), 0, None, 10, GameResult.WON)
+        with pytest.raises(AttributeError):
+            result.winner = 1  # type: ignore[misc]
+
+    def test___repr__(self) -> None:
+        """Test result repr."""
+        result = GameResult(("a", "b"), 0, None, 10, GameResult.WON)
+        assert "GameResult" in repr(result)
+
+
+class TestArena:
+    """Test Arena class."""
+
+    def test___init__(self) -> None:
+        """Test arena initialization."""
+        arena = Arena({"random": get_builtin_command("random")}, time_limit=0.5)
+        assert arena.idle == {"random": []}
+        assert arena.spawned == 0
+
+    def test_acquire(self) -> None:
+        """Test released bots are reused."""
+
+        async def acquire() -> tuple[bool, int]:
+            arena = Arena({"random": get_builtin_command("random")})
+            with pytest.raises(ValueError, match="Unknown bot"):
+                await arena.acquire("unknown")
+            bot = await arena.acquire("random")
+            await arena.release("random", bot)
+            again = await arena.acquire("random")
+            await arena.release("random", again)
+            await arena.close()
+            return again is bot, arena.spawned
+
+        assert asyncio.run(acquire()) == (True, 1)
+
+    def test_release(self) -> None:
+        """Test exited bots are not kept."""
+
+        async def release() -> list[BotProcess]:
+            arena = Arena({"slow": SLOW})
+            bot = await arena.acquire("slow")
+            bot.kill()
+            await arena.release("slow", bot)
+            return arena.idle["slow"]
+
+        assert asyncio.run(release()) == []
+
+    def test_play_move(self) -> None:
+        """Test misbehaving bots forfeit."""
+        commands = {"slow": SLOW, "illegal": ILLEGAL, "crashing": CRASHING}
+
+        async def play() -> list[str | None]:
+            arena = Arena(commands, time_limit=0.5)
+            reasons = []
+            for name in commands:
+                bot = await arena.acquire(name)
+                reasons.append(await arena.play_move(make_game(), bot))
+                await arena.release(name, bot)
+            await arena.close()
+            return reasons
+
+        assert asyncio.run(play()) == [
+            GameResult.TIMEOUT,
+            GameResult.ILLEGAL,
+            GameResult.CRASHED,
+        ]
+
+    def test_play_game(self) -> None:
+        """Test playing games to the end, the move limit or a forfeit."""
+        commands = {
+            "random": get_builtin_command("random"),
+            "greedy": get_builtin_command("greedy"),
+            "slow": SLOW,
+        }
+
+        async def play() -> tuple[GameResult, GameResult]:
+            arena = Arena(commands, time_limit=0.5, max_moves=20)
+            finished = await arena.play_game(["random", "greedy"])
+            forfeited = await arena.play_game(["random", "slow"])
+            await arena.close()
+            return finished, forfeited
+
+        finished, forfeited = asyncio.run(play())
+        if finished.reason == GameResult.WON:
+            assert finished.winner is not None
+        else:
+            assert finished.reason == GameResult.MOVE_LIMIT
+            expected = 20
+            assert finished.moves == expected
+        assert forfeited.reason == GameResult.TIMEOUT
+        assert forfeited.bots[forfeited.forfeit or 0] == "slow"
+
+    def test_play_games(self) -> None:
+        """Test warm bots play the following games."""
+        commands = {
+            "random": get_builtin_command("random"),
+            "greedy": get_builtin_command("greedy"),
+        }
+
+        async def play() -> tuple[list[GameResult], int]:
+            arena = Arena(commands, max_moves=10)
+            results = await arena.play_games(get_lineups(list(commands), 2), 1)
+            await arena.close()
+            return results, arena.spawned
+
+        results, spawned = asyncio.run(play())
+        expected = 4
+        assert len(results) == expected
+        assert spawned == len(commands)
+
+    def test_close(self) -> None:
+        """Test closing stops the idle bots."""
+
+        async def close() -> bool:
+            arena = Arena({"random": get_builtin_command("random")})
+            bot = await arena.acquire("random")
+            await arena.release("random", bot)
+            await arena.close()
+            return bot.is_alive()
+
+        assert not asyncio.run(close())
+
+
+def test_get_lineups() -> None:
+    """Test every seating is played every round."""
+    expected = 12
+    lineups = get_lineups(["a", "b", "c"], 2)
+    assert len(lineups) == expected
+    assert len({tuple(lineup) for lineup in lineups}) == expected // 2
+
+
+def test_get_summary() -> None:
+    """Test counting wins and forfeits."""
+    summary = get_summary(
+        [
+            GameResult(("a", "b"), 0, None, 10, GameResult.WON),
+            GameResult(("b", "a"), None, 0, 3, GameResult.TIMEOUT),
+        ]
+    )
+    assert summary.splitlines() == [
+        "a: 1 wins, 0 forfeits, 2 games",
+        "b: 0 wins, 1 forfeits, 2 games",
+    ]
+
+
+def test_run_arena(mocker: MockerFixture) -> None:
+    """Test every seating is played and the bots are closed."""
+    play = mocker.patch.object(Arena, "play_games", mocker.AsyncMock(return_value=[]))
+    close = mocker.patch.object(Arena, "close", mocker.AsyncMock())
+    assert asyncio.run(run_arena({"a": ["a"], "b": ["b"]}, 2)) == []
+    expected = 4
+    assert len(play.call_args.args[0]) == expected
+    close.assert_awaited_once()
+
+
+def test_get_commands() -> None:
+    """Test parsing strategy names and command lines."""
+    commands = get_commands(["greedy", "greedy", "./bot --fast"])
+    assert commands["greedy"] == get_builtin_command("greedy")
+    assert "greedy'" in commands
+    assert commands["./bot --fast"] == ["./bot", "--fast"]
+
+
+def test_arena(mocker: MockerFixture) -> None:
+    """Test the summary of a run."""
+    mocker.patch.object(
+        arena_module,
+        "run_arena",
+        mocker.AsyncMock(
+            return_value=[GameResult(("a", "b"), 1, None, 10, GameResult.WON)]
+        ),
+    )
+    assert arena(["a", "b"]).startswith("b: 1 wins")
+    with pytest.raises(ValueError, match="bots"):
+        arena(["a"])
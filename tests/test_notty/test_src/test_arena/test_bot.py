@@ -0,0 +1,91 @@
+"""Test bot module."""
+
+import io
+import json
+import sys
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src.arena import bot
+from notty.src.arena.bot import (
+    answer_message,
+    encode_line,
+    get_go_message,
+    get_move,
+    main,
+    run_bot,
+)
+from notty.src.game import Game, Move
+from notty.src.player import Player
+from notty.src.strategy import get_strategy
+
+
+def make_game() -> Game:
+    """Make a two player game."""
+    return Game([Player("P1"), Player("P2")])
+
+
+def test_encode_line() -> None:
+    """Test messages are one compact line."""
+    assert encode_line({"type": "quit"}) == b'{"type":"quit"}\n'
+
+
+def test_get_go_message() -> None:
+    """Test the go message has the public state and the legal moves."""
+    game = make_game()
+    message = get_go_message(game, 0.5)
+    assert message["type"] == "go"
+    # the order of the deck would tell the bot its future draws
+    assert message["state"] == game.to_public_dict()
+    assert Move(Move.END_TURN).to_dict() in message["legal_moves"]
+    # the message is sent as JSON
+    assert json.loads(encode_line(message)) == message
+
+
+def test_answer_message() -> None:
+    """Test answering the messages of the arena."""
+    strategy = get_strategy("greedy")
+    assert answer_message(strategy, {"type": "hello", "version": 1}) == {
+        "type": "ready",
+        "name": "greedy",
+    }
+    assert answer_message(strategy, {"type": "newgame", "seat": 0}) is None
+    game = make_game()
+    answer = answer_message(strategy, get_go_message(game, 1.0))
+    assert answer is not None
+    assert game.is_legal_move(get_move(answer))
+    with pytest.raises(ValueError, match="Unknown type"):
+        answer_message(strategy, {"type": "unknown"})
+
+
+def test_run_bot() -> None:
+    """Test a bot answers until it is told to quit."""
+    messages = [
+        {"type": "hello", "version": 1},
+        {"type": "newgame", "seat": 1},
+        get_go_message(make_game(), 1.0),
+        {"type": "quit"},
+        {"type": "hello", "version": 1},
+    ]
+    stdin = io.BytesIO(b"".join(encode_line(message) for message in messages))
+    stdout = io.BytesIO()
+    run_bot("random", stdin, stdout, seed=1)
+    answers = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [answer["type"] for answer in answers] == ["ready", "move"]
+
+
+def test_get_move() -> None:
+    """Test reading the move of an answer."""
+    move = Move(Move.END_TURN)
+    assert get_move({"type": "move", "move": move.to_dict()}) == move
+    with pytest.raises(ValueError, match="Expected a move"):
+        get_move({"type": "ready"})
+
+
+def test_main(mocker: MockerFixture) -> None:
+    """Test the strategy is taken from the command line."""
+    run = mocker.patch.object(bot, "run_bot")
+    mocker.patch.object(sys, "argv", ["bot", "greedy"])
+    main()
+    run.assert_called_once_with("greedy")
@@ -0,0 +1,163 @@
+"""Test assets module."""
+
+import io
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.artifacts.builder.pack import build_asset_pack
+from notty.src import assets as assets_module
+from notty.src.assets import (
+    PACK_HEADER,
+    PACK_NAME,
+    AssetPack,
+    MemoryFile,
+    get_asset_pack,
+    get_assets_dir,
+    has_asset,
+    open_asset,
+    read_asset,
+)
+
+
+@pytest.fixture
+def assets_dir(tmp_path: Path, mocker: MockerFixture) -> Iterator[Path]:
+    """Use a directory with an icon and a track as the resources package."""
+    mocker.patch.object(assets_module, "get_assets_dir", return_value=tmp_path)
+    (tmp_path / "icon.png").write_bytes(b"icon")
+    (tmp_path / "music").mkdir()
+    (tmp_path / "music" / "track.mp3").write_bytes(b"music" * 100)
+    get_asset_pack.cache_clear()
+    yield tmp_path
+    get_asset_pack.cache_clear()
+
+
+@pytest.fixture
+def pack(assets_dir: Path) -> AssetPack:
+    """Pack the assets and map the pack."""
+    return AssetPack(build_asset_pack(assets_dir, assets_dir))
+
+
+class TestMemoryFile:
+    """Test MemoryFile class."""
+
+    def test___init__(self) -> None:
+        """Test the file starts at the beginning."""
+        assert MemoryFile(memoryview(b"abc")).tell() == 0
+
+    def test_readable(self) -> None:
+        """Test the file can be read."""
+        assert MemoryFile(memoryview(b"abc")).readable()
+
+    def test_seekable(self) -> None:
+        """Test the file supports seeking."""
+        assert MemoryFile(memoryview(b"abc")).seekable()
+
+    def test_readinto(self) -> None:
+        """Test the bytes are read until the end."""
+        file = MemoryFile(memoryview(b"abcde"))
+        buffer = bytearray(3)
+        expected = 3
+        assert file.readinto(buffer) == expected
+        assert buffer == b"abc"
+        assert file.read() == b"de"
+        assert file.readinto(buffer) == 0
+
+    def test_seek(self) -> None:
+        """Test seeking from the start, the position and the end."""
+        file = MemoryFile(memoryview(b"abcde"))
+        expected = 2
+        assert file.seek(2) == expected
+        assert file.seek(1, io.SEEK_CUR) == expected + 1
+        assert file.seek(-1, io.SEEK_END) == expected + 2
+        assert file.read() == b"e"
+        assert file.seek(-10, io.SEEK_CUR) == 0
+
+    def test_tell(self) -> None:
+        """Test the position follows the reads."""
+        file = MemoryFile(memoryview(b"abcde"))
+        file.read(2)
+        expected = 2
+        assert file.tell() == expected
+
+    def test___repr__(self) -> None:
+        """Test the position is shown."""
+        assert repr(MemoryFile(memoryview(b"abc"))) == "MemoryFile(0/3)"
+
+
+class TestAssetPack:
+    """Test AssetPack class."""
+
+    def test___init__(self, pack: AssetPack, tmp_path: Path) -> None:
+        """Test the index is read and other files are rejected."""
+        assert pack.index == {"icon.png": (0, 4), "music/track.mp3": (4, 500)}
+        broken = tmp_path / "broken.pak"
+        broken.write_bytes(PACK_HEADER.pack(b"NOTAPACK", 1, 0))
+        with pytest.raises(ValueError, match="not an asset pack"):
+            AssetPack(broken)
+
+    def test_get(self, pack: AssetPack) -> None:
+        """Test an asset is a view of the mapping."""
+        view = pack.get("music/track.mp3")
+        assert isinstance(view, memoryview)
+        assert view == b"music" * 100
+        with pytest.raises(KeyError):
+            pack.get("missing.png")
+
+    def test_open(self, pack: AssetPack) -> None:
+        """Test an asset can be read as a file."""
+        with pack.open("icon.png") as file:
+            assert file.read() == b"icon"
+
+    def test___contains__(self, pack: AssetPack) -> None:
+        """Test the assets in the pack are found."""
+        assert "icon.png" in pack
+        assert "missing.png" not in pack
+
+    def test___repr__(self, pack: AssetPack) -> None:
+        """Test the number of assets is shown."""
+        assert repr(pack) == f"AssetPack({PACK_NAME}, 2 assets)"
+
+
+def test_get_assets_dir() -> None:
+    """Test the assets are in the resources package."""
+    assert (get_assets_dir() / "icon.png").is_file()
+
+
+def test_get_asset_pack(assets_dir: Path) -> None:
+    """Test the pack is used once it is built."""
+    assert get_asset_pack() is None
+    build_asset_pack(assets_dir, assets_dir)
+    get_asset_pack.cache_clear()
+    pack = get_asset_pack()
+    assert pack is not None
+    assert get_asset_pack() is pack
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_has_asset(assets_dir: Path, *, packed: bool) -> None:
+    """Test assets are found in the pack or as files."""
+    if packed:
+        build_asset_pack(assets_dir, assets_dir)
+    assert has_asset("icon.png")
+    assert not has_asset("missing.png")
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_open_asset(assets_dir: Path, *, packed: bool) -> None:
+    """Test assets are opened from the pack or as files."""
+    if packed:
+        build_asset_pack(assets_dir, assets_dir)
+    with open_asset("music/track.mp3") as file:
+        file.seek(5)
+        assert file.read(5) == b"music"
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_read_asset(assets_dir: Path, *, packed: bool) -> None:
+    """Test assets are read from the pack or from files."""
+    if packed:
+        build_asset_pack(assets_dir, assets_dir)
+    assert bytes(read_asset("icon.png")) == b"icon"
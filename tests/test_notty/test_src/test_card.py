@@ -59,6 +59,30 @@ class TestCard:
         """Test card validation."""
         Card("red", 5)
 
+    def test_to_dict(self) -> None:
+        """Test converting a card to a dict."""
+        card = Card("red", 5)
+        assert card.to_dict() == {"color": "red", "number": 5}
+
+    def test_from_dict(self) -> None:
+        """Test creating a card from a dict."""
+        card = Card("red", 5)
+        assert Card.from_dict(card.to_dict()) == card
+
+    def test_to_id(self) -> None:
+        """Test the ids of all card faces are unique and in range."""
+        ids = {
+            Card(color, number).to_id()
+            for color in Color.get_all_colors()
+            for number in Number.get_all_numbers()
+        }
+        assert ids == set(range(45))
+
+    def test_from_id(self) -> None:
+        """Test creating a card from its id."""
+        card = Card("yellow", 7)
+        assert Card.from_id(card.to_id()) == card
+
     def test___str__(self) -> None:
         """Test card string representation."""
         card = Card("red", 5)
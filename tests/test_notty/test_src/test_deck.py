@@ -23,8 +23,33 @@ class TestDeck:
         """Test deck shuffle."""
         deck = Deck()
         original = deck.cards.copy()
+        deck.add_card(deck.draw())
         deck.shuffle()
         assert deck.cards != original
+        assert deck.known == 0
+
+    def test_shuffle_unknown(self) -> None:
+        """Test the known cards stay on top."""
+        deck = Deck()
+        original = deck.cards.copy()
+        cards = deck.draw_multiple(2)
+        deck.add_cards(cards)
+        deck.shuffle_unknown()
+        assert deck.cards != original
+        assert deck.cards[-2:] == original[-2:][::-1]
+        assert deck.get_known_cards() == cards[::-1]
+
+    def test_get_known_cards(self) -> None:
+        """Test the discarded cards are known until they are drawn."""
+        deck = Deck()
+        assert deck.get_known_cards() == []
+        first, second = deck.draw_multiple(2)
+        deck.add_cards([first, second])
+        assert deck.get_known_cards() == [second, first]
+        assert deck.draw() == second
+        assert deck.get_known_cards() == [first]
+        deck.draw_multiple(2)
+        assert deck.get_known_cards() == []
 
     def test_draw(self) -> None:
         """Test drawing a card."""
@@ -58,6 +83,7 @@ class TestDeck:
         deck.add_card(card)
         expected = 5 * 9 * 2
         assert deck.size() == expected
+        assert deck.known == 1
 
     def test_is_empty(self) -> None:
         """Test checking if deck is empty."""
@@ -86,4 +112,4 @@ class TestDeck:
     def test___repr__(self) -> None:
         """Test deck repr."""
         deck = Deck()
-        assert "Deck" in repr(deck)
+        assert repr(deck) == "Deck(cards=90, known=0)"
@@ -0,0 +1,275 @@
+"""Test estimator module."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src import estimator as estimator_module
+from notty.src.deck import Deck
+from notty.src.estimator import (
+    MAX_WORKERS,
+    WORKER_NICENESS,
+    WinEstimate,
+    WinEstimator,
+    get_state_key,
+    get_worker_count,
+    lower_priority,
+    notify_done,
+    play_rollout,
+    play_rollouts,
+)
+from notty.src.game import Game
+from notty.src.metrics import GameMetrics, enable_metrics
+from notty.src.player import Player
+
+
+def get_game() -> Game:
+    """Get a dealt game of 3 players."""
+    game = Game([Player(name, is_human=False) for name in ("A", "B", "C")])
+    game.setup()
+    return game
+
+
+def get_estimate() -> WinEstimate:
+    """Get an estimate of 2 players with 10 rollouts, 7 won by A."""
+    return WinEstimate(("A", "B"), (7.0, 3.0), 10)
+
+
+@pytest.fixture
+def estimator(mocker: MockerFixture) -> WinEstimator:
+    """Get an estimator of 2 worker threads."""
+    # threads instead of spawned processes, which import notty again
+    mocker.patch.object(
+        estimator_module,
+        "ProcessPoolExecutor",
+        lambda workers, **_: ThreadPoolExecutor(workers),
+    )
+    return WinEstimator(workers=2)
+
+
+def wait_for_batches(estimator: WinEstimator) -> None:
+    """Wait until every batch of the estimator is done."""
+    for future in estimator.pending:
+        future.result()
+
+
+class TestWinEstimate:
+    """Test WinEstimate class."""
+
+    def test___delattr__(self) -> None:
+        """Test estimate is frozen (cannot delete attributes)."""
+        estimate = get_estimate()
+        with pytest.raises(AttributeError):
+            del estimate.wins
+
+    def test___eq__(self) -> None:
+        """Test estimate equality."""
+        assert get_estimate() == get_estimate()
+        assert get_estimate() != WinEstimate()
+
+    def test___hash__(self) -> None:
+        """Test estimate is hashable."""
+        assert isinstance(hash(get_estimate()), int)
+
+    def test___init__(self) -> None:
+        """Test an estimate starts without rollouts."""
+        estimate = WinEstimate()
+        assert estimate.names == ()
+        assert estimate.wins == ()
+        assert estimate.rollouts == 0
+
+    def test___repr__(self) -> None:
+        """Test estimate repr."""
+        assert repr(get_estimate()) == (
+            "WinEstimate(names=('A', 'B'), wins=(7.0, 3.0), rollouts=10)"
+        )
+
+    def test___setattr__(self) -> None:
+        """Test estimate is frozen (cannot set attributes)."""
+        estimate = get_estimate()
+        with pytest.raises(AttributeError):
+            estimate.rollouts = 0  # type: ignore[misc]
+
+    def test_add(self) -> None:
+        """Test the wins and rollouts of a batch are added."""
+        estimate = get_estimate().add((0.5, 1.5), 2)
+        expected = 12
+        assert estimate.rollouts == expected
+        assert estimate.wins == (7.5, 4.5)
+        with pytest.raises(ValueError, match="zip"):
+            get_estimate().add((1.0,), 1)
+
+    def test_get_probability(self) -> None:
+        """Test the share of the rollouts won."""
+        expected = 0.7
+        assert get_estimate().get_probability(0) == pytest.approx(expected)
+        assert WinEstimate(("A",), (0.0,)).get_probability(0) == 0.0
+
+    def test_get_interval(self) -> None:
+        """Test the interval contains the probability."""
+        low, high = get_estimate().get_interval(0)
+        assert low < get_estimate().get_probability(0) < high
+        assert WinEstimate(("A",), (0.0,)).get_interval(0) == (0.0, 1.0)
+
+    def test_get_lines(self) -> None:
+        """Test a header and a line per player once there are rollouts."""
+        assert WinEstimate(("A",), (0.0,)).get_lines() == (
+            "Win chance",
+            "estimating...",
+        )
+        lines = get_estimate().get_lines()
+        assert lines[0] == "Win chance (10 rollouts)"
+        assert lines[1].startswith("A 70% (")
+        assert lines[2].startswith("B 30% (")
+
+
+def test_get_state_key() -> None:
+    """Test the key changes with the state but not with the deck order."""
+    game = get_game()
+    key = get_state_key(game)
+    game.deck.shuffle()
+    assert get_state_key(game) == key
+    game.next_turn()
+    assert get_state_key(game) != key
+    # a discarded card on top is known
+    key = get_state_key(game)
+    card = game.deck.draw()
+    game.deck.cards.insert(0, card)
+    assert get_state_key(game) == key
+    game.deck.add_card(game.deck.cards.pop(0))
+    assert get_state_key(game) != key
+
+
+def test_play_rollout(mocker: MockerFixture) -> None:
+    """Test the shares of the win add up to 1 and a seed repeats a rollout."""
+    game = get_game()
+    # a discarded card stays on top, only the cards below it are shuffled
+    game.deck.add_card(game.players[0].hand.cards.pop())
+    shuffle_unknown = mocker.spy(Deck, "shuffle_unknown")
+    state = game.to_dict()
+    shares = play_rollout(state, 1)
+    shuffle_unknown.assert_called_once()
+    assert len(shares) == len(state["players"])
+    assert sum(shares) == pytest.approx(1.0)
+    assert play_rollout(state, 1) == shares
+
+
+def test_play_rollouts() -> None:
+    """Test at least one rollout is played and every win is counted."""
+    wins, rollouts = play_rollouts(get_game().to_dict(), 0, 0.0)
+    assert rollouts == 1
+    assert sum(wins) == pytest.approx(1.0)
+
+
+def test_lower_priority(mocker: MockerFixture) -> None:
+    """Test the niceness goes up, a failure is ignored and no metrics count."""
+    nice = mocker.patch("os.nice", side_effect=OSError)
+    enable_metrics()
+    lower_priority()
+    nice.assert_called_once_with(WORKER_NICENESS)
+    assert GameMetrics.active is None
+
+
+def test_get_worker_count(mocker: MockerFixture) -> None:
+    """Test one CPU is left to the window within the bounds."""
+    cpu_count = mocker.patch("os.cpu_count")
+    cpu_count.return_value = None
+    assert get_worker_count() == 1
+    cpu_count.return_value = 3
+    expected = 2
+    assert get_worker_count() == expected
+    cpu_count.return_value = 64
+    assert get_worker_count() == MAX_WORKERS
+
+
+class TestWinEstimator:
+    """Test WinEstimator class."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test the workers start with the first estimate."""
+        mocker.patch.object(estimator_module, "get_worker_count", return_value=3)
+        estimator = WinEstimator()
+        expected = 3
+        assert estimator.workers == expected
+        assert estimator.executor is None
+        assert estimator.estimate == WinEstimate()
+
+    def test_update(self, estimator: WinEstimator) -> None:
+        """Test the batches are added and a new state restarts the estimate."""
+        game = get_game()
+        assert estimator.update(game, running=False)
+        assert not estimator.pending
+        assert not estimator.update(game)
+        assert len(estimator.pending) == estimator.workers
+        wait_for_batches(estimator)
+        assert estimator.update(game)
+        # every batch plays at least one rollout
+        assert estimator.estimate.rollouts >= estimator.workers
+        game.next_turn()
+        assert estimator.update(game, running=False)
+        assert estimator.estimate.rollouts == 0
+        estimator.close()
+
+    def test_restart(self, estimator: WinEstimator) -> None:
+        """Test the pending batches are cancelled."""
+        future: Future[Any] = Future()
+        estimator.pending.add(future)
+        game = get_game()
+        estimator.restart(game, get_state_key(game))
+        assert future.cancelled()
+        assert not estimator.pending
+        assert estimator.estimate.names == ("A", "B", "C")
+        assert estimator.state == game.to_dict()
+
+    def test_collect(self, estimator: WinEstimator) -> None:
+        """Test only the batches that are done are added."""
+        estimator.estimate = WinEstimate(("A", "B"), (0.0, 0.0))
+        done: Future[Any] = Future()
+        done.set_result(((1.0, 2.0), 3))
+        running: Future[Any] = Future()
+        estimator.pending.update({done, running})
+        assert estimator.collect()
+        assert estimator.pending == {running}
+        assert estimator.estimate.wins == (1.0, 2.0)
+        assert not estimator.collect()
+
+    def test_submit(self, mocker: MockerFixture, estimator: WinEstimator) -> None:
+        """Test every batch has another seed and notifies when done."""
+        notify = mocker.Mock()
+        estimator.notify = notify
+        game = get_game()
+        estimator.restart(game, get_state_key(game))
+        estimator.submit()
+        estimator.submit()
+        wait_for_batches(estimator)
+        expected = 2_000_000
+        assert estimator.seed == expected
+        assert notify.call_count == len(estimator.pending)
+        estimator.close()
+
+    def test_close(self, estimator: WinEstimator) -> None:
+        """Test the workers stop and can be started again."""
+        game = get_game()
+        estimator.update(game)
+        estimator.close()
+        assert estimator.executor is None
+        assert not estimator.pending
+        estimator.close()
+
+    def test___repr__(self, estimator: WinEstimator) -> None:
+        """Test estimator repr."""
+        assert repr(estimator).startswith("WinEstimator(workers=2, pending=0, ")
+
+
+def test_notify_done(mocker: MockerFixture) -> None:
+    """Test cancelled batches do not notify."""
+    notify = mocker.Mock()
+    future: Future[Any] = Future()
+    future.set_result(None)
+    notify_done(notify, future)
+    cancelled: Future[Any] = Future()
+    cancelled.cancel()
+    notify_done(notify, cancelled)
+    notify.assert_called_once_with()
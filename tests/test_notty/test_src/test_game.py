@@ -1,7 +1,10 @@
 """Test game module."""
 
+import pytest
+
 from notty.src.card import Card
-from notty.src.game import Action, Game
+from notty.src.game import Action, Game, Move
+from notty.src.metrics import GameMetrics
 from notty.src.player import Player
 
 
@@ -21,6 +24,67 @@ class TestAction:
         assert actions == expected
 
 
+class TestMove:
+    """Test Move class."""
+
+    def test___delattr__(self) -> None:
+        """Test move is frozen (cannot delete attributes)."""
+        move = Move(Move.END_TURN)
+        with pytest.raises(AttributeError):
+            del move.kind
+
+    def test___eq__(self) -> None:
+        """Test move equality."""
+        assert Move(Action.DRAW, count=2) == Move(Action.DRAW, count=2)
+        assert Move(Action.DRAW, count=2) != Move(Action.DRAW, count=3)
+
+    def test___hash__(self) -> None:
+        """Test move is hashable."""
+        assert isinstance(hash(Move(Move.END_TURN)), int)
+
+    def test___init__(self) -> None:
+        """Test move initialization."""
+        move = Move(Action.STEAL, target=1)
+        assert move.kind == Action.STEAL
+        assert move.target == 1
+        assert move.cards == ()
+
+    def test___repr__(self) -> None:
+        """Test move repr."""
+        assert "Move" in repr(Move(Move.END_TURN))
+
+    def test___setattr__(self) -> None:
+        """Test move is frozen (cannot set attributes)."""
+        move = Move(Move.END_TURN)
+        with pytest.raises(AttributeError):
+            move.kind = Action.DRAW  # type: ignore[misc]
+
+    def test___post_init__(self) -> None:
+        """Test move validation."""
+        with pytest.raises(ValueError, match="Invalid move kind"):
+            Move("fly")
+
+    def test_get_all_kinds(self) -> None:
+        """Test getting all move kinds."""
+        kinds = Move.get_all_kinds()
+        assert Action.get_all_actions() < kinds
+        assert Move.END_TURN in kinds
+        assert Move.DISCARD_GROUP in kinds
+
+    def test_to_dict(self) -> None:
+        """Test converting a move to a dict."""
+        move = Move(Move.DISCARD_GROUP, cards=(Card("red", 1),))
+        data = move.to_dict()
+        assert data["kind"] == Move.DISCARD_GROUP
+        assert data["cards"] == [{"color": "red", "number": 1}]
+
+    def test_from_dict(self) -> None:
+        """Test creating a move from a dict."""
+        move = Move(Move.DISCARD_GROUP, cards=(Card("red", 1), Card("red", 2)))
+        assert Move.from_dict(move.to_dict()) == move
+        assert Move.from_dict({"kind": Move.END_TURN}) == Move(Move.END_TURN)
+
+
 class TestGame:
     """Test Game class."""
 
@@ -107,6 +171,15 @@ class TestGame:
         expected = 6
         assert game.players[0].hand.size() == expected
 
+    def test_get_max_draw_count(self) -> None:
+        """Test the draw count is capped by the free space in the hand."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        assert game.get_max_draw_count() == game.MAX_DRAW_COUNT
+        hand = game.players[0].hand
+        hand.cards = game.deck.draw_multiple(hand.MAX_CARDS - 1)
+        assert game.get_max_draw_count() == 1
+
     def test_player_can_steal(self) -> None:
         """Test if player can steal."""
         players = [Player("P1", is_human=True), Player("P2", is_human=False)]
@@ -169,6 +242,140 @@ class TestGame:
         expected = 4
         assert game.players[0].hand.size() == expected
 
+    def test_find_valid_groups(self) -> None:
+        """Test finding all valid groups in cards."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        cards = [Card("red", 1), Card("red", 2), Card("red", 3), Card("red", 4)]
+        groups = game.find_valid_groups(cards)
+        expected_sequences = 3  # 1-2-3, 1-2-3-4 and 2-3-4
+        assert len(groups) == expected_sequences
+        assert all(game.card_group_is_valid(list(group)) for group in groups)
+
+        cards = [
+            Card(color, 7) for color in ["red", "blue", "green", "black", "yellow"]
+        ]
+        groups = game.find_valid_groups(cards)
+        expected_sets = 6  # five sets of four colors and one of all five
+        assert len(groups) == expected_sets
+
+        assert game.find_valid_groups([Card("red", 1), Card("blue", 2)]) == []
+
+    def test_get_legal_moves(self) -> None:
+        """Test getting the legal moves of the current player."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        moves = game.get_legal_moves()
+        assert Move(Move.END_TURN) in moves
+        assert Move(Action.DRAW, count=game.MAX_DRAW_COUNT) in moves
+        assert Move(Action.STEAL, target=1) in moves
+        assert Move(Action.DRAW_DISCARD_DRAW) in moves
+        assert all(game.is_legal_move(move) for move in moves)
+        # no draw offers more cards than the hand can hold
+        hand = game.players[0].hand
+        hand.cards.extend(game.deck.draw_multiple(hand.MAX_CARDS - 2 - hand.size()))
+        draws = [move for move in game.get_legal_moves() if move.kind == Action.DRAW]
+        assert [move.count for move in draws] == [1, 2]
+        total = hand.size() + game.deck.size()
+        game.apply_move(draws[-1])
+        assert hand.size() + game.deck.size() == total
+
+    def test_is_legal_move(self) -> None:
+        """Test checking if a move is legal."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        assert game.is_legal_move(Move(Action.DRAW, count=1))
+        assert not game.is_legal_move(Move(Action.DRAW, count=4))
+        hand = game.players[0].hand
+        hand.cards.extend(game.deck.draw_multiple(hand.MAX_CARDS - 1 - hand.size()))
+        assert game.is_legal_move(Move(Action.DRAW, count=1))
+        assert not game.is_legal_move(Move(Action.DRAW, count=2))
+        assert not game.is_legal_move(Move(Action.STEAL, target=0))
+        assert not game.is_legal_move(Move(Action.DRAW_DISCARD_DISCARD))
+        # cards not in the hand can never be discarded
+        game.players[0].hand.cards = [Card("red", 1), Card("red", 2)]
+        group = (Card("red", 1), Card("red", 2), Card("red", 3))
+        assert not game.is_legal_move(Move(Move.DISCARD_GROUP, cards=group))
+        game.players[0].hand.cards.append(Card("red", 3))
+        assert game.is_legal_move(Move(Move.DISCARD_GROUP, cards=group))
+
+    def test_apply_move(self) -> None:
+        """Test applying a move."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        assert game.apply_move(Move(Action.DRAW, count=2))
+        expected = 6
+        assert game.players[0].hand.size() == expected
+        with pytest.raises(ValueError, match="Illegal move"):
+            game.apply_move(Move(Action.DRAW, count=1))
+        game.apply_move(Move(Move.END_TURN))
+        assert game.current_player_index == 1
+
+        group = (Card("red", 1), Card("red", 2), Card("red", 3))
+        game.players[1].hand.cards = list(group)
+        game.apply_move(Move(Move.DISCARD_GROUP, cards=group))
+        assert game.game_over
+        assert game.winner == players[1]
+
+    def test_apply_move_metrics(self, game_metrics: GameMetrics) -> None:
+        """Test the moves, the turns and the finished game are counted."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        deck_size = game.deck.size()
+        game.apply_move(Move(Move.END_TURN))
+        group = (Card("red", 1), Card("red", 2), Card("red", 3))
+        game.players[1].hand.cards = list(group)
+        game.apply_move(Move(Move.DISCARD_GROUP, cards=group))
+        assert game_metrics.moves.values == {"end_turn": 1, "discard_group": 1}
+        assert game_metrics.deck_size.values == {deck_size: 1}
+        assert game_metrics.hand_size.values == {Game.INITIAL_HAND_SIZE: 1}
+        assert game_metrics.games.values == {"": 1}
+
+    def test_to_dict(self) -> None:
+        """Test converting a game to its save format."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        data = game.to_dict()
+        assert [p["name"] for p in data["players"]] == ["P1", "P2"]
+        assert len(data["deck"]) == game.deck.size()
+        assert data["known"] == 0
+        assert data["winner"] is None
+
+    def test_from_dict(self) -> None:
+        """Test loading a game from its save format."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        game.player_draws_multiple(3)
+        game.deck.add_card(players[0].hand.cards.pop())
+        loaded = Game.from_dict(game.to_dict())
+        assert loaded.to_dict() == game.to_dict()
+        assert loaded.players[0].hand.cards == players[0].hand.cards
+        assert loaded.deck.cards == game.deck.cards
+        assert loaded.deck.known == 1
+        # the deck of a public view is every card in no hand
+        public = Game.from_dict(game.to_public_dict())
+        assert public.to_public_dict() == game.to_public_dict()
+        assert sorted(public.deck.cards, key=Card.to_id) == sorted(
+            game.deck.cards, key=Card.to_id
+        )
+        assert public.deck.get_known_cards() == game.deck.get_known_cards()
+        # a save from before the known cards were tracked
+        old = {key: value for key, value in game.to_dict().items() if key != "known"}
+        assert Game.from_dict(old).deck.known == 0
+
+    def test_to_public_dict(self) -> None:
+        """Test the deck order is not public, only its size and known cards."""
+        players = [Player("P1", is_human=True), Player("P2", is_human=False)]
+        game = Game(players)
+        game.setup()
+        data = game.to_public_dict()
+        assert data["deck"] == game.deck.size()
+        assert data["top"] == []
+        assert data["players"] == game.to_dict()["players"]
+        card = players[0].hand.cards.pop()
+        game.deck.add_card(card)
+        assert game.to_public_dict()["top"] == [card.to_dict()]
+
     def test___str__(self) -> None:
         """Test game string representation."""
         players = [Player("P1", is_human=True), Player("P2", is_human=False)]
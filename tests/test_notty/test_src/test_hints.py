@@ -0,0 +1,406 @@
+"""Test hints module."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src import hints as hints_module
+from notty.src.card import Card
+from notty.src.game import Action, Game, Move
+from notty.src.hints import (
+    Hint,
+    HintService,
+    HintState,
+    describe_move,
+    evaluate_move,
+    get_best_cards_left,
+    get_cards_left,
+    get_deck_outcomes,
+    get_discard_plan,
+    get_draw_outcomes,
+    get_hint_state,
+    get_ids,
+    get_move_order,
+    remove_cards,
+)
+from notty.src.player import Player
+
+# ids of red 1 to red 3, red 5 is 4 and blue 5 is 40
+RED_1, RED_2, RED_3 = 0, 1, 2
+BLUE_5 = 40
+# no action used yet
+ACTIONS = tuple(sorted((action, 0) for action in Action.get_all_actions()))
+# the human holds red 1 and red 2, the deck is red 3 and blue 5
+STATE = HintState(0, ((RED_1, RED_2), (RED_3,)), (RED_3, BLUE_5), (), ACTIONS)
+NAMES = ("Human", "Computer")
+
+
+def get_game() -> Game:
+    """Get the game of STATE, the human to move."""
+    game = Game([Player("Human", is_human=True), Player("Computer", is_human=False)])
+    for player, hand in zip(game.players, STATE.hands, strict=True):
+        player.hand.cards = [Card.from_id(card) for card in hand]
+    game.deck.cards = [Card.from_id(card) for card in STATE.deck]
+    return game
+
+
+def get_move(kind: str, count: int = 0) -> Move:
+    """Get a move without cards or targets."""
+    return Move(kind, count=count)
+
+
+@pytest.fixture
+def service(mocker: MockerFixture) -> HintService:
+    """Get a service evaluating in a thread."""
+    # a thread instead of a spawned process, which imports notty again
+    mocker.patch.object(
+        hints_module,
+        "ProcessPoolExecutor",
+        lambda workers, **_: ThreadPoolExecutor(workers),
+    )
+    return HintService()
+
+
+def wait_for_move(service: HintService) -> None:
+    """Wait until the pending move of the service is evaluated."""
+    if service.pending is not None:
+        service.pending.result()
+
+
+class TestHintState:
+    """Test HintState class."""
+
+    def test___delattr__(self) -> None:
+        """Test state is frozen (cannot delete attributes)."""
+        with pytest.raises(AttributeError):
+            del STATE.deck
+
+    def test___eq__(self) -> None:
+        """Test state equality."""
+        assert HintState(0, (), (), (), ()) == HintState(0, (), (), (), ())
+        assert HintState(0, (), (), (), ()) != STATE
+
+    def test___hash__(self) -> None:
+        """Test state is hashable, it is the key of the cache."""
+        assert isinstance(hash(STATE), int)
+
+    def test___init__(self) -> None:
+        """Test state fields."""
+        assert STATE.seat == 0
+        assert STATE.deck == (RED_3, BLUE_5)
+        assert STATE.top == ()
+
+    def test___repr__(self) -> None:
+        """Test state repr."""
+        assert repr(STATE) == "HintState(seat=0, hands=[2, 1], deck=2, top=())"
+
+    def test___setattr__(self) -> None:
+        """Test state is frozen (cannot set attributes)."""
+        with pytest.raises(AttributeError):
+            STATE.seat = 1  # type: ignore[misc]
+
+    def test_get_hand(self) -> None:
+        """Test the hand of the human."""
+        assert STATE.get_hand() == (RED_1, RED_2)
+
+
+class TestHint:
+    """Test Hint class."""
+
+    def test___delattr__(self) -> None:
+        """Test hint is frozen (cannot delete attributes)."""
+        hint = Hint()
+        with pytest.raises(AttributeError):
+            del hint.move
+
+    def test___eq__(self) -> None:
+        """Test hint equality."""
+        assert Hint(get_move(Move.END_TURN), 2.0, 1, 1) == Hint(
+            get_move(Move.END_TURN), 2.0, 1, 1
+        )
+        assert Hint() != Hint(moves=1)
+
+    def test___hash__(self) -> None:
+        """Test hint is hashable."""
+        assert isinstance(hash(Hint(get_move(Move.END_TURN))), int)
+
+    def test___init__(self) -> None:
+        """Test a hint starts without a move."""
+        hint = Hint()
+        assert hint.move is None
+        assert hint.evaluated == hint.moves == 0
+
+    def test___repr__(self) -> None:
+        """Test hint repr."""
+        assert repr(Hint(cards_left=1.5, evaluated=1, moves=2)) == (
+            "Hint(move=None, cards_left=1.5, evaluated=1/2)"
+        )
+
+    def test___setattr__(self) -> None:
+        """Test hint is frozen (cannot set attributes)."""
+        hint = Hint()
+        with pytest.raises(AttributeError):
+            hint.moves = 1  # type: ignore[misc]
+
+    def test_is_done(self) -> None:
+        """Test a hint is final once every move was evaluated."""
+        assert Hint(evaluated=2, moves=2).is_done()
+        assert not Hint(evaluated=1, moves=2).is_done()
+
+    def test_get_lines(self) -> None:
+        """Test the progress is shown until the hint is final."""
+        assert Hint().get_lines(NAMES) == ()
+        hint = Hint(get_move(Action.DRAW, 1), 1.5, 1, 2)
+        assert hint.get_lines(NAMES) == ("Hint (1/2)", "draw 1", "1.5 cards left")
+        assert Hint(get_move(Move.END_TURN), 2, 2, 2).get_lines(NAMES)[0] == "Hint"
+
+
+def test_get_ids() -> None:
+    """Test the ids are sorted."""
+    assert get_ids([Card.from_id(RED_3), Card.from_id(RED_1)]) == (RED_1, RED_3)
+
+
+def test_get_hint_state() -> None:
+    """Test the state ignores the order of the cards and the turn of others."""
+    game = get_game()
+    assert get_hint_state(game) == STATE
+    game.deck.cards.reverse()
+    game.players[0].hand.cards.reverse()
+    assert get_hint_state(game) == STATE
+    # a discarded card is known on top of the deck
+    game.deck.add_card(game.players[1].hand.cards.pop())
+    state = get_hint_state(game)
+    assert state is not None
+    assert state.deck == (RED_3, BLUE_5)
+    assert state.top == (RED_3,)
+    game.next_turn()
+    assert get_hint_state(game) is None
+
+
+def test_describe_move() -> None:
+    """Test every kind of move."""
+    red_1, red_2, red_3 = (Card.from_id(card) for card in (RED_1, RED_2, RED_3))
+    fives = tuple(Card.from_id(card) for card in (4, 13, 22, 31))
+    assert describe_move(
+        Move(Move.DISCARD_GROUP, cards=(red_1, red_2, red_3)), NAMES
+    ) == ("discard red 1-3")
+    assert describe_move(Move(Move.DISCARD_GROUP, cards=fives), NAMES) == (
+        "discard 4 5s"
+    )
+    assert describe_move(Move(Action.STEAL, target=1), NAMES) == "steal from Computer"
+    assert describe_move(get_move(Action.DRAW, 2), NAMES) == "draw 2"
+    assert describe_move(get_move(Action.DRAW_DISCARD_DRAW), NAMES) == (
+        "draw, then discard one"
+    )
+    assert describe_move(Move(Action.DRAW_DISCARD_DISCARD, cards=(red_1,)), NAMES) == (
+        "discard red 1"
+    )
+    assert describe_move(get_move(Move.END_TURN), NAMES) == "end the turn"
+
+
+def test_remove_cards() -> None:
+    """Test one copy of every card is removed."""
+    assert remove_cards((RED_1, RED_1, RED_2), (RED_1,)) == (RED_1, RED_2)
+
+
+def test_get_discard_plan() -> None:
+    """Test the plan discards the most cards with valid groups."""
+    game = get_game()
+    assert get_discard_plan((RED_1, RED_2, RED_3)) == ((RED_1, RED_2, RED_3),)
+    # red 1 either starts the sequence or the set of 1s
+    ones = (RED_1, 9, 18, 27)
+    plan = get_discard_plan(tuple(sorted((*ones, RED_2, RED_3))))
+    assert plan == (ones,)
+    # with blue 1 the other colors make the set
+    hand = tuple(sorted((*ones, 36, RED_2, RED_3)))
+    plan = get_discard_plan(hand)
+    assert sorted(card for group in plan for card in group) == list(hand)
+    assert all(
+        game.card_group_is_valid([Card.from_id(card) for card in group])
+        for group in plan
+    )
+    # red 9 and green 1 are no sequence
+    assert get_discard_plan((7, 8, 9)) == ()
+
+
+def test_get_cards_left() -> None:
+    """Test the cards that are in no group."""
+    expected = 2
+    assert get_cards_left((RED_1, RED_2, RED_3, BLUE_5, BLUE_5)) == expected
+
+
+def test_get_best_cards_left() -> None:
+    """Test a card is discarded only if it helps."""
+    assert get_best_cards_left((RED_1, RED_2, RED_3, BLUE_5)) == 0
+    assert get_best_cards_left((RED_1, RED_2, RED_3)) == 0
+    assert get_best_cards_left((RED_1,)) == 0
+
+
+def test_get_draw_outcomes() -> None:
+    """Test the probabilities of the copies in the deck."""
+    deck = (RED_1, RED_1, RED_2)
+    draws = {cards: probability for probability, cards in get_draw_outcomes(deck, 1)}
+    assert draws == pytest.approx({(RED_1,): 2 / 3, (RED_2,): 1 / 3})
+    draws = {cards: probability for probability, cards in get_draw_outcomes(deck, 2)}
+    assert draws == pytest.approx({(RED_1, RED_1): 1 / 3, (RED_1, RED_2): 2 / 3})
+
+
+def test_get_deck_outcomes() -> None:
+    """Test the known cards are drawn first and the rest by probability."""
+    state = HintState(0, ((),), (RED_3, BLUE_5), (RED_1, RED_2), ACTIONS)
+    assert list(get_deck_outcomes(state, 1)) == [(1.0, (RED_1,))]
+    draws = {cards: probability for probability, cards in get_deck_outcomes(state, 3)}
+    assert draws == pytest.approx(
+        {(RED_1, RED_2, RED_3): 0.5, (RED_1, RED_2, BLUE_5): 0.5}
+    )
+    # the deck runs out
+    draws = {cards: probability for probability, cards in get_deck_outcomes(state, 5)}
+    assert draws == pytest.approx({(RED_1, RED_2, RED_3, BLUE_5): 1.0})
+
+
+def test_evaluate_move() -> None:
+    """Test the expected cards left of every kind of move."""
+    expected = 2.0
+    assert evaluate_move(STATE, get_move(Move.END_TURN)) == expected
+    # red 3 discards all 3 cards, blue 5 leaves 3
+    expected = 1.5
+    assert evaluate_move(STATE, get_move(Action.DRAW, 1)) == expected
+    # blue 5 is discarded again
+    expected = 1.0
+    assert evaluate_move(STATE, get_move(Action.DRAW_DISCARD_DRAW)) == expected
+    assert evaluate_move(STATE, Move(Action.STEAL, target=1)) == 0.0
+    red_1 = Card.from_id(RED_1)
+    move = Move(Action.DRAW_DISCARD_DISCARD, cards=(red_1,))
+    assert evaluate_move(STATE, move) == 1.0
+    # the known red 3 on top discards all 3 cards
+    known = HintState(0, STATE.hands, (BLUE_5,), (RED_3,), ACTIONS)
+    assert evaluate_move(known, get_move(Action.DRAW, 1)) == 0.0
+
+
+def test_get_move_order() -> None:
+    """Test the draws of more cards come last."""
+    moves = [get_move(Action.DRAW, 2), get_move(Action.DRAW, 1)]
+    moves.append(get_move(Move.END_TURN))
+    assert sorted(moves, key=get_move_order) == [
+        get_move(Move.END_TURN),
+        get_move(Action.DRAW, 1),
+        get_move(Action.DRAW, 2),
+    ]
+
+
+class TestHintService:
+    """Test HintService class."""
+
+    def test___init__(self) -> None:
+        """Test the service starts without a hint and a worker."""
+        service = HintService()
+        assert service.state is None
+        assert service.hint == Hint()
+        assert not service.cache
+        assert service.executor is None
+        assert service.pending is None
+
+    def test_update(self, service: HintService) -> None:
+        """Test the moves are evaluated one by one and a seen state is cached."""
+        game = get_game()
+        assert service.update(game, running=False)
+        # nothing was submitted, the worker starts with the first move
+        assert service.executor is None
+        assert service.hint.moves == len(game.get_legal_moves())
+        assert not service.update(game)
+        assert service.pending is not None
+        while not service.hint.is_done():
+            wait_for_move(service)
+            assert service.update(game)
+        # stealing red 3 discards every card
+        assert service.get_lines()[1:] == ("steal from Computer", "0.0 cards left")
+        assert service.cache[STATE] is service.hint
+        cached = service.hint
+        game.next_turn()
+        assert service.update(game)
+        assert service.hint == Hint()
+        game.next_turn()
+        assert service.update(game)
+        assert service.hint is cached
+        service.close()
+
+    def test_restart(self, service: HintService) -> None:
+        """Test the pending move is cancelled and a cached hint is shown."""
+        future: Future[float] = Future()
+        service.pending = future
+        game = get_game()
+        service.restart(game, STATE)
+        assert future.cancelled()
+        assert service.names == NAMES
+        assert service.moves == tuple(
+            sorted(game.get_legal_moves(), key=get_move_order)
+        )
+        assert service.hint == Hint(moves=len(service.moves))
+        cached = Hint(get_move(Move.END_TURN), 1.0, 1, 1)
+        service.cache[STATE] = cached
+        service.restart(game, STATE)
+        assert service.hint is cached
+        assert service.moves == ()
+        service.restart(game, None)
+        assert service.hint == Hint()
+
+    def test_collect(self, service: HintService) -> None:
+        """Test only a better move replaces the hint and the final one is cached."""
+        service.restart(get_game(), STATE)
+        assert not service.collect()
+        service.moves = (get_move(Move.END_TURN), get_move(Action.DRAW, 1))
+        service.hint = Hint(moves=2)
+        for cards_left in (2.0, 1.5):
+            future: Future[float] = Future()
+            future.set_result(cards_left)
+            service.pending = future
+            assert service.collect()
+        expected = 1.5
+        assert service.hint == Hint(service.moves[1], expected, 2, 2)
+        assert service.cache[STATE] == service.hint
+        assert service.pending is None
+
+    def test_submit(self, mocker: MockerFixture, service: HintService) -> None:
+        """Test the next move is evaluated and notifies when done."""
+        notify = mocker.Mock()
+        service.notify = notify
+        service.restart(get_game(), STATE)
+        service.submit(STATE)
+        assert service.pending is not None
+        assert service.pending.result() == evaluate_move(STATE, service.moves[0])
+        notify.assert_called_once_with()
+        service.pending = None
+        service.hint = Hint()
+        service.submit(STATE)
+        assert service.pending is None
+        service.close()
+
+    def test_add_to_cache(self, mocker: MockerFixture) -> None:
+        """Test the least recently used hint is dropped."""
+        mocker.patch.object(hints_module, "HINT_CACHE_SIZE", 1)
+        service = HintService()
+        service.add_to_cache(STATE, Hint())
+        other = HintState(1, (), (), (), ())
+        service.add_to_cache(other, Hint())
+        assert list(service.cache) == [other]
+
+    def test_get_lines(self) -> None:
+        """Test the hint names the target of a steal."""
+        service = HintService()
+        service.names = NAMES
+        service.hint = Hint(Move(Action.STEAL, target=1), 0.0, 1, 1)
+        assert service.get_lines()[1] == "steal from Computer"
+
+    def test_close(self, service: HintService) -> None:
+        """Test the worker stops and can be started again."""
+        service.update(get_game())
+        service.close()
+        assert service.executor is None
+        assert service.pending is None
+        service.close()
+
+    def test___repr__(self) -> None:
+        """Test service repr."""
+        service = HintService()
+        assert repr(service).startswith("HintService(state=None, hint=Hint(")
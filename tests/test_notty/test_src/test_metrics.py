@@ -0,0 +1,336 @@
+"""Test metrics module."""
+
+import asyncio
+import functools
+import json
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src import metrics as metrics_module
+from notty.src.consts import METRICS_DIR_ENV
+from notty.src.metrics import (
+    Counter,
+    GameMetrics,
+    Histogram,
+    Metric,
+    disable_metrics,
+    enable_metrics,
+    export_metrics,
+    get_metrics_dir,
+    handle_scrape,
+    load_snapshots,
+    run_metrics_server,
+    serve_metrics,
+    write_atomic,
+)
+
+
+def get_histogram() -> Histogram:
+    """Get a histogram of the values 1, 5 and 7 in the buckets 2 and 5."""
+    histogram = Histogram("size", "Sizes.", (5, 2))
+    for value in (1, 5, 7):
+        histogram.observe(value)
+    return histogram
+
+
+def save_snapshot(directory: Path, name: str, moves: int) -> None:
+    """Save the snapshot of a process that applied some draw moves."""
+    metrics = GameMetrics(directory)
+    metrics.moves.inc("draw", moves)
+    write_atomic(directory / f"{name}.json", json.dumps(metrics.to_dict()))
+
+
+async def scrape(directory: Path, path: str) -> bytes:
+    """Request a path from a metrics handler and read the whole answer."""
+    server = await asyncio.start_server(
+        functools.partial(handle_scrape, directory), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        answer = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+    return answer
+
+
+class TestMetric:
+    """Test Metric class."""
+
+    def test___init__(self) -> None:
+        """Test the name and the help text."""
+        metric = Counter("a_total", "As.")
+        assert metric.name == "a_total"
+        assert metric.documentation == "As."
+
+    def test_get_lines(self) -> None:
+        """Test the help and type lines come before the samples."""
+        assert Counter("a_total", "As.").get_lines() == [
+            "# HELP a_total As.",
+            "# TYPE a_total counter",
+            "a_total 0",
+        ]
+
+    def test_get_samples(self) -> None:
+        """Test get_samples is abstract."""
+        assert Metric.get_samples.__isabstractmethod__  # type: ignore[attr-defined]
+
+    def test_to_dict(self) -> None:
+        """Test to_dict is abstract."""
+        assert Metric.to_dict.__isabstractmethod__  # type: ignore[attr-defined]
+
+    def test_merge(self) -> None:
+        """Test merge is abstract."""
+        assert Metric.merge.__isabstractmethod__  # type: ignore[attr-defined]
+
+    def test___repr__(self) -> None:
+        """Test metric repr."""
+        assert repr(Counter("a_total", "As.")) == "Counter('a_total', {'': 0})"
+
+
+class TestCounter:
+    """Test Counter class."""
+
+    def test___init__(self) -> None:
+        """Test only a counter without a label starts at 0."""
+        assert Counter("a_total", "As.").values == {"": 0}
+        assert Counter("a_total", "As.", "kind").values == {}
+
+    def test_inc(self) -> None:
+        """Test the count of every label value goes up."""
+        counter = Counter("a_total", "As.", "kind")
+        counter.inc("x")
+        counter.inc("x", 2)
+        expected = 3
+        assert counter.values == {"x": expected}
+
+    def test_get_samples(self) -> None:
+        """Test a line per label value."""
+        counter = Counter("a_total", "As.", "kind")
+        counter.inc("y")
+        counter.inc("x")
+        assert counter.get_samples() == ['a_total{kind="x"} 1', 'a_total{kind="y"} 1']
+
+    def test_to_dict(self) -> None:
+        """Test the counts by label value."""
+        counter = Counter("a_total", "As.", "kind")
+        counter.inc("x")
+        assert counter.to_dict() == {"x": 1}
+
+    def test_merge(self) -> None:
+        """Test the counts are summed up."""
+        counter = Counter("a_total", "As.", "kind")
+        counter.inc("x")
+        counter.merge({"x": 2, "y": 1})
+        expected = 3
+        assert counter.values == {"x": expected, "y": 1}
+
+
+class TestHistogram:
+    """Test Histogram class."""
+
+    def test___init__(self) -> None:
+        """Test the buckets are sorted."""
+        assert Histogram("size", "Sizes.", (5, 2)).buckets == (2, 5)
+
+    def test_observe(self) -> None:
+        """Test every value is counted."""
+        assert get_histogram().values == {1: 1, 5: 1, 7: 1}
+
+    def test_get_counts(self) -> None:
+        """Test a value on a bound is in its bucket."""
+        assert get_histogram().get_counts() == [1, 1, 1]
+
+    def test_get_samples(self) -> None:
+        """Test the buckets are cumulative."""
+        assert get_histogram().get_samples() == [
+            'size_bucket{le="2"} 1',
+            'size_bucket{le="5"} 2',
+            'size_bucket{le="+Inf"} 3',
+            "size_sum 13",
+            "size_count 3",
+        ]
+
+    def test_to_dict(self) -> None:
+        """Test the counts by value are JSON serializable."""
+        assert json.loads(json.dumps(get_histogram().to_dict())) == {
+            "1": 1,
+            "5": 1,
+            "7": 1,
+        }
+
+    def test_merge(self) -> None:
+        """Test the counts of a snapshot are added."""
+        histogram = get_histogram()
+        histogram.merge(get_histogram().to_dict())
+        expected = 2
+        assert histogram.values == {1: expected, 5: expected, 7: expected}
+
+
+class TestGameMetrics:
+    """Test GameMetrics class."""
+
+    def test___init__(self) -> None:
+        """Test every metric is exported."""
+        metrics = GameMetrics()
+        assert metrics.directory is None
+        expected = 5
+        assert len(metrics.metrics) == expected
+
+    def test_on_move(self) -> None:
+        """Test moves are counted by kind."""
+        metrics = GameMetrics()
+        metrics.on_move("draw")
+        assert metrics.moves.values == {"draw": 1}
+
+    def test_on_rejected_card(self) -> None:
+        """Test rejected cards are counted."""
+        metrics = GameMetrics()
+        metrics.on_rejected_card()
+        assert metrics.rejected_cards.values == {"": 1}
+
+    def test_on_turn_end(self) -> None:
+        """Test the deck and the hand sizes are observed."""
+        metrics = GameMetrics()
+        metrics.on_turn_end(30, 4)
+        assert metrics.deck_size.values == {30: 1}
+        expected = 4
+        assert metrics.hand_size.values == {expected: 1}
+
+    def test_on_game_over(self, tmp_path: Path) -> None:
+        """Test the game is counted and the snapshot saved."""
+        metrics = GameMetrics(tmp_path)
+        metrics.on_game_over()
+        snapshot = json.loads((tmp_path / f"{os.getpid()}.json").read_text())
+        assert snapshot["notty_games_total"] == {"": 1}
+
+    def test_to_dict(self) -> None:
+        """Test the snapshot has every metric by name."""
+        assert list(GameMetrics().to_dict()) == [
+            "notty_moves_total",
+            "notty_rejected_cards_total",
+            "notty_games_total",
+            "notty_deck_size",
+            "notty_hand_size",
+        ]
+
+    def test_merge(self) -> None:
+        """Test a snapshot is added and unknown metrics are ignored."""
+        other = GameMetrics()
+        other.on_move("steal")
+        metrics = GameMetrics()
+        metrics.merge({**other.to_dict(), "unknown": {}})
+        metrics.merge(other.to_dict())
+        expected = 2
+        assert metrics.moves.values == {"steal": expected}
+
+    def test_to_prometheus(self) -> None:
+        """Test the text of every metric ends with a newline."""
+        text = GameMetrics().to_prometheus()
+        assert text.startswith("# HELP notty_moves_total")
+        assert "notty_hand_size_count 0\n" in text
+        assert text.endswith("\n")
+
+    def test_save(self, tmp_path: Path) -> None:
+        """Test the snapshot is saved only with a directory."""
+        GameMetrics().save()
+        metrics = GameMetrics(tmp_path / "metrics")
+        metrics.save()
+        path = tmp_path / "metrics" / f"{os.getpid()}.json"
+        assert json.loads(path.read_text()) == metrics.to_dict()
+
+    def test___repr__(self) -> None:
+        """Test metrics repr."""
+        assert repr(GameMetrics()).startswith("GameMetrics({'notty_moves_total'")
+
+
+def test_write_atomic(tmp_path: Path) -> None:
+    """Test the file is replaced without a temporary file left."""
+    path = tmp_path / "a" / "b.txt"
+    write_atomic(path, "1")
+    write_atomic(path, "2")
+    assert path.read_text() == "2"
+    assert [file.name for file in path.parent.iterdir()] == ["b.txt"]
+
+
+def test_load_snapshots(tmp_path: Path) -> None:
+    """Test the snapshots are summed up and broken ones skipped."""
+    save_snapshot(tmp_path, "1", 2)
+    save_snapshot(tmp_path, "2", 3)
+    (tmp_path / "3.json").write_text("{")
+    expected = 5
+    assert load_snapshots(tmp_path).moves.values == {"draw": expected}
+    assert load_snapshots(tmp_path / "missing").moves.values == {}
+
+
+def test_get_metrics_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test metrics are off without the environment variable."""
+    monkeypatch.delenv(METRICS_DIR_ENV, raising=False)
+    assert get_metrics_dir() is None
+    monkeypatch.setenv(METRICS_DIR_ENV, "metrics")
+    assert get_metrics_dir() == Path("metrics")
+
+
+def test_enable_metrics(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test the hooks update the enabled metrics, saved at exit."""
+    atexit = mocker.patch.object(metrics_module, "atexit")
+    metrics = enable_metrics(tmp_path)
+    assert GameMetrics.active is metrics
+    atexit.register.assert_called_once_with(metrics.save)
+    disable_metrics()
+
+
+def test_disable_metrics(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test the metrics are not saved at exit anymore."""
+    atexit = mocker.patch.object(metrics_module, "atexit")
+    metrics = enable_metrics(tmp_path)
+    disable_metrics()
+    assert GameMetrics.active is None
+    atexit.unregister.assert_called_once_with(metrics.save)
+    disable_metrics()
+
+
+def test_export_metrics(tmp_path: Path) -> None:
+    """Test the summed up text is written to the output."""
+    save_snapshot(tmp_path, "1", 2)
+    output = tmp_path / "out" / "notty.prom"
+    text = export_metrics(tmp_path, output)
+    assert 'notty_moves_total{kind="draw"} 2\n' in text
+    assert output.read_text() == text
+
+
+def test_handle_scrape(tmp_path: Path) -> None:
+    """Test /metrics is answered with the text and other paths are not found."""
+    save_snapshot(tmp_path, "1", 2)
+    answer = asyncio.run(scrape(tmp_path, "/metrics"))
+    assert answer.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert answer.endswith(export_metrics(tmp_path).encode())
+    assert asyncio.run(scrape(tmp_path, "/")).startswith(b"HTTP/1.1 404")
+
+
+def test_run_metrics_server(tmp_path: Path) -> None:
+    """Test serving until cancelled."""
+
+    async def serve_briefly() -> bool:
+        task = asyncio.create_task(run_metrics_server(tmp_path, "127.0.0.1", 0))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return task.cancelled()
+
+    assert asyncio.run(serve_briefly())
+
+
+def test_serve_metrics(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test the blocking serve function."""
+    run_metrics_server_mock = mocker.patch.object(
+        metrics_module, "run_metrics_server", mocker.AsyncMock()
+    )
+    serve_metrics(tmp_path, "127.0.0.1", 0)
+    run_metrics_server_mock.assert_called_once_with(tmp_path, "127.0.0.1", 0)
@@ -1,6 +1,7 @@
 """Test player module."""
 
 from notty.src.card import Card
+from notty.src.metrics import GameMetrics
 from notty.src.player import Hand, Player
 
 
@@ -28,6 +29,14 @@ class TestHand:
         assert result is True
         assert hand.size() == 1
 
+    def test_add_card_rejected(self, game_metrics: GameMetrics) -> None:
+        """Test a full hand rejects a card and counts it."""
+        hand = Hand()
+        hand.cards = [Card("red", 1)] * Hand.MAX_CARDS
+        assert hand.add_card(Card("red", 5)) is False
+        assert hand.add_card(Card("red", 5), draw_discard_draw=True) is True
+        assert game_metrics.rejected_cards.values == {"": 1}
+
     def test_add_cards(self) -> None:
         """Test adding multiple cards."""
         hand = Hand()
@@ -0,0 +1,160 @@
+"""Test loadgen module."""
+
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src.server.loadgen import (
+    LoadReport,
+    get_server_stats,
+    loadgen,
+    request,
+    run_client,
+    run_load,
+    run_local_load,
+)
+from notty.src.server.server import GameServer, ServerStats
+
+
+class TestLoadReport:
+    """Test LoadReport class."""
+
+    def test___delattr__(self) -> None:
+        """Test report is frozen (cannot delete attributes)."""
+        report = LoadReport(1, 1.0, (0.1,))
+        with pytest.raises(AttributeError):
+            del report.moves
+
+    def test___eq__(self) -> None:
+        """Test report equality."""
+        assert LoadReport(1, 1.0, (0.1,)) == LoadReport(1, 1.0, (0.1,))
+
+    def test___hash__(self) -> None:
+        """Test report is hashable."""
+        assert isinstance(hash(LoadReport(1, 1.0, (0.1,))), int)
+
+    def test___init__(self) -> None:
+        """Test report initialization."""
+        report = LoadReport(2, 1.0, (0.1, 0.2))
+        expected = 2
+        assert report.moves == expected
+
+    def test___repr__(self) -> None:
+        """Test report repr."""
+        assert "LoadReport" in repr(LoadReport(1, 1.0, (0.1,)))
+
+    def test___setattr__(self) -> None:
+        """Test report is frozen (cannot set attributes)."""
+        report = LoadReport(1, 1.0, (0.1,))
+        with pytest.raises(AttributeError):
+            report.moves = 2  # type: ignore[misc]
+
+    def test_get_moves_per_second(self) -> None:
+        """Test the throughput."""
+        expected = 50.0
+        assert LoadReport(100, 2.0, ()).get_moves_per_second() == expected
+        assert LoadReport(0, 0.0, ()).get_moves_per_second() == 0.0
+
+    def test_get_latency_percentile(self) -> None:
+        """Test the latency percentiles."""
+        report = LoadReport(4, 1.0, (0.4, 0.1, 0.3, 0.2))
+        expected = 0.4
+        assert report.get_latency_percentile(99) == expected
+
+    def test___str__(self) -> None:
+        """Test the summary."""
+        assert "moves/s" in str(LoadReport(4, 1.0, (0.4, 0.1, 0.3, 0.2)))
+        shards = (ServerStats(1, 2, 1.0, 0.1, 0.2), ServerStats(1, 2, 1.0, 0.1, 0.2))
+        assert "shard 1:" in str(LoadReport(4, 1.0, (0.1,), shards))
+
+
+def test_request() -> None:
+    """Test a request that fails raises."""
+
+    async def failing_request() -> None:
+        server = GameServer(port=0)
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            await request(reader, writer, {"type": "unknown"})
+        finally:
+            writer.close()
+            await writer.wait_closed()
+            await server.stop()
+
+    with pytest.raises(RuntimeError, match="Server error"):
+        asyncio.run(failing_request())
+
+
+def test_run_client() -> None:
+    """Test a client makes its moves."""
+
+    async def run() -> list[float]:
+        server = GameServer(port=0)
+        port = await server.start()
+        try:
+            return await run_client("127.0.0.1", port, 20, seed=1)
+        finally:
+            await server.stop()
+
+    expected = 20
+    assert len(asyncio.run(run())) == expected
+
+
+def test_get_server_stats() -> None:
+    """Test fetching the stats of a server without shards."""
+
+    async def get_stats() -> tuple[ServerStats, ...]:
+        server = GameServer(port=0)
+        port = await server.start()
+        try:
+            return await get_server_stats("127.0.0.1", port)
+        finally:
+            await server.stop()
+
+    (stats,) = asyncio.run(get_stats())
+    assert stats.moves == 0
+
+
+def test_run_load() -> None:
+    """Test running concurrent clients."""
+
+    async def run() -> LoadReport:
+        server = GameServer(port=0)
+        port = await server.start()
+        try:
+            return await run_load("127.0.0.1", port, clients=3, moves_per_client=5)
+        finally:
+            await server.stop()
+
+    report = asyncio.run(run())
+    expected = 15
+    assert report.moves == expected
+    assert report.shards[0].moves == expected
+
+
+def test_run_local_load() -> None:
+    """Test running the load against a local server."""
+    report = asyncio.run(run_local_load(clients=2, moves_per_client=5))
+    expected = 10
+    assert report.moves == expected
+    assert report.get_moves_per_second() > 0
+    report = asyncio.run(run_local_load(clients=2, moves_per_client=5, shards=2))
+    assert report.moves == expected
+    expected = 2
+    assert len(report.shards) == expected
+    assert sum(stats.moves for stats in report.shards) == report.moves
+
+
+def test_loadgen(mocker: MockerFixture) -> None:
+    """Test the blocking load generator."""
+    report = loadgen(clients=2, moves=3)
+    expected = 6
+    assert report.moves == expected
+    run_load_mock = mocker.patch(
+        "notty.src.server.loadgen.run_load",
+        mocker.AsyncMock(return_value=LoadReport(0, 0.0, ())),
+    )
+    loadgen("127.0.0.1", 1, 2, 3)
+    run_load_mock.assert_called_once_with("127.0.0.1", 1, 2, 3)
@@ -0,0 +1,103 @@
+"""Test protocol module."""
+
+import asyncio
+
+import pytest
+
+from notty.src.server.protocol import (
+    HEADER,
+    MAX_FRAME_SIZE,
+    MESSAGE,
+    NOTICE,
+    STATE,
+    decode_message,
+    encode_frame,
+    encode_message,
+    read_frame,
+    read_message,
+    write_message,
+)
+
+
+def test_encode_frame() -> None:
+    """Test prefixing a body with its length and frame type."""
+    assert encode_frame(b"\x01\x02") == HEADER.pack(2, MESSAGE) + b"\x01\x02"
+    assert encode_frame(b"\x01", STATE) == HEADER.pack(1, STATE) + b"\x01"
+
+
+def test_encode_message() -> None:
+    """Test encoding a message into a frame."""
+    frame = encode_message({"type": "state"})
+    length, frame_type = HEADER.unpack(frame[: HEADER.size])
+    assert length == len(frame) - HEADER.size
+    assert frame_type == MESSAGE
+    assert encode_message({"type": "closed"}, NOTICE)[HEADER.size - 1] == NOTICE
+
+
+def test_decode_message() -> None:
+    """Test decoding the body of a frame."""
+    frame = encode_message({"type": "state", "table": 1})
+    assert decode_message(frame[HEADER.size :]) == {"type": "state", "table": 1}
+    with pytest.raises(TypeError, match="JSON object"):
+        decode_message(b"[1, 2]")
+
+
+def test_read_frame() -> None:
+    """Test reading typed frames from a stream."""
+
+    async def read_all(data: bytes) -> list[tuple[int, bytes] | None]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [await read_frame(reader), await read_frame(reader)]
+
+    assert asyncio.run(read_all(encode_frame(b"\x01", STATE))) == [
+        (STATE, b"\x01"),
+        None,
+    ]
+    with pytest.raises(ValueError, match="Unknown frame type"):
+        asyncio.run(read_all(HEADER.pack(1, 0) + b"\x01"))
+
+
+def test_read_message() -> None:
+    """Test reading messages from a stream."""
+
+    async def read_all(data: bytes) -> list[dict[str, object] | None]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [await read_message(reader), await read_message(reader)]
+
+    frame = encode_message({"type": "state"})
+    assert asyncio.run(read_all(frame)) == [{"type": "state"}, None]
+    # a truncated frame counts as a closed stream
+    assert asyncio.run(read_all(frame[:-1])) == [None, None]
+    with pytest.raises(ValueError, match="exceeds the maximum"):
+        asyncio.run(read_all(HEADER.pack(MAX_FRAME_SIZE + 1, MESSAGE)))
+    with pytest.raises(ValueError, match="Expected a message frame"):
+        asyncio.run(read_all(encode_frame(b"\x01", STATE)))
+
+
+def test_write_message() -> None:
+    """Test writing a message to a stream."""
+
+    async def echo() -> dict[str, object] | None:
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            message = await read_message(reader)
+            if message is not None:
+                await write_message(writer, message)
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await write_message(writer, {"type": "ping"})
+        answer = await read_message(reader)
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return answer
+
+    assert asyncio.run(echo()) == {"type": "ping"}
@@ -0,0 +1,415 @@
+"""Test server module."""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src.game import Action, Game, Move
+from notty.src.server.protocol import (
+    NOTICE,
+    STATE,
+    decode_message,
+    read_frame,
+    read_message,
+    write_message,
+)
+from notty.src.server.server import GameServer, ServerStats, run_server, serve
+from notty.src.server.sync import StateDecoder, SyncState
+from notty.src.server.table import Table
+
+
+def make_create(*seats: str) -> dict[str, Any]:
+    """Make a create request."""
+    return {"type": "create", "seats": list(seats)}
+
+
+class TestServerStats:
+    """Test ServerStats class."""
+
+    def test___delattr__(self) -> None:
+        """Test stats are frozen (cannot delete attributes)."""
+        stats = ServerStats(1, 2, 1.0, 0.1, 0.2)
+        with pytest.raises(AttributeError):
+            del stats.moves
+
+    def test___eq__(self) -> None:
+        """Test stats equality."""
+        assert ServerStats(1, 2, 1.0, 0.1, 0.2) == ServerStats(1, 2, 1.0, 0.1, 0.2)
+
+    def test___hash__(self) -> None:
+        """Test stats are hashable."""
+        assert isinstance(hash(ServerStats(1, 2, 1.0, 0.1, 0.2)), int)
+
+    def test___init__(self) -> None:
+        """Test stats initialization."""
+        stats = ServerStats(1, 2, 1.0, 0.1, 0.2)
+        expected = 2
+        assert stats.moves == expected
+
+    def test___setattr__(self) -> None:
+        """Test stats are frozen (cannot set attributes)."""
+        stats = ServerStats(1, 2, 1.0, 0.1, 0.2)
+        with pytest.raises(AttributeError):
+            stats.moves = 3  # type: ignore[misc]
+
+    def test___repr__(self) -> None:
+        """Test stats repr."""
+        assert "ServerStats" in repr(ServerStats(1, 2, 1.0, 0.1, 0.2))
+
+    def test___str__(self) -> None:
+        """Test the summary."""
+        assert "2 moves/s" in str(ServerStats(1, 2, 1.0, 0.1, 0.2))
+
+    def test_merge(self) -> None:
+        """Test merging sums the counts and keeps the worst latencies."""
+        merged = ServerStats.merge(
+            [ServerStats(1, 2, 1.0, 0.1, 0.2), ServerStats(3, 4, 2.0, 0.3, 0.1)]
+        )
+        assert merged == ServerStats(4, 6, 2.0, 0.3, 0.2)
+        assert ServerStats.merge([]) == ServerStats(0, 0, 0.0, 0.0, 0.0)
+
+    def test_get_moves_per_second(self) -> None:
+        """Test the throughput."""
+        expected = 4.0
+        assert ServerStats(1, 8, 2.0, 0.1, 0.2).get_moves_per_second() == expected
+        assert ServerStats(1, 8, 0.0, 0.1, 0.2).get_moves_per_second() == 0.0
+
+    def test_to_dict(self) -> None:
+        """Test converting the stats to a dict."""
+        assert ServerStats(1, 2, 1.0, 0.1, 0.2).to_dict()["tables"] == 1
+
+    def test_from_dict(self) -> None:
+        """Test the dict round trip."""
+        stats = ServerStats(1, 2, 1.0, 0.1, 0.2)
+        assert ServerStats.from_dict(stats.to_dict()) == stats
+
+
+class TestGameServer:
+    """Test GameServer class."""
+
+    def test___init__(self) -> None:
+        """Test server initialization."""
+        server = GameServer(port=0)
+        assert server.tables == {}
+        assert server.server is None
+
+    def test_start(self) -> None:
+        """Test starting the server on a free port."""
+
+        async def start() -> int:
+            server = GameServer(port=0)
+            port = await server.start()
+            await server.stop()
+            return port
+
+        assert asyncio.run(start()) > 0
+
+    def test_serve_forever(self) -> None:
+        """Test serving until cancelled."""
+
+        async def serve_briefly() -> bool:
+            server = GameServer(port=0)
+            task = asyncio.create_task(server.serve_forever())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return task.cancelled()
+
+        assert asyncio.run(serve_briefly())
+
+    def test_stop(self) -> None:
+        """Test stopping the server."""
+
+        async def stop() -> GameServer:
+            server = GameServer(port=0)
+            await server.stop()
+            await server.start()
+            await server.stop()
+            return server
+
+        assert asyncio.run(stop()).server is None
+
+    def test_handle_client(self) -> None:
+        """Test a client session over TCP."""
+
+        async def session() -> tuple[list[dict[str, Any] | None], GameServer]:
+            server = GameServer(port=0)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            answers = []
+            for message in [make_create(Table.HUMAN, "random"), {"type": "?"}]:
+                await write_message(writer, message)
+                answers.append(await asyncio.wait_for(read_message(reader), 5))
+            assert len(server.tables) == 1
+            writer.close()
+            await writer.wait_closed()
+            # the server closes the tables of the client once it sees the EOF
+            for _ in range(100):
+                if not server.tables:
+                    break
+                await asyncio.sleep(0.01)
+            await server.stop()
+            return answers, server
+
+        (created, error), server = asyncio.run(session())
+        assert server.tables == {}
+        assert server.owned == {}
+        assert created is not None
+        assert created["type"] == "state"
+        assert error is not None
+        assert error["type"] == "error"
+
+    def test_handle_message(self) -> None:
+        """Test dispatching requests."""
+        server = GameServer(port=0)
+        answer = asyncio.run(server.handle_message({"type": "state", "table": 42}))
+        assert answer is not None
+        assert answer["type"] == "error"
+        assert "Unknown table" in answer["message"]
+        answer = asyncio.run(server.handle_message({"type": "unknown"}))
+        assert answer is not None
+        assert answer["type"] == "error"
+        created = asyncio.run(server.create_table(make_create(Table.HUMAN, "random")))
+        answer = asyncio.run(
+            server.handle_message({"type": "watch", "table": created["table"]})
+        )
+        assert answer is not None
+        assert "needs a connection" in answer["message"]
+
+    def test_create_table(self, mocker: MockerFixture) -> None:
+        """Test creating a table."""
+        server = GameServer(port=0)
+        owner = mocker.MagicMock(spec=asyncio.StreamWriter)
+        answer = asyncio.run(
+            server.create_table(make_create("random", Table.HUMAN), owner)
+        )
+        assert server.owned == {owner: {answer["table"]}}
+        assert server.tables[answer["table"]].owner is owner
+        # the bot in the first seat already played its turn
+        assert (
+            answer["state"]["current_player_index"] == 1
+            or (answer["state"]["game_over"])
+        )
+        assert answer["table"] in server.tables
+
+    def test_get_new_table_id(self) -> None:
+        """Test ids are allocated or taken from the request."""
+        server = GameServer(port=0)
+        assert server.get_new_table_id({}) == 1
+        expected = 7
+        assert server.get_new_table_id({"table": 7}) == expected
+        server.add_table(Table(2, [Table.HUMAN, "random"]))
+        expected = 3
+        assert server.get_new_table_id({}) == expected
+        with pytest.raises(ValueError, match="already exists"):
+            server.get_new_table_id({"table": 2})
+
+    def test_add_table(self) -> None:
+        """Test hosting a table."""
+        server = GameServer(port=0)
+        table = server.add_table(Table(5, [Table.HUMAN, "random"]))
+        assert server.tables == {5: table}
+
+    def test_make_move(self) -> None:
+        """Test making a move with bots in a worker pool."""
+
+        async def play() -> dict[str, Any]:
+            with ThreadPoolExecutor(2) as executor:
+                server = GameServer(port=0, executor=executor)
+                created = await server.create_table(make_create(Table.HUMAN, "greedy"))
+                return await server.make_move(
+                    {
+                        "type": "move",
+                        "table": created["table"],
+                        "move": Move(Move.END_TURN).to_dict(),
+                    }
+                )
+
+        answer = asyncio.run(play())
+        assert (
+            answer["state"]["current_player_index"] == 0
+            or (answer["state"]["game_over"])
+        )
+
+    def test_get_table_state(self) -> None:
+        """Test getting the state of a table."""
+        server = GameServer(port=0)
+        created = asyncio.run(server.create_table(make_create(Table.HUMAN, "random")))
+        answer = asyncio.run(
+            server.get_table_state({"type": "state", "table": created["table"]})
+        )
+        assert answer["state"] == created["state"]
+
+    def test_close_table(self) -> None:
+        """Test closing a table."""
+        server = GameServer(port=0)
+        created = asyncio.run(server.create_table(make_create(Table.HUMAN, "random")))
+        answer = asyncio.run(
+            server.close_table({"type": "close", "table": created["table"]})
+        )
+        assert answer["type"] == "closed"
+        assert server.tables == {}
+
+    def test_remove_table(self, mocker: MockerFixture) -> None:
+        """Test removing a table without spectators."""
+        server = GameServer(port=0)
+        created = asyncio.run(server.create_table(make_create(Table.HUMAN, "random")))
+        server.remove_table(server.tables[created["table"]])
+        assert server.tables == {}
+        owner = mocker.MagicMock(spec=asyncio.StreamWriter)
+        created = asyncio.run(
+            server.create_table(make_create(Table.HUMAN, Table.HUMAN), owner)
+        )
+        server.remove_table(server.tables[created["table"]])
+        assert server.owned == {owner: set()}
+
+    def test_export_table(self) -> None:
+        """Test exporting removes the table and returns its game."""
+        server = GameServer(port=0)
+        created = asyncio.run(server.create_table(make_create(Table.HUMAN, "random")))
+        exported = asyncio.run(
+            server.export_table({"type": "export", "table": created["table"]})
+        )
+        assert exported["type"] == "exported"
+        # the export keeps the deck order, the state message only its size
+        game = Game.from_dict(exported["state"])
+        assert game.to_public_dict() == created["state"]
+        assert server.tables == {}
+
+    def test_import_table(self) -> None:
+        """Test an exported table continues on another server."""
+        source, target = GameServer(port=0), GameServer(port=0)
+        created = asyncio.run(source.create_table(make_create(Table.HUMAN, "random")))
+        exported = asyncio.run(
+            source.export_table({"type": "export", "table": created["table"]})
+        )
+        answer = asyncio.run(target.import_table({**exported, "type": "import"}))
+        assert answer == {"type": "imported", "table": created["table"]}
+        state = asyncio.run(
+            target.get_table_state({"type": "state", "table": created["table"]})
+        )
+        assert state["state"] == created["state"]
+        assert state["legal_moves"] == created["legal_moves"]
+
+    def test_get_stats(self) -> None:
+        """Test the stats count moves and tables."""
+        server = GameServer(port=0)
+        created = asyncio.run(server.create_table(make_create(Table.HUMAN, "random")))
+        asyncio.run(
+            server.make_move(
+                {
+                    "type": "move",
+                    "table": created["table"],
+                    "move": Move(Move.END_TURN).to_dict(),
+                }
+            )
+        )
+        stats = server.get_stats()
+        assert stats.tables == stats.moves == 1
+        assert stats.p99 > 0
+
+    def test_get_stats_message(self) -> None:
+        """Test answering a stats request."""
+        server = GameServer(port=0)
+        answer = asyncio.run(server.handle_message({"type": "stats"}))
+        assert answer is not None
+        assert answer["type"] == "stats"
+        assert ServerStats.from_dict(answer).moves == 0
+
+    def test_watch_table(self) -> None:
+        """Test a spectator receives a snapshot, deltas and the close notice."""
+
+        async def watch() -> list[SyncState | None]:
+            server = GameServer(port=0)
+            port = await server.start()
+            created = await server.create_table(make_create(Table.HUMAN, "greedy"))
+            table_id = created["table"]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await write_message(writer, {"type": "watch", "table": table_id})
+            answer = await asyncio.wait_for(read_message(reader), 5)
+            assert answer == {"type": "watching", "table": table_id}
+            decoder = StateDecoder()
+            states = []
+            snapshot = await asyncio.wait_for(read_frame(reader), 5)
+            assert snapshot is not None
+            assert snapshot[0] == STATE
+            states.append(decoder.decode(snapshot[1]))
+            for move in [Move(Action.DRAW, count=1), Move(Move.END_TURN)]:
+                await server.make_move(
+                    {"type": "move", "table": table_id, "move": move.to_dict()}
+                )
+            # a delta for the draw, the end of the turn and the turn of the bot,
+            # which always changes the state because greedy draws every turn
+            for _ in range(3):
+                delta = await asyncio.wait_for(read_frame(reader), 5)
+                assert delta is not None
+                assert delta[0] == STATE
+                states.append(decoder.decode(delta[1]))
+            expected = SyncState.from_game(server.tables[table_id].game)
+            assert states[-1] == expected
+            await server.close_table({"type": "close", "table": table_id})
+            closed = await asyncio.wait_for(read_frame(reader), 5)
+            assert closed is not None
+            assert closed[0] == NOTICE
+            assert decode_message(closed[1]) == {"type": "closed", "table": table_id}
+            assert all(table_id not in ids for ids in server.watching.values())
+            writer.close()
+            await writer.wait_closed()
+            await server.stop()
+            return states
+
+        snapshot, drawn, *_ = asyncio.run(watch())
+        assert snapshot is not None
+        assert drawn is not None
+        assert drawn.hands[0].total() == snapshot.hands[0].total() + 1
+
+    def test_get_table(self) -> None:
+        """Test getting a table by id."""
+        server = GameServer(port=0)
+        created = asyncio.run(server.create_table(make_create(Table.HUMAN, "random")))
+        table = server.get_table({"table": created["table"]})
+        assert table.table_id == created["table"]
+
+    def test_play_bot_turns(self) -> None:
+        """Test bots play until a human is to move."""
+        server = GameServer(port=0)
+        table = Table(1, [Table.HUMAN, "random", "greedy"])
+        table.game.next_turn()
+        asyncio.run(server.play_bot_turns(table))
+        assert not table.is_bot_turn()
+
+    def test_play_bot_turns_in_process_pool(self) -> None:
+        """Test bots play in spawned worker processes like in run_server."""
+
+        async def play() -> Table:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                server = GameServer(port=0, executor=executor)
+                table = Table(1, [Table.HUMAN, "random", "greedy"])
+                table.game.next_turn()
+                await server.play_bot_turns(table)
+                return table
+
+        table = asyncio.run(play())
+        assert not table.is_bot_turn()
+        assert table.game.current_player_index == 0 or table.game.game_over
+
+
+def test_run_server(mocker: MockerFixture) -> None:
+    """Test running the server."""
+    serve_forever = mocker.patch.object(GameServer, "serve_forever")
+    asyncio.run(run_server(port=0))
+    serve_forever.assert_called_once()
+
+
+def test_serve(mocker: MockerFixture) -> None:
+    """Test the blocking serve function."""
+    run_server_mock = mocker.patch(
+        "notty.src.server.server.run_server", mocker.AsyncMock()
+    )
+    serve(port=0)
+    run_server_mock.assert_called_once_with("127.0.0.1", 0, 0)
@@ -0,0 +1,548 @@
+"""Test supervisor module."""
+
+import asyncio
+import contextlib
+import multiprocessing
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src.game import Move
+from notty.src.server.loadgen import request
+from notty.src.server.protocol import NOTICE, STATE, decode_message, read_frame
+from notty.src.server.server import GameServer
+from notty.src.server.supervisor import (
+    ClientSession,
+    Shard,
+    Supervisor,
+    run_shard,
+    run_supervisor,
+    serve_shard,
+    supervise,
+)
+from notty.src.server.table import Table
+
+CREATE = {"type": "create", "seats": [Table.HUMAN, "random"]}
+
+
+@contextlib.asynccontextmanager
+async def local_supervisor(
+    mocker: MockerFixture, shards: int = 2
+) -> AsyncIterator[tuple[Supervisor, list[GameServer]]]:
+    """Run a supervisor whose shards are servers on this event loop."""
+    servers = []
+    supervisor = Supervisor(port=0, shards=shards)
+    for i in range(shards):
+        server = GameServer(port=0)
+        port = await server.start()
+        control = await asyncio.open_connection("127.0.0.1", port)
+        supervisor.shards.append(
+            Shard(i, "127.0.0.1", port, mocker.MagicMock(), control)
+        )
+        servers.append(server)
+    await supervisor.start()
+    try:
+        yield supervisor, servers
+    finally:
+        await supervisor.stop()
+        for server in servers:
+            await server.stop()
+
+
+@contextlib.asynccontextmanager
+async def connect(
+    supervisor: Supervisor,
+) -> AsyncIterator[tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+    """Connect a client to a supervisor."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", supervisor.port)
+    try:
+        yield reader, writer
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def wait_until_closed(server: GameServer) -> None:
+    """Wait until a server closed all its tables."""
+    for _ in range(100):
+        if not server.tables:
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_run_shard(mocker: MockerFixture) -> None:
+    """Test the worker process entry point serves a shard."""
+    serve_shard_mock = mocker.patch(
+        "notty.src.server.supervisor.serve_shard", mocker.AsyncMock()
+    )
+    connection = mocker.MagicMock()
+    run_shard("127.0.0.1", connection)
+    serve_shard_mock.assert_called_once_with("127.0.0.1", connection)
+
+
+def test_serve_shard(mocker: MockerFixture) -> None:
+    """Test the shard sends the port of its server."""
+    mocker.patch.object(GameServer, "serve_forever", mocker.AsyncMock())
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    asyncio.run(serve_shard("127.0.0.1", sender))
+    assert receiver.recv() > 0
+
+
+class TestShard:
+    """Test Shard class."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test shard initialization."""
+        control = (mocker.MagicMock(), mocker.MagicMock())
+        shard = Shard(1, "127.0.0.1", 5, mocker.MagicMock(), control)
+        assert shard.index == 1
+        assert shard.tables == 0
+        assert shard.writer is control[1]
+
+    def test_spawn(self) -> None:
+        """Test a spawned shard serves requests until stopped."""
+
+        async def spawn() -> tuple[dict[str, Any], Shard]:
+            shard = await Shard.spawn(0)
+            try:
+                return await shard.request({"type": "stats"}), shard
+            finally:
+                await shard.stop()
+
+        answer, shard = asyncio.run(spawn())
+        assert answer["type"] == "stats"
+        assert not shard.process.is_alive()
+
+    def test_request(self, mocker: MockerFixture) -> None:
+        """Test control requests and their errors."""
+
+        async def requests() -> dict[str, Any]:
+            async with local_supervisor(mocker, 1) as (supervisor, _):
+                shard = supervisor.shards[0]
+                with pytest.raises(ValueError, match="Unknown table"):
+                    await shard.request({"type": "state", "table": 1})
+                return await shard.request({"type": "stats"})
+
+        assert asyncio.run(requests())["type"] == "stats"
+
+    def test_stop(self, mocker: MockerFixture) -> None:
+        """Test stopping closes the connection and terminates the process."""
+
+        async def stop() -> Shard:
+            async with local_supervisor(mocker, 1) as (supervisor, _):
+                return supervisor.shards[0]
+
+        shard = asyncio.run(stop())
+        assert shard.writer.is_closing()
+        shard.process.terminate.assert_called_once()  # type: ignore[attr-defined]
+
+
+class TestClientSession:
+    """Test ClientSession class."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test session initialization."""
+        session = ClientSession(mocker.MagicMock())
+        assert session.upstreams == {}
+        assert session.tables == set()
+
+    def test_forward(self, mocker: MockerFixture) -> None:
+        """Test forwarding opens one connection per shard."""
+
+        async def forward() -> list[dict[str, Any]]:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                answers = [
+                    await session.forward(shard, {"type": "stats"})
+                    for shard in [*supervisor.shards, supervisor.shards[0]]
+                ]
+                assert len(session.upstreams) == len(supervisor.shards)
+                await session.close()
+                return answers
+
+        assert all(answer["type"] == "stats" for answer in asyncio.run(forward()))
+
+    def test_relay(self, mocker: MockerFixture) -> None:
+        """Test all frames are relayed to the client in order."""
+
+        async def relay() -> list[bytes]:
+            writer = mocker.MagicMock()
+            writer.is_closing.return_value = False
+            writer.drain = mocker.AsyncMock()
+            session = ClientSession(writer)
+            session.answers[0] = asyncio.Queue()
+            reader = asyncio.StreamReader()
+            reader.feed_data(
+                b"".join(
+                    [
+                        b"\x00\x00\x00\x02\x01{}",
+                        b"\x00\x00\x00\x01\x02\x07",
+                    ]
+                )
+            )
+            reader.feed_eof()
+            await session.relay(0, reader)
+            assert session.answers[0].get_nowait() == {}
+            # the end of the connection wakes up a waiting request
+            assert session.answers[0].get_nowait() is None
+            return [call.args[0] for call in writer.write.call_args_list]
+
+        assert asyncio.run(relay()) == [
+            b"\x00\x00\x00\x02\x01{}",
+            b"\x00\x00\x00\x01\x02\x07",
+        ]
+
+    def test_close(self, mocker: MockerFixture) -> None:
+        """Test closing ends all relays."""
+
+        async def close() -> ClientSession:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                await session.forward(supervisor.shards[0], {"type": "stats"})
+                await session.close()
+                return session
+
+        session = asyncio.run(close())
+        assert all(relay.done() for relay in session.relays)
+
+
+class TestSupervisor:
+    """Test Supervisor class."""
+
+    def test___init__(self) -> None:
+        """Test supervisor initialization."""
+        supervisor = Supervisor(port=0, shards=3)
+        expected = 3
+        assert supervisor.num_shards == expected
+        assert supervisor.shards == []
+        assert Supervisor(port=0).num_shards >= 1
+
+    def test_start(self) -> None:
+        """Test starting spawns the shards."""
+
+        async def start() -> tuple[int, int]:
+            supervisor = Supervisor(port=0, shards=1)
+            port = await supervisor.start()
+            shards = len(supervisor.shards)
+            await supervisor.stop()
+            return port, shards
+
+        port, shards = asyncio.run(start())
+        assert port > 0
+        assert shards == 1
+
+    def test_serve_forever(self, mocker: MockerFixture) -> None:
+        """Test serving until cancelled."""
+
+        async def serve_briefly() -> bool:
+            async with local_supervisor(mocker, 1) as (supervisor, _):
+                task = asyncio.create_task(supervisor.serve_forever())
+                await asyncio.sleep(0.05)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return task.cancelled()
+
+        assert asyncio.run(serve_briefly())
+
+    def test_stop(self, mocker: MockerFixture) -> None:
+        """Test stopping the supervisor and its shards."""
+
+        async def stop() -> Supervisor:
+            async with local_supervisor(mocker, 1) as (supervisor, _):
+                pass
+            return supervisor
+
+        supervisor = asyncio.run(stop())
+        assert supervisor.server is None
+        assert supervisor.shards == []
+
+    def test_handle_client(self, mocker: MockerFixture) -> None:
+        """Test a client plays over the supervisor and its tables close."""
+
+        async def session() -> list[GameServer]:
+            async with local_supervisor(mocker) as (supervisor, servers):
+                async with connect(supervisor) as (reader, writer):
+                    for _ in range(2):
+                        created = await request(reader, writer, CREATE)
+                        await request(
+                            reader,
+                            writer,
+                            {
+                                "type": "move",
+                                "table": created["table"],
+                                "move": Move(Move.END_TURN).to_dict(),
+                            },
+                        )
+                    assert all(len(server.tables) == 1 for server in servers)
+                for server in servers:
+                    await wait_until_closed(server)
+                assert supervisor.routes == {}
+                return servers
+
+        servers = asyncio.run(session())
+        assert all(server.tables == {} for server in servers)
+        assert sum(server.moves for server in servers) == len(servers)
+
+    def test_handle_message(self, mocker: MockerFixture) -> None:
+        """Test dispatching requests and errors."""
+
+        async def handle() -> list[dict[str, Any]]:
+            async with local_supervisor(mocker, 1) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                answers = []
+                messages: list[dict[str, Any]] = [
+                    {"type": "unknown"},
+                    {"type": "export", "table": 1},
+                    {"type": "state", "table": 1},
+                    {"type": "move"},
+                ]
+                for message in messages:
+                    answer = await supervisor.handle_message(message, session)
+                    assert answer is not None
+                    answers.append(answer)
+                await session.close()
+                return answers
+
+        unknown, export, state, move = asyncio.run(handle())
+        assert "Unknown type" in unknown["message"]
+        # tables only move between shards through migrate requests
+        assert "Unknown type" in export["message"]
+        assert "Unknown table" in state["message"]
+        assert move["type"] == "error"
+
+    def test_create_table(self, mocker: MockerFixture) -> None:
+        """Test new tables spread over the shards."""
+
+        async def create() -> tuple[list[int], dict[str, Any]]:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                for _ in range(4):
+                    await supervisor.create_table(CREATE, session)
+                failed = await supervisor.create_table(
+                    {"type": "create", "seats": ["random", "random"]}, session
+                )
+                loads = [shard.tables for shard in supervisor.shards]
+                assert session.tables == {1, 2, 3, 4}
+                await session.close()
+                return loads, failed
+
+        loads, failed = asyncio.run(create())
+        assert loads == [2, 2]
+        assert failed["type"] == "error"
+
+    def test_forward_request(self, mocker: MockerFixture) -> None:
+        """Test requests reach the shard of their table."""
+
+        async def forward() -> Supervisor:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                created = await supervisor.create_table(CREATE, session)
+                message = {"type": "state", "table": created["table"]}
+                state = await supervisor.forward_request(message, session)
+                assert state["state"] == created["state"]
+                message = {"type": "close", "table": created["table"]}
+                closed = await supervisor.forward_request(message, session)
+                assert closed["type"] == "closed"
+                await session.close()
+                return supervisor
+
+        supervisor = asyncio.run(forward())
+        assert supervisor.routes == {}
+        assert supervisor.locks == {}
+
+    def test_forward_request_unknown(self, mocker: MockerFixture) -> None:
+        """Test requests about unknown tables leave no lock behind."""
+        supervisor = Supervisor(port=0, shards=1)
+        session = ClientSession(mocker.MagicMock())
+        for table_id in range(3):
+            message = {"type": "state", "table": table_id}
+            with pytest.raises(ValueError, match="Unknown table"):
+                asyncio.run(supervisor.forward_request(message, session))
+        assert supervisor.locks == {}
+
+    def test_get_lock(self, mocker: MockerFixture) -> None:
+        """Test every routed table has one lock and others none."""
+        supervisor = Supervisor(port=0, shards=1)
+        control = (mocker.MagicMock(), mocker.MagicMock())
+        shard = Shard(0, "127.0.0.1", 1, mocker.MagicMock(), control)
+        supervisor.routes.update({1: shard, 2: shard})
+        assert supervisor.get_lock(1) is supervisor.get_lock(1)
+        assert supervisor.get_lock(1) is not supervisor.get_lock(2)
+        with pytest.raises(ValueError, match="Unknown table"):
+            supervisor.get_lock(3)
+        assert list(supervisor.locks) == [1, 2]
+
+    def test_get_shard(self, mocker: MockerFixture) -> None:
+        """Test getting the shard of a table."""
+        supervisor = Supervisor(port=0, shards=1)
+        control = (mocker.MagicMock(), mocker.MagicMock())
+        shard = Shard(0, "127.0.0.1", 1, mocker.MagicMock(), control)
+        supervisor.routes[3] = shard
+        assert supervisor.get_shard(3) is shard
+        with pytest.raises(ValueError, match="Unknown table"):
+            supervisor.get_shard(4)
+
+    def test_drop_route(self, mocker: MockerFixture) -> None:
+        """Test forgetting a table."""
+        supervisor = Supervisor(port=0, shards=1)
+        control = (mocker.MagicMock(), mocker.MagicMock())
+        shard = Shard(0, "127.0.0.1", 1, mocker.MagicMock(), control)
+        shard.tables = 1
+        supervisor.routes[3] = shard
+        supervisor.get_lock(3)
+        supervisor.drop_route(3)
+        supervisor.drop_route(3)
+        assert shard.tables == 0
+        assert supervisor.routes == {}
+        assert supervisor.locks == {}
+
+    def test_migrate_table(self, mocker: MockerFixture) -> None:
+        """Test a live table moves to another shard with its spectators."""
+
+        async def migrate() -> tuple[dict[str, Any], dict[str, Any]]:
+            async with local_supervisor(mocker) as (supervisor, servers):
+                async with connect(supervisor) as (reader, writer):
+                    created = await request(reader, writer, CREATE)
+                    table_id = created["table"]
+                    source = supervisor.get_shard(table_id).index
+                    target = 1 - source
+                    watch = {"type": "watch", "table": table_id}
+                    await request(reader, writer, watch)
+                    snapshot = await asyncio.wait_for(read_frame(reader), 5)
+                    assert snapshot is not None
+                    assert snapshot[0] == STATE
+                    await supervisor.migrate_table(table_id, target)
+                    notice = await asyncio.wait_for(read_frame(reader), 5)
+                    assert notice is not None
+                    assert notice[0] == NOTICE
+                    assert decode_message(notice[1])["type"] == "moved"
+                    assert table_id in servers[target].tables
+                    assert table_id not in servers[source].tables
+                    with pytest.raises(ValueError, match="Unknown shard"):
+                        await supervisor.migrate_table(table_id, 2)
+                    # migrating to the hosting shard does nothing
+                    await supervisor.migrate_table(table_id, target)
+                    state = {"type": "state", "table": table_id}
+                    moved = await request(reader, writer, state)
+                # the table has no owner on its new shard,
+                # the supervisor still closes it for the client
+                await wait_until_closed(servers[target])
+                assert supervisor.routes == {}
+                return created, moved
+
+        created, moved = asyncio.run(migrate())
+        assert moved["state"] == created["state"]
+        assert moved["legal_moves"] == created["legal_moves"]
+
+    def test_migrate_request(self, mocker: MockerFixture) -> None:
+        """Test answering a migrate request."""
+
+        async def migrate() -> dict[str, Any]:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                created = await supervisor.create_table(CREATE, session)
+                target = 1 - supervisor.get_shard(created["table"]).index
+                answer = await supervisor.handle_message(
+                    {"type": "migrate", "table": created["table"], "shard": target},
+                    session,
+                )
+                assert supervisor.get_shard(created["table"]).index == target
+                await session.close()
+                assert answer is not None
+                return answer
+
+        assert asyncio.run(migrate())["type"] == "migrated"
+
+    def test_rebalance(self, mocker: MockerFixture) -> None:
+        """Test tables move until the shards are balanced."""
+
+        async def rebalance() -> tuple[int, list[int]]:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                for _ in range(4):
+                    await supervisor.create_table(CREATE, session)
+                for table_id in list(supervisor.routes):
+                    await supervisor.migrate_table(table_id, 0)
+                moved = await supervisor.rebalance()
+                loads = [shard.tables for shard in supervisor.shards]
+                await session.close()
+                return moved, loads
+
+        moved, loads = asyncio.run(rebalance())
+        expected = 2
+        assert moved == expected
+        assert loads == [2, 2]
+
+    def test_rebalance_request(self, mocker: MockerFixture) -> None:
+        """Test answering a rebalance request."""
+
+        async def rebalance() -> dict[str, Any]:
+            async with local_supervisor(mocker) as (supervisor, _):
+                return await supervisor.rebalance_request({"type": "rebalance"})
+
+        assert asyncio.run(rebalance()) == {"type": "rebalanced", "moved": 0}
+
+    def test_get_stats(self, mocker: MockerFixture) -> None:
+        """Test getting the stats of every shard."""
+
+        async def get_stats() -> list[int]:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                await supervisor.create_table(CREATE, session)
+                stats = await supervisor.get_stats()
+                await session.close()
+                return [s.tables for s in stats]
+
+        assert sorted(asyncio.run(get_stats())) == [0, 1]
+
+    def test_get_stats_message(self, mocker: MockerFixture) -> None:
+        """Test the stats message merges the shards."""
+
+        async def get_stats() -> dict[str, Any]:
+            async with local_supervisor(mocker) as (supervisor, _):
+                session = ClientSession(mocker.MagicMock())
+                await supervisor.create_table(CREATE, session)
+                await supervisor.create_table(CREATE, session)
+                answer = await supervisor.get_stats_message({"type": "stats"})
+                await session.close()
+                return answer
+
+        answer = asyncio.run(get_stats())
+        expected = 2
+        assert answer["tables"] == expected
+        assert len(answer["shards"]) == expected
+
+    def test_close_tables(self, mocker: MockerFixture) -> None:
+        """Test the tables of a client are closed, even after a migration."""
+
+        async def close() -> list[GameServer]:
+            async with local_supervisor(mocker) as (supervisor, servers):
+                session = ClientSession(mocker.MagicMock())
+                created = await supervisor.create_table(CREATE, session)
+                target = 1 - supervisor.get_shard(created["table"]).index
+                await supervisor.migrate_table(created["table"], target)
+                await supervisor.close_tables(session)
+                assert supervisor.routes == {}
+                assert session.tables == set()
+                await session.close()
+                return servers
+
+        assert all(server.tables == {} for server in asyncio.run(close()))
+
+
+def test_run_supervisor(mocker: MockerFixture) -> None:
+    """Test running the supervisor."""
+    serve_forever = mocker.patch.object(Supervisor, "serve_forever")
+    asyncio.run(run_supervisor(port=0, shards=1))
+    serve_forever.assert_called_once()
+
+
+def test_supervise(mocker: MockerFixture) -> None:
+    """Test the blocking supervise function."""
+    run_supervisor_mock = mocker.patch(
+        "notty.src.server.supervisor.run_supervisor", mocker.AsyncMock()
+    )
+    supervise(port=0, shards=2)
+    run_supervisor_mock.assert_called_once_with("127.0.0.1", 0, 2)
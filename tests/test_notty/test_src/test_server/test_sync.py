@@ -0,0 +1,353 @@
+"""Test sync module."""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from notty.src.card import Card
+from notty.src.game import Action, Game, Move
+from notty.src.player import Player
+from notty.src.server.protocol import MESSAGE, STATE, encode_frame, read_frame
+from notty.src.server.sync import (
+    DELTA,
+    FULL,
+    Broadcaster,
+    StateDecoder,
+    StateEncoder,
+    SyncState,
+    decode_changes,
+    decode_hands,
+    decode_state,
+    encode_delta,
+    encode_full,
+    encode_header,
+)
+
+
+def make_game() -> Game:
+    """Make a two player game."""
+    return Game([Player("P1", is_human=True), Player("P2", is_human=False)])
+
+
+class TestSyncState:
+    """Test SyncState class."""
+
+    def test___init__(self) -> None:
+        """Test state initialization."""
+        state = SyncState(1, 80, None, [Counter({3: 2})])
+        assert state.current_player == 1
+        expected = 2
+        assert state.hands[0][3] == expected
+
+    def test___eq__(self) -> None:
+        """Test state equality."""
+        assert SyncState(0, 1, None, [Counter()]) == SyncState(0, 1, None, [Counter()])
+        assert SyncState(0, 1, None, [Counter()]) != SyncState(0, 2, None, [Counter()])
+
+    def test___repr__(self) -> None:
+        """Test state repr."""
+        assert "SyncState" in repr(SyncState(0, 1, None, [Counter({1: 1})]))
+
+    def test_from_game(self) -> None:
+        """Test taking the state of a game."""
+        game = make_game()
+        state = SyncState.from_game(game)
+        assert state.deck_size == game.deck.size()
+        assert state.hands[0].total() == game.INITIAL_HAND_SIZE
+
+    def test_get_hand_changes(self) -> None:
+        """Test diffing hands by card id."""
+        old = SyncState(0, 1, None, [Counter({1: 2, 2: 1}), Counter()])
+        new = SyncState(0, 1, None, [Counter({1: 1, 3: 1}), Counter({2: 1})])
+        assert sorted(old.get_hand_changes(new)) == [
+            (0, 1, False),
+            (0, 2, False),
+            (0, 3, True),
+            (1, 2, True),
+        ]
+
+    def test_apply_hand_changes(self) -> None:
+        """Test applying hand changes."""
+        old = SyncState(0, 1, None, [Counter({1: 2, 2: 1}), Counter()])
+        new = SyncState(0, 1, None, [Counter({1: 1, 3: 1}), Counter({2: 1})])
+        old.apply_hand_changes(old.get_hand_changes(new))
+        assert old == new
+
+    def test_copy(self) -> None:
+        """Test copies do not share hands."""
+        state = SyncState(0, 1, None, [Counter({1: 1})])
+        copy = state.copy()
+        copy.hands[0][1] += 1
+        assert state.hands[0][1] == 1
+
+
+def test_encode_header() -> None:
+    """Test encoding a frame header."""
+    header = encode_header(FULL, 7, SyncState(1, 80, None, [Counter(), Counter()]))
+    assert header[0] == FULL
+    expected = 7
+    assert decode_state(header + b"\x00\x00", None)[0] == expected
+
+
+def test_encode_full() -> None:
+    """Test a full snapshot round trip."""
+    state = SyncState.from_game(make_game())
+    seq, decoded = decode_state(encode_full(3, state), None)
+    expected = 3
+    assert seq == expected
+    assert decoded == state
+
+
+def test_encode_delta() -> None:
+    """Test a delta is small and round trips."""
+    game = make_game()
+    old = SyncState.from_game(game)
+    game.player_draws_multiple(2)
+    new = SyncState.from_game(game)
+    delta = encode_delta(2, old, new)
+    assert delta[0] == DELTA
+    assert len(delta) < len(encode_full(2, new))
+    assert decode_state(delta, old) == (2, new)
+
+
+def test_decode_hands() -> None:
+    """Test decoding the hands of a full snapshot."""
+    state = SyncState.from_game(make_game())
+    assert decode_hands(encode_full(1, state), len(state.hands)) == state.hands
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_hands(encode_full(1, state), len(state.hands) + 1)
+
+
+def test_decode_changes() -> None:
+    """Test decoding the hand changes of a delta."""
+    old = SyncState(0, 1, None, [Counter({1: 1}), Counter()])
+    new = SyncState(0, 1, None, [Counter(), Counter({1: 1})])
+    delta = encode_delta(1, old, new)
+    assert sorted(decode_changes(delta, 2)) == [(0, 1, False), (1, 1, True)]
+    with pytest.raises(ValueError, match="unknown player"):
+        decode_changes(delta, 1)
+
+
+def test_decode_state() -> None:
+    """Test decoding rejects malformed frames."""
+    state = SyncState.from_game(make_game())
+    with pytest.raises(ValueError, match="too short"):
+        decode_state(b"\x01", None)
+    with pytest.raises(ValueError, match="without a full snapshot"):
+        decode_state(encode_delta(1, state, state), None)
+    with pytest.raises(ValueError, match="Unknown state frame kind"):
+        decode_state(b"\x09" + encode_full(1, state)[1:], None)
+    game = make_game()
+    game.players[0].hand.cards = []
+    game.check_win_condition()
+    assert decode_state(encode_full(1, SyncState.from_game(game)), None)[1].winner == 0
+
+
+def test_decode_state_truncated() -> None:
+    """Test truncated and inconsistent frames raise ValueError."""
+    game = make_game()
+    old = SyncState.from_game(game)
+    game.player_draws_multiple(2)
+    new = SyncState.from_game(game)
+    full = encode_full(1, new)
+    delta = encode_delta(2, old, new)
+    # every cut inside the body of a frame is detected
+    for frame, base in [(full, None), (delta, old)]:
+        for end in range(len(encode_header(FULL, 1, new)), len(frame)):
+            with pytest.raises(ValueError, match="Truncated"):
+                decode_state(frame[:end], base)
+    with pytest.raises(ValueError, match="unknown player"):
+        decode_state(delta[:-2] + bytes([9, 0]), old)
+    with pytest.raises(ValueError, match="base has"):
+        decode_state(delta, SyncState(0, 1, None, [Counter()]))
+
+
+class TestStateEncoder:
+    """Test StateEncoder class."""
+
+    def test___init__(self) -> None:
+        """Test encoder initialization."""
+        encoder = StateEncoder(snapshot_interval=10)
+        assert encoder.seq == 0
+        assert encoder.state is None
+
+    def test_encode(self) -> None:
+        """Test snapshots, deltas and unchanged states."""
+        game = make_game()
+        encoder = StateEncoder(snapshot_interval=3)
+        first = encoder.encode(game)
+        assert first is not None
+        assert first[0] == FULL
+        assert encoder.encode(game) is None
+        game.player_draws_multiple(1)
+        second = encoder.encode(game)
+        assert second is not None
+        assert second[0] == DELTA
+        game.apply_move(Move(Move.END_TURN))
+        third = encoder.encode(game)
+        assert third is not None
+        assert third[0] == FULL
+
+    def test_get_snapshot(self) -> None:
+        """Test getting a snapshot of the last state."""
+        encoder = StateEncoder()
+        assert encoder.get_snapshot() is None
+        game = make_game()
+        encoder.encode(game)
+        snapshot = encoder.get_snapshot()
+        assert snapshot is not None
+        assert decode_state(snapshot, None)[1] == SyncState.from_game(game)
+
+
+class TestStateDecoder:
+    """Test StateDecoder class."""
+
+    def test___init__(self) -> None:
+        """Test decoder initialization."""
+        assert StateDecoder().state is None
+
+    def test_decode(self) -> None:
+        """Test following a game and resyncing after a gap."""
+        game = make_game()
+        encoder = StateEncoder(snapshot_interval=4)
+        decoder = StateDecoder()
+        frames = []
+        for move in [
+            Move(Action.DRAW, count=1),
+            Move(Move.END_TURN),
+            Move(Action.DRAW, count=2),
+            Move(Move.END_TURN),
+        ]:
+            frame = encoder.encode(game)
+            assert frame is not None
+            frames.append(frame)
+            game.apply_move(move)
+        last = encoder.encode(game)
+        assert last is not None
+        for frame in frames:
+            decoder.decode(frame)
+        assert decoder.decode(last) == SyncState.from_game(game)
+
+        # a late joiner that only gets deltas waits for the next snapshot,
+        # with an interval of 4 the fourth frame is a full snapshot
+        late = StateDecoder()
+        assert late.decode(frames[2]) is None
+        assert frames[3][0] == FULL
+        assert late.decode(frames[3]) is not None
+        assert late.decode(last) == SyncState.from_game(game)
+
+    def test_get_base_seq(self) -> None:
+        """Test the sequence number a frame builds on."""
+        state = SyncState.from_game(make_game())
+        expected = 4
+        assert StateDecoder().get_base_seq(encode_delta(5, state, state)) == expected
+        with pytest.raises(ValueError, match="too short"):
+            StateDecoder().get_base_seq(b"\x02")
+
+
+class TestBroadcaster:
+    """Test Broadcaster class."""
+
+    def test___init__(self) -> None:
+        """Test broadcaster initialization."""
+        assert Broadcaster().subscribers == set()
+
+    def test_subscribe(self) -> None:
+        """Test subscribers get a snapshot and the same bytes afterwards."""
+
+        async def fan_out() -> list[list[tuple[int, bytes] | None]]:
+            game = make_game()
+            broadcaster = Broadcaster()
+            broadcaster.publish(game)
+            readers: list[asyncio.StreamReader] = []
+
+            async def accept(
+                reader: asyncio.StreamReader, _writer: asyncio.StreamWriter
+            ) -> None:
+                readers.append(reader)
+
+            server = await asyncio.start_server(accept, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            writers = []
+            for _ in range(2):
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                broadcaster.subscribe(writer)
+                writers.append(writer)
+            game.player_draws_multiple(1)
+            broadcaster.publish(game)
+            received = [
+                [await read_frame(reader), await read_frame(reader)]
+                for reader in readers
+            ]
+            for writer in writers:
+                writer.close()
+            server.close()
+            return received
+
+        first, second = asyncio.run(fan_out())
+        assert first == second
+        snapshot, delta = first
+        assert snapshot is not None
+        assert delta is not None
+        assert snapshot[0] == delta[0] == STATE
+        assert snapshot[1][0] == FULL
+        assert delta[1][0] == DELTA
+
+    def test_unsubscribe(self) -> None:
+        """Test removing a subscriber."""
+
+        async def unsubscribe() -> int:
+            broadcaster = Broadcaster()
+            server = await asyncio.start_server(lambda _r, _w: None, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            broadcaster.subscribe(writer)
+            broadcaster.unsubscribe(writer)
+            writer.close()
+            server.close()
+            return len(broadcaster.subscribers)
+
+        assert asyncio.run(unsubscribe()) == 0
+
+    def test_publish(self) -> None:
+        """Test publishing without changes sends nothing."""
+        game = make_game()
+        broadcaster = Broadcaster()
+        assert broadcaster.publish(game) > 0
+        assert broadcaster.publish(game) == 0
+        game.players[0].hand.add_card(Card("red", 1))
+        assert broadcaster.publish(game) > 0
+
+    def test_close(self) -> None:
+        """Test closing sends a notice and removes all subscribers."""
+
+        async def close() -> tuple[tuple[int, bytes] | None, int]:
+            game = make_game()
+            broadcaster = Broadcaster()
+            readers: list[asyncio.StreamReader] = []
+
+            async def accept(
+                reader: asyncio.StreamReader, _writer: asyncio.StreamWriter
+            ) -> None:
+                readers.append(reader)
+
+            server = await asyncio.start_server(accept, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            broadcaster.subscribe(writer)
+            removed = broadcaster.close(encode_frame(b"bye"))
+            # nothing is sent after closing
+            game.player_draws_multiple(1)
+            broadcaster.publish(game)
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+            notice = await read_frame(readers[0])
+            assert await read_frame(readers[0]) is None
+            server.close()
+            return notice, len(removed) + len(broadcaster.subscribers)
+
+        notice, removed = asyncio.run(close())
+        assert notice == (MESSAGE, b"bye")
+        assert removed == 1
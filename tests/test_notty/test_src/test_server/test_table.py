@@ -0,0 +1,69 @@
+"""Test table module."""
+
+import pytest
+
+from notty.src.game import Game, Move
+from notty.src.server.table import Table, apply_client_move, run_bot_turn
+
+
+class TestTable:
+    """Test Table class."""
+
+    def test___init__(self) -> None:
+        """Test table initialization."""
+        table = Table(1, [Table.HUMAN, "random"])
+        assert table.table_id == 1
+        assert table.game.players[0].is_human
+        assert not table.game.players[1].is_human
+        assert table.owner is None
+        with pytest.raises(ValueError, match="Invalid seat"):
+            Table(1, [Table.HUMAN, "unknown"])
+        with pytest.raises(ValueError, match="human seat"):
+            Table(1, ["random", "random"])
+        # a moved table continues its game
+        game = Game.from_dict(table.game.to_dict())
+        assert Table(2, [Table.HUMAN, "random"], game).game is game
+        with pytest.raises(ValueError, match="seats"):
+            Table(2, [Table.HUMAN, "random", "random"], game)
+
+    def test_get_current_strategy(self) -> None:
+        """Test getting the strategy of the current seat."""
+        table = Table(1, [Table.HUMAN, "greedy"])
+        assert table.get_current_strategy() is None
+        table.game.next_turn()
+        assert table.get_current_strategy() == "greedy"
+
+    def test_is_bot_turn(self) -> None:
+        """Test checking if a bot is to move."""
+        table = Table(1, [Table.HUMAN, "greedy"])
+        assert not table.is_bot_turn()
+        table.game.next_turn()
+        assert table.is_bot_turn()
+
+    def test_get_state(self) -> None:
+        """Test the state message."""
+        table = Table(1, [Table.HUMAN, "random"])
+        state = table.get_state()
+        assert state["type"] == "state"
+        assert state["table"] == 1
+        assert Move(Move.END_TURN).to_dict() in state["legal_moves"]
+        table.game.next_turn()
+        assert table.get_state()["legal_moves"] == []
+
+
+def test_run_bot_turn() -> None:
+    """Test playing a bot turn."""
+    table = Table(1, [Table.HUMAN, "random"])
+    table.game.next_turn()
+    game = run_bot_turn(table.game, "random")
+    assert isinstance(game, Game)
+    assert game.current_player_index == 0 or game.game_over
+
+
+def test_apply_client_move() -> None:
+    """Test applying a client move."""
+    table = Table(1, [Table.HUMAN, "random"])
+    move = apply_client_move(table, Move(Move.END_TURN).to_dict())
+    assert move == Move(Move.END_TURN)
+    with pytest.raises(ValueError, match="not a human's turn"):
+        apply_client_move(table, Move(Move.END_TURN).to_dict())
@@ -0,0 +1,28 @@
+"""Test stats module."""
+
+import pytest
+
+from notty.src.stats import get_percentile, get_wilson_interval
+
+
+def test_get_percentile() -> None:
+    """Test the nearest-rank percentile."""
+    values = [float(v) for v in range(1, 101)]
+    expected_p50 = 50.0
+    expected_p99 = 99.0
+    assert get_percentile(values, 50) == expected_p50
+    assert get_percentile(values, 99) == expected_p99
+    assert get_percentile(values, 0) == 1.0
+    assert get_percentile([], 99) == 0.0
+
+
+def test_get_wilson_interval() -> None:
+    """Test the interval contains the rate and stays within 0 and 1."""
+    assert get_wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = get_wilson_interval(50, 100)
+    expected = 0.404
+    assert low == pytest.approx(expected, abs=0.001)
+    assert high == pytest.approx(1 - expected, abs=0.001)
+    low, high = get_wilson_interval(0, 10)
+    assert low == 0.0
+    assert 0 < high < 1
@@ -0,0 +1,90 @@
+"""Test strategy module."""
+
+import pytest
+
+from notty.src.card import Card
+from notty.src.game import Action, Game, Move
+from notty.src.player import Player
+from notty.src.strategy import (
+    GreedyStrategy,
+    RandomStrategy,
+    Strategy,
+    get_all_strategies,
+    get_strategy,
+)
+
+
+class TestStrategy:
+    """Test Strategy class."""
+
+    def test___init__(self) -> None:
+        """Test strategy initialization."""
+        first = RandomStrategy(seed=1).random.random()
+        assert first == RandomStrategy(seed=1).random.random()
+
+    def test_choose_move(self) -> None:
+        """Test choose_move is abstract."""
+        assert Strategy.choose_move.__isabstractmethod__  # type: ignore[attr-defined]
+
+    def test_play_turn(self) -> None:
+        """Test playing a full turn."""
+        players = [Player("P1", is_human=False), Player("P2", is_human=False)]
+        game = Game(players)
+        moves = RandomStrategy(seed=0).play_turn(game)
+        assert moves
+        assert moves[-1].kind == Move.END_TURN or game.game_over
+        assert game.current_player_index == 1 or game.game_over
+
+
+class TestRandomStrategy:
+    """Test RandomStrategy class."""
+
+    def test_choose_move(self) -> None:
+        """Test choosing a random legal move."""
+        players = [Player("P1", is_human=False), Player("P2", is_human=False)]
+        game = Game(players)
+        strategy = RandomStrategy(seed=0)
+        for _ in range(10):
+            assert game.is_legal_move(strategy.choose_move(game))
+
+
+class TestGreedyStrategy:
+    """Test GreedyStrategy class."""
+
+    def test_choose_move(self) -> None:
+        """Test the greedy strategy prefers the biggest group."""
+        players = [Player("P1", is_human=False), Player("P2", is_human=False)]
+        game = Game(players)
+        game.players[0].hand.cards = [Card("blue", n) for n in range(1, 6)]
+        move = GreedyStrategy().choose_move(game)
+        assert move.kind == Move.DISCARD_GROUP
+        expected = 5
+        assert len(move.cards) == expected
+
+        game.players[0].hand.cards = [Card("blue", 1)]
+        assert GreedyStrategy().choose_move(game).kind == Action.DRAW_DISCARD_DRAW
+
+    def test_get_card_usefulness(self) -> None:
+        """Test the usefulness counts related cards."""
+        players = [Player("P1", is_human=False), Player("P2", is_human=False)]
+        game = Game(players)
+        game.players[0].hand.cards = [Card("blue", 1), Card("blue", 2), Card("red", 9)]
+        strategy = GreedyStrategy()
+        useful = Move(Action.DRAW_DISCARD_DISCARD, cards=(Card("blue", 1),))
+        useless = Move(Action.DRAW_DISCARD_DISCARD, cards=(Card("red", 9),))
+        assert strategy.get_card_usefulness(game, useful) == 1
+        assert strategy.get_card_usefulness(game, useless) == 0
+
+
+def test_get_all_strategies() -> None:
+    """Test getting all strategies."""
+    strategies = get_all_strategies()
+    assert strategies[RandomStrategy.NAME] is RandomStrategy
+    assert strategies[GreedyStrategy.NAME] is GreedyStrategy
+
+
+def test_get_strategy() -> None:
+    """Test creating a strategy by name."""
+    assert isinstance(get_strategy("greedy"), GreedyStrategy)
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        get_strategy("unknown")
@@ -0,0 +1,241 @@
+"""Test tournament module."""
+
+import json
+import math
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src import tournament as tournament_module
+from notty.src.tournament import (
+    Leaderboard,
+    MatchResult,
+    Rating,
+    get_elo,
+    get_lineups,
+    get_schedule,
+    play_match,
+    run_tournament,
+    tournament,
+)
+
+
+def test_get_lineups() -> None:
+    """Test every seating of every mix is played once."""
+    lineups = get_lineups(["a", "b"])
+    # ab, ba and the three seatings of aab and abb
+    expected = 8
+    assert len(lineups) == expected
+    assert len(set(lineups)) == expected
+    assert ("a", "a") not in lineups
+    assert ("b", "a", "b") in lineups
+
+
+class TestMatchResult:
+    """Test MatchResult class."""
+
+    def test___delattr__(self) -> None:
+        """Test results are frozen (cannot delete attributes)."""
+        result = MatchResult(("a", "b"), 1, 0, 10)
+        with pytest.raises(AttributeError):
+            del result.winner
+
+    def test___eq__(self) -> None:
+        """Test result equality."""
+        assert MatchResult(("a", "b"), 1, 0, 10) == MatchResult(("a", "b"), 1, 0, 10)
+
+    def test___hash__(self) -> None:
+        """Test results are hashable."""
+        assert isinstance(hash(MatchResult(("a", "b"), 1, 0, 10)), int)
+
+    def test___init__(self) -> None:
+        """Test result initialization."""
+        result = MatchResult(("a", "b"), 1, None, 10)
+        assert result.winner is None
+
+    def test___setattr__(self) -> None:
+        """Test results are frozen (cannot set attributes)."""
+        result = MatchResult(("a", "b"), 1, 0, 10)
+        with pytest.raises(AttributeError):
+            result.winner = 1  # type: ignore[misc]
+
+    def test___repr__(self) -> None:
+        """Test result repr."""
+        assert "MatchResult" in repr(MatchResult(("a", "b"), 1, 0, 10))
+
+    def test_get_pairwise_scores(self) -> None:
+        """Test the winner beats every seat and the others draw."""
+        result = MatchResult(("a", "b", "c"), 1, 2, 10)
+        assert result.get_pairwise_scores() == [
+            ("a", "b", 0.5),
+            ("a", "c", 0.0),
+            ("b", "c", 0.0),
+        ]
+        # seats of the same strategy do not play each other
+        assert MatchResult(("a", "a", "b"), 1, 0, 10).get_pairwise_scores() == [
+            ("a", "b", 1.0),
+            ("a", "b", 0.5),
+        ]
+        assert MatchResult(("a", "b"), 1, None, 10).get_pairwise_scores() == [
+            ("a", "b", 0.5)
+        ]
+
+    def test_to_dict(self) -> None:
+        """Test the result is JSON serializable."""
+        data = MatchResult(("a", "b"), 1, 0, 10).to_dict()
+        assert json.loads(json.dumps(data))["lineup"] == ["a", "b"]
+
+
+def test_play_match() -> None:
+    """Test games are replayed from their seed."""
+    first = play_match(("greedy", "random"), 3)
+    assert first == play_match(("greedy", "random"), 3)
+    assert first.moves > 0
+    assert first.winner in (0, 1, None)
+
+
+class TestRating:
+    """Test Rating class."""
+
+    def test___init__(self) -> None:
+        """Test rating initialization."""
+        rating = Rating("greedy")
+        assert rating.games == 0
+        assert rating.get_elo() == 0.0
+
+    def test_add(self) -> None:
+        """Test adding scores."""
+        rating = Rating("greedy")
+        rating.add(1.0)
+        rating.add(0.5)
+        expected = 1.25
+        assert rating.squares == expected
+
+    def test_get_score_rate(self) -> None:
+        """Test the mean score."""
+        rating = Rating("greedy")
+        expected = 0.5
+        assert rating.get_score_rate() == expected
+        rating.add(1.0)
+        rating.add(0.0)
+        rating.add(1.0)
+        assert rating.get_score_rate() == pytest.approx(2 / 3)
+
+    def test_get_interval(self) -> None:
+        """Test the interval narrows with more games."""
+        rating = Rating("greedy")
+        assert rating.get_interval() == (-math.inf, math.inf)
+        widths = []
+        for games in (10, 100):
+            rating = Rating("greedy")
+            for game in range(games):
+                rating.add(float(game % 2))
+            low, high = rating.get_interval()
+            assert low < rating.get_elo() < high
+            widths.append(high - low)
+        assert widths[1] < widths[0]
+
+    def test_get_elo(self) -> None:
+        """Test a higher score has a higher Elo."""
+        rating = Rating("greedy")
+        for score in (1.0, 1.0, 1.0, 0.0):
+            rating.add(score)
+        assert rating.get_elo() == pytest.approx(get_elo(0.75))
+
+    def test___repr__(self) -> None:
+        """Test rating repr."""
+        assert "greedy" in repr(Rating("greedy"))
+
+
+def test_get_elo() -> None:
+    """Test the logistic Elo curve."""
+    assert get_elo(0.5) == 0.0
+    expected = 400 * math.log10(3)
+    assert get_elo(0.75) == pytest.approx(expected)
+    assert get_elo(0.25) == pytest.approx(-expected)
+    assert math.isfinite(get_elo(1.0))
+
+
+class TestLeaderboard:
+    """Test Leaderboard class."""
+
+    def test___init__(self) -> None:
+        """Test leaderboard initialization."""
+        board = Leaderboard(["a", "b"])
+        assert set(board.ratings) == {"a", "b"}
+        assert board.matches == 0
+
+    def test_add(self) -> None:
+        """Test both strategies of a pair get a score."""
+        board = Leaderboard(["a", "b"])
+        board.add(MatchResult(("a", "b"), 1, 0, 10))
+        assert board.ratings["a"].score == 1.0
+        assert board.ratings["b"].games == 1
+
+    def test_get_ranking(self) -> None:
+        """Test the best strategy comes first."""
+        board = Leaderboard(["a", "b"])
+        board.add(MatchResult(("a", "b"), 1, 1, 10))
+        assert [rating.name for rating in board.get_ranking()] == ["b", "a"]
+
+    def test_is_separated(self) -> None:
+        """Test the ranking settles with enough clear results."""
+        board = Leaderboard(["a", "b"])
+        assert not board.is_separated(0)
+        for seed in range(30):
+            board.add(MatchResult(("a", "b"), seed, 0, 10))
+            board.add(MatchResult(("a", "b"), seed, None, 10))
+        assert board.is_separated(60)
+        assert not board.is_separated(61)
+        even = Leaderboard(["a", "b"])
+        for seed in range(30):
+            even.add(MatchResult(("a", "b"), seed, seed % 2, 10))
+        assert not even.is_separated(0)
+
+    def test___str__(self) -> None:
+        """Test the ranking lines."""
+        board = Leaderboard(["a", "b"])
+        board.add(MatchResult(("a", "b"), 1, 1, 10))
+        lines = str(board).splitlines()
+        assert lines[0] == "1 games"
+        assert lines[1].startswith("1. b: +")
+
+    def test___repr__(self) -> None:
+        """Test leaderboard repr."""
+        assert "Leaderboard" in repr(Leaderboard(["a", "b"]))
+
+
+def test_get_schedule() -> None:
+    """Test every round plays every lineup with a new seed."""
+    schedule = list(get_schedule([("a", "b"), ("b", "a")], 2))
+    assert [seed for _, seed in schedule] == [0, 1, 2, 3]
+    assert schedule[2][0] == ("a", "b")
+
+
+def test_run_tournament(tmp_path: Path) -> None:
+    """Test the results are streamed to disk and stopping early."""
+    output = tmp_path / "results.jsonl"
+    board = run_tournament(output, ["greedy", "random"], 1, 1, None)
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(get_lineups(["greedy", "random"])) == board.matches
+    assert {json.loads(line)["seed"] for line in lines} == set(range(len(lines)))
+    # results are appended, a stopped tournament plays fewer games
+    stopped = run_tournament(output, ["greedy", "random"], 10, 1, 1)
+    assert stopped.is_separated(1)
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == board.matches + stopped.matches
+
+
+def test_tournament(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test the strategies are checked and the ranking summarized."""
+    run = mocker.patch.object(
+        tournament_module, "run_tournament", return_value=Leaderboard(["a", "b"])
+    )
+    output = tmp_path / "results.jsonl"
+    assert tournament(output).startswith("0 games")
+    assert run.call_args.args[1] == ["random", "greedy"]
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        tournament(output, ["unknown", "random"])
+    with pytest.raises(ValueError, match="at least"):
+        tournament(output, ["random", "random"])
@@ -0,0 +1,223 @@
+"""test module."""
+
+import pytest
+
+from notty.src.card import Card, Color
+from notty.src.ui.app import (
+    HumanView,
+    discard_selection,
+    get_game_layout,
+    handle_click,
+    init_game,
+)
+
+
+class TestHumanView:
+    """Test HumanView class."""
+
+    def test___delattr__(self) -> None:
+        """Test view is frozen (cannot delete attributes)."""
+        view = HumanView()
+        with pytest.raises(AttributeError):
+            del view.selected
+
+    def test___eq__(self) -> None:
+        """Test view equality."""
+        assert HumanView(frozenset({1}), ("a",)) == HumanView(frozenset({1}), ("a",))
+        assert HumanView(frozenset({1})) != HumanView()
+
+    def test___hash__(self) -> None:
+        """Test view is hashable."""
+        assert isinstance(hash(HumanView(frozenset({1}), ("a",))), int)
+
+    def test___init__(self) -> None:
+        """Test nothing is selected, estimated or hinted by default."""
+        view = HumanView()
+        assert view.selected == frozenset()
+        assert view.estimate == ()
+        assert view.hint == ()
+
+    def test___repr__(self) -> None:
+        """Test view repr."""
+        assert repr(HumanView(frozenset({2, 1}), ("a",), ("b",))) == (
+            "HumanView(selected=[1, 2], estimate=('a',), hint=('b',))"
+        )
+
+    def test___setattr__(self) -> None:
+        """Test view is frozen (cannot set attributes)."""
+        view = HumanView()
+        with pytest.raises(AttributeError):
+            view.estimate = ()  # type: ignore[misc]
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_start() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_run() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_create_window() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_init_game() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_get_players() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_show_deck() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_show_player_with_hand() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_run_event_loop() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_load_background() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_get_window_size() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_simulate_first_shuffle_and_deal() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_get_player_display_order() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_show_actions() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_draw_frame() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_handle_animation_key() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_animate_card_moves() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_handle_input() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+def test_handle_click() -> None:
+    """Test clicks toggle the selection of the cards of the human."""
+    game = init_game()
+    layout = get_game_layout(game, 1000, 500)
+    selected: set[int] = set()
+    card = layout.card_rects[("Human", 1)]
+    assert handle_click(game, layout, selected, card.center)
+    assert selected == {1}
+    assert handle_click(game, layout, selected, card.center)
+    assert selected == set()
+    # cards of the computers and the deck cannot be selected
+    computer = layout.card_rects[("Computer 1", 0)]
+    assert not handle_click(game, layout, selected, computer.center)
+    assert not handle_click(game, layout, selected, layout.deck_rect.center)
+    assert not handle_click(game, layout, selected, (0, 0))
+
+
+def test_discard_selection() -> None:
+    """Test only a valid group of the human on their turn is discarded."""
+    game = init_game()
+    human = game.get_current_player()
+    assert human.is_human
+    assert not discard_selection(game, set())
+    human.hand.cards = [
+        Card(Color.RED, 5),
+        Card(Color.BLUE, 1),
+        Card(Color.RED, 3),
+        Card(Color.RED, 4),
+    ]
+    assert not discard_selection(game, {0, 1, 2})
+    # selected in any order
+    assert discard_selection(game, {0, 2, 3})
+    assert human.hand.cards == [Card(Color.BLUE, 1)]
+    game.next_turn()
+    assert not discard_selection(game, {0})
+
+
+def test_get_game_layout() -> None:
+    """Test the layout follows the hand sizes."""
+    game = init_game()
+    layout = get_game_layout(game, 1000, 500)
+    assert get_game_layout(game, 1000, 500) is layout
+    assert [name for name, _ in layout.hand_sizes][-1] == "Human"
+    game.players[0].hand.cards.pop()
+    assert get_game_layout(game, 1000, 500) is not layout
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_handle_resize() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_handle_background_ready() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_draw_players() -> None:
+    """Test function."""
+    raise NotImplementedError
+
+
+@pytest.mark.skip(reason="Won't test UI")
+def test_post_panel_ready() -> None:
+    """Test function."""
+    raise NotImplementedError
@@ -0,0 +1,67 @@
+"""Test atlas module."""
+
+from collections.abc import Iterator
+
+import pygame
+import pytest
+
+from notty.src.card import Card, Color
+from notty.src.ui.atlas import CARD_BACK_COLOR, COLOR_MAP, CardAtlas, get_card_atlas
+from notty.src.ui.text import clear_text_caches
+
+
+@pytest.fixture(autouse=True)
+def font() -> Iterator[None]:
+    """Initialize the font module, the faces render their numbers."""
+    pygame.font.init()
+    yield
+    clear_text_caches()
+    pygame.font.quit()
+
+
+class TestCardAtlas:
+    """Test CardAtlas class."""
+
+    def test___init__(self) -> None:
+        """Test every face is rendered in the card size."""
+        atlas = CardAtlas(28, 40)
+        expected = 45
+        assert len(atlas.faces) == expected
+        assert {face.get_size() for face in atlas.faces} == {(28, 40)}
+        assert atlas.back.get_size() == (28, 40)
+
+    def test_render_face(self) -> None:
+        """Test the face has a black border and the card color inside."""
+        atlas = CardAtlas(28, 40)
+        face = atlas.render_face(Card(Color.RED, 7))
+        assert face.get_at((0, 0)) == pygame.Color(0, 0, 0)
+        assert face.get_at((14, 3)) == pygame.Color(COLOR_MAP[Color.RED])
+
+    def test_render_back(self) -> None:
+        """Test the back has a white border and the back color inside."""
+        back = CardAtlas(28, 40).render_back()
+        assert back.get_at((0, 0)) == pygame.Color(255, 255, 255)
+        assert back.get_at((14, 20)) == pygame.Color(COLOR_MAP[CARD_BACK_COLOR])
+
+    def test_get_face(self) -> None:
+        """Test faces are looked up by card id."""
+        atlas = CardAtlas(28, 40)
+        assert atlas.get_face(Card(Color.BLUE, 9)) is atlas.faces[-1]
+        assert atlas.get_face(Card(Color.RED, 1)) is atlas.faces[0]
+
+    def test_get_blits(self) -> None:
+        """Test a hand is drawn with one blits call."""
+        atlas = CardAtlas(28, 40)
+        cards = [Card(Color.GREEN, 2), Card(Color.GREEN, 2), Card(Color.BLACK, 5)]
+        blits = atlas.get_blits(cards, [(0, 0), (30, 0), (60, 0)])
+        assert blits[0][0] is blits[1][0]
+        screen = pygame.Surface((100, 50))
+        screen.blits(blits, doreturn=False)
+        assert screen.get_at((74, 3)) == pygame.Color(COLOR_MAP[Color.BLACK])
+
+
+def test_get_card_atlas() -> None:
+    """Test the atlas is only rebuilt when the card size changes."""
+    atlas = get_card_atlas(28, 40)
+    assert get_card_atlas(28, 40) is atlas
+    assert get_card_atlas(35, 50) is not atlas
@@ -0,0 +1,94 @@
+"""Test audio module."""
+
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+
+import pygame
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.dev.artifacts.builder.pack import build_asset_pack
+from notty.src import assets as assets_module
+from notty.src.assets import get_asset_pack, get_assets_dir
+from notty.src.ui.audio import MUSIC_ASSET, MusicPlayer
+
+
+@pytest.fixture
+def dummy_audio(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Play to an audio device that discards everything."""
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    yield
+    pygame.mixer.quit()
+
+
+class TestMusicPlayer:
+    """Test MusicPlayer class."""
+
+    def test___init__(self) -> None:
+        """Test nothing plays at first."""
+        player = MusicPlayer(volume=0.25)
+        expected = 0.25
+        assert player.volume == expected
+        assert player.thread is None
+        assert not player.playing
+
+    @pytest.mark.usefixtures("dummy_audio")
+    def test_start(self) -> None:
+        """Test the music starts in a thread."""
+        player = MusicPlayer()
+        player.start()
+        assert player.thread is not None
+        player.thread.join(10)
+        assert player.playing
+        assert pygame.mixer.music.get_busy()
+        player.stop()
+
+    @pytest.mark.usefixtures("dummy_audio")
+    def test_play(self) -> None:
+        """Test the track is streamed in a loop."""
+        player = MusicPlayer()
+        assert player.play()
+        assert pygame.mixer.music.get_busy()
+        player.stop()
+
+    @pytest.mark.usefixtures("dummy_audio")
+    def test_play_from_pack(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Test the track is streamed from the memory mapped pack."""
+        (tmp_path / "music").mkdir()
+        shutil.copy(get_assets_dir() / MUSIC_ASSET, tmp_path / MUSIC_ASSET)
+        build_asset_pack(tmp_path, tmp_path)
+        mocker.patch.object(assets_module, "get_assets_dir", return_value=tmp_path)
+        get_asset_pack.cache_clear()
+        player = MusicPlayer()
+        assert player.play()
+        assert player.file is not None
+        assert pygame.mixer.music.get_busy()
+        file = player.file
+        player.stop()
+        assert file.closed
+        get_asset_pack.cache_clear()
+
+    def test_play_without_audio(self, mocker: MockerFixture) -> None:
+        """Test the game goes on without an audio device."""
+        mocker.patch.object(
+            pygame.mixer, "init", side_effect=pygame.error("No such audio device")
+        )
+        player = MusicPlayer()
+        assert not player.play()
+        assert not player.playing
+        player.stop()
+
+    @pytest.mark.usefixtures("dummy_audio")
+    def test_stop(self) -> None:
+        """Test the music stops."""
+        player = MusicPlayer()
+        player.start()
+        player.stop()
+        assert not player.playing
+        assert not pygame.mixer.music.get_busy()
+
+    def test___repr__(self) -> None:
+        """Test the track is shown."""
+        player = MusicPlayer()
+        assert repr(player) == f"MusicPlayer({MUSIC_ASSET}, False)"
@@ -0,0 +1,176 @@
+"""Test background module."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pygame
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src import assets as assets_module
+from notty.src.assets import get_asset_pack
+from notty.src.ui import background as background_module
+from notty.src.ui.background import (
+    BACKGROUND_READY,
+    DIM_COLOR,
+    BackgroundLoader,
+    get_background,
+    get_cache_dir,
+    get_cache_path,
+    prune_cache,
+    render_background,
+)
+
+SIZE = (40, 30)
+
+
+@pytest.fixture
+def assets_dir(tmp_path: Path, mocker: MockerFixture) -> Iterator[Path]:
+    """Use an empty directory as the resources package without a pack."""
+    assets_dir = tmp_path / "assets"
+    assets_dir.mkdir()
+    mocker.patch.object(assets_module, "get_assets_dir", return_value=assets_dir)
+    get_asset_pack.cache_clear()
+    yield assets_dir
+    get_asset_pack.cache_clear()
+
+
+@pytest.fixture
+def source(assets_dir: Path) -> str:
+    """Save a small white image as the background source."""
+    image = pygame.Surface((80, 60))
+    image.fill((255, 255, 255))
+    pygame.image.save(image, assets_dir / "source.png")
+    return "source.png"
+
+
+def test_get_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test the XDG cache directory is used if set."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert get_cache_dir() == tmp_path / "notty" / "backgrounds"
+
+
+def test_get_cache_path(source: str, assets_dir: Path, tmp_path: Path) -> None:
+    """Test the path is keyed by source and size."""
+    path = get_cache_path(source, SIZE, tmp_path)
+    assert path.parent == tmp_path
+    assert path.name.endswith("-40x30.rgb")
+    assert get_cache_path(source, (41, 30), tmp_path) != path
+    image = assets_dir / source
+    image.write_bytes(image.read_bytes() + b"changed")
+    assert get_cache_path(source, SIZE, tmp_path) != path
+
+
+def test_render_background(source: str) -> None:
+    """Test the image is scaled and dimmed."""
+    background = render_background(source, SIZE)
+    assert background.get_size() == SIZE
+    # white blended with the dark overlay
+    white = 255
+    assert DIM_COLOR[0] < background.get_at((0, 0)).r < white
+
+
+def test_get_background(source: str, tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test the background is rendered once and then read from disk."""
+    cache_dir = tmp_path / "cache"
+    rendered = get_background(source, SIZE, cache_dir)
+    assert get_cache_path(source, SIZE, cache_dir).is_file()
+    render = mocker.spy(background_module, "render_background")
+    cached = get_background(source, SIZE, cache_dir)
+    render.assert_not_called()
+    assert cached.get_size() == SIZE
+    assert cached.get_at((5, 5)) == rendered.get_at((5, 5))
+    # a broken file is rendered again
+    get_cache_path(source, SIZE, cache_dir).write_bytes(b"broken")
+    assert get_background(source, SIZE, cache_dir).get_size() == SIZE
+    render.assert_called_once()
+
+
+def test_get_background_unwritable(source: str, tmp_path: Path) -> None:
+    """Test a cache that cannot be written still returns the background."""
+    blocked = tmp_path / "file"
+    blocked.write_text("not a directory")
+    assert get_background(source, SIZE, blocked / "cache").get_size() == SIZE
+
+
+def test_prune_cache(tmp_path: Path) -> None:
+    """Test the least recently used backgrounds are deleted."""
+    for age in range(4):
+        path = tmp_path / f"{age}.rgb"
+        path.write_bytes(b"")
+        os.utime(path, (1000 - age, 1000 - age))
+    prune_cache(tmp_path, 2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["0.rgb", "1.rgb"]
+
+
+class TestBackgroundLoader:
+    """Test BackgroundLoader class."""
+
+    def test___init__(self, source: str) -> None:
+        """Test nothing is requested at first."""
+        loader = BackgroundLoader(source)
+        assert loader.future is None
+        assert loader.poll() is None
+        loader.close()
+
+    def test_request(self, source: str, tmp_path: Path) -> None:
+        """Test only the latest size is returned."""
+        loader = BackgroundLoader(source, tmp_path)
+        loader.request((10, 10))
+        loader.request(SIZE)
+        assert loader.size == SIZE
+        assert loader.future is not None
+        loader.future.result(timeout=10)
+        background = loader.poll()
+        assert background is not None
+        assert background.get_size() == SIZE
+        assert loader.poll() is None
+        loader.close()
+
+    def test_load(self, source: str, tmp_path: Path) -> None:
+        """Test the loader uses its cache directory."""
+        loader = BackgroundLoader(source, tmp_path)
+        assert loader.load(SIZE).get_size() == SIZE
+        assert get_cache_path(source, SIZE, tmp_path).is_file()
+        loader.close()
+
+    def test_notify(self, source: str, mocker: MockerFixture) -> None:
+        """Test the event loop is woken up only for finished backgrounds."""
+        post = mocker.patch.object(pygame.event, "post")
+        get_init = mocker.patch.object(pygame.display, "get_init", return_value=True)
+        loader = BackgroundLoader(source)
+        future = mocker.MagicMock()
+        future.cancelled.return_value = False
+        loader.notify(future)
+        assert post.call_args.args[0].type == BACKGROUND_READY
+        future.cancelled.return_value = True
+        loader.notify(future)
+        get_init.return_value = False
+        future.cancelled.return_value = False
+        loader.notify(future)
+        post.assert_called_once()
+        loader.close()
+
+    def test_poll(self, source: str, tmp_path: Path) -> None:
+        """Test polling waits for the worker."""
+        loader = BackgroundLoader(source, tmp_path)
+        assert loader.poll() is None
+        loader.request(SIZE)
+        assert loader.future is not None
+        loader.future.result(timeout=10)
+        assert loader.poll() is not None
+        loader.close()
+
+    def test_close(self, source: str) -> None:
+        """Test no more backgrounds are made after closing."""
+        loader = BackgroundLoader(source)
+        loader.close()
+        with pytest.raises(RuntimeError):
+            loader.request(SIZE)
+
+    def test___repr__(self, source: str) -> None:
+        """Test loader repr."""
+        loader = BackgroundLoader(source)
+        assert "source.png" in repr(loader)
+        loader.close()
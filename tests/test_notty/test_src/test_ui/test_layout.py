@@ -0,0 +1,99 @@
+"""Test layout module."""
+
+import pygame
+
+from notty.src.ui.layout import Layout, SpatialIndex, get_layout
+from notty.src.ui.moves import DECK
+
+HAND_SIZES = (("a", 7), ("b", 0), ("c", 4))
+
+
+class TestSpatialIndex:
+    """Test SpatialIndex class."""
+
+    def test___init__(self) -> None:
+        """Test the index starts empty."""
+        index = SpatialIndex(0)
+        assert index.cell_size == 1
+        assert not index.buckets
+
+    def test_get_cells(self) -> None:
+        """Test a rect covers the cells it overlaps."""
+        index = SpatialIndex(10)
+        assert list(index.get_cells(pygame.Rect(5, 5, 10, 5))) == [(0, 0), (1, 0)]
+        assert list(index.get_cells(pygame.Rect(0, 0, 10, 10))) == [(0, 0)]
+
+    def test_insert(self) -> None:
+        """Test a rect is added to every cell it overlaps."""
+        index = SpatialIndex(10)
+        index.insert(pygame.Rect(5, 5, 10, 10), "a")
+        expected = 4
+        assert len(index.buckets) == expected
+
+    def test_query(self) -> None:
+        """Test the last inserted rect wins."""
+        index = SpatialIndex(10)
+        index.insert(pygame.Rect(0, 0, 20, 20), "below")
+        index.insert(pygame.Rect(15, 15, 10, 10), "above")
+        assert index.query((5, 5)) == "below"
+        assert index.query((16, 16)) == "above"
+        assert index.query((22, 5)) is None
+        assert index.query((500, 500)) is None
+
+    def test___repr__(self) -> None:
+        """Test index repr."""
+        assert "SpatialIndex" in repr(SpatialIndex(10))
+
+
+class TestLayout:
+    """Test Layout class."""
+
+    def test___init__(self) -> None:
+        """Test the areas do not overlap."""
+        layout = Layout(1000, 500, HAND_SIZES)
+        areas = [
+            layout.deck_area,
+            layout.actions_area,
+            layout.overlay_area,
+            *layout.player_areas.values(),
+        ]
+        for i, area in enumerate(areas):
+            assert area.collidelist(areas[i + 1 :]) == -1
+        assert len(layout.card_rects) == 7 + 4
+        assert layout.deck_area.contains(layout.deck_rect)
+        for (name, _), rect in layout.card_rects.items():
+            assert layout.player_areas[name].contains(rect)
+
+    def test_get_card_position(self) -> None:
+        """Test 5 cards per row."""
+        layout = Layout(1000, 500, HAND_SIZES)
+        first = layout.get_card_position("a", 0)
+        assert layout.get_card_position("a", 5)[0] == first[0]
+        assert layout.get_card_position("a", 5)[1] > first[1]
+        assert layout.get_card_position("c", 0)[0] > first[0]
+
+    def test_get_slot_position(self) -> None:
+        """Test the deck slot is centered on the deck."""
+        layout = Layout(1000, 500, HAND_SIZES)
+        rect = pygame.Rect(layout.get_slot_position(DECK), layout.card_size)
+        assert rect.center == layout.deck_rect.center
+        assert layout.get_slot_position(("c", 2)) == layout.get_card_position("c", 2)
+
+    def test_hit_test(self) -> None:
+        """Test points resolve to cards and the deck."""
+        layout = Layout(1000, 500, HAND_SIZES)
+        for slot, rect in layout.card_rects.items():
+            assert layout.hit_test(rect.center) == slot
+        assert layout.hit_test(layout.deck_rect.center) == DECK
+        assert layout.hit_test((0, 0)) is None
+
+    def test___repr__(self) -> None:
+        """Test layout repr."""
+        assert "1000x500" in repr(Layout(1000, 500, HAND_SIZES))
+
+
+def test_get_layout() -> None:
+    """Test layouts are cached by size and hand sizes."""
+    layout = get_layout(1000, 500, HAND_SIZES)
+    assert get_layout(1000, 500, HAND_SIZES) is layout
+    assert get_layout(1001, 500, HAND_SIZES) is not layout
@@ -0,0 +1,53 @@
+"""Test loop module."""
+
+import pygame
+from pytest_mock import MockerFixture
+
+from notty.src.ui.loop import FPS, IDLE_TIMEOUT_MS, FramePacer
+
+
+class TestFramePacer:
+    """Test FramePacer class."""
+
+    def test___init__(self) -> None:
+        """Test the first frame does not wait."""
+        pacer = FramePacer()
+        assert pacer.fps == FPS
+        assert pacer.idle_timeout_ms == IDLE_TIMEOUT_MS
+        assert pacer.frame_requested
+
+    def test_request_frame(self) -> None:
+        """Test requesting a frame."""
+        pacer = FramePacer()
+        pacer.frame_requested = False
+        pacer.request_frame()
+        assert pacer.frame_requested
+
+    def test_wait_for_events(self, mocker: MockerFixture) -> None:
+        """Test the pacer ticks while animating and blocks while idle."""
+        event = pygame.event.Event(pygame.KEYDOWN)
+        get = mocker.patch.object(pygame.event, "get", return_value=[event])
+        wait = mocker.patch.object(
+            pygame.event, "wait", return_value=pygame.event.Event(pygame.NOEVENT)
+        )
+        pacer = FramePacer(idle_timeout_ms=10)
+        clock = mocker.MagicMock()
+        clock.tick.return_value = 16
+        pacer.clock = clock
+        tick = clock.tick
+
+        # the requested first frame and animations run at the frame rate
+        assert pacer.wait_for_events(animating=False) == [event]
+        assert pacer.wait_for_events(animating=True) == [event]
+        tick.assert_called_with(FPS)
+        expected = 16
+        assert pacer.elapsed_ms == expected
+        wait.assert_not_called()
+
+        # idle waits for events with a timeout, a timeout is no event
+        get.return_value = []
+        assert pacer.wait_for_events(animating=False) == []
+        wait.assert_called_once_with(10)
+        assert pacer.elapsed_ms == 0
+        wait.return_value = event
+        assert pacer.wait_for_events(animating=False) == [event]
@@ -0,0 +1,83 @@
+"""Test moves module."""
+
+from collections import Counter
+
+import pytest
+
+from notty.src.game import Game
+from notty.src.player import Player
+from notty.src.ui.moves import (
+    DECK,
+    CardMove,
+    get_card_moves,
+    get_changed_indices,
+    get_hands,
+)
+
+
+class TestCardMove:
+    """Test CardMove class."""
+
+    def test___delattr__(self) -> None:
+        """Test moves are frozen (cannot delete attributes)."""
+        move = CardMove(1, DECK, ("a", 0))
+        with pytest.raises(AttributeError):
+            del move.card_id
+
+    def test___eq__(self) -> None:
+        """Test move equality."""
+        assert CardMove(1, DECK, ("a", 0)) == CardMove(1, DECK, ("a", 0))
+
+    def test___hash__(self) -> None:
+        """Test moves are hashable."""
+        assert isinstance(hash(CardMove(1, DECK, ("a", 0))), int)
+
+    def test___init__(self) -> None:
+        """Test move initialization."""
+        move = CardMove(1, ("a", 2), DECK)
+        assert move.source == ("a", 2)
+        assert move.target == DECK
+
+    def test___setattr__(self) -> None:
+        """Test moves are frozen (cannot set attributes)."""
+        move = CardMove(1, DECK, ("a", 0))
+        with pytest.raises(AttributeError):
+            move.card_id = 2  # type: ignore[misc]
+
+    def test___repr__(self) -> None:
+        """Test move repr."""
+        assert "deck" in repr(CardMove(1, DECK, ("a", 0)))
+
+
+def test_get_hands() -> None:
+    """Test the card ids of every hand."""
+    game = Game([Player("a"), Player("b")])
+    hands = get_hands(game)
+    assert set(hands) == {"a", "b"}
+    assert len(hands["a"]) == Game.INITIAL_HAND_SIZE
+    assert hands["b"][0] == game.players[1].hand.cards[0].to_id()
+
+
+def test_get_changed_indices() -> None:
+    """Test equal cards count from the end of the hand."""
+    assert get_changed_indices((1, 2, 1, 3), Counter({1: 1, 3: 1})) == [
+        (2, 1),
+        (3, 3),
+    ]
+    assert get_changed_indices((1, 2), Counter()) == []
+
+
+def test_get_card_moves() -> None:
+    """Test draws, steals and discards are told apart."""
+    # a draws 5, steals 7 from b and discards 1 and 2
+    before = {"a": (1, 2, 3), "b": (7, 8)}
+    after = {"a": (3, 5, 7), "b": (8,)}
+    assert get_card_moves(before, after) == [
+        CardMove(5, DECK, ("a", 1)),
+        CardMove(7, ("b", 0), ("a", 2)),
+        CardMove(1, ("a", 0), DECK),
+        CardMove(2, ("a", 1), DECK),
+    ]
+    assert get_card_moves(before, before) == []
+    # a card the same player had before is no steal
+    assert get_card_moves({"a": (1,)}, {"a": (1, 1)}) == [CardMove(1, DECK, ("a", 1))]
@@ -0,0 +1,167 @@
+"""Test profiler module."""
+
+import csv
+from collections.abc import Iterator
+from pathlib import Path
+
+import pygame
+import pytest
+
+from notty.src.consts import PROFILE_CSV_ENV
+from notty.src.ui.profiler import (
+    NO_STAGE,
+    OVERLAY_BACKGROUND,
+    OVERLAY_KEY,
+    OVERLAY_REFRESH_FRAMES,
+    PERCENTILES,
+    STAGES,
+    FrameProfiler,
+    get_profile_csv,
+)
+from notty.src.ui.text import clear_text_caches
+
+
+@pytest.fixture
+def font() -> Iterator[None]:
+    """Initialize the font module and start with empty caches."""
+    pygame.font.init()
+    clear_text_caches()
+    yield
+    clear_text_caches()
+    pygame.font.quit()
+
+
+def run_frame(profiler: FrameProfiler, ms: float) -> None:
+    """Record a frame spending the same time in every stage."""
+    for stage in STAGES:
+        profiler.frame[stage] = ms
+    profiler.end_frame()
+
+
+class TestFrameProfiler:
+    """Test FrameProfiler class."""
+
+    def test___init__(self, tmp_path: Path) -> None:
+        """Test the profiler is off without a CSV file."""
+        assert not FrameProfiler().enabled
+        profiler = FrameProfiler(tmp_path / "frames.csv")
+        assert profiler.enabled
+        assert not profiler.shown
+        profiler.close()
+
+    def test_toggle(self) -> None:
+        """Test showing the overlay turns the measuring on."""
+        profiler = FrameProfiler()
+        profiler.toggle()
+        assert profiler.shown
+        assert profiler.enabled
+        assert len(profiler.lines) == len(STAGES) + 1
+        profiler.toggle()
+        assert not profiler.enabled
+
+    def test_handle_event(self) -> None:
+        """Test only the overlay key toggles the overlay."""
+        profiler = FrameProfiler()
+        other = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+        assert not profiler.handle_event(other)
+        assert not profiler.handle_event(pygame.event.Event(pygame.QUIT))
+        assert profiler.handle_event(
+            pygame.event.Event(pygame.KEYDOWN, key=OVERLAY_KEY)
+        )
+        assert profiler.shown
+
+    def test_stage(self) -> None:
+        """Test stages are measured only while the profiler is on."""
+        profiler = FrameProfiler()
+        assert profiler.stage("deck") is NO_STAGE
+        with profiler.stage("deck"):
+            pass
+        assert profiler.frame["deck"] == 0
+        profiler.toggle()
+        assert profiler.stage("deck") is not NO_STAGE
+
+    def test_time_stage(self) -> None:
+        """Test the time of every block of a stage is added up."""
+        profiler = FrameProfiler()
+        with profiler.time_stage("deck"):
+            pygame.time.wait(2)
+        first = profiler.frame["deck"]
+        assert first > 1
+        with profiler.time_stage("deck"):
+            pass
+        assert profiler.frame["deck"] >= first
+        assert profiler.frame["flip"] == 0
+
+    def test_end_frame(self, tmp_path: Path) -> None:
+        """Test every frame is kept and written to the CSV file."""
+        path = tmp_path / "frames.csv"
+        profiler = FrameProfiler(path)
+        run_frame(profiler, 1.5)
+        run_frame(profiler, 2.5)
+        profiler.close()
+        assert list(profiler.samples["deck"]) == [1.5, 2.5]
+        assert profiler.frame["deck"] == 0
+        with path.open(newline="") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["frame"] for row in rows] == ["0", "1"]
+        assert rows[1]["flip"] == "2.500"
+
+        # the overlay text is refreshed now and then, not every frame
+        profiler = FrameProfiler()
+        profiler.toggle()
+        lines = profiler.lines
+        run_frame(profiler, 1)
+        assert profiler.lines is lines
+        for _ in range(OVERLAY_REFRESH_FRAMES):
+            run_frame(profiler, 1)
+        assert profiler.lines != lines
+
+    def test_get_percentiles(self) -> None:
+        """Test the nearest rank percentiles of the last frames."""
+        profiler = FrameProfiler(window=100)
+        assert profiler.get_percentiles("deck") == (0, 0, 0)
+        profiler.toggle()
+        for ms in range(200, 0, -1):
+            run_frame(profiler, ms)
+        # only the last 100 frames, 1 to 100 ms, are kept
+        assert profiler.get_percentiles("deck") == tuple(map(float, PERCENTILES))
+
+    def test_get_lines(self) -> None:
+        """Test a header and one line per stage."""
+        profiler = FrameProfiler()
+        profiler.toggle()
+        run_frame(profiler, 1.25)
+        lines = profiler.get_lines()
+        assert lines[0] == "ms p50 p95 p99"
+        assert lines[1] == "background 1.25 1.25 1.25"
+
+    @pytest.mark.usefixtures("font")
+    def test_draw(self) -> None:
+        """Test the lines are drawn in the area."""
+        profiler = FrameProfiler()
+        profiler.toggle()
+        screen = pygame.Surface((200, 200))
+        screen.fill((255, 255, 255))
+        profiler.draw(screen, pygame.Rect(10, 10, 100, 100))
+        assert screen.get_at((10, 10)) == pygame.Color(*OVERLAY_BACKGROUND)
+        assert screen.get_at((5, 5)) == pygame.Color(255, 255, 255)
+
+    def test_close(self, tmp_path: Path) -> None:
+        """Test closing stops the export and keeps the overlay."""
+        profiler = FrameProfiler(tmp_path / "frames.csv")
+        profiler.close()
+        assert profiler.csv_writer is None
+        assert not profiler.enabled
+        profiler.close()
+
+    def test___repr__(self) -> None:
+        """Test profiler repr."""
+        assert "FrameProfiler" in repr(FrameProfiler())
+
+
+def test_get_profile_csv(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the CSV file is read from the environment."""
+    monkeypatch.delenv(PROFILE_CSV_ENV, raising=False)
+    assert get_profile_csv() is None
+    monkeypatch.setenv(PROFILE_CSV_ENV, "frames.csv")
+    assert get_profile_csv() == Path("frames.csv")
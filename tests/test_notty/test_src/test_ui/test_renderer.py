@@ -0,0 +1,100 @@
+"""Test renderer module."""
+
+import pygame
+from pytest_mock import MockerFixture
+
+from notty.src.ui.renderer import DirtyRenderer
+
+RED = pygame.Color(255, 0, 0)
+GRAY = pygame.Color(40, 40, 40)
+
+
+def make_renderer() -> DirtyRenderer:
+    """Make a renderer of an offscreen surface with a gray background."""
+    background = pygame.Surface((100, 100))
+    background.fill(GRAY)
+    return DirtyRenderer(pygame.Surface((100, 100)), background)
+
+
+class TestDirtyRenderer:
+    """Test DirtyRenderer class."""
+
+    def test___init__(self) -> None:
+        """Test the first frame is drawn in full."""
+        renderer = make_renderer()
+        assert renderer.full_redraw
+        assert renderer.states == {}
+        assert not renderer.profiler.enabled
+
+    def test_invalidate(self) -> None:
+        """Test invalidating redraws every region."""
+        renderer = make_renderer()
+        renderer.begin_frame()
+        renderer.draw_region("a", pygame.Rect(0, 0, 10, 10), 1, lambda: None)
+        renderer.end_frame()
+        renderer.invalidate()
+        renderer.begin_frame()
+        assert renderer.draw_region("a", pygame.Rect(0, 0, 10, 10), 1, lambda: None)
+        assert renderer.end_frame() == [pygame.Rect(0, 0, 100, 100)]
+
+    def test_set_screen(self) -> None:
+        """Test a new screen is drawn in full."""
+        renderer = make_renderer()
+        renderer.end_frame()
+        screen = pygame.Surface((50, 50))
+        background = pygame.Surface((50, 50))
+        renderer.set_screen(screen, background)
+        assert renderer.screen is screen
+        assert renderer.background is background
+        assert renderer.full_redraw
+
+    def test_begin_frame(self) -> None:
+        """Test a full redraw restores the whole background."""
+        renderer = make_renderer()
+        renderer.screen.fill(RED)
+        renderer.begin_frame()
+        assert renderer.screen.get_at((99, 99)) == GRAY
+
+    def test_draw_region(self) -> None:
+        """Test regions are drawn when they change and clipped to their rect."""
+        renderer = make_renderer()
+        renderer.begin_frame()
+        renderer.end_frame()
+        rect = pygame.Rect(10, 10, 20, 20)
+        assert renderer.draw_region("a", rect, 1, lambda: renderer.screen.fill(RED))
+        assert renderer.screen.get_at((15, 15)) == RED
+        assert renderer.screen.get_at((50, 50)) == GRAY
+        assert not renderer.draw_region("a", rect, 1, lambda: None)
+        # a moved region restores the background where it was
+        moved = pygame.Rect(40, 40, 20, 20)
+        assert renderer.draw_region("a", moved, 1, lambda: None)
+        assert renderer.screen.get_at((15, 15)) == GRAY
+        assert renderer.dirty == [rect, rect.union(moved)]
+
+    def test_end_frame(self, mocker: MockerFixture) -> None:
+        """Test only changed rects are updated."""
+        update = mocker.patch.object(pygame.display, "update")
+        renderer = make_renderer()
+        renderer.begin_frame()
+        assert renderer.end_frame() == [pygame.Rect(0, 0, 100, 100)]
+        renderer.begin_frame()
+        assert renderer.end_frame() == []
+        renderer.begin_frame()
+        renderer.draw_region("a", pygame.Rect(0, 0, 5, 5), 2, lambda: None)
+        assert renderer.end_frame() == [pygame.Rect(0, 0, 5, 5)]
+        # an offscreen surface is not the display
+        update.assert_not_called()
+
+    def test_end_frame_profiled(self) -> None:
+        """Test the renderer measures the background and the flip of a frame."""
+        renderer = make_renderer()
+        renderer.profiler.toggle()
+        renderer.begin_frame()
+        renderer.end_frame()
+        renderer.begin_frame()
+        renderer.end_frame()
+        # only the full redraw of the first frame blits the whole background
+        background = list(renderer.profiler.samples["background"])
+        assert background[0] > 0
+        assert background[1] == 0
+        assert len(renderer.profiler.samples["flip"]) == len(background)
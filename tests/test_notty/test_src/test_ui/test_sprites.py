@@ -0,0 +1,195 @@
+"""Test sprites module."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pygame
+import pytest
+from pytest_mock import MockerFixture
+
+from notty.src import assets as assets_module
+from notty.src.assets import get_asset_pack
+from notty.src.ui.sprites import (
+    SPRITE_NAMES,
+    SPRITE_READY,
+    VARIANT_FORMAT,
+    SpriteCache,
+    get_sprite_asset,
+    get_sprite_dir,
+    get_surface_bytes,
+    get_variant_name,
+    load_image,
+)
+
+
+@pytest.fixture
+def sprite_dir(tmp_path: Path, mocker: MockerFixture) -> Iterator[Path]:
+    """Use an empty directory as the resources package without a pack."""
+    mocker.patch.object(assets_module, "get_assets_dir", return_value=tmp_path)
+    get_asset_pack.cache_clear()
+    sprite_dir = tmp_path / "sprites"
+    sprite_dir.mkdir()
+    yield sprite_dir
+    get_asset_pack.cache_clear()
+
+
+@pytest.fixture
+def sprite(sprite_dir: Path) -> str:
+    """Save a small sprite as a full size sprite."""
+    image = pygame.Surface((30, 40), pygame.SRCALPHA)
+    image.fill((255, 0, 0, 128))
+    pygame.image.save(image, sprite_dir / "sprite.png")
+    return "sprite"
+
+
+def wait_for(cache: SpriteCache, name: str, height: int) -> pygame.Surface:
+    """Get a sprite once the worker thread decoded it."""
+    for future in list(cache.pending.values()):
+        future.result(timeout=10)
+    sprite = cache.get(name, height)
+    assert sprite is not None
+    return sprite
+
+
+def test_get_sprite_dir() -> None:
+    """Test the full size sprites are in the sprites directory."""
+    for name in SPRITE_NAMES:
+        assert (get_sprite_dir() / f"{name}.png").is_file()
+
+
+def test_get_variant_name() -> None:
+    """Test the variants are in a directory per height."""
+    assert (
+        get_variant_name("nottyangry", 256)
+        == f"sprites/256/nottyangry.{VARIANT_FORMAT}"
+    )
+
+
+def test_get_sprite_asset(sprite_dir: Path) -> None:
+    """Test the smallest fitting variant is used, then the full size sprite."""
+    with pytest.raises(FileNotFoundError):
+        get_sprite_asset("nottyangry", 100)
+
+    # the largest variant if there is no full size sprite
+    large = get_variant_name("nottyangry", 1024)
+    (sprite_dir / "1024").mkdir()
+    (sprite_dir.parent / large).touch()
+    assert get_sprite_asset("nottyangry", 2000) == large
+
+    # the full size sprite if it is higher than all variants
+    (sprite_dir / "nottyangry.png").touch()
+    assert get_sprite_asset("nottyangry", 2000) == "sprites/nottyangry.png"
+
+    small = get_variant_name("nottyangry", 256)
+    (sprite_dir / "256").mkdir()
+    (sprite_dir.parent / small).touch()
+    assert get_sprite_asset("nottyangry", 100) == small
+    assert get_sprite_asset("nottyangry", 256) == small
+    assert get_sprite_asset("nottyangry", 300) == large
+
+
+def test_load_image(sprite: str) -> None:
+    """Test an image asset is decoded."""
+    assert load_image(f"sprites/{sprite}.png").get_size() == (30, 40)
+
+
+def test_get_surface_bytes() -> None:
+    """Test the bytes of the pixels of a surface are counted."""
+    expected = 4 * 10 * 20
+    assert get_surface_bytes(pygame.Surface((10, 20), pygame.SRCALPHA)) >= expected
+
+
+class TestSpriteCache:
+    """Test SpriteCache class."""
+
+    def test___init__(self) -> None:
+        """Test the cache is empty at first."""
+        cache = SpriteCache(100)
+        expected = 100
+        assert cache.budget == expected
+        assert cache.used == 0
+        assert not cache.surfaces
+        assert not cache.pending
+        cache.close()
+
+    def test_request(self, sprite: str) -> None:
+        """Test an image is decoded only once."""
+        cache = SpriteCache()
+        asset = cache.request(sprite, 20)
+        assert asset == "sprites/sprite.png"
+        future = cache.pending[asset]
+        assert cache.request(sprite, 10) == asset
+        assert cache.pending[asset] is future
+        cache.close()
+
+    def test_prefetch(self, sprite: str) -> None:
+        """Test prefetched sprites are decoded before they are shown."""
+        cache = SpriteCache()
+        cache.prefetch([sprite], 20)
+        assert "sprites/sprite.png" in cache.pending
+        cache.close()
+
+    def test_notify(self, mocker: MockerFixture) -> None:
+        """Test the event loop is woken up only for decoded sprites."""
+        post = mocker.patch.object(pygame.event, "post")
+        mocker.patch.object(pygame.display, "get_init", return_value=True)
+        cache = SpriteCache()
+        future = mocker.MagicMock()
+        future.cancelled.return_value = False
+        cache.notify(future)
+        assert post.call_args.args[0].type == SPRITE_READY
+        future.cancelled.return_value = True
+        cache.notify(future)
+        post.assert_called_once()
+        cache.close()
+
+    def test_get_image(self, sprite: str) -> None:
+        """Test an image is returned once it is decoded and then kept."""
+        cache = SpriteCache()
+        asset = cache.request(sprite, 40)
+        cache.pending[asset].result(timeout=10)
+        image = cache.get_image(asset)
+        assert image is not None
+        assert image.get_size() == (30, 40)
+        assert not cache.pending
+        assert cache.get_image(asset) is image
+        cache.close()
+
+    def test_get(self, sprite: str) -> None:
+        """Test a sprite is scaled once per height."""
+        cache = SpriteCache()
+        assert cache.get(sprite, 20) is None
+        scaled = wait_for(cache, sprite, 20)
+        assert scaled.get_size() == (15, 20)
+        assert cache.get(sprite, 20) is scaled
+        assert list(cache.surfaces)[-1] == (sprite, 20)
+        cache.close()
+
+    def test_add(self) -> None:
+        """Test the least recently used surfaces are dropped over the budget."""
+        surface = pygame.Surface((10, 10), pygame.SRCALPHA)
+        size = get_surface_bytes(surface)
+        cache = SpriteCache(2 * size)
+        cache.add("a", surface)
+        cache.add("b", surface.copy())
+        cache.surfaces.move_to_end("a")
+        cache.add("c", surface.copy())
+        assert list(cache.surfaces) == ["a", "c"]
+        assert cache.used == 2 * size
+        # the last surface is kept even over the budget
+        cache.add("d", pygame.Surface((30, 30), pygame.SRCALPHA))
+        assert list(cache.surfaces) == ["d"]
+        cache.close()
+
+    def test_close(self) -> None:
+        """Test the worker thread is stopped."""
+        cache = SpriteCache()
+        cache.close()
+        with pytest.raises(RuntimeError):
+            cache.executor.submit(print)
+
+    def test___repr__(self) -> None:
+        """Test the usage is shown."""
+        cache = SpriteCache(100)
+        assert repr(cache) == "SpriteCache(0 surfaces, 0/100 bytes)"
+        cache.close()
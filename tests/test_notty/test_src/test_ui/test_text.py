@@ -0,0 +1,46 @@
+"""Test text module."""
+
+from collections.abc import Iterator
+
+import pygame
+import pytest
+
+from notty.src.ui.text import clear_text_caches, get_font, render_text
+
+
+@pytest.fixture(autouse=True)
+def font() -> Iterator[None]:
+    """Initialize the font module and start with empty caches."""
+    pygame.font.init()
+    clear_text_caches()
+    yield
+    clear_text_caches()
+    pygame.font.quit()
+
+
+def test_get_font() -> None:
+    """Test fonts are created once per size."""
+    assert get_font(20) is get_font(20)
+    assert get_font(20) is not get_font(24)
+
+
+def test_render_text() -> None:
+    """Test unchanged text is rendered once."""
+    deck = render_text("DECK", 20)
+    assert render_text("DECK", 20) is deck
+    assert render_text("DECK", 20, (0, 0, 0)) is not deck
+    assert render_text("DECK", 20, antialias=False) is not deck
+    assert render_text("DECK", 30).get_height() > deck.get_height()
+    info = render_text.cache_info()
+    assert info.hits == 1
+    expected = 4
+    assert info.misses == expected
+
+
+def test_clear_text_caches() -> None:
+    """Test fonts and texts are created again after clearing."""
+    font = get_font(20)
+    text = render_text("DECK", 20)
+    clear_text_caches()
+    assert get_font(20) is not font
+    assert render_text("DECK", 20) is not text
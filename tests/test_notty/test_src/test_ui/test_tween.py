@@ -0,0 +1,198 @@
+"""Test tween module."""
+
+import dataclasses
+
+import pygame
+
+from notty.src.ui.tween import (
+    MAX_SPEED,
+    MIN_SPEED,
+    Tween,
+    TweenScheduler,
+    ease_out_cubic,
+)
+
+RED = pygame.Color(255, 0, 0)
+
+
+def make_tween(delay_ms: float = 0.0, target: str | None = None) -> Tween:
+    """Make a tween moving a red square 100 pixels right in 100 ms."""
+    surface = pygame.Surface((2, 2))
+    surface.fill(RED)
+    return Tween(surface, (0, 0), (100, 0), 100, delay_ms, target, "deck", lambda p: p)
+
+
+def test_ease_out_cubic() -> None:
+    """Test the easing starts fast and ends at 1."""
+    assert ease_out_cubic(0.0) == 0.0
+    assert ease_out_cubic(1.0) == 1.0
+    half = 0.5
+    assert ease_out_cubic(half) > half
+
+
+class TestTween:
+    """Test Tween class."""
+
+    def test___init__(self) -> None:
+        """Test tween initialization."""
+        tween = make_tween()
+        assert tween.elapsed_ms == 0.0
+        assert tween.source == "deck"
+
+    def test___eq__(self) -> None:
+        """Test tween equality."""
+        tween = make_tween()
+        assert dataclasses.replace(tween) == tween
+        # another surface is another tween
+        assert tween != make_tween()
+
+    def test_update(self) -> None:
+        """Test the tween advances by elapsed time."""
+        tween = make_tween()
+        tween.update(30)
+        tween.update(20)
+        expected = 50
+        assert tween.elapsed_ms == expected
+
+    def test_is_started(self) -> None:
+        """Test the tween waits for its delay."""
+        tween = make_tween(delay_ms=50)
+        assert not tween.is_started()
+        tween.update(50)
+        assert tween.is_started()
+
+    def test_is_done(self) -> None:
+        """Test the tween is done after delay and duration."""
+        tween = make_tween(delay_ms=50)
+        tween.update(149)
+        assert not tween.is_done()
+        tween.update(1)
+        assert tween.is_done()
+
+    def test_get_progress(self) -> None:
+        """Test the progress is clamped between 0 and 1."""
+        tween = make_tween(delay_ms=50)
+        assert tween.get_progress() == 0.0
+        tween.update(75)
+        expected = 0.25
+        assert tween.get_progress() == expected
+        tween.update(1000)
+        assert tween.get_progress() == 1.0
+        instant = make_tween()
+        instant.duration_ms = 0
+        assert instant.get_progress() == 1.0
+
+    def test_get_position(self) -> None:
+        """Test the position is interpolated."""
+        tween = make_tween()
+        tween.update(40)
+        expected = (40, 0)
+        assert tween.get_position() == expected
+
+    def test___repr__(self) -> None:
+        """Test tween repr."""
+        assert "Tween" in repr(make_tween())
+
+
+class TestTweenScheduler:
+    """Test TweenScheduler class."""
+
+    def test___init__(self) -> None:
+        """Test scheduler initialization."""
+        scheduler = TweenScheduler()
+        assert scheduler.speed == 1.0
+        assert not scheduler.is_active()
+
+    def test_add(self) -> None:
+        """Test adding a tween."""
+        scheduler = TweenScheduler()
+        scheduler.add(make_tween())
+        assert len(scheduler.tweens) == 1
+
+    def test_is_active(self) -> None:
+        """Test the scheduler is active while tweens run."""
+        scheduler = TweenScheduler()
+        scheduler.add(make_tween())
+        assert scheduler.is_active()
+        scheduler.update(100)
+        assert not scheduler.is_active()
+
+    def test_update(self) -> None:
+        """Test tweens advance by the scaled time and finish."""
+        scheduler = TweenScheduler(speed=2)
+        assert not scheduler.update(10)
+        tween = make_tween()
+        scheduler.add(tween)
+        assert scheduler.update(10)
+        expected = 20
+        assert tween.elapsed_ms == expected
+        # the update finishing the last tween still changes the screen
+        assert scheduler.update(40)
+        assert not scheduler.tweens
+        assert not scheduler.update(10)
+
+    def test_skip(self) -> None:
+        """Test skipping finishes all tweens and erases them once."""
+        scheduler = TweenScheduler()
+        scheduler.skip()
+        assert not scheduler.skipped
+        scheduler.add(make_tween())
+        scheduler.skip()
+        assert not scheduler.is_active()
+        assert scheduler.update(0)
+        assert not scheduler.update(0)
+
+    def test_set_speed(self) -> None:
+        """Test the speed is limited."""
+        scheduler = TweenScheduler()
+        scheduler.set_speed(100)
+        assert scheduler.speed == MAX_SPEED
+        scheduler.set_speed(0)
+        assert scheduler.speed == MIN_SPEED
+
+    def test_get_remaining_ms(self) -> None:
+        """Test the remaining time of the longest tween."""
+        scheduler = TweenScheduler()
+        assert scheduler.get_remaining_ms() == 0.0
+        scheduler.add(make_tween())
+        scheduler.add(make_tween(delay_ms=50))
+        scheduler.update(30)
+        expected = 120
+        assert scheduler.get_remaining_ms() == expected
+
+    def test_get_targets(self) -> None:
+        """Test the targets of the running tweens."""
+        scheduler = TweenScheduler()
+        scheduler.add(make_tween(target="a"))
+        assert scheduler.get_targets() == ["a"]
+
+    def test_count_source(self) -> None:
+        """Test counting tweens by source."""
+        scheduler = TweenScheduler()
+        scheduler.add(make_tween())
+        assert scheduler.count_source("deck") == 1
+        assert scheduler.count_source("other") == 0
+
+    def test_count_target(self) -> None:
+        """Test counting tweens by target."""
+        scheduler = TweenScheduler()
+        scheduler.add(make_tween(target="a"))
+        scheduler.add(make_tween(target="a"))
+        expected = 2
+        assert scheduler.count_target("a") == expected
+
+    def test_draw(self) -> None:
+        """Test only started tweens are drawn."""
+        scheduler = TweenScheduler()
+        scheduler.add(make_tween())
+        scheduler.add(make_tween(delay_ms=50))
+        scheduler.update(10)
+        screen = pygame.Surface((200, 10))
+        scheduler.draw(screen)
+        assert screen.get_at((10, 0)) == RED
+        # the delayed tween would be at the start
+        assert screen.get_at((0, 0)) != RED
+
+    def test___repr__(self) -> None:
+        """Test scheduler repr."""
+        assert "TweenScheduler" in repr(TweenScheduler())